@@ -10,6 +10,7 @@ Enhanced to leverage the improved MCP server's features:
 - Improved error handling and logging
 - Graceful shutdown with resource cleanup
 - Dynamic configuration updates
+- Negotiated binary wire format with compression and chunking (mcp_wire.py)
 
 Architecture Compliance:
 - No HTTP/REST endpoints
@@ -33,6 +34,8 @@ from abc import ABC, abstractmethod
 import websockets
 from websockets.exceptions import ConnectionClosed
 
+from mcp_wire import DEFAULT_CHUNK_SIZE, FrameAssembler, WireCodec, wire_capabilities
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -75,6 +78,12 @@ class BaseMCPAgent(ABC):
         self.heartbeat_interval = config.get("heartbeat_interval", 30)
         self.ping_timeout = config.get("ping_timeout", 10)
         
+        # Wire format: JSON text until the server confirms a binary codec
+        self.wire_enabled = config.get("wire_enabled", True)
+        self.wire_chunk_size = config.get("wire_chunk_size", DEFAULT_CHUNK_SIZE)
+        self.codec = WireCodec()
+        self.assembler = FrameAssembler()
+        
         # Task handling
         self.task_handlers: Dict[str, Callable] = {}
         self.message_handlers = {
@@ -180,12 +189,16 @@ class BaseMCPAgent(ABC):
                 self.connection_attempts += 1
                 self.logger.info(f"Connecting to MCP server at {self.mcp_server_url} (attempt {self.connection_attempts})")
                 
+                self.codec = WireCodec()
+                self.assembler = FrameAssembler()
                 self.websocket = await websockets.connect(
                     self.mcp_server_url,
                     ping_interval=self.heartbeat_interval,
                     ping_timeout=self.ping_timeout,
                     close_timeout=10,
-                    max_size=1024*1024  # 1MB max message size
+                    max_size=1024*1024,  # 1MB max frame size; larger messages are chunked
+                    # The negotiated codec compresses large payloads itself
+                    compression=None if self.wire_enabled else "deflate"
                 )
                 
                 # Register with MCP server
@@ -220,6 +233,8 @@ class BaseMCPAgent(ABC):
             "capabilities": self.get_capabilities(),
             "timestamp": datetime.now().isoformat()
         }
+        if self.wire_enabled:
+            registration["wire"] = wire_capabilities(self.wire_chunk_size)
         
         await self._send_message(registration)
         self.logger.info(f"Sent registration for agent {self.agent_id} with capabilities: {self.get_capabilities()}")
@@ -246,8 +261,8 @@ class BaseMCPAgent(ABC):
             pass
         
         try:
-            message_str = json.dumps(message)
-            await self.websocket.send(message_str)
+            for frame in self.codec.encode(message):
+                await self.websocket.send(frame)
             self.logger.debug(f"Sent message: {message.get('type', 'unknown')}")
         except Exception as e:
             self.logger.error(f"Error sending message: {e}")
@@ -261,10 +276,12 @@ class BaseMCPAgent(ABC):
                 
             async for message in self.websocket:
                 try:
-                    data = json.loads(message)
+                    data = self.assembler.feed(message)
+                    if data is None:
+                        continue  # Waiting for the remaining chunks
                     await self._process_mcp_message(data)
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Invalid JSON received: {e}")
+                except ValueError as e:
+                    self.logger.error(f"Undecodable message received: {e}")
                 except Exception as e:
                     self.logger.error(f"Error processing message: {e}")
                     
@@ -406,6 +423,9 @@ class BaseMCPAgent(ABC):
         """Handle registration confirmation from server."""
         server_id = data.get("server_id")
         self.logger.info(f"Registration confirmed by server {server_id}")
+        if data.get("wire"):
+            self.codec = WireCodec.from_dict(data["wire"])
+            self.logger.info(f"Using wire format {self.codec.format}/{self.codec.compression}")
         # Process any additional server instructions if present
         if "instructions" in data:
             self.logger.info(f"Received server instructions: {data['instructions']}")
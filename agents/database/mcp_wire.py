@@ -0,0 +1,407 @@
+"""
+MCP wire format.
+
+By default MCP messages travel as JSON text frames. A peer that lists a
+``wire`` entry in its registration message (see :func:`wire_capabilities`)
+is switched to compact binary frames once the server confirms the codec
+it picked (see :func:`negotiate`):
+
+    message frame:  b"MCP1" | format | compression | payload
+    relay frame:    b"MCPR" | format | header length (u32) | header | format | compression | body
+    chunk frame:    b"MCPC" | message id (16) | index (u32) | total (u32) | slice
+
+``format`` is one byte: ``j`` json, ``o`` orjson, ``m`` msgpack.
+``compression`` is one byte: ``n`` none, ``z`` zlib, ``s`` zstd. Payloads
+are only compressed above ``compress_threshold`` bytes. Encoded messages
+larger than ``chunk_size`` are split into chunk frames, each under the
+websocket ``max_size``, and put back together by :class:`FrameAssembler`.
+
+Messages that carry a bulky body (``RELAY_BODY_PATHS``) are sent as relay
+frames: a small uncompressed routing header plus the separately encoded
+body. The MCP server decodes only the header and hands the body around as
+a :class:`RawBody`, which is written out verbatim when the next hop
+accepts its format and compression.
+
+Text frames are always accepted, so peers that never negotiate keep
+working unchanged. ``orjson``, ``msgpack`` and ``zstandard`` are optional;
+only what is installed on both ends is offered.
+
+This module is shared verbatim by the MCP server, the gateway client
+template and the agents; keep the copies in sync.
+"""
+
+import json
+import struct
+import time
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+WIRE_VERSION = 1
+
+MESSAGE_MAGIC = b"MCP1"
+RELAY_MAGIC = b"MCPR"
+CHUNK_MAGIC = b"MCPC"
+_CHUNK_HEADER = struct.Struct(">4s16sII")
+_RELAY_HEADER = struct.Struct(">4scI")
+
+# Where the body sits in messages sent as relay frames, by message type
+RELAY_BODY_PATHS = {
+    "task_result": ("result",),
+    "task_request": ("data",),
+    "research_action": ("data", "payload"),
+    "result_response": ("result",),
+}
+
+_FORMAT_CODES = {"json": b"j", "orjson": b"o", "msgpack": b"m"}
+_COMPRESSION_CODES = {"none": b"n", "zlib": b"z", "zstd": b"s"}
+_FORMAT_NAMES = {code: name for name, code in _FORMAT_CODES.items()}
+_COMPRESSION_NAMES = {code: name for name, code in _COMPRESSION_CODES.items()}
+
+DEFAULT_COMPRESS_THRESHOLD = 16 * 1024
+DEFAULT_CHUNK_SIZE = 512 * 1024
+DEFAULT_MAX_MESSAGE_SIZE = 256 * 1024 * 1024
+DEFAULT_ASSEMBLY_TIMEOUT = 120
+
+Frame = Union[str, bytes]
+
+
+class WireError(ValueError):
+    """Raised for frames that cannot be decoded."""
+
+
+def available_formats() -> List[str]:
+    """Encodings installed locally, fastest first."""
+    formats = []
+    if orjson is not None:
+        formats.append("orjson")
+    if msgpack is not None:
+        formats.append("msgpack")
+    formats.append("json")
+    return formats
+
+
+def available_compression() -> List[str]:
+    """Compression schemes installed locally, preferred first."""
+    return (["zstd"] if zstandard is not None else []) + ["zlib"]
+
+
+def wire_capabilities(chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """The ``wire`` entry a client adds to its registration message."""
+    return {
+        "version": WIRE_VERSION,
+        "formats": available_formats(),
+        "compression": available_compression(),
+        "chunking": True,
+        "max_chunk_size": chunk_size
+    }
+
+
+class RawBody:
+    """An encoded message body (format, compression, payload) kept as bytes."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Union[bytes, memoryview]):
+        self.data = data
+
+    @property
+    def format(self) -> Optional[str]:
+        return _FORMAT_NAMES.get(bytes(self.data[0:1]))
+
+    @property
+    def compression(self) -> Optional[str]:
+        return _COMPRESSION_NAMES.get(bytes(self.data[1:2]))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def decode(self, max_size: int = DEFAULT_MAX_MESSAGE_SIZE) -> Any:
+        fmt, compression = self.format, self.compression
+        if fmt is None or compression is None:
+            raise WireError("Unknown body format or compression")
+        payload = self.data[2:]
+        if compression != "none":
+            payload = _decompress(payload, compression, max_size)
+        return _deserialize(payload, fmt)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, RawBody):
+        return value.decode()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _serialize(message: Dict[str, Any], fmt: str) -> bytes:
+    if fmt == "orjson":
+        return orjson.dumps(message, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    if fmt == "msgpack":
+        return msgpack.packb(message, default=_json_default, use_bin_type=True)
+    return json.dumps(message, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _deserialize(payload: bytes, fmt: str) -> Any:
+    if fmt == "orjson":
+        if orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(bytes(payload))
+    if fmt == "msgpack":
+        if msgpack is None:
+            raise WireError("msgpack frame received but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    return json.loads(bytes(payload))
+
+
+_MISSING = object()
+
+
+def _strip_body(message: Dict[str, Any], path: tuple) -> Tuple[Dict[str, Any], Any]:
+    """Return a shallow copy of ``message`` without the body, and the body."""
+    envelope = dict(message)
+    parent = envelope
+    for key in path[:-1]:
+        if not isinstance(parent.get(key), dict):
+            return message, _MISSING
+        parent[key] = dict(parent[key])
+        parent = parent[key]
+    if path[-1] not in parent:
+        return message, _MISSING
+    return envelope, parent.pop(path[-1])
+
+
+def _place_body(envelope: Dict[str, Any], path: List[str], body: Any) -> Dict[str, Any]:
+    parent = envelope
+    for key in path[:-1]:
+        parent = parent.setdefault(key, {})
+    parent[path[-1]] = body
+    return envelope
+
+
+def _compress(payload: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    return zlib.compress(payload, 6)
+
+
+def _decompress(payload: bytes, compression: str, max_size: int) -> bytes:
+    if compression == "zstd":
+        if zstandard is None:
+            raise WireError("zstd frame received but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(bytes(payload), max_output_size=max_size)
+    decompressor = zlib.decompressobj()
+    data = decompressor.decompress(payload, max_size)
+    if decompressor.unconsumed_tail:
+        raise WireError(f"Decompressed message exceeds {max_size} bytes")
+    return data
+
+
+class WireCodec:
+    """Encodes outgoing messages for one connection.
+
+    The default codec (``binary=False``) produces plain JSON text frames for
+    peers that did not negotiate a wire format.
+    """
+
+    def __init__(
+        self,
+        fmt: str = "json",
+        compression: str = "none",
+        binary: bool = False,
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        accepted_formats: Optional[List[str]] = None,
+        accepted_compression: Optional[List[str]] = None
+    ):
+        self.format = fmt
+        self.compression = compression
+        self.binary = binary
+        self.compress_threshold = compress_threshold
+        self.chunk_size = chunk_size
+        # What the peer can decode, for forwarding raw bodies as they are
+        self.accepted_formats = set(accepted_formats or [fmt])
+        self.accepted_compression = set(accepted_compression or [compression]) | {"none"}
+        self.bodies_forwarded = 0
+
+    @classmethod
+    def from_dict(cls, settings: Optional[Dict[str, Any]]) -> "WireCodec":
+        """Build the codec described by a ``registration_confirmed`` message."""
+        if not settings:
+            return cls()
+        return cls(
+            fmt=settings.get("format", "json"),
+            compression=settings.get("compression", "none"),
+            binary=True,
+            compress_threshold=settings.get("compress_threshold", DEFAULT_COMPRESS_THRESHOLD),
+            chunk_size=settings.get("chunk_size", DEFAULT_CHUNK_SIZE)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": WIRE_VERSION,
+            "format": self.format,
+            "compression": self.compression,
+            "compress_threshold": self.compress_threshold,
+            "chunk_size": self.chunk_size
+        }
+
+    def encode(self, message: Dict[str, Any]) -> List[Frame]:
+        """Encode ``message`` into one or more websocket frames."""
+        if not self.binary:
+            return [json.dumps(message, default=_json_default)]
+
+        path = RELAY_BODY_PATHS.get(message.get("type"))
+        envelope, body = _strip_body(message, path) if path else (message, _MISSING)
+        if body is _MISSING:
+            frame = MESSAGE_MAGIC + self._encode_payload(message)
+        else:
+            header = _serialize(_place_body(envelope, ["_body"], list(path)), self.format)
+            frame = b"".join((
+                _RELAY_HEADER.pack(RELAY_MAGIC, _FORMAT_CODES[self.format], len(header)),
+                header,
+                self._encode_body(body)
+            ))
+        if len(frame) <= self.chunk_size:
+            return [frame]
+
+        message_id = uuid.uuid4().bytes
+        total = (len(frame) + self.chunk_size - 1) // self.chunk_size
+        view = memoryview(frame)
+        return [
+            _CHUNK_HEADER.pack(CHUNK_MAGIC, message_id, index, total)
+            + view[index * self.chunk_size:(index + 1) * self.chunk_size]
+            for index in range(total)
+        ]
+
+    def _encode_payload(self, value: Any) -> bytes:
+        """format | compression | payload"""
+        payload = _serialize(value, self.format)
+        compression = "none"
+        if self.compression != "none" and len(payload) >= self.compress_threshold:
+            payload = _compress(payload, self.compression)
+            compression = self.compression
+        return _FORMAT_CODES[self.format] + _COMPRESSION_CODES[compression] + payload
+
+    def _encode_body(self, body: Any) -> Union[bytes, memoryview]:
+        if isinstance(body, RawBody):
+            if body.format in self.accepted_formats and body.compression in self.accepted_compression:
+                self.bodies_forwarded += 1
+                return body.data
+            body = body.decode()
+        return self._encode_payload(body)
+
+
+def negotiate(
+    offer: Optional[Dict[str, Any]],
+    compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> WireCodec:
+    """Pick the codec for a peer from the ``wire`` entry it registered with."""
+    if not isinstance(offer, dict) or offer.get("version") != WIRE_VERSION:
+        return WireCodec()
+
+    formats = offer.get("formats", [])
+    compressions = offer.get("compression", [])
+    fmt = next((f for f in available_formats() if f in formats), "json")
+    compression = next((c for c in available_compression() if c in compressions), "none")
+    if offer.get("chunking"):
+        chunk_size = min(chunk_size, offer.get("max_chunk_size", chunk_size))
+    else:
+        chunk_size = DEFAULT_MAX_MESSAGE_SIZE
+    return WireCodec(
+        fmt, compression, binary=True, compress_threshold=compress_threshold, chunk_size=chunk_size,
+        accepted_formats=formats, accepted_compression=compressions
+    )
+
+
+class FrameAssembler:
+    """Decodes incoming frames of any supported kind for one connection.
+
+    Chunk frames are buffered until the whole message has arrived;
+    incomplete messages are dropped after ``timeout`` seconds. With
+    ``lazy_bodies`` the body of a relay frame is left encoded as a
+    :class:`RawBody` so a router can pass it on without decoding it.
+    """
+
+    def __init__(
+        self,
+        max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE,
+        timeout: float = DEFAULT_ASSEMBLY_TIMEOUT,
+        lazy_bodies: bool = False
+    ):
+        self.max_message_size = max_message_size
+        self.timeout = timeout
+        self.lazy_bodies = lazy_bodies
+        self._partial: Dict[bytes, Dict[str, Any]] = {}
+
+    def feed(self, frame: Frame) -> Optional[Dict[str, Any]]:
+        """Decode ``frame``; returns None while a chunked message is incomplete."""
+        if isinstance(frame, str):
+            return json.loads(frame)
+
+        magic = bytes(frame[:4])
+        if magic == MESSAGE_MAGIC:
+            return self._decode_message(frame)
+        if magic == RELAY_MAGIC:
+            return self._decode_relay(frame)
+        if magic != CHUNK_MAGIC:
+            raise WireError("Unknown binary frame")
+
+        _, message_id, index, total = _CHUNK_HEADER.unpack_from(frame)
+        self._expire()
+        entry = self._partial.setdefault(message_id, {"parts": {}, "size": 0, "started": time.monotonic()})
+        if index >= total or index in entry["parts"]:
+            raise WireError(f"Invalid chunk {index}/{total}")
+        part = frame[_CHUNK_HEADER.size:]
+        entry["parts"][index] = part
+        entry["size"] += len(part)
+        if entry["size"] > self.max_message_size:
+            self._partial.pop(message_id, None)
+            raise WireError(f"Chunked message exceeds {self.max_message_size} bytes")
+        if len(entry["parts"]) < total:
+            return None
+
+        self._partial.pop(message_id, None)
+        return self.feed(b"".join(entry["parts"][i] for i in range(total)))
+
+    def _decode_message(self, frame: bytes) -> Dict[str, Any]:
+        return RawBody(memoryview(frame)[4:]).decode(self.max_message_size)
+
+    def _decode_relay(self, frame: bytes) -> Dict[str, Any]:
+        _, fmt_code, header_length = _RELAY_HEADER.unpack_from(frame)
+        fmt = _FORMAT_NAMES.get(fmt_code)
+        if fmt is None:
+            raise WireError("Unknown relay header format")
+        view = memoryview(frame)
+        start = _RELAY_HEADER.size
+        envelope = _deserialize(view[start:start + header_length], fmt)
+        body = RawBody(view[start + header_length:])
+        path = envelope.pop("_body", None)
+        if not path:
+            raise WireError("Relay frame without a body path")
+        return _place_body(envelope, path, body if self.lazy_bodies else body.decode(self.max_message_size))
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.timeout
+        for message_id in [m for m, entry in self._partial.items() if entry["started"] < cutoff]:
+            del self._partial[message_id]
+
+    @property
+    def pending(self) -> int:
+        return len(self._partial)
@@ -15,6 +15,7 @@ ARCHITECTURE COMPLIANCE:
 """
 
 import asyncio
+import base64
 import json
 import logging
 import re
@@ -36,6 +37,7 @@ import asyncpg
 # Import the standardized health check service
 sys.path.append(str(Path(__file__).parent.parent))
 from health_check_service import create_health_check_app
+from mcp_wire import DEFAULT_CHUNK_SIZE, FrameAssembler, WireCodec, wire_capabilities
 
 # Configure logging
 logging.basicConfig(
@@ -74,6 +76,12 @@ class DatabaseAgentService:
         self.mcp_connected = False
         self.should_run = True
         
+        # Wire format: JSON text until the server confirms a binary codec
+        self.wire_enabled = config.get("wire_enabled", True)
+        self.wire_chunk_size = config.get("wire_chunk_size", DEFAULT_CHUNK_SIZE)
+        self.codec = WireCodec()
+        self.assembler = FrameAssembler()
+        
         # Database connection pool
         self.db_pool: Optional[asyncpg.Pool] = None
         
@@ -98,6 +106,7 @@ class DatabaseAgentService:
             "create_task", "update_task", "delete_task", "get_task",
             "create_literature_record", "update_literature_record", "delete_literature_record",
             "store_literature_records", "store_initial_literature_results", "store_reviewed_literature_results",
+            "search_literature_records",
             "create_search_term_optimization", "update_search_term_optimization", "delete_search_term_optimization", "get_search_term_optimization",
             "get_search_terms_for_plan", "get_search_terms_for_task", "store_optimized_search_terms",
             "database_operations", "data_persistence", "query_execution"
@@ -192,10 +201,13 @@ class DatabaseAgentService:
             try:
                 logger.info(f"Connecting to MCP server at {self.mcp_server_url} (attempt {attempt + 1})")
                 
+                self.codec = WireCodec()
+                self.assembler = FrameAssembler()
                 self.websocket = await websockets.connect(
                     self.mcp_server_url,
                     ping_interval=30,
-                    ping_timeout=10
+                    ping_timeout=10,
+                    compression=None if self.wire_enabled else "deflate"
                 )
                 
                 # Register with MCP server
@@ -230,11 +242,18 @@ class DatabaseAgentService:
                 "health_endpoint": f"http://{self.service_host}:{self.service_port}/health"
             }
         }
+        if self.wire_enabled:
+            registration_message["wire"] = wire_capabilities(self.wire_chunk_size)
         
-        await self.websocket.send(json.dumps(registration_message))
+        await self._send_mcp_message(registration_message)
         logger.info(f"Registered with MCP server: {len(self.capabilities)} capabilities")
         logger.info(f"DEBUG: Capabilities sent: {self.capabilities}")
     
+    async def _send_mcp_message(self, message: Dict[str, Any]):
+        """Send a message to the MCP server using the negotiated wire format."""
+        for frame in self.codec.encode(message):
+            await self.websocket.send(frame)
+    
     async def _listen_for_tasks(self):
         """Listen for tasks from MCP server."""
         try:
@@ -249,8 +268,10 @@ class DatabaseAgentService:
                     break
                     
                 try:
-                    data = json.loads(message)
-                    logger.info(f"Received message from MCP server: {data}")
+                    data = self.assembler.feed(message)
+                    if data is None:
+                        continue  # Waiting for the remaining chunks
+                    logger.info(f"Received message from MCP server: {data.get('type')} ({len(message)} bytes)")
                     
                     # Filter out system messages - only queue actual task requests
                     message_type = data.get("type", "")
@@ -259,13 +280,16 @@ class DatabaseAgentService:
                         logger.info("Task request added to task queue")
                     elif message_type == "registration_confirmed":
                         logger.info("Registration confirmed by MCP server")
+                        if data.get("wire"):
+                            self.codec = WireCodec.from_dict(data["wire"])
+                            logger.info(f"Using wire format {self.codec.format}/{self.codec.compression}")
                     elif message_type == "heartbeat_ack":
                         logger.debug("Heartbeat acknowledgment received")
                     else:
                         logger.info(f"Received system message type: {message_type} - not queuing as task")
                         
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse MCP message: {e}")
+                except ValueError as e:
+                    logger.error(f"Failed to decode MCP message: {e}")
                 except Exception as e:
                     logger.error(f"Error handling MCP message: {e}")
                     
@@ -303,10 +327,13 @@ class DatabaseAgentService:
                         pass
                 
                 # Create new connection
+                self.codec = WireCodec()
+                self.assembler = FrameAssembler()
                 self.websocket = await websockets.connect(
                     self.mcp_server_url,
                     ping_interval=20,  # More frequent pings during long operations
-                    ping_timeout=15    # Longer timeout for ping responses
+                    ping_timeout=15,   # Longer timeout for ping responses
+                    compression=None if self.wire_enabled else "deflate"
                 )
                 
                 # Re-register with MCP server
@@ -336,12 +363,12 @@ class DatabaseAgentService:
                 # Get task from queue
                 logger.info("Waiting for task from queue")
                 task_data = await self.task_queue.get()
-                logger.info(f"Got task from queue: {task_data}")
+                logger.info(f"Got task from queue: {task_data.get('task_id')}")
 
                 # Process the task
                 logger.info("About to process database task")
                 result = await self._process_database_task(task_data)
-                logger.info(f"Task processing result: {result}")
+                logger.debug(f"Task processing result: {result}")
 
                 # Send result back to MCP server
                 if self.websocket and self.mcp_connected:
@@ -355,8 +382,8 @@ class DatabaseAgentService:
                         "status": "completed",
                         "timestamp": datetime.now().isoformat()
                     }
-                    logger.info(f"Sending response to MCP server: {response}")
-                    await self.websocket.send(json.dumps(response))
+                    logger.info(f"Sending response to MCP server for task {response['task_id']}")
+                    await self._send_mcp_message(response)
                     logger.info("Response sent successfully")
                 else:
                     logger.warning("No websocket connection to send response")
@@ -377,7 +404,7 @@ class DatabaseAgentService:
         logger.info("Entering _process_database_task method")
         logger.info(f"Method received task_data type: {type(task_data)}")
         try:
-            logger.info(f"Full task data received: {task_data}")
+            logger.debug(f"Full task data received: {task_data}")
 
             # Handle both MCP formats:
             # 1. {"type": "task_request", "task_type": "create_project", "data": {...}}
@@ -446,6 +473,8 @@ class DatabaseAgentService:
                 return await self._handle_store_initial_literature_results(data)
             elif task_type == "store_reviewed_literature_results":
                 return await self._handle_store_reviewed_literature_results(data)
+            elif task_type == "search_literature_records":
+                return await self._handle_search_literature_records(data)
             
             # Search term optimization operations
             elif task_type == "create_search_term_optimization":
@@ -1224,9 +1253,10 @@ class DatabaseAgentService:
             async with self.db_pool.acquire() as conn:
                 async with conn.transaction():
                     stored_count = 0
+                    failed_records = []
                     
                     # Store individual literature records
-                    for record in records:
+                    for index, record in enumerate(records):
                         try:
                             # Use the internal_id from the record as the database id
                             # This ensures consistent mapping between simplified JSON and full records
@@ -1250,43 +1280,47 @@ class DatabaseAgentService:
                                 except (ValueError, TypeError):
                                     year = None
                             
-                            await conn.execute("""
-                                INSERT INTO literature_records (
-                                    id, title, authors, project_id, doi, external_id, year,
-                                    journal, abstract, url, citation_count, source, publication_type,
-                                    mesh_terms, categories, created_at, updated_at, metadata
-                                ) VALUES (
-                                    $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18
+                            # Savepoint per record so one bad row does not abort the whole batch
+                            async with conn.transaction():
+                                await conn.execute("""
+                                    INSERT INTO literature_records (
+                                        id, title, authors, project_id, doi, external_id, year,
+                                        journal, abstract, url, citation_count, source, publication_type,
+                                        mesh_terms, categories, created_at, updated_at, metadata
+                                    ) VALUES (
+                                        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18
+                                    )
+                                    ON CONFLICT (id) DO NOTHING
+                                """, 
+                                    record_id,  # Use internal_id as the primary key id
+                                    record.get("title", ""),
+                                    json.dumps(record.get("authors", [])),
+                                    project_id,
+                                    record.get("doi", ""),
+                                    record.get("external_id", ""),
+                                    year,
+                                    record.get("journal", ""),
+                                    record.get("abstract", ""),
+                                    record.get("url", ""),
+                                    citation_count,  # Use the converted integer value
+                                    record.get("source", ""),
+                                    record.get("publication_type", ""),
+                                    json.dumps(record.get("mesh_terms", [])),
+                                    json.dumps(record.get("categories", [])),
+                                    datetime.now(),
+                                    datetime.now(),
+                                    json.dumps({
+                                        "raw_data": record.get("raw_data", {}),
+                                        "retrieval_timestamp": record.get("retrieval_timestamp", datetime.now().isoformat()),
+                                        "lit_review_id": lit_review_id,
+                                        "plan_id": plan_id,
+                                        "stored_by": "literature-service"
+                                    })
                                 )
-                            """, 
-                                record_id,  # Use internal_id as the primary key id
-                                record.get("title", ""),
-                                json.dumps(record.get("authors", [])),
-                                project_id,
-                                record.get("doi", ""),
-                                record.get("external_id", ""),
-                                year,
-                                record.get("journal", ""),
-                                record.get("abstract", ""),
-                                record.get("url", ""),
-                                citation_count,  # Use the converted integer value
-                                record.get("source", ""),
-                                record.get("publication_type", ""),
-                                json.dumps(record.get("mesh_terms", [])),
-                                json.dumps(record.get("categories", [])),
-                                datetime.now(),
-                                datetime.now(),
-                                json.dumps({
-                                    "raw_data": record.get("raw_data", {}),
-                                    "retrieval_timestamp": record.get("retrieval_timestamp", datetime.now().isoformat()),
-                                    "lit_review_id": lit_review_id,
-                                    "plan_id": plan_id,
-                                    "stored_by": "literature-service"
-                                })
-                            )
                             stored_count += 1
                         except Exception as e:
                             logger.warning(f"Failed to store individual literature record: {e}")
+                            failed_records.append({"index": index, "id": record.get("internal_id"), "error": str(e)})
                             continue
                     
                     # Create JSON for research_plans.initial_literature_results
@@ -1315,6 +1349,8 @@ class DatabaseAgentService:
                     return {
                         "status": "completed",
                         "stored_count": stored_count,
+                        "failed_count": len(failed_records),
+                        "failed_records": failed_records,
                         "lit_review_id": lit_review_id,
                         "plan_id": plan_id,
                         "timestamp": datetime.now().isoformat()
@@ -1436,6 +1472,121 @@ class DatabaseAgentService:
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def _handle_search_literature_records(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle ranked full-text or fuzzy title search over a project's literature records.
+        
+        mode "fulltext" matches title and abstract through the search_vector GIN index
+        and ranks with ts_rank_cd; mode "title" matches titles by trigram similarity,
+        which also serves near-duplicate title checks. Results are keyset-paginated
+        on (score, id) through an opaque cursor.
+        """
+        try:
+            if not self.db_pool:
+                raise Exception("Database pool not available")
+            
+            project_id = data.get("project_id", "")
+            query = (data.get("query") or "").strip()
+            mode = data.get("mode", "fulltext")
+            limit = max(1, min(int(data.get("limit", 20)), 100))
+            min_similarity = float(data.get("min_similarity", 0.3))
+            
+            if not project_id or not query:
+                return {
+                    "status": "failed",
+                    "error": "project_id and query are required",
+                    "timestamp": datetime.now().isoformat()
+                }
+            if mode not in ("fulltext", "title"):
+                return {
+                    "status": "failed",
+                    "error": f"Unknown search mode: {mode}",
+                    "timestamp": datetime.now().isoformat()
+                }
+            
+            after = None
+            if data.get("cursor"):
+                try:
+                    score_after, id_after = self._decode_cursor(data["cursor"])
+                    after = [float(score_after), str(id_after)]
+                except (TypeError, ValueError):
+                    return {
+                        "status": "failed",
+                        "error": "Invalid cursor",
+                        "timestamp": datetime.now().isoformat()
+                    }
+            
+            if mode == "fulltext":
+                score = "ts_rank_cd(search_vector, websearch_to_tsquery('english', $2))"
+                match = "search_vector @@ websearch_to_tsquery('english', $2)"
+            else:
+                score = "similarity(title, $2)"
+                match = "title % $2"
+            
+            params = [project_id, query, limit + 1]
+            keyset = ""
+            if after:
+                keyset = f"AND ({score}, id) < ($4::real, $5)"
+                params.extend(after)
+            
+            async with self.db_pool.acquire() as conn:
+                async with conn.transaction(readonly=True):
+                    if mode == "title":
+                        await conn.execute(
+                            "SELECT set_config('pg_trgm.similarity_threshold', $1, true)", str(min_similarity)
+                        )
+                    rows = await conn.fetch(f"""
+                        SELECT id, title, authors, year, journal, doi, external_id, source, publication_type,
+                               {score} AS score
+                        FROM literature_records
+                        WHERE project_id = $1 AND {match} {keyset}
+                        ORDER BY score DESC, id DESC
+                        LIMIT $3
+                    """, *params)
+            
+            records = []
+            for row in rows[:limit]:
+                record = dict(row)
+                if isinstance(record["authors"], str):
+                    record["authors"] = json.loads(record["authors"])
+                records.append(record)
+            
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = self._encode_cursor([records[-1]["score"], records[-1]["id"]])
+            
+            return {
+                "status": "completed",
+                "project_id": project_id,
+                "mode": mode,
+                "records": records,
+                "count": len(records),
+                "next_cursor": next_cursor,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to search literature records: {e}")
+            return {
+                "status": "failed",
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+    
+    @staticmethod
+    def _encode_cursor(values: List[Any]) -> str:
+        """Opaque pagination cursor for the last row's sort key."""
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> List[Any]:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except Exception:
+            raise ValueError("Invalid cursor")
+        if not isinstance(values, list) or len(values) != 2:
+            raise ValueError("Invalid cursor")
+        return values
+    
     # Search Term Optimization Handlers
     async def _handle_create_search_term_optimization(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle search term optimization creation request."""
@@ -0,0 +1,442 @@
+"""
+Columnar Data Processing Engine for the Executor Agent
+
+Executes small declarative plans over pandas DataFrames so that
+``process_data`` can filter, aggregate, join, pivot and sample extracted
+study tables without materialising them as Python lists of dicts.
+
+A plan looks like::
+
+    {
+        "source": {"file": "studies.parquet"},
+        "steps": [
+            {"op": "filter", "conditions": [
+                {"column": "year", "operator": ">=", "value": 2015}
+            ]},
+            {"op": "group_by", "by": ["design"],
+             "aggregations": {"sample_size": ["sum", "mean"]}},
+            {"op": "sort", "by": ["sample_size_sum"], "ascending": false}
+        ],
+        "output": {"format": "parquet", "filename": "by_design.parquet"}
+    }
+
+Large results are written to the work directory (Parquet, Arrow IPC or
+CSV) and returned as a file reference with a small preview; callers page
+through them with ``read_chunk`` or receive them as streamed chunks.
+"""
+
+import functools
+import io
+import itertools
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    pa = pq = None
+    ARROW_AVAILABLE = False
+
+
+class DataPlanError(ValueError):
+    """Raised when a data plan is invalid or cannot be executed."""
+
+
+FILE_FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "jsonl",
+}
+
+AGGREGATIONS = {"sum", "mean", "median", "min", "max", "count", "nunique", "std", "var", "first", "last"}
+JOIN_TYPES = {"inner", "left", "right", "outer"}
+
+# Rows per Parquet row group / Arrow record batch, so that read_chunk can
+# read a page without loading the whole file
+ROW_GROUP_SIZE = 10000
+
+
+# ---------------------------------------------------------------------------
+# Sources and sinks
+# ---------------------------------------------------------------------------
+
+def resolve_path(work_dir: Path, filename: str) -> Path:
+    """Resolve a filename inside the work directory, rejecting escapes."""
+    path = (work_dir / filename).resolve()
+    if work_dir.resolve() not in path.parents:
+        raise DataPlanError(f"File {filename} is outside the work directory")
+    return path
+
+
+def _file_format(path: Path, explicit: Optional[str] = None) -> str:
+    fmt = explicit or FILE_FORMATS.get(path.suffix.lower())
+    if fmt is None:
+        raise DataPlanError(f"Unsupported file type: {path.suffix}")
+    if fmt in ("parquet", "arrow") and not ARROW_AVAILABLE:
+        raise DataPlanError(f"{fmt} support requires pyarrow")
+    return fmt
+
+
+def load_source(source: Dict[str, Any], work_dir: Path) -> pd.DataFrame:
+    """Load a DataFrame from an inline, CSV-text or work-directory source."""
+    if "data" in source:
+        return pd.DataFrame(source["data"])
+    if "csv" in source:
+        return pd.read_csv(io.StringIO(source["csv"]))
+    if "file" in source:
+        path = resolve_path(work_dir, source["file"])
+        if not path.exists():
+            raise DataPlanError(f"File {source['file']} not found")
+        fmt = _file_format(path, source.get("format"))
+        columns = source.get("columns")
+        if fmt == "parquet":
+            return pd.read_parquet(path, columns=columns)
+        if fmt == "arrow":
+            return pd.read_feather(path, columns=columns)
+        if fmt == "csv":
+            return pd.read_csv(path, usecols=columns)
+        return pd.read_json(path, lines=(fmt == "jsonl"))
+    raise DataPlanError("Source must provide one of: data, csv, file")
+
+
+def write_frame(df: pd.DataFrame, path: Path, fmt: str) -> None:
+    """Write a DataFrame to the work directory in the given format."""
+    if fmt == "parquet":
+        df.to_parquet(path, index=False, row_group_size=ROW_GROUP_SIZE)
+    elif fmt == "arrow":
+        # Uncompressed so read_chunk can slice it through a memory map
+        df.reset_index(drop=True).to_feather(path, compression="uncompressed", chunksize=ROW_GROUP_SIZE)
+    elif fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "jsonl":
+        df.to_json(path, orient="records", lines=True)
+    else:
+        df.to_json(path, orient="records")
+
+
+def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a frame to JSON-safe records (NaN -> None, numpy -> python)."""
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+# ---------------------------------------------------------------------------
+# Plan steps
+# ---------------------------------------------------------------------------
+
+def _require_columns(df: pd.DataFrame, columns: List[str]) -> None:
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise DataPlanError(f"Unknown columns: {missing}")
+
+
+def _condition_mask(df: pd.DataFrame, condition: Dict[str, Any]) -> pd.Series:
+    column = condition.get("column")
+    _require_columns(df, [column])
+    series = df[column]
+    operator = condition.get("operator", "==")
+    value = condition.get("value")
+
+    if operator == "==":
+        return series == value
+    if operator == "!=":
+        return series != value
+    if operator == ">":
+        return series > value
+    if operator == ">=":
+        return series >= value
+    if operator == "<":
+        return series < value
+    if operator == "<=":
+        return series <= value
+    if operator == "in":
+        return series.isin(value or [])
+    if operator == "not_in":
+        return ~series.isin(value or [])
+    if operator == "between":
+        return series.between(value[0], value[1])
+    if operator == "contains":
+        return series.astype("string").str.contains(
+            str(value), case=condition.get("case", False), regex=False, na=False
+        )
+    if operator == "isnull":
+        return series.isna()
+    if operator == "notnull":
+        return series.notna()
+    raise DataPlanError(f"Unknown filter operator: {operator}")
+
+
+def _filter(df: pd.DataFrame, step: Dict[str, Any], work_dir: Path) -> pd.DataFrame:
+    conditions = step.get("conditions") or [step]
+    masks = [
+        _condition_mask(df, condition).to_numpy(dtype=bool, na_value=False)
+        for condition in conditions
+    ]
+    combine = np.logical_or if step.get("mode") == "any" else np.logical_and
+    return df[combine.reduce(masks)]
+
+
+def _select(df: pd.DataFrame, step: Dict[str, Any], work_dir: Path) -> pd.DataFrame:
+    columns = step.get("columns", [])
+    _require_columns(df, columns)
+    df = df[columns]
+    if step.get("rename"):
+        df = df.rename(columns=step["rename"])
+    return df
+
+
+def _group_by(df: pd.DataFrame, step: Dict[str, Any], work_dir: Path) -> pd.DataFrame:
+    by = step.get("by", [])
+    aggregations = step.get("aggregations", {})
+    _require_columns(df, list(by) + list(aggregations))
+    if not aggregations:
+        return df.groupby(by, dropna=False).size().reset_index(name="count")
+
+    spec = {}
+    for column, funcs in aggregations.items():
+        funcs = [funcs] if isinstance(funcs, str) else list(funcs)
+        unknown = set(funcs) - AGGREGATIONS
+        if unknown:
+            raise DataPlanError(f"Unknown aggregations: {sorted(unknown)}")
+        for func in funcs:
+            spec[f"{column}_{func}"] = pd.NamedAgg(column=column, aggfunc=func)
+    return df.groupby(by, dropna=False).agg(**spec).reset_index()
+
+
+def _join(df: pd.DataFrame, step: Dict[str, Any], work_dir: Path) -> pd.DataFrame:
+    how = step.get("how", "inner")
+    if how not in JOIN_TYPES:
+        raise DataPlanError(f"Unknown join type: {how}")
+    right = load_source(step.get("right", {}), work_dir)
+    on = step.get("on")
+    left_on = step.get("left_on", on)
+    right_on = step.get("right_on", on)
+    if not left_on or not right_on:
+        raise DataPlanError("Join requires 'on' or 'left_on'/'right_on'")
+    return df.merge(right, how=how, left_on=left_on, right_on=right_on,
+                    suffixes=tuple(step.get("suffixes", ("", "_right"))))
+
+
+def _pivot(df: pd.DataFrame, step: Dict[str, Any], work_dir: Path) -> pd.DataFrame:
+    index, columns, values = step.get("index"), step.get("columns"), step.get("values")
+    aggfunc = step.get("aggfunc", "sum")
+    if aggfunc not in AGGREGATIONS:
+        raise DataPlanError(f"Unknown aggregation: {aggfunc}")
+    table = pd.pivot_table(df, index=index, columns=columns, values=values,
+                           aggfunc=aggfunc, fill_value=step.get("fill_value"))
+    table.columns = [
+        "_".join(str(part) for part in col) if isinstance(col, tuple) else str(col)
+        for col in table.columns
+    ]
+    return table.reset_index()
+
+
+def _sample(df: pd.DataFrame, step: Dict[str, Any], work_dir: Path) -> pd.DataFrame:
+    n, frac = step.get("n"), step.get("frac")
+    if n is not None:
+        n = min(int(n), len(df))
+    return df.sample(n=n, frac=frac if n is None else None,
+                     random_state=step.get("seed"), replace=step.get("replace", False))
+
+
+def _sort(df: pd.DataFrame, step: Dict[str, Any], work_dir: Path) -> pd.DataFrame:
+    by = step.get("by", [])
+    _require_columns(df, by)
+    return df.sort_values(by, ascending=step.get("ascending", True), kind="stable")
+
+
+def _limit(df: pd.DataFrame, step: Dict[str, Any], work_dir: Path) -> pd.DataFrame:
+    return df.iloc[int(step.get("offset", 0)):int(step.get("offset", 0)) + int(step.get("n", 100))]
+
+
+def _distinct(df: pd.DataFrame, step: Dict[str, Any], work_dir: Path) -> pd.DataFrame:
+    return df.drop_duplicates(subset=step.get("columns"))
+
+
+STEP_HANDLERS: Dict[str, Callable[[pd.DataFrame, Dict[str, Any], Path], pd.DataFrame]] = {
+    "filter": _filter,
+    "select": _select,
+    "group_by": _group_by,
+    "join": _join,
+    "pivot": _pivot,
+    "sample": _sample,
+    "sort": _sort,
+    "limit": _limit,
+    "distinct": _distinct,
+}
+
+
+# ---------------------------------------------------------------------------
+# Plan execution
+# ---------------------------------------------------------------------------
+
+def run_steps(df: pd.DataFrame, steps: List[Dict[str, Any]], work_dir: Path) -> pd.DataFrame:
+    """Apply plan steps to a DataFrame in order."""
+    for index, step in enumerate(steps):
+        handler = STEP_HANDLERS.get(step.get("op"))
+        if handler is None:
+            raise DataPlanError(
+                f"Step {index}: unknown op '{step.get('op')}'. "
+                f"Available ops: {sorted(STEP_HANDLERS)}"
+            )
+        try:
+            df = handler(df, step, work_dir)
+        except DataPlanError as e:
+            raise DataPlanError(f"Step {index} ({step.get('op')}): {e}") from e
+    return df
+
+
+def describe_frame(df: pd.DataFrame) -> Dict[str, Any]:
+    """Summarise the shape and schema of a result frame."""
+    return {
+        "rows": int(len(df)),
+        "columns": [str(c) for c in df.columns],
+        "dtypes": {str(c): str(t) for c, t in df.dtypes.items()},
+    }
+
+
+def execute_plan(
+    plan: Dict[str, Any],
+    work_dir: Path,
+    max_inline_rows: int = 1000,
+    preview_rows: int = 20,
+    on_chunk: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+) -> Dict[str, Any]:
+    """Execute a declarative data plan and return an MCP-sized result.
+
+    ``output.format`` selects how rows are returned:
+
+    - ``inline``: records in the response (spills to a file when the
+      result exceeds ``max_inline_rows``)
+    - ``parquet`` / ``arrow`` / ``csv`` / ``jsonl``: written to the work
+      directory and returned as a file reference with a preview
+    - ``stream``: records passed to ``on_chunk`` in ``chunk_size`` batches
+    """
+    df = run_steps(load_source(plan.get("source", {}), work_dir), plan.get("steps", []), work_dir)
+    output = plan.get("output", {})
+    fmt = output.get("format", "inline")
+    result = describe_frame(df)
+
+    if fmt == "stream":
+        if on_chunk is None:
+            raise DataPlanError("Streaming output is not available for this request")
+        chunk_size = int(output.get("chunk_size", 5000))
+        chunks = 0
+        for start in range(0, len(df), chunk_size):
+            on_chunk(to_records(df.iloc[start:start + chunk_size]))
+            chunks += 1
+        result["chunks"] = chunks
+        return result
+
+    if fmt == "inline" and len(df) <= max_inline_rows:
+        result["records"] = to_records(df)
+        return result
+
+    if fmt == "inline":
+        # Too large to inline: spill to a columnar file instead
+        fmt = "parquet" if ARROW_AVAILABLE else "csv"
+        result["spilled"] = True
+
+    extension = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv", "jsonl": ".jsonl"}.get(fmt)
+    if extension is None:
+        raise DataPlanError(f"Unknown output format: {fmt}")
+    filename = output.get("filename") or f"result_{uuid.uuid4().hex}{extension}"
+    path = resolve_path(work_dir, filename)
+    write_frame(df, path, _file_format(path, fmt))
+
+    result.update({
+        "file": path.name,
+        "format": fmt,
+        "size_bytes": path.stat().st_size,
+        "preview": to_records(df.head(preview_rows)),
+    })
+    return result
+
+
+def _parquet_page(path: Path, offset: int, limit: int, columns: Optional[List[str]]):
+    """Read a page from only the row groups that overlap it."""
+    parquet_file = pq.ParquetFile(path)
+    total = parquet_file.metadata.num_rows
+    groups, first_row, start = [], None, 0
+    for index in range(parquet_file.num_row_groups):
+        rows = parquet_file.metadata.row_group(index).num_rows
+        if start + rows > offset and start < offset + limit:
+            groups.append(index)
+            first_row = start if first_row is None else first_row
+        start += rows
+    if not groups:
+        return [], total
+    table = parquet_file.read_row_groups(groups, columns=columns)
+    return to_records(table.slice(offset - first_row, limit).to_pandas()), total
+
+
+def _arrow_page(path: Path, offset: int, limit: int, columns: Optional[List[str]]):
+    """Slice a page out of a memory-mapped Arrow IPC file."""
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns:
+            table = table.select(columns)
+        return to_records(table.slice(offset, limit).to_pandas()), table.num_rows
+
+
+@functools.lru_cache(maxsize=64)
+def _text_row_count(path: str, fmt: str, mtime_ns: int) -> int:
+    """Row count of a CSV or JSON Lines file, cached per file version."""
+    if fmt == "csv":
+        return sum(len(chunk) for chunk in pd.read_csv(path, usecols=[0], chunksize=100000))
+    with open(path) as f:
+        return sum(1 for line in f if line.strip())
+
+
+def _text_page(path: Path, fmt: str, offset: int, limit: int, columns: Optional[List[str]]):
+    """Parse only the rows of a page from a CSV or JSON Lines file."""
+    total = _text_row_count(str(path), fmt, path.stat().st_mtime_ns)
+    if fmt == "csv":
+        page = pd.read_csv(path, usecols=columns, skiprows=range(1, offset + 1), nrows=limit)
+    else:
+        with open(path) as f:
+            lines = list(itertools.islice(f, offset, offset + limit))
+        page = pd.read_json(io.StringIO("".join(lines)), lines=True) if lines else pd.DataFrame()
+        if columns and len(page):
+            _require_columns(page, columns)
+            page = page[columns]
+    return to_records(page), total
+
+
+def read_chunk(data: Dict[str, Any], work_dir: Path, max_rows: int = 1000) -> Dict[str, Any]:
+    """Read one page of rows from a file-referenced result."""
+    if not data.get("file"):
+        raise DataPlanError("No file provided")
+    path = resolve_path(work_dir, data["file"])
+    if not path.exists():
+        raise DataPlanError(f"File {data['file']} not found")
+    fmt = _file_format(path, data.get("format"))
+    columns = data.get("columns")
+    offset = int(data.get("offset", 0))
+    limit = min(int(data.get("limit", max_rows)), max_rows)
+    if fmt == "parquet":
+        records, total = _parquet_page(path, offset, limit, columns)
+    elif fmt == "arrow":
+        records, total = _arrow_page(path, offset, limit, columns)
+    elif fmt in ("csv", "jsonl"):
+        records, total = _text_page(path, fmt, offset, limit, columns)
+    else:
+        df = load_source({"file": data["file"], "format": fmt, "columns": columns}, work_dir)
+        records, total = to_records(df.iloc[offset:offset + limit]), len(df)
+    return {
+        "file": data["file"],
+        "offset": offset,
+        "rows": len(records),
+        "total_rows": int(total),
+        "next_offset": offset + len(records) if offset + len(records) < total else None,
+        "records": records,
+    }
@@ -27,6 +27,7 @@ import signal
 import subprocess
 import sys
 import tempfile
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -42,6 +43,9 @@ from websockets.exceptions import ConnectionClosed, WebSocketException
 # Import the standardized health check service
 sys.path.append(str(Path(__file__).parent.parent))
 from health_check_service import create_health_check_app
+from src import data_engine
+from src.data_engine import DataPlanError
+from src.sandbox_pool import SandboxWorkerPool
 
 # Configuration
 SERVICE_HOST = os.getenv("SERVICE_HOST", "0.0.0.0")
@@ -90,6 +94,28 @@ class ExecutorAgentService:
         # Working directory for temporary files
         self.work_dir = Path(tempfile.mkdtemp(prefix="executor_"))
         
+        # Data processing limits: larger results are file-referenced
+        data_config = config.get("data_processing", {})
+        self.max_inline_rows = data_config.get("max_inline_rows", 1000)
+        self.preview_rows = data_config.get("preview_rows", 20)
+        # Spilled results are deleted once unread for this long
+        self.spill_ttl = data_config.get("spill_ttl_seconds", 900)
+        self.spilled_files: Dict[str, float] = {}  # filename -> expiry (monotonic)
+        
+        # Pool of warm, pre-imported Python workers for execute_code
+        pool_config = config.get("execution", {}).get("worker_pool", {})
+        self.sandbox_pool: Optional[SandboxWorkerPool] = None
+        if pool_config.get("enabled", True):
+            self.sandbox_pool = SandboxWorkerPool(
+                work_dir=self.work_dir,
+                size=pool_config.get("size", 2),
+                max_runs_per_worker=pool_config.get("max_runs_per_worker", 50),
+                recycle_memory_mb=pool_config.get("recycle_memory_mb", 512),
+                memory_limit_mb=pool_config.get("memory_limit_mb", 2048),
+                cpu_limit_seconds=pool_config.get("cpu_limit_seconds", self.max_execution_time),
+                preload_modules=pool_config.get("preload_modules", ["pandas", "numpy"])
+            )
+        
         # HTTP session for API calls
         self.http_session: Optional[aiohttp.ClientSession] = None
         
@@ -122,6 +148,10 @@ class ExecutorAgentService:
         for sig in [signal.SIGTERM, signal.SIGINT]:
             signal.signal(sig, self._signal_handler)
         
+        # Warm up sandbox workers before accepting tasks
+        if self.sandbox_pool:
+            await self.sandbox_pool.start()
+        
         # Connect to MCP server
         await self.connect_to_mcp_server()
         
@@ -137,6 +167,10 @@ class ExecutorAgentService:
         if self.http_session:
             await self.http_session.close()
         
+        # Terminate sandbox workers
+        if self.sandbox_pool:
+            await self.sandbox_pool.stop()
+        
         # Close WebSocket connection
         if self.websocket:
             await self.websocket.close()
@@ -252,7 +286,7 @@ class ExecutorAgentService:
         
         try:
             if method == "task/execute":
-                result = await self.execute_task(params)
+                result = await self.execute_task(params, self._output_streamer(msg_id))
             elif method == "agent/ping":
                 result = {"status": "alive", "timestamp": datetime.now().isoformat()}
             elif method == "agent/status":
@@ -283,7 +317,26 @@ class ExecutorAgentService:
                 }
                 await self.websocket.send(json.dumps(error_response))
     
-    async def execute_task(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _output_streamer(self, msg_id: Optional[str]):
+        """Build a callback that streams execution output as MCP notifications"""
+        if not msg_id:
+            return None
+        
+        async def send_output(stream: str, text: str):
+            if self.websocket:
+                await self.websocket.send(json.dumps({
+                    "jsonrpc": "2.0",
+                    "method": "task/output",
+                    "params": {
+                        "request_id": msg_id,
+                        "stream": stream,
+                        "data": text
+                    }
+                }))
+        
+        return send_output
+    
+    async def execute_task(self, params: Dict[str, Any], on_output=None) -> Dict[str, Any]:
         """Execute a task via MCP protocol"""
         task_type = params.get("task_type")
         task_data = params.get("data", {})
@@ -291,11 +344,11 @@ class ExecutorAgentService:
         logger.info(f"Executing task: {task_type}")
         
         if task_type == "execute_code":
-            return await self.execute_code(task_data)
+            return await self.execute_code(task_data, on_output)
         elif task_type == "make_api_call":
             return await self.make_api_call(task_data)
         elif task_type == "process_data":
-            return await self.process_data(task_data)
+            return await self.process_data(task_data, on_output)
         elif task_type == "read_file":
             return await self.read_file(task_data)
         elif task_type == "write_file":
@@ -309,13 +362,30 @@ class ExecutorAgentService:
                 "available_tasks": list(self.capabilities)
             }
     
-    async def execute_code(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_code(self, data: Dict[str, Any], on_output=None) -> Dict[str, Any]:
         """Execute Python code in a sandboxed environment"""
         try:
             code = data.get("code", "")
             if not code:
                 return {"status": "error", "message": "No code provided"}
             
+            if self.sandbox_pool:
+                try:
+                    result = await self.sandbox_pool.run(
+                        code, timeout=self.max_execution_time, on_output=on_output
+                    )
+                    return {
+                        "status": "completed",
+                        "result": result,
+                        "timestamp": datetime.now().isoformat()
+                    }
+                except asyncio.TimeoutError:
+                    return {
+                        "status": "error",
+                        "message": f"Code execution timed out after {self.max_execution_time} seconds",
+                        "timestamp": datetime.now().isoformat()
+                    }
+            
             # Create temporary file for code execution
             temp_file = self.work_dir / f"exec_{uuid.uuid4()}.py"
             
@@ -428,51 +498,68 @@ class ExecutorAgentService:
                 "timestamp": datetime.now().isoformat()
             }
     
-    async def process_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process data using pandas or other libraries"""
+    async def process_data(self, data: Dict[str, Any], on_output=None) -> Dict[str, Any]:
+        """Process tabular data with vectorized pandas operations"""
+        operations = ["plan", "read_chunk", "csv_to_json", "json_to_csv", "statistics"]
         try:
             operation = data.get("operation", "")
             input_data = data.get("data", [])
             
-            if operation == "csv_to_json":
-                # Convert CSV data to JSON
-                import pandas as pd
-                import io
-                
-                if isinstance(input_data, str):
-                    df = pd.read_csv(io.StringIO(input_data))
-                else:
-                    df = pd.DataFrame(input_data)
-                
-                result = df.to_json(orient='records')
-                
-            elif operation == "json_to_csv":
-                # Convert JSON data to CSV
-                import pandas as pd
-                
-                df = pd.DataFrame(input_data)
-                result = df.to_csv(index=False)
-                
-            elif operation == "statistics":
-                # Calculate basic statistics
-                import pandas as pd
-                
-                df = pd.DataFrame(input_data)
-                result = df.describe().to_dict()
-                
-            else:
+            if operation not in operations:
                 return {
                     "status": "error",
                     "message": f"Unknown operation: {operation}",
-                    "available_operations": ["csv_to_json", "json_to_csv", "statistics"]
+                    "available_operations": operations
                 }
             
+            self._expire_spilled_files()
+            
+            if operation == "plan":
+                on_chunk = None
+                if on_output:
+                    # Plan execution runs in a worker thread; hop back to
+                    # the event loop to stream each chunk over MCP
+                    loop = asyncio.get_running_loop()
+                    
+                    def send_chunk(records):
+                        asyncio.run_coroutine_threadsafe(
+                            on_output("records", json.dumps(records)), loop
+                        ).result()
+                    
+                    on_chunk = send_chunk
+                
+                result = await asyncio.to_thread(
+                    data_engine.execute_plan,
+                    data.get("plan", {}),
+                    self.work_dir,
+                    self.max_inline_rows,
+                    self.preview_rows,
+                    on_chunk
+                )
+                if result.get("spilled"):
+                    self.spilled_files[result["file"]] = time.monotonic() + self.spill_ttl
+            elif operation == "read_chunk":
+                result = await asyncio.to_thread(
+                    data_engine.read_chunk, data, self.work_dir, self.max_inline_rows
+                )
+                if result["file"] in self.spilled_files:
+                    # Paging keeps a spilled result alive
+                    self.spilled_files[result["file"]] = time.monotonic() + self.spill_ttl
+            else:
+                result = await asyncio.to_thread(self._convert_data, operation, input_data)
+            
             return {
                 "status": "completed",
                 "result": result,
                 "timestamp": datetime.now().isoformat()
             }
             
+        except DataPlanError as e:
+            return {
+                "status": "error",
+                "message": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
         except Exception as e:
             logger.error(f"Error processing data: {e}")
             return {
@@ -481,6 +568,27 @@ class ExecutorAgentService:
                 "timestamp": datetime.now().isoformat()
             }
     
+    def _expire_spilled_files(self):
+        """Delete spilled results that nobody has paged through recently"""
+        now = time.monotonic()
+        for filename, expires_at in list(self.spilled_files.items()):
+            if expires_at <= now:
+                del self.spilled_files[filename]
+                (self.work_dir / filename).unlink(missing_ok=True)
+                logger.info(f"Deleted expired spilled result {filename}")
+    
+    def _convert_data(self, operation: str, input_data: Any) -> Any:
+        """Run the simple format conversion and statistics operations"""
+        if operation == "csv_to_json":
+            source = {"csv": input_data} if isinstance(input_data, str) else {"data": input_data}
+            df = data_engine.load_source(source, self.work_dir)
+            return df.to_json(orient='records')
+        
+        df = data_engine.load_source({"data": input_data}, self.work_dir)
+        if operation == "json_to_csv":
+            return df.to_csv(index=False)
+        return df.describe().to_dict()
+    
     async def read_file(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Read file from work directory"""
         try:
@@ -606,6 +714,7 @@ class ExecutorAgentService:
             "mcp_connected": self.is_connected,
             "work_directory": str(self.work_dir),
             "sandbox_enabled": self.sandbox_enabled,
+            "sandbox_pool": self.sandbox_pool.get_stats() if self.sandbox_pool else None,
             "timestamp": datetime.now().isoformat()
         }
 
@@ -0,0 +1,228 @@
+"""
+Warm Sandbox Worker Pool for the Executor Agent
+
+Keeps a small set of pre-started ``sandbox_worker.py`` interpreters with
+pandas/numpy already imported, so ``execute_code`` requests skip
+interpreter start-up and library import time. Each worker forks a fresh
+child per request, so runs cannot see or alter each other. Output is
+streamed back through an optional callback as the code runs.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).parent / "sandbox_worker.py"
+
+# Largest single protocol line accepted from a worker
+STREAM_LIMIT = 16 * 1024 * 1024
+
+OutputCallback = Callable[[str, str], Awaitable[None]]
+
+
+class SandboxWorker:
+    """Handle on one warm worker process."""
+
+    def __init__(self, process: asyncio.subprocess.Process, pid: int):
+        self.process = process
+        self.pid = pid
+        self.runs = 0
+        self.rss_mb = 0.0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def kill(self):
+        if self.alive:
+            # The worker leads its own process group, which includes the
+            # child running the current request
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        await self.process.wait()
+
+
+class SandboxWorkerPool:
+    """Pool of pre-warmed Python workers that execute code over a pipe.
+
+    Args:
+        work_dir: Directory code runs in.
+        size: Number of warm workers kept available.
+        max_runs_per_worker: Runs after which a worker is replaced.
+        recycle_memory_mb: Resident memory after which a worker is replaced.
+        memory_limit_mb: Address-space limit (``RLIMIT_AS``) per worker.
+        cpu_limit_seconds: CPU-time budget (``RLIMIT_CPU``) per run.
+        preload_modules: Modules imported once when a worker starts.
+    """
+
+    def __init__(
+        self,
+        work_dir: Path,
+        size: int = 2,
+        max_runs_per_worker: int = 50,
+        recycle_memory_mb: int = 512,
+        memory_limit_mb: int = 2048,
+        cpu_limit_seconds: int = 30,
+        preload_modules: Optional[List[str]] = None
+    ):
+        self.work_dir = work_dir
+        self.size = size
+        self.max_runs_per_worker = max_runs_per_worker
+        self.recycle_memory_mb = recycle_memory_mb
+        self.worker_options = {
+            "memory_limit_mb": memory_limit_mb,
+            "cpu_limit_seconds": cpu_limit_seconds,
+            "preload_modules": preload_modules or []
+        }
+        self._idle: "asyncio.Queue[SandboxWorker]" = asyncio.Queue()
+        self._workers: Dict[int, SandboxWorker] = {}
+        self._started = False
+        self.recycled = 0
+
+    async def start(self):
+        """Spawn the initial set of warm workers."""
+        if self._started:
+            return
+        self._started = True
+        workers = await asyncio.gather(
+            *[self._spawn() for _ in range(self.size)], return_exceptions=True
+        )
+        for worker in workers:
+            if isinstance(worker, SandboxWorker):
+                self._idle.put_nowait(worker)
+            else:
+                logger.error(f"Failed to start sandbox worker: {worker}")
+        logger.info(f"Sandbox worker pool started with {self._idle.qsize()} workers")
+
+    async def stop(self):
+        """Terminate all workers."""
+        self._started = False
+        await asyncio.gather(
+            *[worker.kill() for worker in list(self._workers.values())],
+            return_exceptions=True
+        )
+        self._workers.clear()
+
+    async def _spawn(self) -> SandboxWorker:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-u", str(WORKER_SCRIPT), json.dumps(self.worker_options),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=str(self.work_dir),
+            limit=STREAM_LIMIT,
+            start_new_session=True
+        )
+        line = await process.stdout.readline()
+        if not line:
+            await process.wait()
+            raise RuntimeError(f"Sandbox worker exited during start-up ({process.returncode})")
+
+        worker = SandboxWorker(process, json.loads(line).get("pid", process.pid))
+        self._workers[worker.pid] = worker
+        return worker
+
+    async def _replace(self, worker: SandboxWorker):
+        """Kill a worker and put a fresh one in the idle queue."""
+        self._workers.pop(worker.pid, None)
+        await worker.kill()
+        self.recycled += 1
+        if not self._started:
+            return
+        try:
+            self._idle.put_nowait(await self._spawn())
+        except Exception as e:
+            logger.error(f"Failed to replace sandbox worker: {e}")
+
+    async def _acquire(self) -> SandboxWorker:
+        if not self._started:
+            await self.start()
+        if not self._workers and self._idle.empty():
+            # Every worker failed to start; try once more on demand
+            self._idle.put_nowait(await self._spawn())
+        return await self._idle.get()
+
+    async def run(
+        self,
+        code: str,
+        timeout: float,
+        on_output: Optional[OutputCallback] = None
+    ) -> Dict[str, Any]:
+        """Execute ``code`` on a warm worker.
+
+        Returns a dict with ``stdout``, ``stderr`` and ``return_code`` like a
+        subprocess run. Raises ``asyncio.TimeoutError`` when the code runs
+        longer than ``timeout`` seconds; the worker is then replaced.
+        """
+        worker = await self._acquire()
+        request_id = str(uuid.uuid4())
+        output = {"stdout": [], "stderr": []}
+        healthy = False
+
+        async def collect() -> Dict[str, Any]:
+            worker.process.stdin.write((json.dumps({
+                "id": request_id, "code": code, "cwd": str(self.work_dir)
+            }) + "\n").encode("utf-8"))
+            await worker.process.stdin.drain()
+
+            while True:
+                line = await worker.process.stdout.readline()
+                if not line:
+                    await worker.process.wait()
+                    return {"return_code": worker.process.returncode, "crashed": True, "worker_exited": True}
+                frame = json.loads(line)
+                if frame.get("id") != request_id:
+                    # Left over from an earlier run, or forged by user code
+                    continue
+                if frame.get("done"):
+                    return frame
+                output[frame["stream"]].append(frame["data"])
+                if on_output:
+                    await on_output(frame["stream"], frame["data"])
+
+        try:
+            frame = await asyncio.wait_for(collect(), timeout=timeout)
+            worker.runs += 1
+            worker.rss_mb = frame.get("rss_mb", 0.0)
+            healthy = not frame.get("worker_exited")
+        finally:
+            if (healthy and worker.runs < self.max_runs_per_worker
+                    and worker.rss_mb < self.recycle_memory_mb):
+                self._idle.put_nowait(worker)
+            else:
+                asyncio.create_task(self._replace(worker))
+
+        stderr = "".join(output["stderr"])
+        if frame.get("crashed"):
+            stderr += f"\nSandbox run terminated (exit code {frame['return_code']}); " \
+                      "CPU or memory limit may have been exceeded\n"
+
+        return {
+            "stdout": "".join(output["stdout"]),
+            "stderr": stderr,
+            "return_code": frame["return_code"],
+            "duration_ms": frame.get("duration_ms")
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool utilisation for status reporting."""
+        return {
+            "size": self.size,
+            "live_workers": len(self._workers),
+            "idle_workers": self._idle.qsize(),
+            "recycled_workers": self.recycled,
+            "workers": [
+                {"pid": w.pid, "runs": w.runs, "rss_mb": w.rss_mb}
+                for w in self._workers.values()
+            ]
+        }
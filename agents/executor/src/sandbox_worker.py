@@ -0,0 +1,198 @@
+"""
+Sandbox Worker Process for the Executor Agent
+
+A long-lived Python interpreter that pre-imports the analysis libraries
+once and then forks a fresh child for every code snippet sent by the
+executor agent's ``SandboxWorkerPool``. It is started as a standalone script and speaks a
+line-delimited JSON protocol over its standard streams:
+
+- stdin:  one request per line ``{"id": ..., "code": ..., "cwd": ...}``
+- stdout: ``{"ready": true}`` once warm, then for each request any number
+  of ``{"id": ..., "stream": "stdout"|"stderr", "data": ...}`` frames
+  followed by ``{"id": ..., "done": true, "return_code": ..., ...}``
+
+The worker reads requests from a private duplicate of its stdin; user
+code sees an empty stdin and cannot consume or inject requests.
+
+Each run executes in its own forked child, so nothing a snippet does to
+modules, globals or threads outlives it or reaches the next run; the
+warm parent never executes user code. A run gets a CPU-time budget
+enforced with ``RLIMIT_CPU`` and inherits the ``RLIMIT_AS`` address
+space cap. The pool still replaces workers after a number of runs.
+"""
+
+import importlib
+import io
+import json
+import os
+import sys
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that forwards every write as a protocol frame."""
+
+    def __init__(self, channel, request_id: str, stream: str):
+        self._channel = channel
+        self._request_id = request_id
+        self._stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            _send(self._channel, {"id": self._request_id, "stream": self._stream, "data": text})
+        return len(text)
+
+
+# Bound once so a snippet patching json cannot break its own output frames
+_dumps = json.dumps
+
+
+def _send(channel, frame: dict) -> None:
+    channel.write(_dumps(frame) + "\n")
+    channel.flush()
+
+
+def _current_rss_mb() -> float:
+    """Resident memory of this process in MB."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        if resource is None:
+            return 0.0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _set_cpu_budget(seconds: int) -> None:
+    """Allow ``seconds`` of CPU time before the kernel sends SIGXCPU."""
+    if resource is None or seconds <= 0:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = seconds if hard == resource.RLIM_INFINITY else min(seconds, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _fork_run(channel, requests, request: dict, cpu_limit_seconds: int) -> None:
+    """Run one request in a forked child and wait for it.
+
+    The child sends its own frames and ``done`` frame, then signals
+    completion over a pipe. If it dies first (CPU or memory limit,
+    ``os._exit``) the parent sends the ``done`` frame instead.
+    """
+    started = time.perf_counter()
+    finished_r, finished_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(finished_r)
+            requests.close()
+            _set_cpu_budget(cpu_limit_seconds)
+            _run(channel, request)
+            os.write(finished_w, b"1")
+        finally:
+            os._exit(0)
+
+    os.close(finished_w)
+    _, status = os.waitpid(pid, 0)
+    finished = os.read(finished_r, 1)
+    os.close(finished_r)
+    if finished:
+        return
+
+    frame = {
+        "id": request.get("id"),
+        "done": True,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        "rss_mb": round(_current_rss_mb(), 1)
+    }
+    if os.WIFSIGNALED(status):
+        frame.update(return_code=-os.WTERMSIG(status), crashed=True)
+    else:
+        frame["return_code"] = os.WEXITSTATUS(status)
+    _send(channel, frame)
+
+
+def _run(channel, request: dict) -> None:
+    request_id = request.get("id")
+    stdout = _FrameWriter(channel, request_id, "stdout")
+    stderr = _FrameWriter(channel, request_id, "stderr")
+    return_code = 0
+    started = time.perf_counter()
+
+    previous_cwd = os.getcwd()
+    sys.stdin, sys.stdout, sys.stderr = io.StringIO(), stdout, stderr
+    try:
+        if request.get("cwd"):
+            os.chdir(request["cwd"])
+        code = compile(request.get("code", ""), "<sandbox>", "exec")
+        exec(code, {"__name__": "__main__", "__builtins__": __builtins__})
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            return_code = e.code
+        elif e.code is not None:
+            stderr.write(f"{e.code}\n")
+            return_code = 1
+    except BaseException as e:
+        # Drop this module's frame so the traceback starts in user code
+        tb = e.__traceback__.tb_next or e.__traceback__
+        stderr.write("".join(traceback.format_exception(type(e), e, tb)))
+        return_code = 1
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = sys.__stdin__, sys.__stdout__, sys.__stderr__
+        os.chdir(previous_cwd)
+
+    _send(channel, {
+        "id": request_id,
+        "done": True,
+        "return_code": return_code,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        "rss_mb": round(_current_rss_mb(), 1)
+    })
+
+
+def main() -> None:
+    options = json.loads(sys.argv[1]) if len(sys.argv) > 1 else {}
+
+    # Keep private handles on the protocol pipes, point fd 1 at stderr so
+    # stray writes (C extensions, child processes) cannot corrupt the output,
+    # and fd 0 at /dev/null so nothing but this loop reads the requests.
+    channel = os.fdopen(os.dup(1), "w", buffering=1)
+    requests = os.fdopen(os.dup(0), "r")
+    os.dup2(2, 1)
+    sys.__stdout__ = sys.stderr
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    sys.stdin = sys.__stdin__ = open(0, "r", closefd=False)
+
+    memory_limit_mb = options.get("memory_limit_mb", 0)
+    if resource is not None and memory_limit_mb > 0:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    for module_name in options.get("preload_modules", []):
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+
+    _send(channel, {"ready": True, "pid": os.getpid()})
+
+    cpu_limit_seconds = options.get("cpu_limit_seconds", 0)
+    for line in requests:
+        if not line.strip():
+            continue
+        _fork_run(channel, requests, json.loads(line), cpu_limit_seconds)
+
+
+if __name__ == "__main__":
+    main()
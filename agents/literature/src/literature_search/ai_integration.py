@@ -5,22 +5,67 @@ AI integration module for search term extraction and optimization.
 import asyncio
 import json
 import logging
+import re
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .review_engine import ChunkReviewCache, ReviewChunk, pack_chunks, trim_to_tokens
 
 logger = logging.getLogger(__name__)
 
+GOOGLE_SEARCH_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "google_search",
+        "description": "Search the web using Google Custom Search to find recent research papers, discover additional relevant studies, and fill gaps in the literature collection.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The search query to find relevant research papers and studies"
+                },
+                "num_results": {
+                    "type": "integer",
+                    "description": "Number of search results to return (default: 10, max: 10)",
+                    "default": 10,
+                    "minimum": 1,
+                    "maximum": 10
+                }
+            },
+            "required": ["query"]
+        }
+    }
+}
+
 
 class AIIntegration:
     """Handles AI-powered search term extraction and optimization."""
     
-    def __init__(self, websocket, agent_id: str, database_integration=None):
-        """Initialize AI integration with MCP websocket connection."""
+    def __init__(self, websocket, agent_id: str, send_message: Callable[[Dict[str, Any]], Awaitable[None]],
+                 database_integration=None, review_config: Optional[Dict[str, Any]] = None):
+        """Initialize AI integration with MCP websocket connection.
+        
+        ``send_message`` sends a message in the service's negotiated wire format.
+        """
         self.websocket = websocket
         self.agent_id = agent_id
+        self.send_message = send_message
         self.pending_responses: Dict[str, asyncio.Future] = {}
         self.database_integration = database_integration
+        
+        # Map-reduce literature review settings
+        review_config = review_config or {}
+        self.chunk_tokens = review_config.get("chunk_tokens", 6000)
+        self.abstract_tokens = review_config.get("abstract_tokens", 200)
+        self.plan_tokens = review_config.get("plan_tokens", 1500)
+        self.max_records_per_chunk = review_config.get("max_records_per_chunk", 40)
+        self.max_concurrent_chunks = review_config.get("max_concurrent_chunks", 4)
+        self.chunk_response_tokens = review_config.get("chunk_response_tokens", 1500)
+        self.reduce_response_tokens = review_config.get("reduce_response_tokens", 3000)
+        self.request_timeout = review_config.get("request_timeout", 60.0)
+        self.review_cache = ChunkReviewCache(review_config.get("cache_size", 256))
     
     async def extract_search_terms_from_research_plan(self, research_plan) -> List[str]:
         """
@@ -130,7 +175,7 @@ class AIIntegration:
         # Send the request with retry logic
         task_id = optimization_request["data"]["task_id"]
         try:
-            await self.websocket.send(json.dumps(optimization_request))
+            await self.send_message(optimization_request)
             logger.info("Search term optimization request sent to AI agent via MCP")
         except (ConnectionResetError, OSError, BrokenPipeError, Exception) as e:
             logger.warning(f"WebSocket connection failed during send: {e}. Falling back to basic search terms.")
@@ -209,249 +254,312 @@ class AIIntegration:
         Returns:
             List of selected literature records in JSON format
         """
-        logger.info(f"Review literature results: {search_results}")
-
-        # Create research planning prompt
+        review = await self.review_literature(plan, search_results)
+        return review["records"]
+    
+    async def review_literature(self, plan, search_results) -> Dict[str, Any]:
+        """
+        Map-reduce literature review.
+        
+        The records are packed into token-budgeted chunks that are reviewed
+        concurrently (map), then the chunk reviews are merged into a final
+        list of kept and added papers plus a discussion (reduce).
+        
+        Args:
+            plan: AI-generated research plan with objectives, questions, etc. (can be dict or str)
+            search_results: List of literature records to review
+            
+        Returns:
+            Dict with ``records`` (kept, uncertain and added papers),
+            ``removed``, ``discussion`` and ``stats``. Papers the AI neither
+            kept nor removed are returned with ``review_label: "uncertain"``
+        """
+        if not isinstance(search_results, list):
+            search_results = [search_results] if search_results else []
+        
+        plan_text = plan if isinstance(plan, str) else json.dumps(plan, default=str)
+        plan_text = trim_to_tokens(plan_text, self.plan_tokens)
+        
+        chunks = pack_chunks(
+            search_results,
+            chunk_tokens=self.chunk_tokens,
+            abstract_tokens=self.abstract_tokens,
+            max_records_per_chunk=self.max_records_per_chunk
+        )
+        logger.info(f"Reviewing {len(search_results)} literature records in {len(chunks)} chunks")
+        
+        # Map: review chunks concurrently
+        semaphore = asyncio.Semaphore(self.max_concurrent_chunks)
+        
+        async def review_with_limit(chunk: ReviewChunk) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self._review_chunk(plan_text, chunk, len(chunks))
+        
+        chunk_reviews = await asyncio.gather(*[review_with_limit(chunk) for chunk in chunks])
+        
+        kept: List[Dict[str, Any]] = []
+        uncertain_ids = set()
+        removed: List[Dict[str, Any]] = []
+        summaries: List[Dict[str, Any]] = []
+        failed_chunks = 0
+        
+        for chunk, chunk_review in zip(chunks, chunk_reviews):
+            if chunk_review is None:
+                # Keep everything from chunks the AI could not review
+                failed_chunks += 1
+                kept.extend(chunk.records)
+                continue
+            
+            kept_refs = {str(ref) for ref in chunk_review.get("keep", [])}
+            decided = set()
+            for removal in chunk_review.get("removed", []):
+                record = chunk.record_for_ref(removal.get("ref", ""))
+                if record is not None:
+                    kept_refs.discard(str(removal.get("ref")))
+                    decided.add(id(record))
+                    removed.append({"title": record.get("title"), "reason": removal.get("reason", "")})
+            for ref in kept_refs:
+                record = chunk.record_for_ref(ref)
+                if record is not None and id(record) not in decided:
+                    decided.add(id(record))
+                    kept.append(record)
+            # Papers the AI skipped are passed on as undecided rather than dropped
+            for record in chunk.records:
+                if id(record) not in decided:
+                    uncertain_ids.add(id(record))
+                    kept.append(record)
+            
+            summaries.append({
+                "summary": chunk_review.get("summary", ""),
+                "themes_covered": chunk_review.get("themes_covered", []),
+                "gaps": chunk_review.get("gaps", [])
+            })
+        
+        # Preserve the original ordering of kept records
+        order = {id(record): position for position, record in enumerate(search_results)}
+        kept.sort(key=lambda record: order.get(id(record), len(order)))
+        kept = [
+            {**record, "review_label": "uncertain"} if id(record) in uncertain_ids else record
+            for record in kept
+        ]
+        
+        # Reduce: merge chunk reviews, fill gaps and write the discussion
+        reduced = await self._reduce_reviews(plan_text, kept, summaries) if summaries else None
+        added = []
+        if reduced:
+            for paper in reduced.get("added", []):
+                if isinstance(paper, dict) and paper.get("title"):
+                    added.append({**paper, "source": paper.get("source", "ai_review")})
+            discussion = reduced.get("discussion", "")
+        else:
+            discussion = "\n\n".join(s["summary"] for s in summaries if s["summary"])
+        
+        stats = {
+            "input_records": len(search_results),
+            "chunks": len(chunks),
+            "failed_chunks": failed_chunks,
+            "kept": len(kept) - len(uncertain_ids),
+            "uncertain": len(uncertain_ids),
+            "removed": len(removed),
+            "added": len(added),
+            "cache": self.review_cache.stats()
+        }
+        logger.info(f"Literature review complete: {stats}")
+        
+        return {
+            "records": kept + added,
+            "removed": removed,
+            "discussion": discussion,
+            "stats": stats
+        }
+    
+    async def _review_chunk(self, plan_text: str, chunk: ReviewChunk, total_chunks: int) -> Optional[Dict[str, Any]]:
+        """Review one chunk of records, using the cached review when available."""
+        chunk_text = chunk.text
+        cache_key = ChunkReviewCache.make_key(plan_text, chunk_text)
+        cached = self.review_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached review for chunk {chunk.index + 1}/{total_chunks}")
+            return cached
+        
         prompt = (
-            "I am conducting a literature review and have a structured research plan and a preliminary list of references.\n\n"
-
-            "Your task is to act as a scientific research collaborator and perform a comprehensive expansion of the literature base.\n\n"
-
-            "Input:\n"
-            "1. A structured research plan (in JSON or plain text format), including:\n"
-            "- Research questions and/or hypotheses\n"
-            "- Research objectives and goals\n"
-            "- Timeline or phases (if applicable)\n"
-            "- Key thematic areas of investigation\n"
-            "- Constraints (e.g., budget, data availability, species, technical limitations)\n"
-            "2. A preliminary list of relevant literature I've already collected.\n\n"
-
-            "Your responsibilities:\n\n"
-
-            "Step 1: **Decompose the research plan**\n"
-            "- Identify the major themes, variables, requirements, and outputs expected from the review.\n"
-            "- Map each objective/question to the kind of literature or data needed to support it.\n\n"
-
-            "Step 2: **Evaluate the preliminary literature**\n"
-            "- Determine which parts of the research plan are already well-supported.\n"
-            "- Identify missing or weakly supported areas where additional literature is needed.\n"
-            "- Remove any literature that is not relevant or superfluous.\n"
-            "- Note any methodological or domain-specific gaps (e.g., no functional validation, missing comparative analysis, outdated protocols, etc.)\n\n"
-
-            "Step 3: **Expand the literature**\n"
-            "- Find 10-15 additional highly relevant papers, protocols, or datasets.\n"
-            "- Prioritise diversity: experimental methods, review articles, protocols, comparative studies, economic analyses, etc.\n"
-            "- Ensure that every key area in the research plan is supported by at least one citation.\n"
-            "- Include only credible and technically appropriate sources (e.g., PubMed, ArXiv, CORE, Springer, PLOS, major journals).\n\n"
-
-            "Step 4: **Return outputs in the following format**\n"
-            "1. An updated, unified list of papers in the same format as my original list (JSON only).\n"
-            "- Add a 'discussion' field to the JSON response that includes:\n"
-            "  - A summary of the key findings from the literature\n"
-            "  - An analysis of how these findings relate to the research plan\n"
-            "  - Any gaps that the original literature list did not address\n"
-            "  - The items that you removed or added and the reasons why those changes were made.\n"
-            "- Do not include any other commentary, just the JSON response.\n\n"
-
+            "Screen the following papers against the research plan.\n\n"
+            "Each paper is one JSON object per line with a `ref` identifier. "
+            "Abstracts may be truncated.\n\n"
+            "Reply **only** with valid JSON in the following format:\n"
+            "{\n"
+            '  "keep": ["R1", ...],\n'
+            '  "removed": [{"ref": "R2", "reason": "..."}],\n'
+            '  "themes_covered": ["..."],\n'
+            '  "gaps": ["..."],\n'
+            '  "summary": "Key findings of the kept papers and how they relate to the plan"\n'
+            "}\n\n"
             "Instructions:\n"
-            "- Be concise but technically detailed.\n"
-            "- Use Markdown formatting, with tables and sections for clarity.\n"
-            "- Assume the goal is to use this output directly in a PhD-level review or grant proposal.\n\n"
-
-            f"Research Plan: {plan}\n\n"
-
-            f"Literature: {search_results}\n\n"
+            "- Keep papers that support at least one objective, question or theme of the plan.\n"
+            "- Remove papers that are not relevant or superfluous, with a one-sentence reason.\n"
+            "- Every `ref` belongs in either `keep` or `removed`.\n"
+            "- List plan areas these papers leave unsupported under `gaps`.\n"
+            "- Be concise but technically detailed.\n\n"
+            f"Research Plan: {plan_text}\n\n"
+            f"Papers:\n{chunk_text}\n"
         )
-
-        # Implement retry logic for AI review with connection stability checks
+        
+        content = await self._request_chat_completion(
+            task_prefix="literature_review_chunk",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert research assistant specializing in academic literature review and analysis."
+                },
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=self.chunk_response_tokens
+        )
+        review = self._parse_json_object(content) if content else None
+        if review is None:
+            logger.warning(f"No valid review for chunk {chunk.index + 1}/{total_chunks}; keeping its records")
+            return None
+        
+        self.review_cache.put(cache_key, review)
+        return review
+    
+    async def _reduce_reviews(
+        self,
+        plan_text: str,
+        kept: List[Dict[str, Any]],
+        summaries: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Merge chunk reviews into additions and a discussion."""
+        kept_titles = "\n".join(
+            f"- {record.get('title')} ({record.get('year') or 'n.d.'})"
+            for record in kept if record.get("title")
+        )
+        kept_titles = trim_to_tokens(kept_titles, self.chunk_tokens)
+        chunk_findings = json.dumps(summaries, ensure_ascii=False, separators=(",", ":"))
+        
+        prompt = (
+            "I am conducting a literature review. The preliminary literature has been screened in parts; "
+            "below are the titles of the papers kept and the findings and gaps reported for each part.\n\n"
+            
+            "Your task is to act as a scientific research collaborator:\n"
+            "- Merge the findings into one picture of how well the research plan is supported.\n"
+            "- Find 10-15 additional highly relevant papers, protocols, or datasets that fill the reported gaps, "
+            "so that every key area in the research plan is supported by at least one citation.\n"
+            "- Include only credible and technically appropriate sources (e.g., PubMed, ArXiv, CORE, Springer, PLOS, major journals).\n\n"
+            
+            "Reply **only** with valid JSON in the following format:\n"
+            "{\n"
+            '  "added": [{"title": "...", "authors": ["..."], "year": 2020, "journal": "...", "doi": "...", "url": "...", "abstract": "..."}],\n'
+            '  "discussion": "Summary of key findings, relation to the plan, remaining gaps and the reasons for additions"\n'
+            "}\n\n"
+            
+            f"Research Plan: {plan_text}\n\n"
+            f"Kept papers:\n{kept_titles}\n\n"
+            f"Findings by part: {chunk_findings}\n"
+        )
+        
+        content = await self._request_chat_completion(
+            task_prefix="literature_review",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert research assistant specializing in academic literature review and analysis. You can search the web to find additional relevant papers, validate research gaps, and discover recent publications that complement the existing literature collection."
+                },
+                {"role": "user", "content": prompt}
+            ],
+            tools=[GOOGLE_SEARCH_TOOL],
+            max_tokens=self.reduce_response_tokens
+        )
+        return self._parse_json_object(content) if content else None
+    
+    async def _request_chat_completion(
+        self,
+        task_prefix: str,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        max_tokens: int = 3000
+    ) -> Optional[str]:
+        """Send a chat completion request to the AI agent with retries; return the content."""
         max_retries = 3
         retry_delay = 2
         
+        payload: Dict[str, Any] = {
+            "provider": "openai",
+            "model": "gpt-4o-mini",
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0.3
+        }
+        if tools:
+            payload["tools"] = tools
+            payload["tool_choice"] = "auto"
+        
         for attempt in range(max_retries):
-            # Check and ensure connection stability before each attempt
+            if attempt > 0:
+                logger.info(f"Retrying {task_prefix} in {retry_delay} seconds (attempt {attempt + 1}/{max_retries})...")
+                await asyncio.sleep(retry_delay)
+            
             if not self.websocket or self.websocket.closed:
-                logger.warning(f"MCP connection not available for literature review (attempt {attempt + 1}/{max_retries})")
-                if attempt < max_retries - 1:
-                    logger.info(f"Waiting {retry_delay} seconds for connection to stabilize...")
-                    await asyncio.sleep(retry_delay)
-                    continue
-                else:
-                    logger.error("All retry attempts failed - MCP connection unavailable")
-                    fallback_query = search_results
-                    return fallback_query if isinstance(fallback_query, list) else [fallback_query]
-
-            # Send request to AI agent via MCP for literature review
-            task_id = f"literature_review_{uuid.uuid4().hex[:8]}"
-            optimization_request = {
+                logger.warning(f"MCP connection not available for {task_prefix} (attempt {attempt + 1}/{max_retries})")
+                continue
+            
+            task_id = f"{task_prefix}_{uuid.uuid4().hex[:8]}"
+            request = {
                 "type": "research_action",
                 "data": {
                     "task_id": task_id,
-                    "context_id": f"literature_ai_optimization",
-                    "agent_type": "ai_service",  # Use correct agent type for AI service
-                    "action": "ai_chat_completion",  # Use the actual AI service action
-                    "payload": {
-                        "provider": "openai",
-                        "model": "gpt-4o-mini",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an expert research assistant specializing in academic literature review and analysis. You can search the web to find additional relevant papers, validate research gaps, and discover recent publications that complement the existing literature collection."
-                            },
-                            {
-                                "role": "user", 
-                                "content": prompt
-                            }
-                        ],
-                        "tools": [
-                            {
-                                "type": "function",
-                                "function": {
-                                    "name": "google_search",
-                                    "description": "Search the web using Google Custom Search to find recent research papers, discover additional relevant studies, and fill gaps in the literature collection.",
-                                    "parameters": {
-                                        "type": "object",
-                                        "properties": {
-                                            "query": {
-                                                "type": "string",
-                                                "description": "The search query to find relevant research papers and studies"
-                                            },
-                                            "num_results": {
-                                                "type": "integer",
-                                                "description": "Number of search results to return (default: 10, max: 10)",
-                                                "default": 10,
-                                                "minimum": 1,
-                                                "maximum": 10
-                                            }
-                                        },
-                                        "required": ["query"]
-                                    }
-                                }
-                            }
-                        ],
-                        "tool_choice": "auto",
-                        "max_tokens": 3000,
-                        "temperature": 0.3
-                    }
+                    "context_id": "literature_ai_optimization",
+                    "agent_type": "ai_service",
+                    "action": "ai_chat_completion",
+                    "payload": payload
                 },
                 "client_id": self.agent_id,
                 "timestamp": datetime.now().isoformat()
             }
             
-            # Send the request with connection verification
-            try:
-                # Double-check connection right before sending
-                if self.websocket.closed:
-                    raise ConnectionError("WebSocket connection closed before sending")
-                    
-                await self.websocket.send(json.dumps(optimization_request))
-                logger.info(f"Review literature request sent to AI agent via MCP (attempt {attempt + 1}/{max_retries})")
-                
-            except (ConnectionResetError, OSError, BrokenPipeError, ConnectionError, Exception) as e:
-                logger.warning(f"Failed to send literature review request (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    logger.info(f"Retrying in {retry_delay} seconds...")
-                    await asyncio.sleep(retry_delay)
-                    continue
-                else:
-                    logger.error("All retry attempts failed - unable to send AI review request")
-                    return search_results if isinstance(search_results, list) else [search_results]
-            
-            # Wait for response using Future-based approach
+            # Register the future before sending so a fast reply is not missed
+            future = asyncio.get_running_loop().create_future()
+            self.pending_responses[task_id] = future
             try:
-                # Create future for this request
-                future = asyncio.Future()
-                self.pending_responses[task_id] = future
-                
-                # Wait for response with timeout
-                response_data = await asyncio.wait_for(future, timeout=60.0)
-                
-                if (response_data.get("type") == "task_result" and 
-                    response_data.get("task_id") == task_id):
-                    
-                    if response_data.get("status") == "completed":
-                        chat_response = response_data.get("result", {})
-                        logger.info(f"Raw AI result received: {chat_response}")
-                    
-                        if "choices" in chat_response and len(chat_response["choices"]) > 0:
-                            choice = chat_response["choices"][0]
-
-                            if "message" in choice and "content" in choice["message"]:
-                                content = choice["message"]["content"]
-                                logger.info(f"Literature review response: {content[:500]}...")
-                                
-                                # Try to parse JSON response
-                                try:
-                                    # Look for JSON content in the response
-                                    import re
-                                    json_match = re.search(r'\[.*\]', content, re.DOTALL)
-                                    if json_match:
-                                        json_str = json_match.group(0)
-                                        parsed_articles = json.loads(json_str)
-                                        if isinstance(parsed_articles, list):
-                                            logger.info(f"Successfully parsed {len(parsed_articles)} articles from AI response")
-                                            return parsed_articles
-                                    
-                                    # If no JSON array found, try parsing the whole content
-                                    parsed_articles = json.loads(content)
-                                    if isinstance(parsed_articles, list):
-                                        logger.info(f"Successfully parsed {len(parsed_articles)} articles from AI response")
-                                        return parsed_articles
-                                    
-                                except json.JSONDecodeError as e:
-                                    logger.warning(f"Failed to parse AI response as JSON: {e}")
-                                    logger.debug(f"Raw content: {content}")
-                                    if attempt < max_retries - 1:
-                                        logger.info(f"Retrying AI review (attempt {attempt + 2}/{max_retries})...")
-                                        await asyncio.sleep(retry_delay)
-                                        continue
-                                
-                                # If JSON parsing fails, return the first 10 search results as fallback
-                                logger.warning("Using fallback: returning first 10 search results")
-                                return search_results[:10] if isinstance(search_results, list) else []
-                    else:
-                        logger.warning(f"AI review task failed with status: {response_data.get('status')}")
-                        if attempt < max_retries - 1:
-                            logger.info(f"Retrying AI review (attempt {attempt + 2}/{max_retries})...")
-                            await asyncio.sleep(retry_delay)
-                            continue
-
-                logger.warning(f"No valid literature list returned from AI agent (attempt {attempt + 1}/{max_retries})")
-                if attempt < max_retries - 1:
-                    logger.info(f"Retrying AI review (attempt {attempt + 2}/{max_retries})...")
-                    await asyncio.sleep(retry_delay)
-                    continue
-                else:
-                    return []
-                
+                await self.send_message(request)
+                response_data = await asyncio.wait_for(future, timeout=self.request_timeout)
             except asyncio.TimeoutError:
-                logger.warning(f"Timeout waiting for AI agent response (attempt {attempt + 1}/{max_retries})")
-                # Clean up pending response
-                if task_id in self.pending_responses:
-                    del self.pending_responses[task_id]
-                    logger.info("Pending response cleaned up for literature review request")
-                
-                if attempt < max_retries - 1:
-                    logger.info(f"Retrying AI review (attempt {attempt + 2}/{max_retries})...")
-                    await asyncio.sleep(retry_delay)
-                    continue
-                else:
-                    logger.error("All retry attempts failed - AI review timeout")
-                    return []
-                    
+                logger.warning(f"Timeout waiting for {task_prefix} response (attempt {attempt + 1}/{max_retries})")
+                continue
             except Exception as e:
-                logger.error(f"Error reviewing literature (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    logger.info(f"Retrying AI review (attempt {attempt + 2}/{max_retries})...")
-                    await asyncio.sleep(retry_delay)
-                    continue
-                else:
-                    logger.error("All retry attempts failed - unexpected error during AI review")
-                    return []
+                logger.warning(f"Failed {task_prefix} request (attempt {attempt + 1}/{max_retries}): {e}")
+                continue
+            finally:
+                self.pending_responses.pop(task_id, None)
+            
+            if response_data.get("status") != "completed":
+                logger.warning(f"{task_prefix} task failed with status: {response_data.get('status')}")
+                continue
+            
+            choices = response_data.get("result", {}).get("choices", [])
+            content = choices[0].get("message", {}).get("content") if choices else None
+            if content:
+                return content
+            logger.warning(f"Empty {task_prefix} response (attempt {attempt + 1}/{max_retries})")
         
-        # This should never be reached, but just in case
-        logger.error("Unexpected end of retry loop in review_literature_results")
-        return []
-
+        logger.error(f"All retry attempts failed for {task_prefix}")
+        return None
+    
+    def _parse_json_object(self, content: str) -> Optional[Dict[str, Any]]:
+        """Parse a JSON object from model output, tolerating surrounding text."""
+        try:
+            parsed = json.loads(content)
+        except json.JSONDecodeError:
+            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            if not json_match:
+                logger.warning("No JSON object found in AI response")
+                return None
+            try:
+                parsed = json.loads(json_match.group(0))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse AI response as JSON: {e}")
+                return None
+        return parsed if isinstance(parsed, dict) else None
 
     def handle_task_result(self, data: Dict[str, Any]) -> bool:
         """Handle task result responses for pending AI requests."""
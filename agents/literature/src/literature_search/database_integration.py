@@ -3,12 +3,11 @@ Database integration module for storing and retrieving data via MCP protocol.
 """
 
 import asyncio
-import json
 import logging
 import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from .models import SearchQuery
 
@@ -18,10 +17,14 @@ logger = logging.getLogger(__name__)
 class DatabaseIntegration:
     """Handles database operations via MCP protocol."""
     
-    def __init__(self, websocket, agent_id: str):
-        """Initialize database integration with MCP websocket connection."""
+    def __init__(self, websocket, agent_id: str, send_message: Callable[[Dict[str, Any]], Awaitable[None]]):
+        """Initialize database integration with MCP websocket connection.
+        
+        ``send_message`` sends a message in the service's negotiated wire format.
+        """
         self.websocket = websocket
         self.agent_id = agent_id
+        self.send_message = send_message
         self.pending_responses: Dict[str, asyncio.Future] = {}
     
     async def get_cached_search_terms(self, source_type: str, source_id: str, original_query: str) -> Optional[List[str]]:
@@ -57,7 +60,7 @@ class DatabaseIntegration:
                 "timestamp": datetime.now().isoformat()
             }
             
-            await self.websocket.send(json.dumps(db_request))
+            await self.send_message(db_request)
             
             # Wait for response using Future-based approach
             try:
@@ -176,7 +179,7 @@ class DatabaseIntegration:
             }
             
             logger.info(f"Sending store search terms request with task_id: {task_id}")
-            await self.websocket.send(json.dumps(db_request))
+            await self.send_message(db_request)
             
             # Wait for response using Future-based approach
             try:
@@ -290,7 +293,7 @@ class DatabaseIntegration:
             
             logger.info(f"📤 Sending initial literature results storage request (task_id: {task_id})")
             logger.info(f"   └─ Storing {len(records)} records in research_plans.initial_literature_results (plan_id={plan_id})")
-            await self.websocket.send(json.dumps(db_request))
+            await self.send_message(db_request)
             
             # Wait for response
             try:
@@ -381,7 +384,7 @@ class DatabaseIntegration:
             }
             
             logger.info(f"📤 Sending reviewed literature results storage request (task_id: {task_id})")
-            await self.websocket.send(json.dumps(db_request))
+            await self.send_message(db_request)
             
             # Wait for response
             try:
@@ -487,7 +490,7 @@ class DatabaseIntegration:
             }
             
             logger.info(f"📤 Sending literature records storage request (task_id: {task_id})")
-            await self.websocket.send(json.dumps(db_request))
+            await self.send_message(db_request)
             
             # Wait for response
             try:
@@ -565,7 +568,7 @@ class DatabaseIntegration:
             
             # Send the request via websocket and wait for response
             if self.websocket:
-                await self.websocket.send(json.dumps(create_request))
+                await self.send_message(create_request)
                 logger.info(f"Sent project creation request for {project_id}")
                 
                 # Wait for response to get the actual created project ID
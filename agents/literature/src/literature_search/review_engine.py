@@ -0,0 +1,155 @@
+"""
+Chunking and caching helpers for the map-reduce AI literature review.
+
+Search results are serialized into a compact form (no raw source data,
+abstracts trimmed to a token budget) and packed into chunks that fit a
+prompt token budget. Each chunk is reviewed independently and the chunk
+reviews are cached by content hash so repeated reviews of the same
+records do not pay for the same tokens twice.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Rough characters-per-token ratio for English scientific text
+CHARS_PER_TOKEN = 4
+
+# Authors listed in the compact form before truncating with "et al."
+MAX_AUTHORS = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in ``text``."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Trim ``text`` to roughly ``max_tokens`` tokens at a word boundary."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if not text or len(text) <= max_chars:
+        return text or ""
+    trimmed = text[:max_chars].rsplit(" ", 1)[0]
+    return trimmed.rstrip(" ,;:") + " …"
+
+
+def compact_record(record: Dict[str, Any], ref: str, abstract_tokens: int) -> Dict[str, Any]:
+    """Build the compact representation of a record sent to the model."""
+    authors = record.get("authors") or []
+    if isinstance(authors, list):
+        authors = ", ".join(str(a) for a in authors[:MAX_AUTHORS]) + (
+            " et al." if len(authors) > MAX_AUTHORS else ""
+        )
+
+    compact = {
+        "ref": ref,
+        "title": record.get("title"),
+        "authors": authors or None,
+        "year": record.get("year"),
+        "journal": record.get("journal"),
+        "doi": record.get("doi"),
+        "abstract": trim_to_tokens(record.get("abstract") or "", abstract_tokens) or None,
+    }
+    return {key: value for key, value in compact.items() if value}
+
+
+def serialize_records(compact_records: List[Dict[str, Any]]) -> str:
+    """Serialize compact records as one JSON object per line."""
+    return "\n".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        for record in compact_records
+    )
+
+
+class ReviewChunk:
+    """A group of records reviewed together in one map request."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.records: List[Dict[str, Any]] = []
+        self.compact_records: List[Dict[str, Any]] = []
+        self.tokens = 0
+
+    @property
+    def text(self) -> str:
+        return serialize_records(self.compact_records)
+
+    def record_for_ref(self, ref: str) -> Optional[Dict[str, Any]]:
+        """Return the original record for a chunk-local reference."""
+        try:
+            position = int(str(ref).lstrip("R")) - 1
+        except ValueError:
+            return None
+        if 0 <= position < len(self.records):
+            return self.records[position]
+        return None
+
+
+def pack_chunks(
+    records: List[Dict[str, Any]],
+    chunk_tokens: int,
+    abstract_tokens: int,
+    max_records_per_chunk: int = 40
+) -> List[ReviewChunk]:
+    """Pack records into chunks that fit ``chunk_tokens`` tokens each.
+
+    References are chunk-local (``R1``, ``R2``, ...) so a chunk's text, and
+    therefore its cache key, only depends on the records it contains.
+    """
+    chunks: List[ReviewChunk] = []
+    current = ReviewChunk(0)
+
+    for record in records:
+        compact = compact_record(record, f"R{len(current.records) + 1}", abstract_tokens)
+        tokens = estimate_tokens(serialize_records([compact]))
+
+        if current.records and (current.tokens + tokens > chunk_tokens
+                                or len(current.records) >= max_records_per_chunk):
+            chunks.append(current)
+            current = ReviewChunk(len(chunks))
+            compact["ref"] = "R1"
+
+        current.records.append(record)
+        current.compact_records.append(compact)
+        current.tokens += tokens
+
+    if current.records:
+        chunks.append(current)
+    return chunks
+
+
+class ChunkReviewCache:
+    """LRU cache of chunk review results keyed by content hash."""
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(plan_text: str, chunk_text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(plan_text.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(chunk_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        review = self._entries.get(key)
+        if review is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return review
+
+    def put(self, key: str, review: Dict[str, Any]) -> None:
+        self._entries[key] = review
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -3,14 +3,13 @@ Main Literature Search Service implementation.
 """
 
 import asyncio
-import json
 import logging
 import os
 import ssl
 import uuid
 import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import pandas as pd
 
 import aiohttp
@@ -18,6 +17,7 @@ import websockets
 
 from .ai_integration import AIIntegration
 from .database_integration import DatabaseIntegration
+from .mcp_wire import DEFAULT_CHUNK_SIZE, FrameAssembler, WireCodec, wire_capabilities
 from .models import SearchQuery, SearchReport
 from .normalizers import RecordNormalizer
 from .search_pipeline import LiteratureSearchPipeline
@@ -42,6 +42,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Steps of a search reported as progress: terms, sources, AI review, storage
+LITERATURE_SEARCH_STEPS = 4
+
 
 class LiteratureSearchService:
     """
@@ -72,6 +75,12 @@ class LiteratureSearchService:
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.mcp_connected = False
         
+        # Wire format: JSON text until the server confirms a binary codec
+        self.wire_enabled = config.get("wire_enabled", True)
+        self.wire_chunk_size = config.get("wire_chunk_size", DEFAULT_CHUNK_SIZE)
+        self.codec = WireCodec()
+        self.assembler = FrameAssembler()
+        
         # HTTP session for API calls
         self.session: Optional[aiohttp.ClientSession] = None
         
@@ -114,8 +123,10 @@ class LiteratureSearchService:
             await self._connect_to_mcp_server()
             
             # Initialize MCP-dependent components
-            self.ai_integration = AIIntegration(self.websocket, self.agent_id)
-            self.database_integration = DatabaseIntegration(self.websocket, self.agent_id)
+            self.ai_integration = AIIntegration(
+                self.websocket, self.agent_id, self._send_mcp_message, review_config=self.config.get("ai_review")
+            )
+            self.database_integration = DatabaseIntegration(self.websocket, self.agent_id, self._send_mcp_message)
             
             # Set database integration reference in AI integration
             self.ai_integration.database_integration = self.database_integration
@@ -157,10 +168,14 @@ class LiteratureSearchService:
             try:
                 logger.info(f"Connecting to MCP server at {self.mcp_server_url} (attempt {attempt + 1})")
                 
+                self.codec = WireCodec()
+                self.assembler = FrameAssembler()
                 self.websocket = await websockets.connect(
                     self.mcp_server_url,
                     ping_interval=20,  # More frequent pings during long operations
-                    ping_timeout=15    # Longer timeout for ping responses
+                    ping_timeout=15,   # Longer timeout for ping responses
+                    # The negotiated codec compresses large payloads itself
+                    compression=None if self.wire_enabled else "deflate"
                 )
                 
                 # Register with MCP server
@@ -202,16 +217,28 @@ class LiteratureSearchService:
             "capabilities": capabilities,
             "timestamp": datetime.now().isoformat()
         }
+        if self.wire_enabled:
+            registration_message["wire"] = wire_capabilities(self.wire_chunk_size)
         
-        await self.websocket.send(json.dumps(registration_message))
+        await self._send_mcp_message(registration_message)
         logger.info(f"Registered with MCP server: {len(capabilities)} capabilities")
     
+    async def _send_mcp_message(self, message: Dict[str, Any]):
+        """Send a message to the MCP server using the negotiated wire format."""
+        for frame in self.codec.encode(message):
+            await self.websocket.send(frame)
+    
     async def _handle_mcp_messages(self):
         """Handle incoming MCP messages."""
         try:
             while self.websocket:
                 message = await self.websocket.recv()
-                data = json.loads(message)
+                data = self.assembler.feed(message)
+                if data is None:
+                    continue  # Waiting for the remaining chunks
+                if data.get("type") == "registration_confirmed" and data.get("wire"):
+                    self.codec = WireCodec.from_dict(data["wire"])
+                    logger.info(f"Using wire format {self.codec.format}/{self.codec.compression}")
                 logging.info(f"######## Received MCP message: {data} ########")
                 # Handle task result responses for pending AI/DB requests
                 ai_handled = False
@@ -238,7 +265,7 @@ class LiteratureSearchService:
                 elif data.get("type") == "task":
                     await self.task_queue.put(data)
                 elif data.get("type") == "ping":
-                    await self.websocket.send(json.dumps({"type": "pong"}))
+                    await self._send_mcp_message({"type": "pong"})
                     
         except websockets.exceptions.ConnectionClosed:
             logger.warning("MCP server connection closed")
@@ -271,10 +298,14 @@ class LiteratureSearchService:
                         pass
                 
                 # Create new connection
+                self.codec = WireCodec()
+                self.assembler = FrameAssembler()
                 self.websocket = await websockets.connect(
                     self.mcp_server_url,
                     ping_interval=20,  # More frequent pings during long operations
-                    ping_timeout=15    # Longer timeout for ping responses
+                    ping_timeout=15,   # Longer timeout for ping responses
+                    # The negotiated codec compresses large payloads itself
+                    compression=None if self.wire_enabled else "deflate"
                 )
                 
                 # Re-register with MCP server
@@ -342,7 +373,7 @@ class LiteratureSearchService:
                         "agent_id": self.agent_id,
                         "result": result
                     }
-                    await self.websocket.send(json.dumps(response))
+                    await self._send_mcp_message(response)
                 
                 # Mark task as done
                 self.task_queue.task_done()
@@ -410,8 +441,15 @@ class LiteratureSearchService:
                 max_results=max_results
             )
             
+            async def report(step: int, message: str):
+                await self._send_progress(payload, "literature_search", step, LITERATURE_SEARCH_STEPS, message)
+            
             # Execute search
-            search_report = await self.search_literature(search_query)
+            search_report = await self.search_literature(search_query, report)
+            await self._send_progress(
+                payload, "literature_search", LITERATURE_SEARCH_STEPS, LITERATURE_SEARCH_STEPS,
+                f"Found {search_report.total_unique} records", status="completed"
+            )
             
             return {
                 "status": "completed",
@@ -429,12 +467,36 @@ class LiteratureSearchService:
             
         except Exception as e:
             logger.error(f"Failed to handle search literature: {e}")
+            await self._send_progress(payload, "literature_search", 0, LITERATURE_SEARCH_STEPS, str(e), status="failed")
             return {
                 "status": "failed",
                 "error": str(e),
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def _send_progress(self, payload: Dict[str, Any], stage: str, completed: int, total: int,
+                             message: str = "", status: str = "running"):
+        """Report progress of a task delegated by a research execution; best effort."""
+        execution_id = payload.get("original_task_id")
+        if not execution_id or not self.websocket or not self.mcp_connected:
+            return
+        
+        try:
+            await self._send_mcp_message({
+                "type": "progress_event",
+                "execution_id": execution_id,
+                "task_id": payload.get("delegation_id"),
+                "agent_type": self.agent_type,
+                "stage": stage,
+                "status": status,
+                "completed": completed,
+                "total": total,
+                "message": message,
+                "timestamp": datetime.now().isoformat()
+            })
+        except Exception as e:
+            logger.warning(f"Failed to send progress for execution {execution_id}: {e}")
+    
     async def _handle_normalize_records(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Handle record normalization request."""
         try:
@@ -467,12 +529,15 @@ class LiteratureSearchService:
             }
     
     
-    async def search_literature(self, search_query: SearchQuery) -> SearchReport:
+    async def search_literature(self, search_query: SearchQuery,
+                                report: Optional[Callable[[int, str], Awaitable[None]]] = None) -> SearchReport:
         """
         Execute a literature search across multiple sources.
         
         Args:
             search_query: Search query parameters
+            report: Called with the number of finished steps (of
+                LITERATURE_SEARCH_STEPS) and a message as the search advances
             
         Returns:
             SearchReport with results summary
@@ -484,6 +549,8 @@ class LiteratureSearchService:
         sources = search_query.sources or ["semantic_scholar", "arxiv", "pubmed", "crossref", "core", "openalex"]
 
         logger.info(f"Starting literature search for review {search_query.lit_review_id}")
+        if report:
+            await report(0, "Extracting search terms")
         
         # Extract AI-optimized search terms if research plan is available
         search_terms = await self._get_or_extract_search_terms(search_query, sources)
@@ -510,12 +577,18 @@ class LiteratureSearchService:
             logger.info(f"🔍 DEBUG: Item {i+1}: '{item}' (type: {type(item)}, length: {len(str(item))})")
 
         # Main search loop via pipeline
+        if report:
+            await report(1, f"Searching {len(sources)} sources for {len(final_terms)} terms")
         search_results = await self.search_pipeline.search_source(search_query)
 
         # AI review of results
+        if report:
+            await report(2, f"Reviewing {len(search_results) if search_results else 0} results")
         literature_list = await self._review_with_ai(search_query, search_results)
 
         # Store results in database
+        if report:
+            await report(3, f"Storing {len(literature_list)} records")
         await self._store_literature_results(search_query, literature_list, errors)
         
         end_time = datetime.now()
@@ -753,7 +826,7 @@ class LiteratureSearchService:
                 "timestamp": datetime.now().isoformat()
             }
             
-            await self.websocket.send(json.dumps(check_message))
+            await self._send_mcp_message(check_message)
             logger.info("AI agent availability check sent via MCP")
             self.ai_agent_available = True  # Assume available for now
             
@@ -19,9 +19,10 @@ import logging
 import os
 import ssl
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlencode
 
 import aiohttp
@@ -31,6 +32,17 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 
 logger = logging.getLogger(__name__)
 
+# SSL context shared by all HTTP sessions (loading the CA bundle is costly)
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """Return the process-wide SSL context, creating it on first use."""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context(cafile=certifi.where())
+    return _ssl_context
+
 
 class SearchResult:
     """Represents a single search result."""
@@ -136,6 +148,63 @@ class RateLimiter:
         now = datetime.now(timezone.utc)
         self.daily_requests += 1
         self.minute_requests.append(now)
+    
+    def try_acquire(self) -> bool:
+        """Check the limits and reserve a request slot in one step.
+        
+        Concurrent callers on the event loop cannot interleave between the
+        check and the reservation, so parallel page fetches never overshoot
+        the configured limits.
+        """
+        if not self.can_make_request():
+            return False
+        self.record_request()
+        return True
+
+
+class SearchCache:
+    """LRU cache of search responses with a time-to-live."""
+    
+    def __init__(self, ttl_seconds: int = 3600, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, SearchResponse]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(query: str, page: int, page_size: int, params: Dict[str, Any]) -> Tuple:
+        """Build a cache key from the normalised query and request parameters."""
+        return (" ".join(query.lower().split()), page, page_size, tuple(sorted(params.items())))
+    
+    def get(self, key: Tuple) -> Optional["SearchResponse"]:
+        """Return a cached response, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def put(self, key: Tuple, response: "SearchResponse"):
+        """Cache a response, evicting the least recently used entries."""
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters."""
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses
+        }
 
 
 class GoogleSearchService:
@@ -163,6 +232,20 @@ class GoogleSearchService:
             max_requests_per_minute=rate_limit_config.get("max_requests_per_minute", 10)
         )
         
+        # Query result cache
+        cache_config = self.google_config.get("cache", {})
+        self.cache = SearchCache(
+            ttl_seconds=cache_config.get("ttl_seconds", 3600),
+            max_entries=cache_config.get("max_entries", 1000)
+        )
+        
+        # Pooled HTTP client, created lazily and reused across searches
+        connection_config = self.google_config.get("connection_pool", {})
+        self.max_connections = connection_config.get("max_connections", 20)
+        self.keepalive_timeout = connection_config.get("keepalive_timeout", 60)
+        self.max_concurrent_pages = connection_config.get("max_concurrent_pages", 5)
+        self._session: Optional[aiohttp.ClientSession] = None
+        
         # Connection state
         self.connected = False
         self.last_heartbeat = datetime.now(timezone.utc).isoformat()
@@ -258,8 +341,26 @@ class GoogleSearchService:
     async def stop(self):
         """Stop the Google Search Service."""
         self.connected = False
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
         logger.info("Google Search Service stopped")
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive HTTP session."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=get_ssl_context(),
+                limit=self.max_connections,
+                ttl_dns_cache=300,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=connector
+            )
+        return self._session
+    
     async def _test_api_connection(self):
         """Test API connection with a simple query."""
         try:
@@ -297,9 +398,6 @@ class GoogleSearchService:
         if not self.is_api_configured():
             raise ValueError("Google Search API not configured - missing API key or search engine ID")
         
-        if not self.rate_limiter.can_make_request():
-            raise ValueError("Rate limit exceeded - please try again later")
-        
         # Calculate start index for pagination
         page_size = self.default_page_size
         start_index = (page - 1) * page_size + 1
@@ -308,6 +406,15 @@ class GoogleSearchService:
         if max_results:
             page_size = min(page_size, max_results)
         
+        cache_key = SearchCache.make_key(query, page, page_size, kwargs)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Search cache hit: '{query}' (page {page})")
+            return cached
+        
+        if not self.rate_limiter.try_acquire():
+            raise ValueError("Rate limit exceeded - please try again later")
+        
         # Build request parameters
         params = {
             "key": self.api_key,
@@ -323,25 +430,16 @@ class GoogleSearchService:
         try:
             logger.info(f"Performing Google search: '{query}' (page {page})")
             
-            # Create SSL context that works on macOS
-            ssl_context = ssl.create_default_context(cafile=certifi.where())
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            
-            # Make API request
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout),
-                connector=connector
-            ) as session:
-                async with session.get(self.api_endpoint, params=params) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            # Make API request over the pooled keep-alive session
+            async with self._get_session().get(self.api_endpoint, params=params) as response:
+                response.raise_for_status()
+                data = await response.json()
             
-            # Record successful request
-            self.rate_limiter.record_request()
             self.last_heartbeat = datetime.now(timezone.utc).isoformat()
             
-            # Parse and return results
+            # Parse, cache and return results
             search_response = SearchResponse(data, query, page)
+            self.cache.put(cache_key, search_response)
             
             logger.info(f"Search completed: {len(search_response.results)} results found")
             logger.info(f"Total results available: {search_response.total_results}")
@@ -379,20 +477,37 @@ class GoogleSearchService:
         page_size = self.default_page_size
         num_pages = min((max_results + page_size - 1) // page_size, 10)  # Google CSE max 100 results
         
-        responses = []
+        # The first page tells us how many results exist at all
+        try:
+            first = await self.search(query, page=1, **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to fetch page 1: {e}")
+            return []
+        
+        available_pages = (first.total_results + page_size - 1) // page_size
+        num_pages = min(num_pages, max(available_pages, 1))
+        responses = [first]
         
-        for page in range(1, num_pages + 1):
-            try:
-                response = await self.search(query, page=page, **kwargs)
-                responses.append(response)
-                
-                # Stop if we have enough results or no more results available
-                if len(response.results) < page_size:
+        if len(first.results) >= page_size and num_pages > 1:
+            # Fetch the remaining pages concurrently; the rate limiter still
+            # reserves a slot per request and the semaphore bounds fan-out
+            semaphore = asyncio.Semaphore(self.max_concurrent_pages)
+            
+            async def fetch(page: int) -> SearchResponse:
+                async with semaphore:
+                    return await self.search(query, page=page, **kwargs)
+            
+            pages = list(range(2, num_pages + 1))
+            results = await asyncio.gather(*[fetch(page) for page in pages], return_exceptions=True)
+            
+            # Keep pages in order up to the first failure or short page
+            for page, result in zip(pages, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to fetch page {page}: {result}")
+                    break
+                responses.append(result)
+                if len(result.results) < page_size:
                     break
-                    
-            except Exception as e:
-                logger.error(f"Failed to fetch page {page}: {e}")
-                break
         
         logger.info(f"Multi-page search completed: {len(responses)} pages, "
                    f"{sum(len(r.results) for r in responses)} total results")
@@ -17,7 +17,7 @@ import uuid
 import signal
 import sys
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Callable, Dict, List, Optional, Set
 from pathlib import Path
 from abc import ABC, abstractmethod
 
@@ -58,6 +58,9 @@ class NetworkMCPAgent:
         self.running = False
         self.last_heartbeat = datetime.now(timezone.utc).isoformat()
         
+        # In-flight task handlers (searches run concurrently)
+        self.active_tasks: Set[asyncio.Task] = set()
+        
         # Search service
         self.search_service = GoogleSearchService(config)
         
@@ -196,10 +199,12 @@ class NetworkMCPAgent:
         
         logger.debug(f"Received message: {message_type}")
         
-        if message_type == "task_request":
-            await self._handle_task_request(data)
-        elif message_type == "task":
-            await self._handle_task_request(data)
+        if message_type in ("task_request", "task"):
+            # Run each search in its own task so the message loop keeps
+            # reading while slow searches are in flight
+            task = asyncio.create_task(self._handle_task_request(data))
+            self.active_tasks.add(task)
+            task.add_done_callback(self.active_tasks.discard)
         elif message_type == "ping":
             await self._send_message({"type": "pong"})
         elif message_type == "registration_confirmed":
@@ -334,5 +339,7 @@ class NetworkMCPAgent:
                 "minute_limit": self.search_service.rate_limiter.max_requests_per_minute,
                 "daily_used": self.search_service.rate_limiter.daily_requests,
                 "minute_used": len(self.search_service.rate_limiter.minute_requests)
-            }
+            },
+            "cache": self.search_service.cache.get_stats(),
+            "active_tasks": len(self.active_tasks)
         }
@@ -0,0 +1,330 @@
+"""
+Research context store for Research Manager.
+
+This module persists research workflow state in SQLite:
+- Context rows hold the small state (stage, metadata, delegations)
+- Large artifacts (search results, synthesis, node results and shard
+  payloads) live in a separate table, referenced by name
+- Workflow DAG state is stored next to its context
+- Contexts are loaded lazily and evicted from memory when idle; a context
+  whose workflow is running stays cached, since the orchestrator holds it
+  and its DAG across awaits
+
+Every save writes through to the database, so a restarted service picks
+up running workflows where they stopped. The async write methods run the
+SQLite statements in a worker thread, one write at a time and in call
+order; the object being saved is serialized on the caller's thread first.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .models import ResearchContext, ResearchStage
+from .workflow_dag import WorkflowDAG
+
+logger = logging.getLogger(__name__)
+
+# Kept out of the context row; see put_artifact/append_records
+LARGE_FIELDS = ("search_results", "execution_results", "reasoning_output", "synthesis")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS research_contexts (
+    task_id TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    state TEXT NOT NULL,
+    workflow TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS research_artifacts (
+    task_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (task_id, name, seq)
+);
+CREATE TABLE IF NOT EXISTS research_delegations (
+    delegation_id TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_research_delegations_task ON research_delegations (task_id);
+"""
+
+Statement = Tuple[str, tuple]
+
+
+class ResearchContextStore(MutableMapping):
+    """Research contexts by task id, written through to SQLite and cached while in use."""
+
+    def __init__(self, path: str, idle_timeout: int = 600, max_cached: int = 50):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.max_cached = max_cached
+
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        # The connection is shared with the worker threads running writes
+        self._db_lock = threading.RLock()
+        self._write_lock = asyncio.Lock()
+
+        # task_id -> context / workflow, least recently used first
+        self._contexts: "OrderedDict[str, ResearchContext]" = OrderedDict()
+        self._workflows: Dict[str, WorkflowDAG] = {}
+        self._last_used: Dict[str, float] = {}
+
+    # SQLite access
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._db_lock:
+            return self.db.execute(sql, params).fetchall()
+
+    def _write(self, statements: List[Statement]) -> int:
+        """Run write statements in one transaction; returns the rows changed."""
+        with self._db_lock:
+            self.db.execute("BEGIN")
+            try:
+                changed = sum(self.db.execute(sql, params).rowcount for sql, params in statements)
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+            return changed
+
+    async def _write_async(self, statements: List[Statement]) -> int:
+        async with self._write_lock:
+            return await asyncio.to_thread(self._write, statements)
+
+    # Mapping protocol: service.active_contexts
+
+    def __getitem__(self, task_id: str) -> ResearchContext:
+        context = self._contexts.get(task_id)
+        if context is None:
+            rows = self._query("SELECT state FROM research_contexts WHERE task_id = ?", (task_id,))
+            if not rows:
+                raise KeyError(task_id)
+            context = ResearchContext.from_dict(json.loads(rows[0][0]))
+            self._contexts[task_id] = context
+            self._evict_overflow(keep=task_id)
+        self._touch(task_id)
+        return context
+
+    def __setitem__(self, task_id: str, context: ResearchContext):
+        self._contexts[task_id] = context
+        self._touch(task_id)
+        self._write(self._context_statements(context))
+        self._evict_overflow(keep=task_id)
+
+    def __delitem__(self, task_id: str):
+        deleted = self._write([
+            ("DELETE FROM research_contexts WHERE task_id = ?", (task_id,)),
+            ("DELETE FROM research_artifacts WHERE task_id = ?", (task_id,)),
+            ("DELETE FROM research_delegations WHERE task_id = ?", (task_id,)),
+        ])
+        cached = self._contexts.pop(task_id, None)
+        self._workflows.pop(task_id, None)
+        self._last_used.pop(task_id, None)
+        if cached is None and deleted == 0:
+            raise KeyError(task_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([row[0] for row in self._query("SELECT task_id FROM research_contexts")])
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM research_contexts")[0][0]
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._contexts or bool(
+            self._query("SELECT 1 FROM research_contexts WHERE task_id = ?", (task_id,))
+        )
+
+    def _touch(self, task_id: str):
+        self._last_used[task_id] = time.monotonic()
+        if task_id in self._contexts:
+            self._contexts.move_to_end(task_id)
+
+    # Context and workflow state
+
+    @staticmethod
+    def _context_statements(context: ResearchContext) -> List[Statement]:
+        """Upsert for the context's small state (large fields are stored as artifacts)."""
+        state = context.to_dict()
+        for field_name in LARGE_FIELDS:
+            state.pop(field_name, None)
+        return [(
+            "INSERT INTO research_contexts (task_id, stage, state, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (task_id) DO UPDATE SET stage = excluded.stage, state = excluded.state, "
+            "updated_at = excluded.updated_at",
+            (context.task_id, context.stage.value, json.dumps(state, default=str), datetime.now().isoformat())
+        )]
+
+    @classmethod
+    def _workflow_statements(cls, context: ResearchContext, dag: WorkflowDAG) -> List[Statement]:
+        return cls._context_statements(context) + [(
+            "UPDATE research_contexts SET workflow = ? WHERE task_id = ?",
+            (json.dumps(dag.to_dict(), default=str), context.task_id)
+        )]
+
+    async def save(self, context: ResearchContext):
+        """Write the context's small state."""
+        await self._write_async(self._context_statements(context))
+
+    def get_workflow(self, task_id: str) -> Optional[WorkflowDAG]:
+        dag = self._workflows.get(task_id)
+        if dag is None:
+            rows = self._query("SELECT workflow FROM research_contexts WHERE task_id = ?", (task_id,))
+            if not rows or not rows[0][0]:
+                return None
+            dag = WorkflowDAG.from_dict(json.loads(rows[0][0]))
+            self._workflows[task_id] = dag
+        self._touch(task_id)
+        return dag
+
+    async def save_workflow(self, context: ResearchContext, dag: WorkflowDAG):
+        """Checkpoint a context together with its workflow DAG."""
+        self._workflows[context.task_id] = dag
+        await self._write_async(self._workflow_statements(context, dag))
+
+    async def delete_workflow(self, task_id: str):
+        """Drop a finished workflow's DAG, intermediate artifacts and delegations."""
+        self._workflows.pop(task_id, None)
+        await self._write_async([
+            ("UPDATE research_contexts SET workflow = NULL WHERE task_id = ?", (task_id,)),
+            ("DELETE FROM research_artifacts WHERE task_id = ? AND (name LIKE 'payload:%' OR name LIKE 'shard:%')",
+             (task_id,)),
+            ("DELETE FROM research_delegations WHERE task_id = ?", (task_id,)),
+        ])
+
+    def workflow_ids(self) -> List[str]:
+        return [row[0] for row in self._query("SELECT task_id FROM research_contexts WHERE workflow IS NOT NULL")]
+
+    async def add_delegation(self, delegation_id: str, task_id: str):
+        await self._write_async([(
+            "INSERT OR REPLACE INTO research_delegations (delegation_id, task_id) VALUES (?, ?)",
+            (delegation_id, task_id)
+        )])
+
+    def find_delegation(self, delegation_id: str) -> Optional[str]:
+        """Task id of the workflow that delegated ``delegation_id``."""
+        rows = self._query("SELECT task_id FROM research_delegations WHERE delegation_id = ?", (delegation_id,))
+        return rows[0][0] if rows else None
+
+    # Artifacts
+
+    async def put_artifact(self, task_id: str, name: str, value: Any):
+        await self._write_async([
+            ("DELETE FROM research_artifacts WHERE task_id = ? AND name = ?", (task_id, name)),
+            ("INSERT INTO research_artifacts (task_id, name, seq, data) VALUES (?, ?, 0, ?)",
+             (task_id, name, json.dumps(value, default=str))),
+        ])
+
+    def get_artifact(self, task_id: str, name: str, default: Any = None) -> Any:
+        rows = self._query(
+            "SELECT data FROM research_artifacts WHERE task_id = ? AND name = ? ORDER BY seq LIMIT 1",
+            (task_id, name)
+        )
+        return json.loads(rows[0][0]) if rows else default
+
+    async def append_records(self, task_id: str, name: str, records: List[Any]):
+        """Append a batch to a record list without rewriting earlier batches."""
+        if not records:
+            return
+        await self._write_async([(
+            "INSERT INTO research_artifacts (task_id, name, seq, data) VALUES (?, ?, "
+            "(SELECT COALESCE(MAX(seq), -1) + 1 FROM research_artifacts WHERE task_id = ? AND name = ?), ?)",
+            (task_id, name, task_id, name, json.dumps(records, default=str))
+        )])
+
+    def get_records(self, task_id: str, name: str) -> List[Any]:
+        records: List[Any] = []
+        for (data,) in self._query(
+            "SELECT data FROM research_artifacts WHERE task_id = ? AND name = ? ORDER BY seq", (task_id, name)
+        ):
+            records.extend(json.loads(data))
+        return records
+
+    async def delete_artifacts(self, task_id: str, prefix: str):
+        await self._write_async([
+            ("DELETE FROM research_artifacts WHERE task_id = ? AND name LIKE ?", (task_id, prefix + "%"))
+        ])
+
+    # Memory management
+
+    def _in_use(self, task_id: str) -> bool:
+        """A context with a running workflow is held by the orchestrator across awaits."""
+        return task_id in self._workflows
+
+    def _evict_statements(self, task_id: str) -> List[Statement]:
+        """Drop a cached context; returns the writes that save it for the next access."""
+        context = self._contexts.pop(task_id, None)
+        dag = self._workflows.pop(task_id, None)
+        self._last_used.pop(task_id, None)
+        if context is None:
+            return []
+        return self._workflow_statements(context, dag) if dag is not None else self._context_statements(context)
+
+    def _evict_overflow(self, keep: Optional[str] = None):
+        overflow = len(self._contexts) - self.max_cached
+        if overflow <= 0:
+            return
+        # Least recently used first; may stay over max_cached while many workflows run
+        candidates = [task_id for task_id in self._contexts if task_id != keep and not self._in_use(task_id)]
+        statements: List[Statement] = []
+        for task_id in candidates[:overflow]:
+            statements += self._evict_statements(task_id)
+        if statements:
+            self._write(statements)
+
+    async def evict_idle(self) -> int:
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [task_id for task_id, used in self._last_used.items() if used < cutoff and not self._in_use(task_id)]
+        statements: List[Statement] = []
+        for task_id in idle:
+            statements += self._evict_statements(task_id)
+        if statements:
+            await self._write_async(statements)
+        return len(idle)
+
+    async def expire_finished(self, max_age: int) -> int:
+        """Delete completed and failed contexts not updated for ``max_age`` seconds."""
+        cutoff = (datetime.now() - timedelta(seconds=max_age)).isoformat()
+        expired = [row[0] for row in self._query(
+            "SELECT task_id FROM research_contexts WHERE stage IN (?, ?) AND updated_at < ?",
+            (ResearchStage.COMPLETE.value, ResearchStage.FAILED.value, cutoff)
+        )]
+        statements: List[Statement] = []
+        for task_id in expired:
+            self._contexts.pop(task_id, None)
+            self._workflows.pop(task_id, None)
+            self._last_used.pop(task_id, None)
+            statements += [
+                ("DELETE FROM research_contexts WHERE task_id = ?", (task_id,)),
+                ("DELETE FROM research_artifacts WHERE task_id = ?", (task_id,)),
+                ("DELETE FROM research_delegations WHERE task_id = ?", (task_id,)),
+            ]
+        if statements:
+            await self._write_async(statements)
+        return len(expired)
+
+    @property
+    def cached_count(self) -> int:
+        return len(self._contexts)
+
+    def close(self):
+        statements: List[Statement] = []
+        for task_id in list(self._contexts):
+            statements += self._evict_statements(task_id)
+        if statements:
+            self._write(statements)
+        with self._db_lock:
+            self.db.close()
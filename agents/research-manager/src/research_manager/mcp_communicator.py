@@ -6,10 +6,10 @@ This module handles all MCP protocol communication including:
 - Message parsing and routing
 - Task delegation to other agents
 - Response handling and coordination
+- Negotiated binary wire format with compression and chunking (mcp_wire.py)
 """
 
 import asyncio
-import json
 import logging
 import uuid
 from datetime import datetime
@@ -18,19 +18,28 @@ from typing import Any, Dict, Optional
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
+from .mcp_wire import DEFAULT_CHUNK_SIZE, FrameAssembler, WireCodec, wire_capabilities
+
 logger = logging.getLogger(__name__)
 
 
 class MCPCommunicator:
     """Handles MCP protocol communication for Research Manager."""
     
-    def __init__(self, agent_id: str, agent_type: str, mcp_server_url: str, capabilities: list):
+    def __init__(self, agent_id: str, agent_type: str, mcp_server_url: str, capabilities: list,
+                 wire_enabled: bool = True, wire_chunk_size: int = DEFAULT_CHUNK_SIZE):
         """Initialize MCP communicator."""
         self.agent_id = agent_id
         self.agent_type = agent_type
         self.mcp_server_url = mcp_server_url
         self.capabilities = capabilities
         
+        # Wire format: JSON text until the server confirms a binary codec
+        self.wire_enabled = wire_enabled
+        self.wire_chunk_size = wire_chunk_size
+        self.codec = WireCodec()
+        self.assembler = FrameAssembler()
+        
         # Connection state
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.mcp_connected = False
@@ -49,10 +58,14 @@ class MCPCommunicator:
             try:
                 logger.info(f"Connecting to MCP server at {self.mcp_server_url} (attempt {attempt + 1})")
                 
+                self.codec = WireCodec()
+                self.assembler = FrameAssembler()
                 self.websocket = await websockets.connect(
                     self.mcp_server_url,
                     ping_interval=30,
-                    ping_timeout=10
+                    ping_timeout=10,
+                    # The negotiated codec compresses large payloads itself
+                    compression=None if self.wire_enabled else "deflate"
                 )
                 
                 # Register with MCP server
@@ -87,10 +100,25 @@ class MCPCommunicator:
                 "health_endpoint": "http://0.0.0.0:8002/health"
             }
         }
+        if self.wire_enabled:
+            registration_message["wire"] = wire_capabilities(self.wire_chunk_size)
         
-        await self.websocket.send(json.dumps(registration_message))
+        await self._send_message(registration_message)
         logger.info(f"Registered with MCP server: {len(self.capabilities)} capabilities")
     
+    async def _send_message(self, message: Dict[str, Any]):
+        """Send a message to the MCP server using the negotiated wire format."""
+        for frame in self.codec.encode(message):
+            await self.websocket.send(frame)
+    
+    def _decode_message(self, frame) -> Optional[Dict[str, Any]]:
+        """Decode a received frame; None while a chunked message is incomplete."""
+        data = self.assembler.feed(frame)
+        if data and data.get("type") == "registration_confirmed" and data.get("wire"):
+            self.codec = WireCodec.from_dict(data["wire"])
+            logger.info(f"Using wire format {self.codec.format}/{self.codec.compression}")
+        return data
+    
     async def listen_for_tasks(self):
         """Listen for tasks from MCP server."""
         try:
@@ -105,14 +133,15 @@ class MCPCommunicator:
                     break
                     
                 try:
-                    logger.info(f"Received raw WebSocket message: {message}")
-                    data = json.loads(message)
-                    logger.info(f"Parsed message data: {data}")
+                    data = self._decode_message(message)
+                    if data is None:
+                        continue  # Waiting for the remaining chunks
+                    logger.info(f"Received MCP message: {data.get('type')} ({len(message)} bytes)")
                     await self.task_queue.put(data)
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse MCP message: {e}, raw message: {message}")
+                except ValueError as e:
+                    logger.error(f"Failed to decode MCP message ({len(message)} bytes): {e}")
                 except Exception as e:
-                    logger.error(f"Error handling MCP message: {e}, message: {message}")
+                    logger.error(f"Error handling MCP message: {e}")
                     
         except ConnectionClosed:
             logger.warning("MCP server connection closed")
@@ -145,35 +174,63 @@ class MCPCommunicator:
             "status": result.get("status", "completed") if isinstance(result, dict) else "completed"
         }
         
-        logger.info(f"Sending response to MCP server: {response}")
-        await self.websocket.send(json.dumps(response))
+        logger.info(f"Sending response to MCP server for task {response['task_id']}")
+        await self._send_message(response)
     
-    async def delegate_to_agent(self, task_id: str, agent_type: str, action_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Delegate a task to a specific agent via MCP."""
+    async def send_progress(self, execution_id: str, event: Dict[str, Any]):
+        """Report workflow progress of an execution to the MCP server; best effort."""
+        if not self.websocket or not self.mcp_connected:
+            return
+        
+        try:
+            await self._send_message({
+                "type": "progress_event",
+                "execution_id": execution_id,
+                "agent_type": self.agent_type,
+                **event,
+                "timestamp": datetime.now().isoformat()
+            })
+        except Exception as e:
+            logger.warning(f"Failed to send progress for execution {execution_id}: {e}")
+    
+    async def delegate_to_agent(self, task_id: str, agent_type: str, action_data: Dict[str, Any],
+                                delegation_id: Optional[str] = None,
+                                idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Delegate a task to a specific agent via MCP.
+        
+        Resending with the same delegation_id and idempotency_key (e.g. after a
+        restart) is answered by the MCP server without running the task twice.
+        """
         try:
             if not self.websocket or not self.mcp_connected:
                 raise Exception("MCP connection not available")
             
+            delegation_id = delegation_id or str(uuid.uuid4())
+            
             # Create research_action message for delegation
             delegation_message = {
                 "type": "research_action",
                 "data": {
-                    "task_id": str(uuid.uuid4()),
+                    "task_id": delegation_id,
                     "context_id": f"delegation-{task_id}",
                     "agent_type": agent_type,
                     "action": action_data.get("action", "search_literature"),
                     "payload": {
                         **action_data,
                         "delegated_from": self.agent_id,
-                        "original_task_id": task_id
+                        "original_task_id": task_id,
+                        # Lets the agent tag its progress events
+                        "delegation_id": delegation_id
                     }
                 },
                 "client_id": self.agent_id,
                 "timestamp": datetime.now().isoformat()
             }
+            if idempotency_key:
+                delegation_message["data"]["idempotency_key"] = idempotency_key
             
             # Send delegation
-            await self.websocket.send(json.dumps(delegation_message))
+            await self._send_message(delegation_message)
             
             logger.info(f"Delegated task {task_id} to {agent_type} with action {action_data.get('action', 'search_literature')}")
             
@@ -209,7 +266,7 @@ class MCPCommunicator:
                 "timestamp": datetime.now().isoformat()
             }
             
-            await self.websocket.send(json.dumps(db_request))
+            await self._send_message(db_request)
             logger.info(f"Sent request to fetch research plan for topic {topic_id}")
             
             # Wait for response with timeout
@@ -219,7 +276,9 @@ class MCPCommunicator:
             while (datetime.now() - start_time).total_seconds() < response_timeout:
                 try:
                     message = await asyncio.wait_for(self.websocket.recv(), timeout=1.0)
-                    data = json.loads(message)
+                    data = self._decode_message(message)
+                    if data is None:
+                        continue
                     
                     if (data.get("type") == "task_result" and 
                         data.get("task_id") == db_request["task_id"]):
@@ -269,7 +328,7 @@ class MCPCommunicator:
                 "timestamp": datetime.now().isoformat()
             }
             
-            await self.websocket.send(json.dumps(planning_request))
+            await self._send_message(planning_request)
             logger.info(f"Sent request to generate research plan for topic: {topic_name}")
             
             # Wait for response with timeout
@@ -279,7 +338,9 @@ class MCPCommunicator:
             while (datetime.now() - start_time).total_seconds() < response_timeout:
                 try:
                     message = await asyncio.wait_for(self.websocket.recv(), timeout=1.0)
-                    data = json.loads(message)
+                    data = self._decode_message(message)
+                    if data is None:
+                        continue
                     
                     if (data.get("type") == "task_result" and 
                         data.get("task_id") == planning_request["task_id"]):
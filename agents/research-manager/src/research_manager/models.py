@@ -5,7 +5,7 @@ This module contains all the data structures used for research workflow
 management, task tracking, and agent coordination.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
@@ -56,10 +56,37 @@ class ResearchContext:
     execution_results: List[Dict[str, Any]] = field(default_factory=list)
     synthesis: str = ""
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for checkpoints (JSON-compatible)."""
+        data = asdict(self)
+        data["stage"] = self.stage.value
+        data["completed_stages"] = [stage.value for stage in self.completed_stages]
+        data["failed_stages"] = [stage.value for stage in self.failed_stages]
+        data["created_at"] = self.created_at.isoformat()
+        data["updated_at"] = self.updated_at.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResearchContext":
+        data = dict(data)
+        data["stage"] = ResearchStage(data.get("stage", ResearchStage.PLANNING.value))
+        data["completed_stages"] = [ResearchStage(stage) for stage in data.get("completed_stages", [])]
+        data["failed_stages"] = [ResearchStage(stage) for stage in data.get("failed_stages", [])]
+        for key in ("created_at", "updated_at"):
+            if data.get(key):
+                data[key] = datetime.fromisoformat(data[key])
+        return cls(**data)
+
 
 @dataclass
 class ResearchAction:
-    """Research action for agent communication."""
+    """Research action for agent communication.
+
+    In a workflow DAG ``task_id`` is the node id and ``dependencies`` name
+    other nodes. ``parallelism`` splits the list under ``shard_key`` into
+    that many concurrent delegations; ``inputs`` maps payload keys to
+    result keys of the dependencies.
+    """
     task_id: str
     context_id: str
     agent_type: str
@@ -70,6 +97,22 @@ class ResearchAction:
     timeout: int = 300
     retry_count: int = 0
     dependencies: List[str] = field(default_factory=list)
+    shard_key: Optional[str] = None
+    inputs: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class WorkflowNodeState:
+    """Execution state of one workflow DAG node."""
+    node_id: str
+    status: str = "pending"  # pending, running, completed, failed
+    delegations: Dict[str, int] = field(default_factory=dict)  # delegation task id -> shard
+    shard_count: int = 0
+    completed_shards: List[int] = field(default_factory=list)
+    attempts: Dict[str, int] = field(default_factory=dict)  # shard -> failed attempts
+    error: Optional[str] = None
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
 
 
 @dataclass
@@ -10,7 +10,7 @@ import logging
 from datetime import datetime
 from typing import Any, Callable, Dict, List
 
-from .models import ResearchContext
+from .context_store import ResearchContextStore
 from .mcp_communicator import MCPCommunicator
 from .task_handlers import TaskHandlers
 from .task_processor import TaskProcessor
@@ -46,8 +46,14 @@ class ResearchManagerService:
         # Service state
         self.should_run = True
         
-        # Active research contexts
-        self.active_contexts: Dict[str, ResearchContext] = {}
+        # Research contexts, persisted and loaded on demand
+        research_settings = config.get("research_settings", {})
+        self.active_contexts = ResearchContextStore(
+            research_settings.get("context_store_path", "/app/data/research_manager.db"),
+            idle_timeout=research_settings.get("context_idle_timeout", 600),
+            max_cached=research_settings.get("max_cached_contexts", 50)
+        )
+        self.context_cleanup_delay = research_settings.get("context_cleanup_delay", 3600)
         
         # Agent capabilities and availability
         self.agent_capabilities: Dict[str, List[str]] = {}
@@ -87,8 +93,14 @@ class ResearchManagerService:
             # Connect to MCP server
             await self.mcp_communicator.connect_to_mcp_server()
             
+            # Pick up workflows checkpointed before a restart
+            resumed = await self.workflow_orchestrator.resume_workflows()
+            if resumed:
+                logger.info(f"Resumed {resumed} checkpointed workflows")
+            
             # Start task processing
             asyncio.create_task(self._process_task_queue())
+            asyncio.create_task(self._maintain_context_store())
             
             # Listen for MCP messages
             await self.mcp_communicator.listen_for_tasks()
@@ -104,9 +116,8 @@ class ResearchManagerService:
         try:
             self.should_run = False
             
-            # Cancel all active tasks
-            for task_id in list(self.active_contexts.keys()):
-                await self._cancel_task(task_id)
+            # Running workflows stay in the context store and resume on next start
+            self.active_contexts.close()
             
             # Close MCP connection
             await self.mcp_communicator.close()
@@ -142,6 +153,18 @@ class ResearchManagerService:
                 logger.error(f"Traceback: {traceback.format_exc()}")
                 await asyncio.sleep(1)
     
+    async def _maintain_context_store(self):
+        """Evict idle contexts from memory and drop long-finished ones."""
+        while self.should_run:
+            try:
+                await asyncio.sleep(60)
+                evicted = await self.active_contexts.evict_idle()
+                expired = await self.active_contexts.expire_finished(self.context_cleanup_delay)
+                if evicted or expired:
+                    logger.info(f"Context store: evicted {evicted} idle, removed {expired} finished contexts")
+            except Exception as e:
+                logger.error(f"Error maintaining context store: {e}")
+    
     async def _cancel_task(self, task_id: str) -> Dict[str, Any]:
         """Cancel a task."""
         try:
@@ -249,7 +249,8 @@ class TaskHandlers:
             "estimated_cost": context.estimated_cost,
             "actual_cost": context.actual_cost,
             "created_at": context.created_at.isoformat(),
-            "updated_at": context.updated_at.isoformat()
+            "updated_at": context.updated_at.isoformat(),
+            "workflow": self.service.workflow_orchestrator.workflow_progress(context.task_id)
         }
     
     async def _start_workflow(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -13,8 +13,6 @@ import traceback
 from datetime import datetime
 from typing import Any, Dict
 
-from .models import ResearchStage
-
 logger = logging.getLogger(__name__)
 
 
@@ -169,6 +167,11 @@ class TaskProcessor:
             
             logger.info(f"Coordinating research for task {task_id}")
             logger.info(f"Research plan received: {research_plan}")
+            await self.service.mcp_communicator.send_progress(task_id, {
+                "stage": "planning",
+                "status": "running",
+                "message": "Preparing research plan"
+            })
             
             # Check if research plan is empty and needs to be fetched from database
             if not research_plan or research_plan == {}:
@@ -207,6 +210,12 @@ class TaskProcessor:
             
             # Start research workflow which will trigger literature search
             workflow_result = await self.service.workflow_orchestrator.start_research_workflow(context)
+            if not workflow_result.get("workflow_started"):
+                await self.service.mcp_communicator.send_progress(task_id, {
+                    "stage": context.stage.value,
+                    "status": "failed",
+                    "message": workflow_result.get("error", "Workflow did not start")
+                })
             
             return {
                 "status": "completed",
@@ -228,28 +237,15 @@ class TaskProcessor:
         try:
             task_id = task_data.get("task_id")
             agent_id = task_data.get("agent_id")
-            result = task_data.get("result", {})
+            result = task_data.get("result") or {}
             
             logger.info(f"Received task result from {agent_id} for task {task_id}")
-            logger.info(f"Result status: {result.get('status')}")
+            logger.info(f"Result status: {result.get('status') if isinstance(result, dict) else task_data.get('status')}")
             
-            # Find the context and delegation info for this task result
-            found_context = None
-            found_delegation_id = None
-            found_agent_type = None
+            # Find the workflow that delegated this task
+            found_context = self.service.workflow_orchestrator.find_context(task_id)
             
-            # Search through all active contexts to find the matching delegation
-            for ctx_task_id, ctx in self.service.active_contexts.items():
-                for delegation_id, delegation_info in ctx.delegated_tasks.items():
-                    if delegation_info["task_id"] == task_id:
-                        found_context = ctx
-                        found_delegation_id = delegation_id
-                        found_agent_type = delegation_info["agent_type"]
-                        break
-                if found_context:
-                    break
-            
-            if not found_context or not found_delegation_id:
+            if not found_context:
                 logger.warning(f"No active context found for task result {task_id}")
                 return {
                     "status": "acknowledged",
@@ -257,29 +253,19 @@ class TaskProcessor:
                     "timestamp": datetime.now().isoformat()
                 }
             
-            # Update delegation status
-            found_context.delegated_tasks[found_delegation_id]["status"] = "completed"
-            found_context.delegated_tasks[found_delegation_id]["result"] = result
-            found_context.delegated_tasks[found_delegation_id]["completed_at"] = datetime.now().isoformat()
-            
-            logger.info(f"Found delegation: {found_delegation_id} for agent type: {found_agent_type}")
-            
-            # Continue workflow based on current stage and completed delegation
-            if found_agent_type == "literature_search" and found_context.stage == ResearchStage.LITERATURE_REVIEW:
-                logger.info("Literature search completed, continuing to synthesis")
-                await self.service.workflow_orchestrator.continue_workflow_after_literature(found_context, result)
-            elif found_agent_type == "synthesis_review" and found_context.stage == ResearchStage.SYNTHESIS:
-                logger.info("Synthesis completed, continuing to review")
-                await self.service.workflow_orchestrator.continue_workflow_after_synthesis(found_context, result)
-            elif found_agent_type == "screening_agent" and found_context.stage == ResearchStage.SYSTEMATIC_REVIEW:
-                logger.info("Review completed, finalizing workflow")
-                await self.service.workflow_orchestrator.complete_workflow(found_context, result)
-            else:
-                logger.warning(f"Unexpected task result: agent_type={found_agent_type}, stage={found_context.stage}")
+            # Record the node result and dispatch the nodes it unblocks
+            workflow_result = await self.service.workflow_orchestrator.handle_delegation_result(
+                found_context,
+                task_id,
+                task_data.get("status", "completed"),
+                result,
+                task_data.get("error")
+            )
+            logger.info(f"Workflow update for task {found_context.task_id}: {workflow_result}")
             
             return {
                 "status": "acknowledged",
-                "message": f"Task result processed for {found_agent_type}",
+                "message": f"Task result processed for workflow {found_context.task_id}",
                 "timestamp": datetime.now().isoformat()
             }
             
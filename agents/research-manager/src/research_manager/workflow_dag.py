@@ -0,0 +1,221 @@
+"""
+Workflow DAG module for Research Manager.
+
+This module holds the dependency graph of a research workflow:
+- Nodes are ResearchAction specs whose dependencies name other nodes
+- Nodes become ready once all their dependencies completed
+- A node's payload list can be split into shards dispatched concurrently
+- Dependency results are fanned in through the node's inputs
+
+Only small state lives here; payloads and results are artifacts in the
+ResearchContextStore.
+"""
+
+import logging
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import ResearchAction, WorkflowNodeState
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowDAG:
+    """Dependency graph and execution state of one research workflow."""
+
+    def __init__(self, context_id: str, nodes: List[ResearchAction],
+                 states: Optional[Dict[str, WorkflowNodeState]] = None):
+        """Validate the graph; raises ValueError for unknown dependencies or cycles."""
+        self.context_id = context_id
+        self.nodes: Dict[str, ResearchAction] = {}
+        for node in nodes:
+            if node.task_id in self.nodes:
+                raise ValueError(f"Duplicate workflow node: {node.task_id}")
+            self.nodes[node.task_id] = node
+
+        for node in self.nodes.values():
+            unknown = [dep for dep in node.dependencies if dep not in self.nodes]
+            if unknown:
+                raise ValueError(f"Node {node.task_id} depends on unknown nodes: {unknown}")
+
+        self.order = self._topological_order()
+        self.states = states or {node_id: WorkflowNodeState(node_id=node_id) for node_id in self.order}
+
+        # delegation task id -> node id, for routing agent results
+        self.delegation_index: Dict[str, str] = {
+            delegation_id: node_id
+            for node_id, state in self.states.items()
+            for delegation_id in state.delegations
+        }
+
+    def _topological_order(self) -> List[str]:
+        """Kahn's algorithm, keeping declaration order among independent nodes."""
+        remaining = {node_id: len(node.dependencies) for node_id, node in self.nodes.items()}
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
+        for node in self.nodes.values():
+            for dep in node.dependencies:
+                dependents[dep].append(node.task_id)
+
+        ready = [node_id for node_id, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            node_id = ready.pop(0)
+            order.append(node_id)
+            for dependent in dependents[node_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.nodes):
+            cycle = sorted(set(self.nodes) - set(order))
+            raise ValueError(f"Workflow has a dependency cycle through: {cycle}")
+        return order
+
+    def ready_nodes(self) -> List[ResearchAction]:
+        """Pending nodes whose dependencies have all completed."""
+        return [
+            self.nodes[node_id] for node_id in self.order
+            if self.states[node_id].status == "pending"
+            and all(self.states[dep].status == "completed" for dep in self.nodes[node_id].dependencies)
+        ]
+
+    def build_shards(self, node_id: str, dependency_results: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fan in dependency results and split the payload into shards."""
+        node = self.nodes[node_id]
+        payload = dict(node.payload)
+        payload["action"] = node.action
+
+        for payload_key, result_key in node.inputs.items():
+            values = [
+                dependency_results[dep][result_key]
+                for dep in node.dependencies
+                if dependency_results.get(dep) and result_key in dependency_results[dep]
+            ]
+            if values and all(isinstance(value, list) for value in values):
+                payload[payload_key] = [item for value in values for item in value]
+            elif len(values) == 1:
+                payload[payload_key] = values[0]
+            else:
+                payload[payload_key] = values
+
+        items = payload.get(node.shard_key) if node.shard_key else None
+        shard_count = min(max(node.parallelism, 1), len(items)) if isinstance(items, list) else 1
+        if shard_count <= 1:
+            return [payload]
+
+        # Contiguous, evenly sized slices keep record order stable when merging
+        size, extra = divmod(len(items), shard_count)
+        shards, start = [], 0
+        for index in range(shard_count):
+            end = start + size + (1 if index < extra else 0)
+            shards.append({**payload, node.shard_key: items[start:end], "shard": index, "shard_count": shard_count})
+            start = end
+        return shards
+
+    def mark_running(self, node_id: str, shard_count: int):
+        state = self.states[node_id]
+        state.status = "running"
+        state.shard_count = shard_count
+        state.started_at = datetime.now().isoformat()
+
+    def add_delegation(self, node_id: str, shard: int, delegation_id: str):
+        self.states[node_id].delegations[delegation_id] = shard
+        self.delegation_index[delegation_id] = node_id
+
+    def outstanding(self, node_id: str) -> List[Tuple[Optional[str], int]]:
+        """Shards of a running node without a result, with their delegation id if sent."""
+        state = self.states[node_id]
+        sent = {shard: delegation_id for delegation_id, shard in state.delegations.items()}
+        return [
+            (sent.get(shard), shard) for shard in range(state.shard_count)
+            if shard not in state.completed_shards
+        ]
+
+    def record_result(self, delegation_id: str) -> Optional[Tuple[str, int]]:
+        """Mark a shard done; returns (node_id, shard), or None for unknown or duplicate results.
+
+        The node is completed once all of its shards are in.
+        """
+        node_id = self.delegation_index.get(delegation_id)
+        if node_id is None:
+            return None
+        state = self.states[node_id]
+        shard = state.delegations.get(delegation_id)
+        if state.status != "running" or shard is None or shard in state.completed_shards:
+            return None
+
+        state.completed_shards.append(shard)
+        if len(state.completed_shards) == state.shard_count:
+            state.status = "completed"
+            state.completed_at = datetime.now().isoformat()
+        return node_id, shard
+
+    def record_failure(self, delegation_id: str, error: str, max_retries: int) -> Tuple[Optional[str], Optional[int]]:
+        """Count a failed shard; returns (node_id, shard) to retry, or (node_id, None) once the node failed."""
+        node_id = self.delegation_index.get(delegation_id)
+        if node_id is None or self.states[node_id].status != "running":
+            return None, None
+
+        state = self.states[node_id]
+        shard = state.delegations.pop(delegation_id)
+        self.delegation_index.pop(delegation_id, None)
+        attempts = state.attempts.get(str(shard), 0) + 1
+        state.attempts[str(shard)] = attempts
+        if attempts <= max_retries:
+            return node_id, shard
+
+        state.status = "failed"
+        state.error = error
+        state.completed_at = datetime.now().isoformat()
+        return node_id, None
+
+    @staticmethod
+    def merge_shards(shard_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Concatenate list fields and sum counters; other fields come from the first shard."""
+        merged: Dict[str, Any] = {}
+        for result in shard_results:
+            for key, value in result.items():
+                if key not in merged:
+                    merged[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list) and isinstance(merged[key], list):
+                    merged[key].extend(value)
+                elif isinstance(value, (int, float)) and not isinstance(value, bool) \
+                        and isinstance(merged[key], (int, float)) and not isinstance(merged[key], bool):
+                    merged[key] += value
+        merged["shard_results"] = shard_results
+        return merged
+
+    @property
+    def is_complete(self) -> bool:
+        return all(state.status == "completed" for state in self.states.values())
+
+    @property
+    def has_failed(self) -> bool:
+        return any(state.status == "failed" for state in self.states.values())
+
+    def progress(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for state in self.states.values():
+            counts[state.status] = counts.get(state.status, 0) + 1
+        return {
+            "total_nodes": len(self.nodes),
+            "node_status": counts,
+            "nodes": {node_id: self.states[node_id].status for node_id in self.order}
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "context_id": self.context_id,
+            "nodes": [asdict(self.nodes[node_id]) for node_id in self.order],
+            "states": {node_id: asdict(state) for node_id, state in self.states.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkflowDAG":
+        return cls(
+            data["context_id"],
+            [ResearchAction(**node) for node in data["nodes"]],
+            {node_id: WorkflowNodeState(**state) for node_id, state in data["states"].items()}
+        )
+
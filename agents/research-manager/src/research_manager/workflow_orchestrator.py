@@ -2,28 +2,53 @@
 Workflow orchestration module for Research Manager.
 
 This module handles the coordination of multi-stage research workflows including:
-- Literature search initiation and management
-- Synthesis coordination
-- Review process orchestration
-- Workflow state transitions and completion
+- Building the workflow DAG (per-question literature searches, per-outcome
+  synthesis, sharded screening review)
+- Dispatching every ready node concurrently and fanning results in
+- Retrying failed shards and failing the workflow when retries run out
+- Checkpointing workflow state to the context store and resuming it after a restart
+- Reporting workflow progress as MCP progress events for the gateway's execution tracking
 """
 
+import asyncio
 import logging
+import sqlite3
+import uuid
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
-from .models import ResearchContext, ResearchStage
+from .models import ResearchAction, ResearchContext, ResearchStage
+from .workflow_dag import WorkflowDAG
 
 logger = logging.getLogger(__name__)
 
+# Stage reported while nodes of an agent type are running
+STAGE_BY_AGENT = {
+    "literature": ResearchStage.LITERATURE_REVIEW,
+    "synthesis_review": ResearchStage.SYNTHESIS,
+    "screening": ResearchStage.SYSTEMATIC_REVIEW,
+}
+
+FAILED_STATUSES = ("failed", "error", "timeout")
+
 
 class WorkflowOrchestrator:
     """Orchestrates research workflows across multiple agents."""
-    
+
     def __init__(self, service_ref):
         """Initialize with reference to main service."""
         self.service = service_ref
-    
+        
+        research_settings = service_ref.config.get("research_settings", {})
+        self.parallel_execution = research_settings.get("enable_parallel_execution", True)
+        self.screening_parallelism = research_settings.get("screening_parallelism", 4) if self.parallel_execution else 1
+        self.max_retries = research_settings.get("max_retries", 2)
+
+    @property
+    def store(self):
+        """The service's ResearchContextStore (workflow DAGs and artifacts live there too)."""
+        return self.service.active_contexts
+
     async def start_research_workflow(self, context: ResearchContext) -> Dict[str, Any]:
         """Start the research workflow for a task."""
         try:
@@ -35,35 +60,40 @@ class WorkflowOrchestrator:
             estimated_cost = await self._estimate_research_costs(context)
             context.estimated_cost = estimated_cost
             
-            logger.info(f"Started research workflow for task {context.task_id}")
-            
-            # Start the complete workflow - literature search first
-            literature_result = await self._start_literature_search(context)
-            
-            # Store literature search results and continue workflow
-            if literature_result.get("delegated"):
-                # Mark literature stage as initiated
-                context.metadata["literature_delegated"] = True
-                context.metadata["literature_delegation_id"] = literature_result.get("delegation_id")
-                
-                logger.info(f"Literature search delegated for task {context.task_id}, workflow will continue upon completion")
-                
+            if not self.service.mcp_communicator.mcp_connected:
+                logger.error("Cannot start research workflow: MCP connection not available")
+                context.stage = ResearchStage.FAILED
                 return {
-                    "workflow_started": True,
-                    "initial_stage": context.stage.value,
-                    "estimated_cost": estimated_cost,
-                    "task_id": context.task_id,
-                    "literature_search_status": "delegated",
-                    "workflow_status": "literature_search_initiated"
+                    "workflow_started": False,
+                    "error": "MCP connection not available"
                 }
-            else:
-                logger.error(f"Failed to delegate literature search for task {context.task_id}")
-                context.stage = ResearchStage.FAILED
+            
+            dag = self.build_research_dag(context)
+            await self.store.save_workflow(context, dag)
+            
+            logger.info(f"Started research workflow for task {context.task_id} with {len(dag.nodes)} nodes")
+            
+            dispatched = await self._advance(context)
+            
+            if dag.has_failed:
+                error = "; ".join(state.error for state in dag.states.values() if state.error)
+                logger.error(f"Failed to delegate workflow nodes for task {context.task_id}: {error}")
+                await self._fail_workflow(context, error)
                 return {
                     "workflow_started": False,
-                    "error": "Failed to delegate literature search"
+                    "error": f"Failed to delegate workflow nodes: {error}"
                 }
             
+            return {
+                "workflow_started": True,
+                "initial_stage": context.stage.value,
+                "estimated_cost": estimated_cost,
+                "task_id": context.task_id,
+                "dispatched_nodes": dispatched,
+                "total_nodes": len(dag.nodes),
+                "workflow_status": "nodes_delegated"
+            }
+        
         except Exception as e:
             logger.error(f"Failed to start research workflow: {e}")
             context.stage = ResearchStage.FAILED
@@ -71,245 +101,312 @@ class WorkflowOrchestrator:
                 "workflow_started": False,
                 "error": str(e)
             }
-    
-    async def _start_literature_search(self, context: ResearchContext) -> Dict[str, Any]:
-        """Start literature search for the research task."""
-        try:
-            if not self.service.mcp_communicator.mcp_connected:
-                logger.error("Cannot start literature search: MCP connection not available")
-                return {"status": "failed", "error": "MCP connection not available"}
-            
-            # Get the actual research plan from context metadata
-            research_plan = context.metadata.get("research_plan", {})
-            
-            logger.info(f"Starting literature search with research plan: {research_plan}")
-            
-            # Use the delegation method to properly route through MCP server
-            delegation_result = await self.service.mcp_communicator.delegate_to_agent(
-                task_id=context.task_id,
+
+    def build_research_dag(self, context: ResearchContext) -> WorkflowDAG:
+        """Build the workflow DAG from the research plan.
+        
+        One literature search per research question, one synthesis per outcome
+        (each joining all searches), and a screening review that joins
+        everything and is sharded over the found records.
+        """
+        research_plan = context.metadata.get("research_plan", {}) or {}
+        plan = research_plan if isinstance(research_plan, dict) else {}
+        max_results = context.metadata.get("max_results", 50)
+        
+        questions = plan.get("questions") or []
+        outcomes = plan.get("outcomes") or []
+        
+        literature_nodes = []
+        if self.parallel_execution and len(questions) > 1:
+            # Narrow each search to one question and split the result budget
+            scalar_plan = {key: value for key, value in plan.items() if not isinstance(value, list)}
+            per_question = max(1, -(-max_results // len(questions)))
+            for index, question in enumerate(questions):
+                literature_nodes.append(ResearchAction(
+                    task_id=f"literature_{index}",
+                    context_id=context.task_id,
+                    agent_type="literature",
+                    action="search_literature",
+                    payload={
+                        "lit_review_id": context.task_id,
+                        "plan_id": context.plan_id,
+                        "research_plan": {**scalar_plan, "questions": [question]},
+                        "question": question,
+                        "max_results": per_question
+                    }
+                ))
+        else:
+            literature_nodes.append(ResearchAction(
+                task_id="literature",
+                context_id=context.task_id,
                 agent_type="literature",
-                action_data={
-                    "action": "search_literature",
+                action="search_literature",
+                payload={
                     "lit_review_id": context.task_id,
                     "plan_id": context.plan_id,
-                    "research_plan": research_plan,  # Use the actual research plan
-                    "max_results": context.metadata.get("max_results", 50)
+                    "research_plan": research_plan,
+                    "max_results": max_results
                 }
-            )
-            
-            # Track delegation if successful
-            if delegation_result.get("delegated"):
-                delegation_id = f"literature_search_{delegation_result.get('delegation_id')}"
-                context.delegated_tasks[delegation_id] = {
-                    "agent_type": "literature_search",
-                    "task_id": delegation_result.get("delegation_id"),
-                    "action": "search_literature",
-                    "status": "in_progress",
-                    "started_at": datetime.now().isoformat()
+            ))
+        literature_ids = [node.task_id for node in literature_nodes]
+        
+        synthesis_payload = {
+            "task_id": context.task_id,
+            "synthesis_type": "comprehensive",
+            "include_citations": True
+        }
+        synthesis_nodes = []
+        if self.parallel_execution and len(outcomes) > 1:
+            for index, outcome in enumerate(outcomes):
+                synthesis_nodes.append(ResearchAction(
+                    task_id=f"synthesis_{index}",
+                    context_id=context.task_id,
+                    agent_type="synthesis_review",
+                    action="synthesize_evidence",
+                    payload={**synthesis_payload, "research_plan": {**plan, "outcomes": [outcome]}, "outcome": outcome},
+                    dependencies=literature_ids,
+                    inputs={"literature_results": "records"}
+                ))
+        else:
+            synthesis_nodes.append(ResearchAction(
+                task_id="synthesis",
+                context_id=context.task_id,
+                agent_type="synthesis_review",
+                action="synthesize_evidence",
+                payload={**synthesis_payload, "research_plan": research_plan},
+                dependencies=literature_ids,
+                inputs={"literature_results": "records"}
+            ))
+        
+        review_node = ResearchAction(
+            task_id="review",
+            context_id=context.task_id,
+            agent_type="screening",
+            action="screen_literature",
+            payload={
+                "task_id": context.task_id,
+                "research_plan": research_plan,
+                "review_criteria": {
+                    "quality_assessment": True,
+                    "relevance_scoring": True,
+                    "bias_detection": True
                 }
-                context.metadata["literature_delegation_id"] = delegation_id
-            
-            logger.info(f"Literature search delegation result: {delegation_result}")
-            
-            return delegation_result
-            
-        except Exception as e:
-            logger.error(f"Failed to start literature search: {e}")
-            return {
-                "status": "failed",
-                "error": str(e)
-            }
+            },
+            parallelism=self.screening_parallelism,
+            dependencies=literature_ids + [node.task_id for node in synthesis_nodes],
+            shard_key="literature_results",
+            inputs={"literature_results": "records", "synthesis_results": "synthesis"}
+        )
+        
+        return WorkflowDAG(context.task_id, literature_nodes + synthesis_nodes + [review_node])
+
+    async def _advance(self, context: ResearchContext) -> List[str]:
+        """Dispatch every node whose dependencies are done; returns their ids."""
+        dag = self.store.get_workflow(context.task_id)
+        ready = dag.ready_nodes()
+        
+        dispatches = []
+        for node in ready:
+            dependency_results = {
+                dep: self.store.get_artifact(context.task_id, f"node:{dep}") for dep in node.dependencies
+            } if node.inputs else {}
+            shard_payloads = dag.build_shards(node.task_id, dependency_results)
+            dag.mark_running(node.task_id, len(shard_payloads))
+            for shard, payload in enumerate(shard_payloads):
+                # Kept for retries and resends after a restart
+                await self.store.put_artifact(context.task_id, f"payload:{node.task_id}:{shard}", payload)
+                dispatches.append((node, shard, payload))
+        
+        # Independent nodes and shards go out concurrently
+        results = await asyncio.gather(*(
+            self._dispatch_shard(context, dag, node, shard, payload) for node, shard, payload in dispatches
+        ))
+        
+        for (node, shard, _), delegated in zip(dispatches, results):
+            state = dag.states[node.task_id]
+            if not delegated and state.status == "running":
+                state.status = "failed"
+                state.error = f"Failed to delegate {node.action} to {node.agent_type}"
+        
+        if ready:
+            context.stage = STAGE_BY_AGENT.get(ready[-1].agent_type, ResearchStage.EXECUTION)
+            context.updated_at = datetime.now()
+            logger.info(f"Dispatched workflow nodes {[node.task_id for node in ready]} "
+                        f"({len(dispatches)} delegations) for task {context.task_id}")
+        
+        await self._checkpoint(context)
+        await self._report_progress(context)
+        return [node.task_id for node in ready]
+
+    async def _dispatch_shard(self, context: ResearchContext, dag: WorkflowDAG, node: ResearchAction, shard: int,
+                              payload: Optional[Dict[str, Any]] = None, delegation_id: Optional[str] = None) -> bool:
+        """Delegate one shard of a node to its agent."""
+        if payload is None:
+            payload = self.store.get_artifact(context.task_id, f"payload:{node.task_id}:{shard}", {})
+        delegation_id = delegation_id or str(uuid.uuid4())
+        dag.add_delegation(node.task_id, shard, delegation_id)
+        await self.store.add_delegation(delegation_id, context.task_id)
+        
+        # Stable per shard attempt: a resend after a restart does not run the task twice,
+        # while a retry after a failure gets a new key and really runs again
+        attempt = dag.states[node.task_id].attempts.get(str(shard), 0)
+        idempotency_key = f"{context.task_id}:{node.task_id}:{shard}:{attempt}"
+        delegation_result = await self.service.mcp_communicator.delegate_to_agent(
+            task_id=context.task_id,
+            agent_type=node.agent_type,
+            action_data=payload,
+            delegation_id=delegation_id,
+            idempotency_key=idempotency_key
+        )
+        
+        if not delegation_result.get("delegated"):
+            logger.error(f"Failed to delegate node {node.task_id} shard {shard}: {delegation_result.get('error')}")
+            return False
+        
+        context.delegated_tasks[f"{node.task_id}_{delegation_id}"] = {
+            "agent_type": node.agent_type,
+            "task_id": delegation_id,
+            "action": node.action,
+            "node_id": node.task_id,
+            "shard": shard,
+            "status": "in_progress",
+            "started_at": datetime.now().isoformat()
+        }
+        return True
+
+    def find_context(self, delegation_id: str) -> Optional[ResearchContext]:
+        """Find the research context that delegated a task."""
+        task_id = self.store.find_delegation(delegation_id)
+        return self.store.get(task_id) if task_id else None
 
-    async def continue_workflow_after_literature(self, context: ResearchContext, literature_results: Dict[str, Any]) -> Dict[str, Any]:
-        """Continue the research workflow after literature search completion."""
+    async def handle_delegation_result(self, context: ResearchContext, delegation_id: str, status: str,
+                                       result: Dict[str, Any], error: Optional[str] = None) -> Dict[str, Any]:
+        """Record an agent result and dispatch whatever it unblocks."""
         try:
-            logger.info(f"Continuing workflow for task {context.task_id} after literature search")
+            dag = self.store.get_workflow(context.task_id)
+            if dag is None:
+                return {"workflow_continued": False, "error": f"No workflow for task {context.task_id}"}
             
-            # Store literature search results
-            context.search_results = literature_results.get("records", [])
-            context.metadata["literature_search_completed"] = True
-            context.metadata["literature_results"] = literature_results
+            result = result if isinstance(result, dict) else {"result": result}
+            delegation = context.delegated_tasks.get(f"{dag.delegation_index.get(delegation_id)}_{delegation_id}")
             
-            # Move to synthesis stage
-            context.stage = ResearchStage.SYNTHESIS
-            
-            # Start synthesis process
-            synthesis_result = await self._start_synthesis(context)
-            
-            if synthesis_result.get("delegated"):
-                context.metadata["synthesis_delegated"] = True
-                context.metadata["synthesis_delegation_id"] = synthesis_result.get("delegation_id")
-                logger.info(f"Synthesis delegated for task {context.task_id}")
+            if status in FAILED_STATUSES or result.get("status") in FAILED_STATUSES:
+                error = error or result.get("error") or f"Agent returned {status}"
+                if delegation:
+                    delegation.update(status="failed", error=error, completed_at=datetime.now().isoformat())
                 
-                return {
-                    "workflow_continued": True,
-                    "current_stage": context.stage.value,
-                    "synthesis_status": "delegated"
-                }
-            else:
-                logger.error(f"Failed to delegate synthesis for task {context.task_id}")
-                return {
-                    "workflow_continued": False,
-                    "error": "Failed to delegate synthesis"
-                }
+                node_id, retry_shard = dag.record_failure(delegation_id, error, self.max_retries)
+                if node_id is None:
+                    return {"workflow_continued": True, "ignored": delegation_id}
                 
-        except Exception as e:
-            logger.error(f"Failed to continue workflow after literature search: {e}")
-            return {
-                "workflow_continued": False,
-                "error": str(e)
-            }
-
-    async def _start_synthesis(self, context: ResearchContext) -> Dict[str, Any]:
-        """Start synthesis of literature search results."""
-        try:
-            if not self.service.mcp_communicator.mcp_connected:
-                logger.error("Cannot start synthesis: MCP connection not available")
-                return {"status": "failed", "error": "MCP connection not available"}
+                if retry_shard is not None:
+                    logger.warning(f"Node {node_id} shard {retry_shard} failed for task {context.task_id}, retrying: {error}")
+                    if await self._dispatch_shard(context, dag, dag.nodes[node_id], retry_shard):
+                        await self._checkpoint(context)
+                        await self._report_progress(context, message=f"Retrying {node_id} shard {retry_shard}")
+                        return {"workflow_continued": True, "retrying": node_id}
+                    dag.states[node_id].status = "failed"
+                    dag.states[node_id].error = error
+                
+                logger.error(f"Workflow node {node_id} failed for task {context.task_id}: {error}")
+                return await self._fail_workflow(context, f"{node_id}: {error}")
             
-            # Get the actual research plan from context metadata
-            research_plan = context.metadata.get("research_plan", {})
+            if delegation:
+                delegation.update(status="completed", completed_at=datetime.now().isoformat())
             
-            # Prepare synthesis payload
-            synthesis_payload = {
-                "action": "synthesize_evidence",
-                "task_id": context.task_id,
-                "literature_results": context.search_results,
-                "research_plan": research_plan,  # Use the actual research plan
-                "synthesis_type": "comprehensive",
-                "include_citations": True
-            }
+            recorded = dag.record_result(delegation_id)
+            if recorded is None:
+                return {"workflow_continued": True, "ignored": delegation_id}
             
-            # Delegate to synthesis agent
-            delegation_result = await self.service.mcp_communicator.delegate_to_agent(
-                task_id=context.task_id,
-                agent_type="synthesis_review",
-                action_data=synthesis_payload
-            )
+            node_id, shard = recorded
+            await self.store.put_artifact(context.task_id, f"shard:{node_id}:{shard}", result)
+            if dag.states[node_id].status != "completed":
+                # More shards outstanding
+                await self._checkpoint(context)
+                await self._report_progress(context)
+                return {"workflow_continued": True, "waiting": node_id}
             
-            # Track delegation if successful
-            if delegation_result.get("delegated"):
-                delegation_id = f"synthesis_review_{delegation_result.get('delegation_id')}"
-                context.delegated_tasks[delegation_id] = {
-                    "agent_type": "synthesis_review",
-                    "task_id": delegation_result.get("delegation_id"),
-                    "action": "synthesize_evidence",
-                    "status": "in_progress",
-                    "started_at": datetime.now().isoformat()
-                }
-                context.metadata["synthesis_delegation_id"] = delegation_id
+            logger.info(f"Workflow node {node_id} completed for task {context.task_id}")
+            await self._store_node_result(context, dag, node_id)
             
-            logger.info(f"Synthesis delegation result: {delegation_result}")
+            if dag.is_complete:
+                return await self.complete_workflow(context)
             
-            return delegation_result
+            dispatched = await self._advance(context)
+            if dag.has_failed:
+                return await self._fail_workflow(context, f"Failed to delegate nodes after {node_id}")
             
-        except Exception as e:
-            logger.error(f"Failed to start synthesis: {e}")
             return {
-                "status": "failed",
-                "error": str(e)
+                "workflow_continued": True,
+                "completed_node": node_id,
+                "dispatched_nodes": dispatched,
+                "current_stage": context.stage.value
             }
-
-    async def continue_workflow_after_synthesis(self, context: ResearchContext, synthesis_results: Dict[str, Any]) -> Dict[str, Any]:
-        """Continue the research workflow after synthesis completion."""
-        try:
-            logger.info(f"Continuing workflow for task {context.task_id} after synthesis")
-            
-            # Store synthesis results
-            context.synthesis = synthesis_results.get("synthesis", "")
-            context.metadata["synthesis_completed"] = True
-            context.metadata["synthesis_results"] = synthesis_results
-            
-            # Move to systematic review stage
-            context.stage = ResearchStage.SYSTEMATIC_REVIEW
-            
-            # Start review process
-            review_result = await self._start_review(context)
-            
-            if review_result.get("delegated"):
-                context.metadata["review_delegated"] = True
-                context.metadata["review_delegation_id"] = review_result.get("delegation_id")
-                logger.info(f"Review delegated for task {context.task_id}")
-                
-                return {
-                    "workflow_continued": True,
-                    "current_stage": context.stage.value,
-                    "review_status": "delegated"
-                }
-            else:
-                logger.error(f"Failed to delegate review for task {context.task_id}")
-                return {
-                    "workflow_continued": False,
-                    "error": "Failed to delegate review"
-                }
-                
+        
         except Exception as e:
-            logger.error(f"Failed to continue workflow after synthesis: {e}")
+            logger.error(f"Failed to continue workflow for task {context.task_id}: {e}")
             return {
                 "workflow_continued": False,
                 "error": str(e)
             }
 
-    async def _start_review(self, context: ResearchContext) -> Dict[str, Any]:
-        """Start review of synthesized results."""
-        try:
-            if not self.service.mcp_communicator.mcp_connected:
-                logger.error("Cannot start review: MCP connection not available")
-                return {"status": "failed", "error": "MCP connection not available"}
-            
-            # Get the actual research plan from context metadata
-            research_plan = context.metadata.get("research_plan", {})
-            
-            # Prepare review payload
-            review_payload = {
-                "action": "screen_literature",
-                "task_id": context.task_id,
-                "literature_results": context.search_results,
-                "synthesis_results": context.synthesis,
-                "research_plan": research_plan,  # Use the actual research plan
-                "review_criteria": {
-                    "quality_assessment": True,
-                    "relevance_scoring": True,
-                    "bias_detection": True
-                }
-            }
-            
-            # Delegate to screening agent for review
-            delegation_result = await self.service.mcp_communicator.delegate_to_agent(
-                task_id=context.task_id,
-                agent_type="screening",
-                action_data=review_payload
-            )
-            
-            # Track delegation if successful
-            if delegation_result.get("delegated"):
-                delegation_id = f"screening_agent_{delegation_result.get('delegation_id')}"
-                context.delegated_tasks[delegation_id] = {
-                    "agent_type": "screening_agent",
-                    "task_id": delegation_result.get("delegation_id"),
-                    "action": "screen_literature",
-                    "status": "in_progress",
-                    "started_at": datetime.now().isoformat()
-                }
-                context.metadata["review_delegation_id"] = delegation_id
-            
-            logger.info(f"Review delegation result: {delegation_result}")
-            
-            return delegation_result
-            
-        except Exception as e:
-            logger.error(f"Failed to start review: {e}")
-            return {
-                "status": "failed",
-                "error": str(e)
-            }
+    async def _store_node_result(self, context: ResearchContext, dag: WorkflowDAG, node_id: str):
+        """Merge a completed node's shard results into its artifact and update the context."""
+        node = dag.nodes[node_id]
+        state = dag.states[node_id]
+        shard_results = [
+            self.store.get_artifact(context.task_id, f"shard:{node_id}:{shard}", {})
+            for shard in range(state.shard_count)
+        ]
+        result = shard_results[0] if len(shard_results) == 1 else WorkflowDAG.merge_shards(shard_results)
+        await self.store.put_artifact(context.task_id, f"node:{node_id}", result)
+        await self.store.delete_artifacts(context.task_id, f"shard:{node_id}:")
+        await self.store.delete_artifacts(context.task_id, f"payload:{node_id}:")
+        
+        # Records and synthesis are appended to artifacts, not held on the context
+        if node.agent_type == "literature":
+            await self.store.append_records(context.task_id, "search_results", result.get("records", []))
+        elif node.agent_type == "synthesis_review" and result.get("synthesis"):
+            await self.store.append_records(context.task_id, "synthesis", [str(result["synthesis"])])
+        
+        # A stage is complete once all of its nodes are
+        stage = STAGE_BY_AGENT.get(node.agent_type)
+        if stage and stage not in context.completed_stages and all(
+            dag.states[other].status == "completed"
+            for other, other_node in dag.nodes.items() if other_node.agent_type == node.agent_type
+        ):
+            context.completed_stages.append(stage)
+        context.updated_at = datetime.now()
+
+    async def _fail_workflow(self, context: ResearchContext, error: str) -> Dict[str, Any]:
+        if context.stage not in (ResearchStage.FAILED, ResearchStage.COMPLETE):
+            context.failed_stages.append(context.stage)
+        context.stage = ResearchStage.FAILED
+        context.metadata["workflow_error"] = error
+        context.updated_at = datetime.now()
+        await self._report_progress(context, "failed", error)
+        await self.discard_workflow(context.task_id)
+        await self.store.save(context)
+        return {
+            "workflow_continued": False,
+            "error": error
+        }
 
-    async def complete_workflow(self, context: ResearchContext, review_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def complete_workflow(self, context: ResearchContext) -> Dict[str, Any]:
         """Complete the research workflow."""
         try:
             logger.info(f"Completing workflow for task {context.task_id}")
             
-            # Store review results
+            dag = self.store.get_workflow(context.task_id)
+            node_results = {
+                node_id: self.store.get_artifact(context.task_id, f"node:{node_id}") for node_id in dag.order
+            }
+            
+            def results_of(agent_type: str) -> Dict[str, Any]:
+                return {node_id: result for node_id, result in node_results.items()
+                        if dag.nodes[node_id].agent_type == agent_type}
+            
+            review_results = node_results.get("review", {})
             context.metadata["review_completed"] = True
             context.metadata["review_results"] = review_results
             context.stage = ResearchStage.COMPLETE
@@ -318,14 +415,20 @@ class WorkflowOrchestrator:
             final_results = {
                 "task_id": context.task_id,
                 "workflow_status": "completed",
-                "stages_completed": ["literature_search", "synthesis", "review"],
-                "literature_results": context.metadata.get("literature_results", {}),
-                "synthesis_results": context.metadata.get("synthesis_results", {}),
+                "stages_completed": dag.order,
+                "literature_results": {
+                    "records": self.store.get_records(context.task_id, "search_results"),
+                    "searches": results_of("literature")
+                },
+                "synthesis_results": results_of("synthesis_review"),
                 "review_results": review_results,
                 "total_duration": (datetime.now() - context.created_at).total_seconds(),
                 "estimated_cost": context.estimated_cost
             }
             
+            await self._report_progress(context, "completed")
+            await self.discard_workflow(context.task_id)
+            await self.store.save(context)
             logger.info(f"Research workflow completed for task {context.task_id}")
             
             return {
@@ -333,14 +436,92 @@ class WorkflowOrchestrator:
                 "final_stage": context.stage.value,
                 "results": final_results
             }
-            
+        
         except Exception as e:
             logger.error(f"Failed to complete workflow: {e}")
             return {
                 "workflow_completed": False,
                 "error": str(e)
             }
-    
+
+    async def _report_progress(self, context: ResearchContext, status: str = "running", message: str = ""):
+        """Send the workflow's progress as a progress event for the execution.
+        
+        ``completed`` counts finished nodes plus the finished share of sharded
+        ones; ``delegations`` gives each outstanding delegation's share of a
+        node, so the gateway can weigh the agents' own progress events.
+        """
+        dag = self.store.get_workflow(context.task_id) if context.task_id in self.store else None
+        completed, total, delegations = 0.0, 0, {}
+        if dag is not None:
+            total = len(dag.nodes)
+            for state in dag.states.values():
+                if state.status == "completed":
+                    completed += 1
+                elif state.status == "running" and state.shard_count:
+                    completed += len(state.completed_shards) / state.shard_count
+                    delegations.update({
+                        delegation_id: 1 / state.shard_count
+                        for delegation_id, shard in state.delegations.items()
+                        if shard not in state.completed_shards
+                    })
+        
+        await self.service.mcp_communicator.send_progress(context.task_id, {
+            "stage": context.stage.value,
+            "status": status,
+            "completed": round(completed, 4),
+            "total": total,
+            "delegations": delegations,
+            "message": message
+        })
+
+    def workflow_progress(self, task_id: str) -> Optional[Dict[str, Any]]:
+        dag = self.store.get_workflow(task_id) if task_id in self.store else None
+        return dag.progress() if dag else None
+
+    async def discard_workflow(self, task_id: str):
+        """Forget a finished or cancelled workflow's DAG and intermediate artifacts."""
+        if task_id in self.store:
+            await self.store.delete_workflow(task_id)
+
+    async def _checkpoint(self, context: ResearchContext):
+        dag = self.store.get_workflow(context.task_id)
+        if dag is None:
+            return
+        try:
+            await self.store.save_workflow(context, dag)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.error(f"Failed to checkpoint workflow {context.task_id}: {e}")
+
+    async def resume_workflows(self) -> int:
+        """Pick up stored workflows where they stopped."""
+        resumed = 0
+        for task_id in self.store.workflow_ids():
+            try:
+                context = self.store[task_id]
+                dag = self.store.get_workflow(task_id)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Cannot resume workflow {task_id}: {e}")
+                continue
+            
+            # Resend shards without a result; delegation ids and idempotency keys are
+            # reused so the MCP server answers from the original task instead of rerunning it
+            for node_id in dag.order:
+                if dag.states[node_id].status != "running":
+                    continue
+                for delegation_id, shard in dag.outstanding(node_id):
+                    await self._dispatch_shard(context, dag, dag.nodes[node_id], shard, delegation_id=delegation_id)
+            
+            if dag.is_complete:
+                await self.complete_workflow(context)
+            else:
+                await self._advance(context)
+            
+            resumed += 1
+            logger.info(f"Resumed workflow {task_id} at stage {context.stage.value}: {dag.progress()['node_status']}")
+        
+        return resumed
+
     async def _estimate_research_costs(self, context: ResearchContext) -> float:
         """Estimate costs for a research task."""
         base_cost = 0.50
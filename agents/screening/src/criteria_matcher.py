@@ -0,0 +1,222 @@
+"""
+Compiled Screening Criteria Matcher for the Screening Agent
+
+Criteria keywords are compiled once into a phrase index keyed by token
+tuples. A record's text is tokenized with one translate and split, its
+tokens are intersected with the set of words that start a keyword, and
+only the positions found that way are looked up in the index. Each
+distinct word is stemmed once per matcher. The cost grows with the text
+length, not with the number of criteria and keywords.
+
+Matching rules:
+
+- Keywords match whole words and phrases ("trial" does not match
+  "trialist"); hyphens and punctuation separate words
+- With stemming, tokens and keywords are reduced by a light suffix
+  stemmer, so "randomised", "randomized" and "randomization" all match
+  "randomized", and singular and plural forms ("disease"/"diseases",
+  "bias"/"biases", "analysis"/"analyses") match each other. Only real
+  plural endings are undone, so "rats" does not match "rates"
+- A negation word ("no", "not", "without", "non", ...) negates the term
+  right after it, skipping filler words such as "any" or "evidence of"
+  for up to ``negation_window`` tokens. Keywords starting at that term
+  do not count as hits; they are reported as negated hits instead. In
+  "non-randomized controlled trial" "randomized" (and "randomized
+  controlled trial") are negated, "trial" is not
+
+``screen_batch`` is a module-level function so batches of records can be
+screened in a process pool.
+"""
+
+import string
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+# ASCII characters other than letters and digits separate tokens
+SEPARATORS = {code: " " for code in range(128) if chr(code) not in string.ascii_lowercase + string.digits}
+
+NEGATIONS = frozenset({
+    "no", "not", "non", "without", "never", "neither", "nor", "absence", "absent",
+    "excluding", "except", "lack", "lacking",
+})
+
+# Words between a negation and the term it negates ("no evidence of bias")
+NEGATION_FILLERS = frozenset({
+    "a", "an", "the", "any", "of", "for", "to", "be", "been", "being", "evidence", "sign", "signs", "history",
+})
+
+# Longest first; stripped only when at least MIN_STEM characters remain
+SUFFIXES = (
+    "isations", "izations", "isation", "ization", "nesses", "ments", "ment", "ness",
+    "ings", "ing", "ised", "ized", "ises", "izes", "ise", "ize", "ies", "ed", "ly", "is",
+)
+MIN_STEM = 3
+VOWELS = frozenset("aeiouy")
+
+# Singulars ending in -s whose plural adds -es; other -ses plurals drop only the -s
+ES_PLURALS = {
+    "bias": "biases", "alias": "aliases", "atlas": "atlases", "gas": "gases", "canvas": "canvases",
+    "virus": "viruses", "status": "statuses", "sinus": "sinuses", "fetus": "fetuses", "foetus": "foetuses",
+}
+ES_SINGULARS = {plural: singular for singular, plural in ES_PLURALS.items()}
+
+
+def tokenize(text: str) -> List[str]:
+    return text.lower().translate(SEPARATORS).split()
+
+
+def _singular(token: str) -> str:
+    """Undo a regular plural: -s after most letters, -es after s/x/z/ch/sh, -ses of -sis."""
+    if token in ES_PLURALS:
+        return token
+    if token in ES_SINGULARS:
+        return ES_SINGULARS[token]
+    if len(token) <= MIN_STEM or not token.endswith("s") or token.endswith(("ss", "us", "is", "ies")):
+        return token
+    if token.endswith("es"):
+        base = token[:-2]
+        if base.endswith(("ss", "x", "z", "ch", "sh")):
+            return base
+        if base.endswith(("ys", "es")):
+            # "analyses", "theses" and "hypotheses" are plurals of -sis
+            return base + "is"
+    return token[:-1]
+
+
+def _measure(token: str) -> int:
+    """Number of vowel-consonant sequences, as in the Porter stemmer."""
+    pattern = "".join("v" if char in VOWELS else "c" for char in token)
+    return pattern.count("vc")
+
+
+def _ends_cvc(token: str) -> bool:
+    """Consonant-vowel-consonant ending, the last not w/x/y ("rat", "cas")."""
+    return (len(token) >= 3 and token[-3] not in VOWELS and token[-2] in VOWELS
+            and token[-1] not in VOWELS and token[-1] not in "wxy")
+
+
+def stem(token: str) -> str:
+    """Light suffix stemmer; applied the same way to keywords and text."""
+    token = _singular(token)
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            token = token[:-len(suffix)] + ("y" if suffix == "ies" else "")
+            if suffix in ("ed", "ing", "ings"):
+                if token[-1] == token[-2] and token[-1] not in VOWELS:
+                    # "controlled" -> "control", "planning" -> "plan"
+                    token = token[:-1]
+                elif _measure(token) == 1 and _ends_cvc(token):
+                    # "rated" -> "rate", so it stays apart from "rat"
+                    token += "e"
+            break
+    # A final "e" goes only from longer stems ("include", "disease"); short
+    # ones keep it, so "rate" is not "rat" and "these" is not "thes(is)"
+    if token.endswith("e") and len(token) > MIN_STEM:
+        base = token[:-1]
+        if _measure(base) > 1 or (_measure(base) == 1 and not _ends_cvc(base)):
+            token = base
+    # Undouble a final consonant everywhere, so "controlled" and "control" agree
+    if len(token) > MIN_STEM and token[-1] == token[-2] and token[-1] not in VOWELS:
+        token = token[:-1]
+    return token
+
+
+class CriteriaMatcher:
+    """Inclusion/exclusion criteria compiled for repeated matching."""
+
+    def __init__(self, criteria: List[Dict[str, Any]], stemming: bool = True, negation_window: int = 3):
+        self.names = [criterion.get("name", "") for criterion in criteria]
+        self.types = [criterion.get("type", "include") for criterion in criteria]
+        self.stemming = stemming
+        self.negation_window = negation_window
+        # word -> stem, and the words whose stem starts a keyword
+        self._stems: Dict[str, str] = {}
+        self._start_words: Set[str] = set()
+
+        # token tuple -> indexes of the criteria listing that keyword
+        self.phrases: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
+        for index, criterion in enumerate(criteria):
+            for keyword in criterion.get("keywords", []):
+                phrase = tuple(self._normalize(tokenize(str(keyword))))
+                if phrase and index not in self.phrases.get(phrase, ()):
+                    self.phrases[phrase] = self.phrases.get(phrase, ()) + (index,)
+        self.max_phrase_length = max((len(phrase) for phrase in self.phrases), default=0)
+        self.first_tokens = frozenset(phrase[0] for phrase in self.phrases)
+
+    def __getstate__(self):
+        # Workers start with empty word caches
+        return dict(self.__dict__, _stems={}, _start_words=set())
+
+    def _normalize(self, tokens: List[str]) -> List[str]:
+        if not self.stemming:
+            return tokens
+        return [stem(token) for token in tokens]
+
+    def _learn_words(self, words: Set[str]):
+        for word in words:
+            stemmed = self._stems[word] = stem(word) if self.stemming else word
+            if stemmed in self.first_tokens:
+                self._start_words.add(word)
+
+    def match(self, text: str) -> Tuple[List[int], List[int]]:
+        """Indexes of the criteria matched by ``text``, and of those only matched under negation."""
+        if not self.phrases or not text:
+            return [], []
+        raw = tokenize(text)
+        words = set(raw)
+        unseen = words.difference(self._stems)
+        if unseen:
+            self._learn_words(unseen)
+        starts = self._start_words.intersection(words)
+        if not starts:
+            return [], []
+
+        stems = self._stems
+        phrases = self.phrases
+        max_length = self.max_phrase_length
+        negated_starts = self._negated_starts(raw) if self.negation_window and not NEGATIONS.isdisjoint(words) else ()
+        matched = set()
+        negated = set()
+        for start in [index for index, word in enumerate(raw) if word in starts]:
+            tokens = tuple(stems[word] for word in raw[start:start + max_length])
+            negation = start in negated_starts
+            for length in range(1, len(tokens) + 1):
+                indexes = phrases.get(tokens[:length])
+                if indexes is not None:
+                    (negated if negation else matched).update(indexes)
+        return sorted(matched), sorted(negated - matched)
+
+    def _negated_starts(self, raw: List[str]) -> Set[int]:
+        """Positions of the terms negated in ``raw``: the first non-filler word after each negation."""
+        negated_starts = set()
+        for position in [index for index, word in enumerate(raw) if word in NEGATIONS]:
+            start = position + 1
+            while start < len(raw) and start - position < self.negation_window and raw[start] in NEGATION_FILLERS:
+                start += 1
+            if start < len(raw) and raw[start] not in NEGATION_FILLERS:
+                negated_starts.add(start)
+        return negated_starts
+
+
+def screen_batch(matcher: CriteriaMatcher, texts: Sequence[str]) -> Dict[str, Any]:
+    """Match a batch of record texts; returns per-record matches and per-criterion hit counts."""
+    hits = [0] * len(matcher.names)
+    negated_hits = [0] * len(matcher.names)
+    matches = []
+    for text in texts:
+        matched, negated = matcher.match(text)
+        for index in matched:
+            hits[index] += 1
+        for index in negated:
+            negated_hits[index] += 1
+        matches.append(matched)
+    return {"matches": matches, "hits": hits, "negated_hits": negated_hits}
+
+
+def merge_batches(matcher: CriteriaMatcher, batches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Concatenate batch results in order and add up their hit counts."""
+    merged = {"matches": [], "hits": [0] * len(matcher.names), "negated_hits": [0] * len(matcher.names)}
+    for batch in batches:
+        merged["matches"].extend(batch["matches"])
+        merged["hits"] = [a + b for a, b in zip(merged["hits"], batch["hits"])]
+        merged["negated_hits"] = [a + b for a, b in zip(merged["negated_hits"], batch["negated_hits"])]
+    return merged
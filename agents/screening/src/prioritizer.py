@@ -0,0 +1,440 @@
+"""
+Screening Prioritization for the Screening Agent
+
+Records of a session's screening pool are ranked by how likely they are
+to be included, so reviewers and AI screeners see relevant records first:
+
+- Features are TF-IDF weights of the stemmed title/abstract words, plus
+  the record's embedding when one is supplied (the MiniLM vector the
+  literature pipeline computes for scoring)
+- An L2-regularized logistic regression is fitted on the title/abstract
+  decisions made so far; inclusions are up-weighted to balance the
+  classes. Each retrain starts from the previous weights, so only a few
+  passes are needed as decisions arrive
+- Before both an inclusion and an exclusion are known, records are
+  ranked by similarity to a seed query (the session's inclusion
+  criteria), or kept in arrival order
+
+Stopping: once prioritized, the records screened last are the best of
+what was left, so finding few relevant records among them is evidence
+that recall is high. ``recall_p_value`` tests "recall is below the
+target" against that sample, and screening can stop when the test rejects
+it at the configured confidence. The classifier's probabilities over the
+unscreened records (odds scaled back by the inclusion weight) are
+reported as a second recall estimate, but do not decide stopping: they
+are only as well calibrated as the model.
+
+Term counts are kept as flat index/value arrays (one entry per distinct
+word of a record), so scoring and training are a few numpy passes over
+the pool.
+"""
+
+import math
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from criteria_matcher import stem, tokenize
+
+# Before any training, scores are similarities rather than probabilities
+PRIOR_MODEL = "prior"
+LOGISTIC_MODEL = "logistic_regression"
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+def recall_p_value(sequence: np.ndarray, unscreened: int, target_recall: float, max_samples: int = 200) -> float:
+    """p-value of "recall is below ``target_recall``" given the labels in screening order.
+
+    The last n screened records are treated as a sample drawn without
+    replacement from the n + ``unscreened`` records left before them.
+    Under the hypothesis, at least ``floor(found / target_recall) + 1``
+    relevant records exist, so that many minus those found before the
+    sample were in that urn; the p-value is the hypergeometric probability
+    of seeing no more relevant records in the sample than were seen.
+    Records are screened best-ranked first, which only makes the sample
+    richer in relevant records than a random one, so the test errs on the
+    side of screening more. The smallest p-value over sample sizes is
+    returned, checking the sizes that end just before each of the last
+    relevant records and a geometric grid.
+    """
+    screened = len(sequence)
+    if screened == 0:
+        return 1.0
+    found = int(sequence.sum())
+    hypothesized = math.floor(found / target_recall) + 1
+    tail_hits = np.cumsum(sequence[::-1])
+
+    hit_offsets = np.flatnonzero(sequence[::-1])[:max_samples]
+    sizes = np.unique(np.concatenate([
+        hit_offsets[hit_offsets > 0],
+        np.geomspace(1, screened, num=min(screened, max_samples)).astype(np.int64),
+        [screened]
+    ]))
+
+    log_factorials = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, screened + unscreened + 1)))])
+
+    def log_choose(n, k):
+        return log_factorials[n] - log_factorials[k] - log_factorials[n - k]
+
+    best = 1.0
+    for size in sizes.tolist():
+        seen = int(tail_hits[size - 1])
+        urn = size + unscreened
+        relevant = hypothesized - (found - seen)
+        if relevant > urn:
+            return 0.0
+        outcomes = np.arange(max(0, size - (urn - relevant)), min(seen, relevant) + 1)
+        if len(outcomes) == 0:
+            return 0.0
+        log_terms = (log_choose(relevant, outcomes) + log_choose(urn - relevant, size - outcomes)
+                     - log_choose(urn, size))
+        best = min(best, float(np.exp(log_terms).sum()))
+    return best
+
+
+class ScreeningPrioritizer:
+    """Relevance ranking and stopping estimate for one session's screening pool."""
+
+    def __init__(self, stemming: bool = True, l2: float = 1e-3, learning_rate: float = 0.1,
+                 initial_epochs: int = 200, retrain_epochs: int = 50, max_positive_weight: float = 50.0):
+        self.stemming = stemming
+        self.l2 = l2
+        self.learning_rate = learning_rate
+        self.initial_epochs = initial_epochs
+        self.retrain_epochs = retrain_epochs
+        self.max_positive_weight = max_positive_weight
+
+        # Pool, in arrival order
+        self.record_ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.vocabulary: Dict[str, int] = {}
+        self._stems: Dict[str, str] = {}
+        self._chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._embedding_rows: Dict[int, np.ndarray] = {}
+        self.embedding_dim = 0
+
+        # Built lazily from the chunks: entry -> row, term and TF-IDF value
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._terms = np.zeros(0, dtype=np.int64)
+        self._values = np.zeros(0)
+        self._idf = np.zeros(0)
+        self._embeddings = np.zeros((0, 0))
+        self._built = True
+
+        # Title/abstract decisions: record id -> 1 (include) or 0 (exclude), in screening order
+        self.labels: Dict[str, int] = {}
+        self.pending_labels = 0
+
+        # Model
+        self.weights = np.zeros(0)
+        self.embedding_weights = np.zeros(0)
+        self.bias = 0.0
+        self.positive_weight = 1.0
+        self._moments: Optional[Dict[str, Any]] = None
+        self.trained = False
+        self.model_version = 0
+
+        # Records handed out in a batch and not decided yet: record id -> lease expiry
+        self.leases: Dict[str, float] = {}
+
+    # Pool
+
+    def _word_stem(self, word: str) -> str:
+        stemmed = self._stems.get(word)
+        if stemmed is None:
+            stemmed = self._stems[word] = stem(word) if self.stemming else word
+        return stemmed
+
+    def add_records(self, records: Iterable[Tuple[str, str, Any]]) -> int:
+        """Add (record_id, text, embedding or None) entries; known record ids are skipped.
+
+        Embeddings may be sequences of floats or float32 bytes; rows
+        whose dimension differs from the first embedding are ignored.
+        Returns the number of records added.
+        """
+        rows, terms, counts = [], [], []
+        added = 0
+        for record_id, text, embedding in records:
+            record_id = str(record_id)
+            if record_id in self.positions:
+                continue
+            row = len(self.record_ids)
+            self.positions[record_id] = row
+            self.record_ids.append(record_id)
+            added += 1
+
+            frequencies: Dict[int, int] = {}
+            for word in tokenize(text or ""):
+                term = self.vocabulary.setdefault(self._word_stem(word), len(self.vocabulary))
+                frequencies[term] = frequencies.get(term, 0) + 1
+            rows.extend([row] * len(frequencies))
+            terms.extend(frequencies)
+            counts.extend(frequencies.values())
+
+            if embedding is not None:
+                vector = (np.frombuffer(embedding, dtype=np.float32) if isinstance(embedding, (bytes, bytearray))
+                          else np.asarray(embedding, dtype=np.float32))
+                if not self.embedding_dim:
+                    self.embedding_dim = len(vector)
+                if len(vector) == self.embedding_dim:
+                    self._embedding_rows[row] = vector
+
+        if added:
+            self._chunks.append((
+                np.asarray(rows, dtype=np.int64),
+                np.asarray(terms, dtype=np.int64),
+                np.asarray(counts, dtype=np.float64)
+            ))
+            self._built = False
+        return added
+
+    def __len__(self) -> int:
+        return len(self.record_ids)
+
+    def _build(self):
+        """Recompute TF-IDF values over the whole pool after records were added."""
+        if self._built:
+            return
+        if len(self._chunks) > 1:
+            self._chunks = [tuple(np.concatenate(parts) for parts in zip(*self._chunks))]
+        rows, terms, counts = self._chunks[0]
+        n_records, n_terms = len(self.record_ids), len(self.vocabulary)
+
+        document_frequency = np.bincount(terms, minlength=n_terms)
+        self._idf = np.log((1.0 + n_records) / (1.0 + document_frequency)) + 1.0
+        values = (1.0 + np.log(counts)) * self._idf[terms]
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=n_records))
+        self._rows, self._terms = rows, terms
+        self._values = values / np.where(norms > 0, norms, 1.0)[rows]
+
+        if self.embedding_dim:
+            embeddings = np.zeros((n_records, self.embedding_dim))
+            for row, vector in self._embedding_rows.items():
+                embeddings[row] = vector
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            self._embeddings = embeddings / np.where(norms > 0, norms, 1.0)
+        else:
+            self._embeddings = np.zeros((n_records, 0))
+
+        # New words and a first embedding start with zero weight
+        self.weights = np.concatenate([self.weights, np.zeros(n_terms - len(self.weights))])
+        if len(self.embedding_weights) != self.embedding_dim:
+            self.embedding_weights = np.zeros(self.embedding_dim)
+        self._moments = None
+        self._built = True
+
+    # Decisions
+
+    def set_labels(self, labels: Iterable[Tuple[str, str]]):
+        """Apply (record_id, decision) pairs in decision order; "unsure" clears a label.
+
+        A revised record keeps its place in the screening order.
+        """
+        for record_id, decision in labels:
+            record_id = str(record_id)
+            self.leases.pop(record_id, None)
+            if decision == "include":
+                self.labels[record_id] = 1
+            elif decision == "exclude":
+                self.labels[record_id] = 0
+            else:
+                self.labels.pop(record_id, None)
+            self.pending_labels += 1
+
+    def _label_vector(self) -> np.ndarray:
+        """Per row: 1 or 0 for decided records, -1 for unscreened ones."""
+        labels = np.full(len(self.record_ids), -1, dtype=np.int8)
+        for record_id, label in self.labels.items():
+            row = self.positions.get(record_id)
+            if row is not None:
+                labels[row] = label
+        return labels
+
+    # Model
+
+    def _margins(self) -> np.ndarray:
+        """Linear scores for every record in the pool."""
+        margins = np.bincount(self._rows, weights=self._values * self.weights[self._terms],
+                              minlength=len(self.record_ids))
+        if self.embedding_dim:
+            margins += self._embeddings @ self.embedding_weights
+        return margins + self.bias
+
+    def train(self) -> bool:
+        """Fit the classifier on the decisions so far; False until both classes are present."""
+        self._build()
+        labels = self._label_vector()
+        labeled = labels >= 0
+        y = labels[labeled].astype(np.float64)
+        positives = y.sum()
+        if positives == 0 or positives == len(y):
+            return False
+
+        entries = labeled[self._rows]
+        compact = np.cumsum(labeled) - 1
+        entry_rows = compact[self._rows[entries]]
+        terms, values = self._terms[entries], self._values[entries]
+        embeddings = self._embeddings[labeled]
+        size = len(y)
+
+        # Balance the classes, so the few early inclusions are not drowned out
+        self.positive_weight = max(1.0, min(self.max_positive_weight, (size - positives) / positives))
+        sample_weights = np.where(y == 1, self.positive_weight, 1.0)
+        sample_weights /= sample_weights.sum()
+
+        # Adam on the full labeled set, warm-started from the previous fit
+        if self._moments is None:
+            self._moments = {
+                "weights": (np.zeros_like(self.weights), np.zeros_like(self.weights)),
+                "embedding_weights": (np.zeros_like(self.embedding_weights), np.zeros_like(self.embedding_weights)),
+                "bias": (np.zeros(1), np.zeros(1)),
+                "step": 0
+            }
+        moments = self._moments
+        beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+        epochs = self.retrain_epochs if self.trained else self.initial_epochs
+        bias = np.array([self.bias])
+        for _ in range(epochs):
+            margins = np.bincount(entry_rows, weights=values * self.weights[terms], minlength=size)
+            if self.embedding_dim:
+                margins += embeddings @ self.embedding_weights
+            errors = (_sigmoid(margins + bias[0]) - y) * sample_weights
+
+            gradients = {
+                "weights": np.bincount(terms, weights=values * errors[entry_rows], minlength=len(self.weights))
+                + self.l2 * self.weights,
+                "embedding_weights": embeddings.T @ errors + self.l2 * self.embedding_weights,
+                "bias": np.array([errors.sum()])
+            }
+            moments["step"] += 1
+            step = moments["step"]
+            scale = self.learning_rate * math.sqrt(1 - beta2 ** step) / (1 - beta1 ** step)
+            for name, parameter in (("weights", self.weights), ("embedding_weights", self.embedding_weights),
+                                    ("bias", bias)):
+                first, second = moments[name]
+                first *= beta1
+                first += (1 - beta1) * gradients[name]
+                second *= beta2
+                second += (1 - beta2) * gradients[name] ** 2
+                parameter -= scale * first / (np.sqrt(second) + epsilon)
+
+        self.bias = float(bias[0])
+        self.trained = True
+        self.pending_labels = 0
+        self.model_version += 1
+        return True
+
+    def _prior_scores(self, query: str) -> np.ndarray:
+        """Cosine similarity of each record's TF-IDF vector to the query's."""
+        query_weights = np.zeros(len(self.vocabulary))
+        for word in tokenize(query or ""):
+            term = self.vocabulary.get(self._word_stem(word))
+            if term is not None:
+                query_weights[term] += self._idf[term]
+        norm = np.linalg.norm(query_weights)
+        if norm == 0:
+            return np.zeros(len(self.record_ids))
+        return np.bincount(self._rows, weights=self._values * query_weights[self._terms] / norm,
+                           minlength=len(self.record_ids))
+
+    def scores(self, query: str = "", retrain_every: int = 1) -> Tuple[np.ndarray, str]:
+        """Relevance scores for every record in the pool, and the model that produced them.
+
+        The classifier is retrained first when at least ``retrain_every``
+        decisions arrived since the last fit. Probabilities are corrected
+        for the inclusion weight, which multiplies the fitted odds.
+        """
+        self._build()
+        if self.pending_labels >= max(1, retrain_every) or (self.labels and not self.trained):
+            self.train()
+        if self.trained:
+            return _sigmoid(self._margins() - math.log(self.positive_weight)), LOGISTIC_MODEL
+        return self._prior_scores(query), PRIOR_MODEL
+
+    # Queue
+
+    def next_batch(self, size: int, query: str = "", lease_seconds: float = 0,
+                   retrain_every: int = 1) -> Tuple[List[Dict[str, Any]], np.ndarray, str]:
+        """The ``size`` highest-ranked unscreened records not leased to another batch.
+
+        Returned records are leased for ``lease_seconds``. Also returns all
+        scores and the model name, for the stopping estimate.
+        """
+        scores, model = self.scores(query, retrain_every)
+        now = time.monotonic()
+        self.leases = {record_id: expiry for record_id, expiry in self.leases.items() if expiry > now}
+
+        available = self._label_vector() < 0
+        for record_id in self.leases:
+            row = self.positions.get(record_id)
+            if row is not None:
+                available[row] = False
+        candidates = np.flatnonzero(available)
+        if size < len(candidates):
+            top = np.argpartition(-scores[candidates], size - 1)[:size]
+            candidates = candidates[top]
+        # Highest score first, earlier arrival among equal scores
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+        batch = []
+        for rank, row in enumerate(candidates.tolist(), start=1):
+            record_id = self.record_ids[row]
+            if lease_seconds > 0:
+                self.leases[record_id] = now + lease_seconds
+            batch.append({"record_id": record_id, "rank": rank, "score": float(scores[row])})
+        return batch, scores, model
+
+    def stopping(self, scores: np.ndarray, model: str, target_recall: float, confidence: float,
+                 min_screened: int) -> Dict[str, Any]:
+        """Whether screening can stop, having reached ``target_recall`` with ``confidence``.
+
+        The decision rests on the hypergeometric test of ``recall_p_value``
+        over the screening order; the classifier's recall estimate is
+        reported alongside.
+        """
+        sequence = np.array([label for record_id, label in self.labels.items() if record_id in self.positions],
+                            dtype=np.int64)
+        screened = len(sequence)
+        found = int(sequence.sum())
+        unscreened = len(self.record_ids) - screened
+        hits = np.flatnonzero(sequence)
+        p_value = recall_p_value(sequence, unscreened, target_recall)
+
+        expected_remaining = None
+        estimated_recall = None
+        if model == LOGISTIC_MODEL:
+            expected_remaining = float(scores[self._label_vector() < 0].sum())
+            estimated_recall = found / (found + expected_remaining) if found + expected_remaining > 0 else 1.0
+
+        return {
+            "pool_size": len(self.record_ids),
+            "screened": screened,
+            "unscreened": unscreened,
+            "relevant_found": found,
+            "irrelevant_streak": int(screened - 1 - hits[-1]) if len(hits) else screened,
+            "target_recall": target_recall,
+            "p_value": p_value,
+            "expected_relevant_remaining": expected_remaining,
+            "estimated_recall": estimated_recall,
+            "should_stop": bool(
+                screened >= min(min_screened, len(self.record_ids))
+                and (unscreened == 0 or p_value < 1 - confidence)
+            )
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "model": LOGISTIC_MODEL if self.trained else PRIOR_MODEL,
+            "model_version": self.model_version,
+            "pool_size": len(self.record_ids),
+            "vocabulary_size": len(self.vocabulary),
+            "embedding_dim": self.embedding_dim,
+            "records_with_embeddings": len(self._embedding_rows),
+            "labels": len(self.labels),
+            "pending_labels": self.pending_labels,
+            "leased": len(self.leases)
+        }
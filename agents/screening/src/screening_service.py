@@ -7,6 +7,7 @@ This module provides a containerized Screening & PRISMA Agent that handles:
 - Literature record filtering
 - Inclusion/exclusion criteria application
 - PRISMA flowchart generation
+- Prioritized screening (relevance-ranked batches with a recall estimate)
 
 ARCHITECTURE COMPLIANCE:
 - ONLY exposes health check API endpoint (/health)
@@ -15,20 +16,29 @@ ARCHITECTURE COMPLIANCE:
 """
 
 import asyncio
+import hashlib
 import json
 import logging
+import os
 import uuid
 import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Literal, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Literal, Tuple, Union
 
+import numpy as np
 import uvicorn
 import websockets
 from fastapi import FastAPI
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
+from criteria_matcher import CriteriaMatcher, merge_batches, screen_batch
+from prioritizer import ScreeningPrioritizer
+from screening_store import ScreeningStore
+
 # Import the standardized health check service
 sys.path.append(str(Path(__file__).parent.parent))
 from health_check_service import create_health_check_app
@@ -108,15 +118,47 @@ class ScreeningService:
         self.service_port = config.get("service_port", 8004)
         self.mcp_server_url = config.get("mcp_server_url", "ws://mcp-server:9000")
         
+        # Criteria matching configuration
+        screening_config = config.get("screening", {})
+        self.stemming = screening_config.get("stemming", True)
+        self.negation_window = screening_config.get("negation_window", 3)
+        self.screening_batch_size = screening_config.get("batch_size", 2000)
+        self.screening_workers = screening_config.get("max_workers") or os.cpu_count() or 1
+        self.max_compiled_criteria = screening_config.get("max_compiled_criteria", 32)
+        
         # MCP connection
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.mcp_connected = False
         self.should_run = True
         
-        # Screening data storage
+        # Screening data storage: decisions and PRISMA counters live in the store,
+        # sessions are loaded from it on startup
+        prisma_config = config.get("prisma", {})
+        self.store = ScreeningStore(prisma_config.get("store_path", "/app/data/screening.db"))
+        self.decision_page_size = prisma_config.get("decision_page_size", 1000)
         self.sessions: Dict[str, PRISMASession] = {}
-        self.screening_decisions: Dict[str, List[ScreeningDecision]] = {}
-        self.flowchart_data: Dict[str, PRISMAFlowchartData] = {}
+        for stored in self.store.load_sessions():
+            session = PRISMASession(stored["session_id"], stored["lit_review_id"],
+                                    [self._criteria_from_dict(c) for c in stored["criteria"]])
+            session.created_at = stored["created_at"]
+            session.updated_at = stored["updated_at"]
+            self.sessions[session.session_id] = session
+        
+        # Prioritized screening: rankers by session, rebuilt from the store's pool when evicted
+        prioritization_config = config.get("prioritization", {})
+        self.priority_batch_size = prioritization_config.get("batch_size", 25)
+        self.target_recall = prioritization_config.get("target_recall", 0.95)
+        self.stopping_confidence = prioritization_config.get("stopping_confidence", 0.95)
+        self.min_screened = prioritization_config.get("min_screened", 100)
+        self.lease_seconds = prioritization_config.get("lease_seconds", 900)
+        self.retrain_every = prioritization_config.get("retrain_every", 1)
+        self.l2_penalty = prioritization_config.get("l2_penalty", 1e-3)
+        self.max_prioritizers = prioritization_config.get("max_sessions", 8)
+        self.prioritizers: "OrderedDict[str, ScreeningPrioritizer]" = OrderedDict()
+        
+        # Compiled criteria by fingerprint, and the pool screening large batches
+        self.compiled_criteria: "OrderedDict[str, CriteriaMatcher]" = OrderedDict()
+        self.process_pool: Optional[ProcessPoolExecutor] = None
         
         # Task processing queue
         self.task_queue = asyncio.Queue()
@@ -131,7 +173,9 @@ class ScreeningService:
             "generate_prisma_flowchart",
             "validate_prisma_compliance",
             "track_screening_decisions",
-            "manage_screening_sessions"
+            "record_screening_decisions",
+            "manage_screening_sessions",
+            "prioritize_screening"
         ]
         
         logger.info(f"Screening Agent Service initialized on port {self.service_port}")
@@ -163,6 +207,12 @@ class ScreeningService:
             if self.websocket:
                 await self.websocket.close()
             
+            if self.process_pool:
+                self.process_pool.shutdown(wait=False, cancel_futures=True)
+                self.process_pool = None
+            
+            self.store.close()
+            
             logger.info("Screening Agent Service stopped")
             
         except Exception as e:
@@ -292,8 +342,12 @@ class ScreeningService:
                     return await self._handle_validate_prisma_compliance(data)
                 elif task_type == "track_screening_decisions":
                     return await self._handle_track_screening_decisions(data)
+                elif task_type == "record_screening_decisions":
+                    return await self._handle_record_screening_decisions(data)
                 elif task_type == "manage_screening_sessions":
                     return await self._handle_manage_screening_sessions(data)
+                elif task_type == "prioritize_screening":
+                    return await self._handle_prioritize_screening(data)
                 else:
                     return {
                         "status": "failed",
@@ -326,6 +380,7 @@ class ScreeningService:
             criteria = data.get("criteria", [])
             stage = data.get("stage", "title_abstract")
             session_id = data.get("session_id")
+            matching = data.get("matching", {})
             
             if not records:
                 return {
@@ -334,32 +389,69 @@ class ScreeningService:
                     "timestamp": datetime.now().isoformat()
                 }
             
+            started = datetime.now()
+            
+            async def report(screened: int, total: int):
+                elapsed = (datetime.now() - started).total_seconds()
+                eta = elapsed / screened * (total - screened) if screened else None
+                await self._send_progress(data, "screening", screened, total,
+                                          f"Screened {screened} of {total} records", eta_seconds=eta)
+            
             # Perform screening
-            screening_results = await self._screen_records(records, criteria, stage)
+            await self._send_progress(data, "screening", 0, len(records), f"Screening {len(records)} records")
+            screening_results, criteria_hits = await self._screen_records(records, criteria, stage, matching, report)
             
             # Store decisions if session ID provided
             if session_id:
-                if session_id not in self.screening_decisions:
-                    self.screening_decisions[session_id] = []
-                self.screening_decisions[session_id].extend(screening_results)
+                self.store.append_decisions(session_id, [self._decision_to_dict(d) for d in screening_results])
+                self._update_prioritizer(session_id, screening_results)
             
-            return {
+            result = {
                 "status": "completed",
                 "session_id": session_id,
                 "stage": stage,
                 "screening_results": [self._decision_to_dict(decision) for decision in screening_results],
                 "total_screened": len(screening_results),
+                "criteria_hits": criteria_hits,
                 "timestamp": datetime.now().isoformat()
             }
+            await self._send_progress(data, "screening", len(records), len(records),
+                                      f"Screened {len(records)} records", status="completed")
+            return result
             
         except Exception as e:
             logger.error(f"Failed to screen literature: {e}")
+            await self._send_progress(data, "screening", 0, len(data.get("records", [])), str(e), status="failed")
             return {
                 "status": "failed",
                 "error": str(e),
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def _send_progress(self, data: Dict[str, Any], stage: str, completed: int, total: int,
+                             message: str = "", status: str = "running", eta_seconds: Optional[float] = None):
+        """Report progress of a task delegated by a research execution; best effort."""
+        execution_id = data.get("original_task_id")
+        if not execution_id or not self.websocket or not self.mcp_connected:
+            return
+        
+        try:
+            await self.websocket.send(json.dumps({
+                "type": "progress_event",
+                "execution_id": execution_id,
+                "task_id": data.get("delegation_id"),
+                "agent_type": self.agent_type,
+                "stage": stage,
+                "status": status,
+                "completed": completed,
+                "total": total,
+                "eta_seconds": eta_seconds,
+                "message": message,
+                "timestamp": datetime.now().isoformat()
+            }))
+        except Exception as e:
+            logger.warning(f"Failed to send progress for execution {execution_id}: {e}")
+    
     async def _handle_apply_criteria(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle criteria application request."""
         try:
@@ -374,7 +466,7 @@ class ScreeningService:
                 }
             
             # Apply criteria to record
-            decision = await self._apply_criteria_to_record(record, criteria)
+            decision = await self._apply_criteria_to_record(record, criteria, matching=data.get("matching", {}))
             
             return {
                 "status": "completed",
@@ -404,7 +496,7 @@ class ScreeningService:
                 }
             
             # Generate flowchart data
-            flowchart_data = await self._generate_flowchart_data(session_id)
+            flowchart_data = await self._generate_flowchart_data(session_id, data.get("as_of"))
             
             return {
                 "status": "completed",
@@ -434,7 +526,7 @@ class ScreeningService:
                 }
             
             # Validate compliance
-            compliance_result = await self._validate_compliance(session_id)
+            compliance_result = await self._validate_compliance(session_id, data.get("as_of"))
             
             return {
                 "status": "completed",
@@ -463,23 +555,33 @@ class ScreeningService:
                     "timestamp": datetime.now().isoformat()
                 }
             
-            # Get screening decisions
-            decisions = self.screening_decisions.get(session_id, [])
+            # Statistics come from the maintained counters
+            counts: Dict[str, int] = {"include": 0, "exclude": 0, "unsure": 0}
+            for (_, decision, _), count in self.store.counters(session_id, data.get("as_of")).items():
+                counts[decision] = counts.get(decision, 0) + count
             
-            # Calculate statistics
-            total_decisions = len(decisions)
-            include_count = sum(1 for d in decisions if d.decision == "include")
-            exclude_count = sum(1 for d in decisions if d.decision == "exclude")
-            unsure_count = sum(1 for d in decisions if d.decision == "unsure")
+            # Decisions are paged out of the store
+            limit = data.get("limit", self.decision_page_size)
+            offset = data.get("offset", 0)
+            decisions = self.store.get_decisions(
+                session_id,
+                limit=limit,
+                offset=offset,
+                record_id=data.get("record_id"),
+                include_history=data.get("include_history", False)
+            )
             
             return {
                 "status": "completed",
                 "session_id": session_id,
-                "total_decisions": total_decisions,
-                "include_count": include_count,
-                "exclude_count": exclude_count,
-                "unsure_count": unsure_count,
-                "decisions": [self._decision_to_dict(d) for d in decisions],
+                "total_decisions": sum(counts.values()),
+                "include_count": counts["include"],
+                "exclude_count": counts["exclude"],
+                "unsure_count": counts["unsure"],
+                "decisions": [self._row_to_dict(row) for row in decisions],
+                "limit": limit,
+                "offset": offset,
+                "last_seq": self.store.last_seq(session_id),
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -491,6 +593,55 @@ class ScreeningService:
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def _handle_record_screening_decisions(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle decisions made outside the agent (reviewers, LLM screeners) or revisions."""
+        try:
+            session_id = data.get("session_id", "")
+            decisions = data.get("decisions", [])
+            
+            if not session_id or not decisions:
+                return {
+                    "status": "failed",
+                    "error": "Session ID and decisions are required",
+                    "timestamp": datetime.now().isoformat()
+                }
+            
+            screening_decisions = []
+            for item in decisions:
+                if "record_id" not in item or item.get("decision") not in ("include", "exclude", "unsure"):
+                    return {
+                        "status": "failed",
+                        "error": f"Invalid decision: {item}",
+                        "timestamp": datetime.now().isoformat()
+                    }
+                screening_decisions.append(ScreeningDecision(
+                    record_id=str(item["record_id"]),
+                    stage="full_text" if item.get("stage") == "full_text" else "title_abstract",
+                    decision=item["decision"],
+                    reason=item.get("reason", "Manual decision"),
+                    confidence=float(item.get("confidence", 1.0))
+                ))
+            
+            revisions = self.store.append_decisions(session_id, [self._decision_to_dict(d) for d in screening_decisions])
+            self._update_prioritizer(session_id, screening_decisions)
+            
+            return {
+                "status": "completed",
+                "session_id": session_id,
+                "recorded": len(screening_decisions),
+                "revisions": revisions,
+                "last_seq": self.store.last_seq(session_id),
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to record screening decisions: {e}")
+            return {
+                "status": "failed",
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+    
     async def _handle_manage_screening_sessions(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle screening session management request."""
         try:
@@ -522,57 +673,267 @@ class ScreeningService:
                 "timestamp": datetime.now().isoformat()
             }
     
-    async def _screen_records(self, records: List[Dict[str, Any]], criteria: List[Dict[str, Any]], 
-                            stage: str) -> List[ScreeningDecision]:
-        """Screen a list of records against criteria."""
-        decisions = []
+    async def _handle_prioritize_screening(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle prioritized screening: add records to a session's pool, hand out the next batch, report status."""
+        try:
+            operation = data.get("operation", "")
+            session_id = data.get("session_id", "")
+            
+            if not session_id:
+                return {
+                    "status": "failed",
+                    "error": "Session ID is required",
+                    "timestamp": datetime.now().isoformat()
+                }
+            
+            if operation == "add_records":
+                return await self._add_pool_records(session_id, data.get("records", []))
+            elif operation == "next_batch":
+                return await self._next_screening_batch(session_id, data)
+            elif operation == "status":
+                return await self._prioritization_status(session_id, data)
+            else:
+                return {
+                    "status": "failed",
+                    "error": f"Unknown operation: {operation}",
+                    "available_operations": ["add_records", "next_batch", "status"],
+                    "timestamp": datetime.now().isoformat()
+                }
+                
+        except Exception as e:
+            logger.error(f"Failed to prioritize screening: {e}")
+            return {
+                "status": "failed",
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+    
+    async def _add_pool_records(self, session_id: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add records to a session's screening pool; records may carry an "embedding" vector."""
+        if not records:
+            return {
+                "status": "failed",
+                "error": "Records are required",
+                "timestamp": datetime.now().isoformat()
+            }
         
+        entries = []
         for record in records:
-            decision = await self._apply_criteria_to_record(record, criteria, stage)
-            decisions.append(decision)
+            if "id" not in record:
+                return {
+                    "status": "failed",
+                    "error": f"Record without id: {record.get('title', '')}",
+                    "timestamp": datetime.now().isoformat()
+                }
+            embedding = record.get("embedding")
+            entries.append((
+                str(record["id"]),
+                self._record_text(record),
+                np.asarray(embedding, dtype=np.float32).tobytes() if embedding else None
+            ))
+        
+        added = self.store.add_pool_records(session_id, entries)
+        prioritizer = self.prioritizers.get(session_id)
+        if prioritizer is not None:
+            await asyncio.to_thread(prioritizer.add_records, entries)
+        
+        return {
+            "status": "completed",
+            "session_id": session_id,
+            "added": added,
+            "pool_size": self.store.pool_size(session_id),
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    async def _next_screening_batch(self, session_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Hand out the highest-ranked unscreened records, with the stopping estimate."""
+        prioritizer = await self._get_prioritizer(session_id)
+        if not len(prioritizer):
+            return {
+                "status": "failed",
+                "error": f"Screening pool of session {session_id} is empty",
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        batch, scores, model = await asyncio.to_thread(
+            prioritizer.next_batch,
+            int(data.get("batch_size", self.priority_batch_size)),
+            self._seed_query(session_id, data),
+            float(data.get("lease_seconds", self.lease_seconds)),
+            self.retrain_every
+        )
         
-        return decisions
+        return {
+            "status": "completed",
+            "session_id": session_id,
+            "batch": batch,
+            "model": prioritizer.summary(),
+            "stopping": prioritizer.stopping(
+                scores, model,
+                float(data.get("target_recall", self.target_recall)),
+                float(data.get("confidence", self.stopping_confidence)),
+                int(data.get("min_screened", self.min_screened))
+            ),
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    async def _prioritization_status(self, session_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Report the model and stopping estimate without handing out records."""
+        prioritizer = await self._get_prioritizer(session_id)
+        scores, model = await asyncio.to_thread(
+            prioritizer.scores, self._seed_query(session_id, data), self.retrain_every
+        )
+        
+        return {
+            "status": "completed",
+            "session_id": session_id,
+            "model": prioritizer.summary(),
+            "stopping": prioritizer.stopping(
+                scores, model,
+                float(data.get("target_recall", self.target_recall)),
+                float(data.get("confidence", self.stopping_confidence)),
+                int(data.get("min_screened", self.min_screened))
+            ),
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    async def _get_prioritizer(self, session_id: str) -> ScreeningPrioritizer:
+        """Cached ranker for a session, rebuilt from its stored pool and decisions when missing."""
+        prioritizer = self.prioritizers.get(session_id)
+        if prioritizer is None:
+            prioritizer = ScreeningPrioritizer(stemming=self.stemming, l2=self.l2_penalty)
+            await asyncio.to_thread(prioritizer.add_records, list(self.store.load_pool(session_id)))
+            prioritizer.set_labels(self.store.current_labels(session_id))
+            self.prioritizers[session_id] = prioritizer
+            while len(self.prioritizers) > self.max_prioritizers:
+                self.prioritizers.popitem(last=False)
+        else:
+            self.prioritizers.move_to_end(session_id)
+        return prioritizer
+    
+    def _update_prioritizer(self, session_id: str, decisions: List[ScreeningDecision]):
+        """Feed new title/abstract decisions to a cached ranker; uncached ones read them from the store."""
+        prioritizer = self.prioritizers.get(session_id)
+        if prioritizer is not None:
+            prioritizer.set_labels(
+                (decision.record_id, decision.decision) for decision in decisions
+                if decision.stage == "title_abstract"
+            )
+    
+    def _seed_query(self, session_id: str, data: Dict[str, Any]) -> str:
+        """Text ranking records before the classifier can be trained: the request's query or the inclusion criteria."""
+        if data.get("query"):
+            return str(data["query"])
+        session = self.sessions.get(session_id)
+        if not session:
+            return ""
+        return " ".join(f"{c.name} {c.description}" for c in session.criteria if c.type == "include")
+    
+    def _get_matcher(self, criteria: List[Dict[str, Any]], matching: Optional[Dict[str, Any]] = None) -> CriteriaMatcher:
+        """Compiled matcher for a criteria set, reused across requests of a session."""
+        matching = matching or {}
+        stemming = matching.get("stemming", self.stemming)
+        negation_window = matching.get("negation_window", self.negation_window)
+        fingerprint = hashlib.sha256(
+            json.dumps([criteria, stemming, negation_window], sort_keys=True, default=str).encode()
+        ).hexdigest()
+        
+        matcher = self.compiled_criteria.get(fingerprint)
+        if matcher is None:
+            matcher = CriteriaMatcher(criteria, stemming=stemming, negation_window=negation_window)
+            self.compiled_criteria[fingerprint] = matcher
+            while len(self.compiled_criteria) > self.max_compiled_criteria:
+                self.compiled_criteria.popitem(last=False)
+        else:
+            self.compiled_criteria.move_to_end(fingerprint)
+        return matcher
+    
+    @staticmethod
+    def _record_text(record: Dict[str, Any]) -> str:
+        return f"{record.get('title') or ''} {record.get('abstract') or ''}"
+    
+    async def _screen_records(self, records: List[Dict[str, Any]], criteria: List[Dict[str, Any]], 
+                            stage: str, matching: Optional[Dict[str, Any]] = None,
+                            progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+                            ) -> Tuple[List[ScreeningDecision], Dict[str, Any]]:
+        """Screen a list of records against criteria.
+        
+        Large record lists are split into batches matched in a process pool;
+        ``progress`` is awaited with the records screened so far as each
+        batch finishes. Returns the decisions and, per criterion, how many
+        records it matched.
+        """
+        matcher = self._get_matcher(criteria, matching)
+        texts = [self._record_text(record) for record in records]
+        
+        batch_size = max(1, self.screening_batch_size)
+        if len(texts) <= batch_size or self.screening_workers <= 1:
+            result = screen_batch(matcher, texts)
+        else:
+            if self.process_pool is None:
+                self.process_pool = ProcessPoolExecutor(max_workers=self.screening_workers)
+            loop = asyncio.get_running_loop()
+            screened = 0
+            
+            async def run_batch(batch: List[str]) -> Dict[str, Any]:
+                nonlocal screened
+                result = await loop.run_in_executor(self.process_pool, screen_batch, matcher, batch)
+                screened += len(batch)
+                if progress:
+                    await progress(screened, len(texts))
+                return result
+            
+            batches = await asyncio.gather(*[
+                run_batch(texts[start:start + batch_size]) for start in range(0, len(texts), batch_size)
+            ])
+            result = merge_batches(matcher, batches)
+        
+        decisions = [
+            self._make_decision(record, matcher, matched, stage)
+            for record, matched in zip(records, result["matches"])
+        ]
+        criteria_hits = {
+            "hits": dict(zip(matcher.names, result["hits"])),
+            "negated_hits": dict(zip(matcher.names, result["negated_hits"]))
+        }
+        return decisions, criteria_hits
     
     async def _apply_criteria_to_record(self, record: Dict[str, Any], criteria: List[Dict[str, Any]], 
-                                      stage: str = "title_abstract") -> ScreeningDecision:
+                                      stage: str = "title_abstract",
+                                      matching: Optional[Dict[str, Any]] = None) -> ScreeningDecision:
         """Apply screening criteria to a single record."""
+        matcher = self._get_matcher(criteria, matching)
+        matched, _ = matcher.match(self._record_text(record))
+        return self._make_decision(record, matcher, matched, stage)
+    
+    def _make_decision(self, record: Dict[str, Any], matcher: CriteriaMatcher, matched: List[int],
+                       stage: str) -> ScreeningDecision:
+        """Turn the criteria a record matched into a screening decision."""
         record_id = record.get("id", str(uuid.uuid4()))
         
         # Validate stage
         valid_stage: Literal["title_abstract", "full_text"] = "title_abstract" if stage == "title_abstract" else "full_text"
         
-        # Simple criteria matching logic
         include_score = 0
         exclude_score = 0
         reasons = []
         
-        title = record.get("title", "").lower()
-        abstract = record.get("abstract", "").lower()
-        content = f"{title} {abstract}"
-        
-        for criterion in criteria:
-            criterion_type = criterion.get("type", "include")
-            criterion_keywords = criterion.get("keywords", [])
-            criterion_name = criterion.get("name", "")
-            
-            # Check if any keywords match
-            matches = any(keyword.lower() in content for keyword in criterion_keywords)
-            
-            if matches:
-                if criterion_type == "include":
-                    include_score += 1
-                    reasons.append(f"Matches inclusion criterion: {criterion_name}")
-                else:
-                    exclude_score += 1
-                    reasons.append(f"Matches exclusion criterion: {criterion_name}")
+        for index in matched:
+            if matcher.types[index] == "include":
+                include_score += 1
+                reasons.append(f"Matches inclusion criterion: {matcher.names[index]}")
+            else:
+                exclude_score += 1
+                reasons.append(f"Matches exclusion criterion: {matcher.names[index]}")
         
         # Make decision based on scores
+        criteria_count = len(matcher.names)
         if exclude_score > 0:
             decision: Literal["include", "exclude", "unsure"] = "exclude"
-            confidence = min(0.8, exclude_score / len(criteria))
+            confidence = min(0.8, exclude_score / criteria_count)
         elif include_score > 0:
             decision = "include"
-            confidence = min(0.8, include_score / len(criteria))
+            confidence = min(0.8, include_score / criteria_count)
         else:
             decision = "unsure"
             confidence = 0.3
@@ -587,38 +948,35 @@ class ScreeningService:
             confidence=confidence
         )
     
-    async def _generate_flowchart_data(self, session_id: str) -> PRISMAFlowchartData:
-        """Generate PRISMA flowchart data for a session."""
+    async def _generate_flowchart_data(self, session_id: str,
+                                       as_of: Optional[Union[str, int]] = None) -> PRISMAFlowchartData:
+        """Generate PRISMA flowchart data for a session from its decision counters."""
         flowchart = PRISMAFlowchartData()
         
-        decisions = self.screening_decisions.get(session_id, [])
-        
-        # Calculate flowchart statistics
-        flowchart.total_records = len(decisions)
-        flowchart.records_screened = len([d for d in decisions if d.stage == "title_abstract"])
-        flowchart.records_excluded = len([d for d in decisions if d.decision == "exclude" and d.stage == "title_abstract"])
-        flowchart.full_text_assessed = len([d for d in decisions if d.stage == "full_text"])
-        flowchart.full_text_excluded = len([d for d in decisions if d.decision == "exclude" and d.stage == "full_text"])
-        flowchart.studies_included = len([d for d in decisions if d.decision == "include"])
-        
-        # Count exclusion reasons
-        exclusion_reasons = {}
-        for decision in decisions:
-            if decision.decision == "exclude":
-                reason = decision.reason
-                exclusion_reasons[reason] = exclusion_reasons.get(reason, 0) + 1
-        
-        flowchart.exclusion_reasons = exclusion_reasons
-        
-        # Store for future reference
-        self.flowchart_data[session_id] = flowchart
+        for (stage, decision, reason), count in self.store.counters(session_id, as_of).items():
+            flowchart.total_records += count
+            if stage == "title_abstract":
+                flowchart.records_screened += count
+                if decision == "exclude":
+                    flowchart.records_excluded += count
+            else:
+                flowchart.full_text_assessed += count
+                if decision == "exclude":
+                    flowchart.full_text_excluded += count
+            if decision == "include":
+                flowchart.studies_included += count
+            elif decision == "exclude":
+                flowchart.exclusion_reasons[reason] = flowchart.exclusion_reasons.get(reason, 0) + count
         
         return flowchart
     
-    async def _validate_compliance(self, session_id: str) -> Dict[str, Any]:
+    async def _validate_compliance(self, session_id: str, as_of: Optional[Union[str, int]] = None) -> Dict[str, Any]:
         """Validate PRISMA compliance for a session."""
         session = self.sessions.get(session_id)
-        decisions = self.screening_decisions.get(session_id, [])
+        stage_counts: Dict[str, int] = {}
+        for (stage, _, _), count in self.store.counters(session_id, as_of).items():
+            stage_counts[stage] = stage_counts.get(stage, 0) + count
+        total_decisions = sum(stage_counts.values())
         
         compliance_issues = []
         compliance_score = 1.0
@@ -631,19 +989,16 @@ class ScreeningService:
             compliance_issues.append("No screening criteria defined")
             compliance_score -= 0.3
         
-        if not decisions:
+        if not total_decisions:
             compliance_issues.append("No screening decisions recorded")
             compliance_score -= 0.5
         else:
             # Check for stage coverage
-            title_abstract_decisions = [d for d in decisions if d.stage == "title_abstract"]
-            full_text_decisions = [d for d in decisions if d.stage == "full_text"]
-            
-            if not title_abstract_decisions:
+            if not stage_counts.get("title_abstract"):
                 compliance_issues.append("Missing title/abstract screening stage")
                 compliance_score -= 0.2
             
-            if not full_text_decisions:
+            if not stage_counts.get("full_text"):
                 compliance_issues.append("Missing full-text screening stage")
                 compliance_score -= 0.2
         
@@ -653,7 +1008,7 @@ class ScreeningService:
             "compliant": len(compliance_issues) == 0,
             "compliance_score": compliance_score,
             "issues": compliance_issues,
-            "total_decisions": len(decisions)
+            "total_decisions": total_decisions
         }
     
     async def _create_screening_session(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -663,17 +1018,12 @@ class ScreeningService:
         criteria_data = data.get("criteria", [])
         
         # Convert criteria data to Criteria objects
-        criteria = []
-        for c in criteria_data:
-            criteria.append(Criteria(
-                name=c.get("name", ""),
-                description=c.get("description", ""),
-                type=c.get("type", "include")
-            ))
+        criteria = [self._criteria_from_dict(c) for c in criteria_data]
         
         # Create session
         session = PRISMASession(session_id, lit_review_id, criteria)
         self.sessions[session_id] = session
+        self._save_session(session)
         
         return {
             "created": True,
@@ -708,17 +1058,10 @@ class ScreeningService:
         
         # Update criteria if provided
         if "criteria" in data:
-            criteria_data = data["criteria"]
-            criteria = []
-            for c in criteria_data:
-                criteria.append(Criteria(
-                    name=c.get("name", ""),
-                    description=c.get("description", ""),
-                    type=c.get("type", "include")
-                ))
-            session.criteria = criteria
+            session.criteria = [self._criteria_from_dict(c) for c in data["criteria"]]
         
         session.updated_at = datetime.now()
+        self._save_session(session)
         
         return {"updated": True, "session_id": session_id}
     
@@ -729,10 +1072,8 @@ class ScreeningService:
         if session_id in self.sessions:
             del self.sessions[session_id]
             # Also clean up related data
-            if session_id in self.screening_decisions:
-                del self.screening_decisions[session_id]
-            if session_id in self.flowchart_data:
-                del self.flowchart_data[session_id]
+            self.store.delete_session(session_id)
+            self.prioritizers.pop(session_id, None)
             return {"deleted": True, "session_id": session_id}
         
         return {"error": f"Session {session_id} not found"}
@@ -754,6 +1095,36 @@ class ScreeningService:
             "total_sessions": len(sessions)
         }
     
+    @staticmethod
+    def _criteria_from_dict(data: Dict[str, Any]) -> Criteria:
+        return Criteria(
+            name=data.get("name", ""),
+            description=data.get("description", ""),
+            type=data.get("type", "include")
+        )
+    
+    def _save_session(self, session: PRISMASession):
+        self.store.save_session(
+            session.session_id,
+            session.lit_review_id,
+            [{"name": c.name, "description": c.description, "type": c.type} for c in session.criteria],
+            session.created_at,
+            session.updated_at
+        )
+    
+    def _row_to_dict(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a decision store row to the decision dictionary, with its log position."""
+        return {
+            "record_id": row["record_id"],
+            "stage": row["stage"],
+            "decision": row["decision"],
+            "reason": row["reason"],
+            "confidence": row["confidence"],
+            "timestamp": row["timestamp"],
+            "seq": row["seq"],
+            "supersedes": row["supersedes"]
+        }
+    
     def _decision_to_dict(self, decision: ScreeningDecision) -> Dict[str, Any]:
         """Convert ScreeningDecision to dictionary."""
         return {
@@ -788,7 +1159,7 @@ class ScreeningService:
             "capabilities": self.capabilities,
             "mcp_connected": self.mcp_connected,
             "active_sessions": len(self.sessions),
-            "total_decisions": sum(len(decisions) for decisions in self.screening_decisions.values()),
+            "total_decisions": self.store.total_decisions(),
             "uptime_seconds": uptime,
             "timestamp": datetime.now().isoformat()
         }
@@ -814,7 +1185,7 @@ def get_additional_metadata() -> Dict[str, Any]:
         return {
             "capabilities": screening_service.capabilities,
             "active_sessions": len(screening_service.sessions),
-            "total_decisions": sum(len(decisions) for decisions in screening_service.screening_decisions.values()),
+            "total_decisions": screening_service.store.total_decisions(),
             "agent_id": screening_service.agent_id
         }
     return {}
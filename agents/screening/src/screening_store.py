@@ -0,0 +1,313 @@
+"""
+Screening decision store for the Screening Agent.
+
+Screening sessions and decisions are persisted in SQLite:
+- Decisions are appended to a log and never updated; a later decision
+  for the same record and stage is a revision that supersedes it
+- A current-decision index points at each record's latest revision
+- Counters per session, stage, decision and exclusion reason are
+  adjusted in the same transaction as every insert, so PRISMA flowchart
+  and compliance reads do not depend on the number of decisions
+- Past states are rebuilt from the log (``as_of`` a timestamp or log
+  sequence number)
+- A session's screening pool (record text and embedding) is kept for
+  prioritized screening, so rankings can be rebuilt after a restart
+
+Nothing but session metadata is kept in memory.
+"""
+
+import json
+import logging
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS screening_sessions (
+    session_id TEXT PRIMARY KEY,
+    lit_review_id TEXT NOT NULL,
+    criteria TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS screening_decisions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    supersedes INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_screening_decisions_record
+    ON screening_decisions (session_id, record_id, stage, seq);
+CREATE INDEX IF NOT EXISTS idx_screening_decisions_time
+    ON screening_decisions (session_id, timestamp);
+CREATE TABLE IF NOT EXISTS screening_current (
+    session_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (session_id, record_id, stage)
+);
+CREATE TABLE IF NOT EXISTS screening_counters (
+    session_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (session_id, stage, decision, reason)
+);
+CREATE TABLE IF NOT EXISTS screening_pool (
+    session_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    embedding BLOB,
+    PRIMARY KEY (session_id, record_id)
+);
+"""
+
+# Only exclusions are counted per reason; other decisions use an empty reason
+CounterKey = Tuple[str, str, str]
+
+# SQLite's default limit on host parameters is 999
+LOOKUP_CHUNK = 500
+
+
+def _counter_key(stage: str, decision: str, reason: str) -> CounterKey:
+    return stage, decision, reason if decision == "exclude" else ""
+
+
+class ScreeningStore:
+    """Append-only screening decision log with incrementally maintained PRISMA counters."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    # Sessions
+
+    def save_session(self, session_id: str, lit_review_id: str, criteria: List[Dict[str, Any]],
+                     created_at: datetime, updated_at: datetime):
+        self.db.execute(
+            "INSERT INTO screening_sessions (session_id, lit_review_id, criteria, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (session_id) DO UPDATE SET "
+            "lit_review_id = excluded.lit_review_id, criteria = excluded.criteria, updated_at = excluded.updated_at",
+            (session_id, lit_review_id, json.dumps(criteria), created_at.isoformat(), updated_at.isoformat())
+        )
+
+    def load_sessions(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "session_id": session_id,
+                "lit_review_id": lit_review_id,
+                "criteria": json.loads(criteria),
+                "created_at": datetime.fromisoformat(created_at),
+                "updated_at": datetime.fromisoformat(updated_at)
+            }
+            for session_id, lit_review_id, criteria, created_at, updated_at in self.db.execute(
+                "SELECT session_id, lit_review_id, criteria, created_at, updated_at FROM screening_sessions"
+            )
+        ]
+
+    def delete_session(self, session_id: str):
+        """Remove a session together with its decision log and counters."""
+        self.db.execute("BEGIN")
+        try:
+            for table in ("screening_sessions", "screening_decisions", "screening_current", "screening_counters",
+                          "screening_pool"):
+                self.db.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+
+    # Decisions
+
+    def _current_decisions(self, session_id: str, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Tuple]:
+        """Current (seq, stage, decision, reason) by (record_id, stage) for the given keys."""
+        current = {}
+        record_ids = sorted({record_id for record_id, _ in keys})
+        for start in range(0, len(record_ids), LOOKUP_CHUNK):
+            chunk = record_ids[start:start + LOOKUP_CHUNK]
+            rows = self.db.execute(
+                "SELECT d.record_id, d.stage, d.seq, d.decision, d.reason FROM screening_current c "
+                "JOIN screening_decisions d ON d.seq = c.seq "
+                f"WHERE c.session_id = ? AND c.record_id IN ({', '.join('?' * len(chunk))})",
+                [session_id, *chunk]
+            )
+            for record_id, stage, seq, decision, reason in rows:
+                current[(record_id, stage)] = (seq, stage, decision, reason)
+        return current
+
+    def append_decisions(self, session_id: str, decisions: Iterable[Dict[str, Any]]) -> int:
+        """Append decisions in one transaction; a decision for a record and stage already decided revises it.
+
+        Each decision needs record_id, stage, decision, reason, confidence
+        and timestamp. Returns the number of revisions among them.
+        """
+        decisions = list(decisions)
+        if not decisions:
+            return 0
+
+        deltas: Counter = Counter()
+        revisions = 0
+        self.db.execute("BEGIN")
+        try:
+            current = self._current_decisions(
+                session_id, [(decision["record_id"], decision["stage"]) for decision in decisions]
+            )
+            for decision in decisions:
+                key = (decision["record_id"], decision["stage"])
+                previous = current.get(key)
+                if previous is not None:
+                    _, stage, old_decision, old_reason = previous
+                    deltas[_counter_key(stage, old_decision, old_reason)] -= 1
+                    revisions += 1
+
+                cursor = self.db.execute(
+                    "INSERT INTO screening_decisions "
+                    "(session_id, record_id, stage, decision, reason, confidence, timestamp, supersedes) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (session_id, decision["record_id"], decision["stage"], decision["decision"],
+                     decision["reason"], decision["confidence"], decision["timestamp"],
+                     previous[0] if previous else None)
+                )
+                current[key] = (cursor.lastrowid, decision["stage"], decision["decision"], decision["reason"])
+                deltas[_counter_key(decision["stage"], decision["decision"], decision["reason"])] += 1
+
+            self.db.executemany(
+                "INSERT INTO screening_current (session_id, record_id, stage, seq) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (session_id, record_id, stage) DO UPDATE SET seq = excluded.seq",
+                [(session_id, record_id, stage, entry[0]) for (record_id, stage), entry in current.items()]
+            )
+            self.db.executemany(
+                "INSERT INTO screening_counters (session_id, stage, decision, reason, count) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (session_id, stage, decision, reason) DO UPDATE SET count = count + excluded.count",
+                [(session_id, *key, delta) for key, delta in deltas.items() if delta]
+            )
+            self.db.execute(
+                "DELETE FROM screening_counters WHERE session_id = ? AND count = 0", (session_id,)
+            )
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        return revisions
+
+    def current_labels(self, session_id: str, stage: str = "title_abstract") -> List[Tuple[str, str]]:
+        """(record_id, decision) of the current decisions at ``stage``, in log order."""
+        return self.db.execute(
+            "SELECT d.record_id, d.decision FROM screening_current c JOIN screening_decisions d ON d.seq = c.seq "
+            "WHERE c.session_id = ? AND c.stage = ? ORDER BY d.seq",
+            (session_id, stage)
+        ).fetchall()
+
+    def get_decisions(self, session_id: str, limit: Optional[int] = None, offset: int = 0,
+                      record_id: Optional[str] = None, include_history: bool = False) -> List[Dict[str, Any]]:
+        """Current decisions in log order, or every revision with ``include_history``."""
+        if include_history:
+            query = "SELECT * FROM screening_decisions d WHERE d.session_id = ?"
+        else:
+            query = ("SELECT d.* FROM screening_current c JOIN screening_decisions d ON d.seq = c.seq "
+                     "WHERE c.session_id = ?")
+        params: List[Any] = [session_id]
+        if record_id is not None:
+            query += " AND d.record_id = ?"
+            params.append(record_id)
+        query += " ORDER BY d.seq LIMIT ? OFFSET ?"
+        params.extend([limit if limit is not None else -1, offset])
+
+        cursor = self.db.execute(query, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    # Counters
+
+    def counters(self, session_id: str, as_of: Optional[Union[str, int]] = None) -> Dict[CounterKey, int]:
+        """Decision counts by (stage, decision, exclusion reason).
+
+        ``as_of`` (an ISO timestamp or a log sequence number) rebuilds the
+        counts from the log as they were at that point; otherwise the
+        maintained counters are read.
+        """
+        if as_of is None:
+            rows = self.db.execute(
+                "SELECT stage, decision, reason, count FROM screening_counters WHERE session_id = ?",
+                (session_id,)
+            )
+            return {(stage, decision, reason): count for stage, decision, reason, count in rows}
+
+        bound = "seq <= ?" if isinstance(as_of, int) else "timestamp <= ?"
+        rows = self.db.execute(
+            "SELECT stage, decision, CASE WHEN decision = 'exclude' THEN reason ELSE '' END, COUNT(*) FROM ("
+            "  SELECT stage, decision, reason, ROW_NUMBER() OVER ("
+            "    PARTITION BY record_id, stage ORDER BY seq DESC) AS revision"
+            f"  FROM screening_decisions WHERE session_id = ? AND {bound}"
+            ") WHERE revision = 1 GROUP BY 1, 2, 3",
+            (session_id, as_of)
+        )
+        return {(stage, decision, reason): count for stage, decision, reason, count in rows}
+
+    def total_decisions(self, session_id: Optional[str] = None) -> int:
+        if session_id is None:
+            row = self.db.execute("SELECT COALESCE(SUM(count), 0) FROM screening_counters").fetchone()
+        else:
+            row = self.db.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM screening_counters WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0]
+
+    def last_seq(self, session_id: str) -> int:
+        row = self.db.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM screening_decisions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row[0]
+
+    # Screening pool
+
+    def add_pool_records(self, session_id: str, records: Iterable[Tuple[str, str, Optional[bytes]]]) -> int:
+        """Add (record_id, text, embedding bytes or None) to a session's pool; known records are kept.
+
+        Returns the number of records added.
+        """
+        before = self.pool_size(session_id)
+        self.db.execute("BEGIN")
+        try:
+            self.db.executemany(
+                "INSERT INTO screening_pool (session_id, record_id, position, text, embedding) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (session_id, record_id) DO NOTHING",
+                [(session_id, record_id, before + index, text, embedding)
+                 for index, (record_id, text, embedding) in enumerate(records)]
+            )
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        return self.pool_size(session_id) - before
+
+    def load_pool(self, session_id: str) -> Iterable[Tuple[str, str, Optional[bytes]]]:
+        """(record_id, text, embedding) of a session's pool, in arrival order."""
+        return self.db.execute(
+            "SELECT record_id, text, embedding FROM screening_pool WHERE session_id = ? ORDER BY position",
+            (session_id,)
+        )
+
+    def pool_size(self, session_id: str) -> int:
+        return self.db.execute(
+            "SELECT COUNT(*) FROM screening_pool WHERE session_id = ?", (session_id,)
+        ).fetchone()[0]
+
+    def close(self):
+        self.db.close()
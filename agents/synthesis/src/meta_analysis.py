@@ -0,0 +1,340 @@
+"""
+Vectorized Meta-Analysis Core for the Synthesis & Review Agent
+
+Effect sizes and pooled estimates are computed over whole study arrays
+instead of one study at a time. Studies of all outcomes are analysed
+together: each study carries the index of its outcome, and per-outcome
+sums are taken with ``np.bincount``.
+
+Supported effect sizes (``EFFECT_SIZE_TYPES``):
+
+- ``cohens_d`` / ``hedges_g``: standardized mean difference, with the
+  small-sample correction for Hedges' g
+- ``odds_ratio`` / ``log_odds_ratio``: analysed on the log scale, with a
+  0.5 continuity correction for tables containing a zero cell
+- ``mean_difference``: raw mean difference
+
+Pooling uses inverse-variance weights, with a fixed-effect model or a
+random-effects model whose between-study variance (tau²) is estimated by
+DerSimonian-Laird or REML. Leave-one-out sensitivity analysis and
+bootstrap confidence intervals reuse the same grouped pooling on expanded
+index arrays, so every outcome and replicate is computed in one pass.
+"""
+
+import math
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class MetaAnalysisError(ValueError):
+    """Raised for unknown effect size types or pooling methods."""
+
+
+EFFECT_SIZE_TYPES = {"cohens_d", "hedges_g", "odds_ratio", "log_odds_ratio", "mean_difference"}
+LOG_SCALE_TYPES = {"odds_ratio"}   # analysed as log(OR), reported as OR
+TAU2_METHODS = {"FE", "DL", "REML"}
+
+TAU2_METHOD_ALIASES = {
+    "fe": "FE",
+    "fixed": "FE",
+    "fixed_effect": "FE",
+    "fixed_effects": "FE",
+    "dl": "DL",
+    "dersimonian_laird": "DL",
+    "reml": "REML",
+}
+
+# Bootstrap replicates are pooled in chunks of about this many rows
+BOOTSTRAP_CHUNK_ROWS = 1_000_000
+
+
+def resolve_method(analysis_model: str, tau2_method: str = "REML") -> str:
+    """Map an analysis model and tau² estimator to FE, DL or REML."""
+    model = TAU2_METHOD_ALIASES.get(str(analysis_model).lower())
+    if model == "FE":
+        return "FE"
+    method = TAU2_METHOD_ALIASES.get(str(tau2_method).lower(), str(tau2_method).upper())
+    if method not in TAU2_METHODS:
+        raise MetaAnalysisError(f"Unknown tau² estimator: {tau2_method}")
+    return method
+
+
+def z_critical(alpha: float) -> float:
+    return NormalDist().inv_cdf(1 - alpha / 2)
+
+
+def two_sided_p(z: np.ndarray) -> np.ndarray:
+    return np.array([math.erfc(abs(value) / math.sqrt(2)) if np.isfinite(value) else np.nan for value in z])
+
+
+# ---------------------------------------------------------------------------
+# Effect sizes
+# ---------------------------------------------------------------------------
+
+def column(rows: List[Dict[str, Any]], key: str) -> np.ndarray:
+    """Float column from a list of dicts; missing or non-numeric values are NaN."""
+    values = np.full(len(rows), np.nan)
+    for index, row in enumerate(rows):
+        value = row.get(key)
+        if value is None or value == "":
+            continue
+        try:
+            values[index] = float(value)
+        except (TypeError, ValueError):
+            pass
+    return values
+
+
+def standardized_mean_difference(m1, m2, sd1, sd2, n1, n2, hedges: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    df = n1 + n2 - 2
+    pooled_sd = np.sqrt(((n1 - 1) * sd1 ** 2 + (n2 - 1) * sd2 ** 2) / df)
+    d = (m1 - m2) / pooled_sd
+    variance = (n1 + n2) / (n1 * n2) + d ** 2 / (2 * (n1 + n2))
+    if not hedges:
+        return d, variance
+    correction = 1 - 3 / (4 * df - 1)
+    return correction * d, correction ** 2 * variance
+
+
+def log_odds_ratio(a, b, c, d) -> Tuple[np.ndarray, np.ndarray]:
+    zero_cell = (a == 0) | (b == 0) | (c == 0) | (d == 0)
+    a, b, c, d = (np.where(zero_cell, cell + 0.5, cell) for cell in (a, b, c, d))
+    return np.log((a * d) / (b * c)), 1 / a + 1 / b + 1 / c + 1 / d
+
+
+def mean_difference(m1, m2, sd1, sd2, n1, n2) -> Tuple[np.ndarray, np.ndarray]:
+    return m1 - m2, sd1 ** 2 / n1 + sd2 ** 2 / n2
+
+
+def compute_effect_sizes(studies: List[Dict[str, Any]], effect_size_type: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Effect sizes and sampling variances for all studies, on the analysis scale.
+
+    Studies with missing or impossible group data get NaN.
+    """
+    if effect_size_type not in EFFECT_SIZE_TYPES:
+        raise MetaAnalysisError(f"Unknown effect size type: {effect_size_type}")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if effect_size_type in ("odds_ratio", "log_odds_ratio"):
+            cells = [column(studies, key) for key in
+                     ("events_group1", "non_events_group1", "events_group2", "non_events_group2")]
+            if any(np.any(cell < 0) for cell in cells):
+                cells = [np.where(cell < 0, np.nan, cell) for cell in cells]
+            y, v = log_odds_ratio(*cells)
+        else:
+            m1, m2 = column(studies, "mean_group1"), column(studies, "mean_group2")
+            sd1, sd2 = column(studies, "sd_group1"), column(studies, "sd_group2")
+            n1, n2 = column(studies, "n_group1"), column(studies, "n_group2")
+            if effect_size_type == "mean_difference":
+                y, v = mean_difference(m1, m2, sd1, sd2, n1, n2)
+            else:
+                y, v = standardized_mean_difference(m1, m2, sd1, sd2, n1, n2,
+                                                    hedges=effect_size_type == "hedges_g")
+            v = np.where((n1 >= 2) & (n2 >= 2), v, np.nan)
+
+    invalid = ~(np.isfinite(y) & np.isfinite(v) & (v > 0))
+    return np.where(invalid, np.nan, y), np.where(invalid, np.nan, v)
+
+
+def outcome_effects(outcomes: List[Dict[str, Any]], effect_size_type: str,
+                    alpha: float = 0.05) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Effect sizes and variances for extracted outcome rows.
+
+    A row's own ``effect_size`` is used with its ``variance``,
+    ``standard_error`` or ``confidence_interval``; rows without one are
+    computed from their group data. Standardized mean differences reported
+    with only ``total_n`` use the equal-arms variance 4 / N. Returns
+    (y, v, approximated) where ``approximated`` flags that last case.
+    """
+    y, v = compute_effect_sizes(outcomes, effect_size_type)
+    log_scale = effect_size_type in LOG_SCALE_TYPES
+
+    reported = column(outcomes, "effect_size")
+    variance = column(outcomes, "variance")
+    standard_error = column(outcomes, "standard_error")
+    lower = np.full(len(outcomes), np.nan)
+    upper = np.full(len(outcomes), np.nan)
+    for index, outcome in enumerate(outcomes):
+        ci = outcome.get("confidence_interval")
+        if isinstance(ci, (list, tuple)) and len(ci) == 2:
+            try:
+                lower[index], upper[index] = float(ci[0]), float(ci[1])
+            except (TypeError, ValueError):
+                pass
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if log_scale:
+            reported, lower, upper = np.log(reported), np.log(lower), np.log(upper)
+        ci_variance = ((upper - lower) / (2 * z_critical(alpha))) ** 2
+        reported_variance = np.where(np.isfinite(variance), variance,
+                                     np.where(np.isfinite(standard_error), standard_error ** 2, ci_variance))
+
+        approximated = np.zeros(len(outcomes), dtype=bool)
+        if effect_size_type in ("cohens_d", "hedges_g"):
+            total_n = column(outcomes, "total_n")
+            approximated = ~np.isfinite(reported_variance) & (total_n > 0)
+            reported_variance = np.where(approximated, 4 / total_n, reported_variance)
+
+    use_reported = np.isfinite(reported) & np.isfinite(reported_variance) & (reported_variance > 0)
+    y = np.where(use_reported, reported, y)
+    v = np.where(use_reported, reported_variance, v)
+    return y, v, approximated & use_reported
+
+
+# ---------------------------------------------------------------------------
+# Grouped pooling
+# ---------------------------------------------------------------------------
+
+def _group_sum(values: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    return np.bincount(groups, weights=values, minlength=n_groups)
+
+
+def _reml_tau2(y, v, groups, n_groups, tau2, max_iter: int = 100, tol: float = 1e-8) -> np.ndarray:
+    """REML tau² by Fisher scoring, started from the DerSimonian-Laird estimate.
+
+    A group's step is halved each time its direction flips, which stops
+    the overshooting Fisher scoring is prone to near tau² = 0. Converged
+    groups drop out of later iterations.
+    """
+    tau2 = tau2.copy()
+    active = np.ones(n_groups, dtype=bool)
+    damping = np.ones(n_groups)
+    previous = np.zeros(n_groups)
+    for _ in range(max_iter):
+        w = 1 / (v + tau2[groups])
+        sum_w = _group_sum(w, groups, n_groups)
+        sum_w2 = _group_sum(w * w, groups, n_groups)
+        mu = _group_sum(w * y, groups, n_groups) / sum_w
+        # tr(P) and tr(PP) for the REML projection matrix P
+        trace_p = sum_w - sum_w2 / sum_w
+        trace_pp = sum_w2 - 2 * _group_sum(w ** 3, groups, n_groups) / sum_w + (sum_w2 / sum_w) ** 2
+        score = _group_sum(w * w * (y - mu[groups]) ** 2, groups, n_groups) - trace_p
+        step = np.where(active & (trace_pp > 0), score / trace_pp, 0.0)
+        damping = np.where(step * previous < 0, damping / 2, damping)
+        step = step * damping
+        previous = step
+
+        updated = np.maximum(0.0, tau2 + step)
+        updated = np.where(np.isfinite(updated), updated, tau2)
+        active &= np.abs(updated - tau2) >= tol
+        tau2 = updated
+        if not active.any():
+            break
+        rows = active[groups]
+        if rows.mean() < 0.5:
+            y, v, groups = y[rows], v[rows], groups[rows]
+    return tau2
+
+
+def pool(y: np.ndarray, v: np.ndarray, groups: np.ndarray, n_groups: int,
+         method: str = "REML", alpha: float = 0.05, p_values: bool = True) -> Dict[str, np.ndarray]:
+    """Inverse-variance pooling of every group at once.
+
+    ``groups`` holds each study's group index in ``range(n_groups)``;
+    studies must have finite effects and positive variances. All returned
+    arrays have one entry per group; empty groups get NaN estimates.
+    """
+    if method not in TAU2_METHODS:
+        raise MetaAnalysisError(f"Unknown pooling method: {method}")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.bincount(groups, minlength=n_groups).astype(float)
+        w = 1 / v
+        sum_w = _group_sum(w, groups, n_groups)
+        fixed = _group_sum(w * y, groups, n_groups) / sum_w
+        q = _group_sum(w * (y - fixed[groups]) ** 2, groups, n_groups)
+        df = np.maximum(k - 1, 0)
+
+        if method == "FE":
+            tau2 = np.zeros(n_groups)
+        else:
+            c = sum_w - _group_sum(w * w, groups, n_groups) / sum_w
+            tau2 = np.where(c > 0, np.maximum(0.0, (q - df) / c), 0.0)
+            if method == "REML":
+                tau2 = _reml_tau2(y, v, groups, n_groups, tau2)
+
+        w_star = 1 / (v + tau2[groups])
+        sum_w_star = _group_sum(w_star, groups, n_groups)
+        estimate = _group_sum(w_star * y, groups, n_groups) / sum_w_star
+        se = np.sqrt(1 / sum_w_star)
+        i2 = np.where(q > 0, np.maximum(0.0, (q - df) / q) * 100, 0.0)
+        z = estimate / se
+        fixed_se = np.sqrt(1 / sum_w)
+
+    z_crit = z_critical(alpha)
+    return {
+        "k": k.astype(int),
+        "estimate": estimate,
+        "se": se,
+        "lower": estimate - z_crit * se,
+        "upper": estimate + z_crit * se,
+        "z": z,
+        "p_value": two_sided_p(z) if p_values else None,
+        "tau2": tau2,
+        "q": q,
+        "df": df.astype(int),
+        "i2": i2,
+        "fixed_estimate": fixed,
+        "fixed_se": fixed_se,
+    }
+
+
+def _sorted_layout(groups: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Study order sorted by group, group sizes and each group's start offset."""
+    order = np.argsort(groups, kind="stable")
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    return order, counts, starts
+
+
+def leave_one_out(y: np.ndarray, v: np.ndarray, groups: np.ndarray, n_groups: int,
+                  method: str = "REML", alpha: float = 0.05) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Pool each group once per omitted study.
+
+    Returns (omitted, results): ``omitted[i]`` is the index of the study
+    left out of row ``i`` of the results, ordered by group.
+    """
+    order, counts, starts = _sorted_layout(groups, n_groups)
+    sorted_groups = groups[order]
+    sizes = counts[sorted_groups]
+
+    # One block per omitted study, listing every study of its group
+    row = np.repeat(np.arange(len(order)), sizes)
+    block_start = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    col = starts[sorted_groups][row] + (np.arange(len(row)) - block_start)
+    keep = row != col
+
+    results = pool(y[order][col[keep]], v[order][col[keep]], row[keep], len(order), method, alpha, p_values=False)
+    return order, results
+
+
+def bootstrap_intervals(y: np.ndarray, v: np.ndarray, groups: np.ndarray, n_groups: int,
+                        method: str = "REML", samples: int = 1000, alpha: float = 0.05,
+                        seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Percentile bootstrap CIs of the pooled estimate, resampling studies within each group.
+
+    Replicates of all groups are pooled together; they are processed in
+    chunks to bound memory.
+    """
+    rng = np.random.default_rng(seed)
+    order, counts, starts = _sorted_layout(groups, n_groups)
+    sorted_groups = groups[order]
+    y_sorted, v_sorted = y[order], v[order]
+    n_studies = len(order)
+
+    chunk = max(1, min(samples, BOOTSTRAP_CHUNK_ROWS // max(n_studies, 1)))
+    estimates = []
+    for done in range(0, samples, chunk):
+        replicates = min(chunk, samples - done)
+        picks = (rng.random((replicates, n_studies)) * counts[sorted_groups]).astype(int)
+        col = (starts[sorted_groups] + picks).ravel()
+        replicate_groups = (np.arange(replicates)[:, None] * n_groups + sorted_groups).ravel()
+        pooled = pool(y_sorted[col], v_sorted[col], replicate_groups, replicates * n_groups,
+                      method, alpha, p_values=False)
+        estimates.append(pooled["estimate"].reshape(replicates, n_groups))
+
+    estimates = np.vstack(estimates)
+    lower, upper = np.nanpercentile(estimates, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+    return lower, upper
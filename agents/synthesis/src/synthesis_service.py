@@ -24,13 +24,15 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
-from statistics import mean, stdev
 
+import numpy as np
 import uvicorn
 import websockets
 from fastapi import FastAPI
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
+import meta_analysis
+
 # Import the standardized health check service
 sys.path.append(str(Path(__file__).parent.parent))
 from health_check_service import create_health_check_app
@@ -67,6 +69,18 @@ class MetaAnalysisResult:
     total_participants: int
     p_value: Optional[float] = None
     forest_plot_data: Optional[Dict[str, Any]] = None
+    model: str = "random_effects"
+    tau2_method: Optional[str] = None
+    effect_size_type: Optional[str] = None
+    standard_error: Optional[float] = None
+    tau_squared: float = 0.0
+    q_statistic: float = 0.0
+    q_df: int = 0
+    fixed_effect: Optional[Dict[str, Any]] = None
+    leave_one_out: Optional[List[Dict[str, Any]]] = None
+    bootstrap_ci: Optional[Tuple[float, float]] = None
+    studies_excluded: int = 0
+    variance_approximated: int = 0
 
 
 @dataclass
@@ -103,6 +117,8 @@ class SynthesisReviewService:
         self.min_studies_for_meta = config.get("min_studies_for_meta", 2)
         self.significance_level = config.get("significance_level", 0.05)
         self.heterogeneity_threshold = config.get("heterogeneity_threshold", 75.0)
+        self.tau2_method = config.get("tau2_method", "REML")
+        self.bootstrap_samples = config.get("bootstrap_samples", 0)
         
         # MCP connection
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
@@ -427,7 +443,11 @@ class SynthesisReviewService:
                 }
             
             # Perform evidence synthesis
+            await self._send_progress(data, "synthesis", 0, len(studies),
+                                      f"Synthesizing {len(studies)} studies ({synthesis_method})")
             synthesis_result = await self._synthesize_evidence(studies, outcomes, synthesis_method)
+            await self._send_progress(data, "synthesis", len(studies), len(studies),
+                                      f"Synthesized {len(studies)} studies", status="completed")
             
             return {
                 "status": "completed",
@@ -439,17 +459,42 @@ class SynthesisReviewService:
             
         except Exception as e:
             logger.error(f"Failed to synthesize evidence: {e}")
+            await self._send_progress(data, "synthesis", 0, len(data.get("studies", [])), str(e), status="failed")
             return {
                 "status": "failed",
                 "error": str(e),
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def _send_progress(self, data: Dict[str, Any], stage: str, completed: int, total: int,
+                             message: str = "", status: str = "running"):
+        """Report progress of a task delegated by a research execution; best effort."""
+        execution_id = data.get("original_task_id")
+        if not execution_id or not self.websocket or not self.mcp_connected:
+            return
+        
+        try:
+            await self.websocket.send(json.dumps({
+                "type": "progress_event",
+                "execution_id": execution_id,
+                "task_id": data.get("delegation_id"),
+                "agent_type": self.agent_type,
+                "stage": stage,
+                "status": status,
+                "completed": completed,
+                "total": total,
+                "message": message,
+                "timestamp": datetime.now().isoformat()
+            }))
+        except Exception as e:
+            logger.warning(f"Failed to send progress for execution {execution_id}: {e}")
+    
     async def _handle_perform_meta_analysis(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle meta-analysis request."""
         try:
             outcomes_data = data.get("outcomes_data", [])
             analysis_model = data.get("analysis_model", "random_effects")
+            effect_size_type = data.get("effect_size_type", "cohens_d")
             
             if not outcomes_data:
                 return {
@@ -459,11 +504,20 @@ class SynthesisReviewService:
                 }
             
             # Perform meta-analysis
-            meta_results = await self._perform_meta_analysis(outcomes_data, analysis_model)
+            meta_results = await self._perform_meta_analysis(
+                outcomes_data,
+                analysis_model,
+                effect_size_type=effect_size_type,
+                tau2_method=data.get("tau2_method", self.tau2_method),
+                leave_one_out=data.get("leave_one_out", False),
+                bootstrap_samples=data.get("bootstrap_samples", self.bootstrap_samples),
+                seed=data.get("seed")
+            )
             
             return {
                 "status": "completed",
                 "analysis_model": analysis_model,
+                "effect_size_type": effect_size_type,
                 "meta_analysis_results": [self._meta_result_to_dict(result) for result in meta_results],
                 "outcomes_analyzed": len(meta_results),
                 "timestamp": datetime.now().isoformat()
@@ -563,7 +617,12 @@ class SynthesisReviewService:
                 }
             
             # Assess heterogeneity
-            heterogeneity_result = await self._assess_heterogeneity(effect_sizes, assessment_method)
+            heterogeneity_result = await self._assess_heterogeneity(
+                effect_sizes,
+                assessment_method,
+                variances=data.get("variances"),
+                standard_errors=data.get("standard_errors")
+            )
             
             return {
                 "status": "completed",
@@ -628,23 +687,110 @@ class SynthesisReviewService:
         return synthesis_result
     
     async def _perform_meta_analysis(self, outcomes_data: List[Dict[str, Any]], 
-                                   analysis_model: str) -> List[MetaAnalysisResult]:
-        """Perform meta-analysis on outcomes data."""
-        meta_results = []
+                                   analysis_model: str, effect_size_type: str = "cohens_d",
+                                   tau2_method: Optional[str] = None, leave_one_out: bool = False,
+                                   bootstrap_samples: int = 0, seed: Optional[int] = None) -> List[MetaAnalysisResult]:
+        """Perform meta-analysis on outcomes data.
+        
+        All outcomes are pooled in one vectorized pass, run in a worker thread
+        so large analyses do not block the MCP connection.
+        """
+        return await asyncio.to_thread(
+            self._pool_outcomes, outcomes_data, analysis_model, effect_size_type,
+            tau2_method or self.tau2_method, leave_one_out, int(bootstrap_samples or 0), seed
+        )
+    
+    def _pool_outcomes(self, outcomes_data: List[Dict[str, Any]], analysis_model: str, effect_size_type: str,
+                       tau2_method: str, leave_one_out: bool, bootstrap_samples: int,
+                       seed: Optional[int]) -> List[MetaAnalysisResult]:
+        """Pool every outcome with at least ``min_studies_for_meta`` usable studies."""
+        method = meta_analysis.resolve_method(analysis_model, tau2_method)
+        alpha = self.significance_level
         
         # Group outcomes by outcome name
-        outcomes_by_name = {}
-        for outcome in outcomes_data:
-            name = outcome.get("outcome_name", "unknown")
-            if name not in outcomes_by_name:
-                outcomes_by_name[name] = []
-            outcomes_by_name[name].append(outcome)
+        names = [outcome.get("outcome_name", "unknown") for outcome in outcomes_data]
+        outcome_names = list(dict.fromkeys(names))
+        name_index = {name: index for index, name in enumerate(outcome_names)}
+        outcome_groups = np.array([name_index[name] for name in names], dtype=int)
+        
+        y, v, approximated = meta_analysis.outcome_effects(outcomes_data, effect_size_type, alpha)
+        usable = np.isfinite(y) & np.isfinite(v)
+        usable_counts = np.bincount(outcome_groups[usable], minlength=len(outcome_names))
+        row_counts = np.bincount(outcome_groups, minlength=len(outcome_names))
         
-        # Perform meta-analysis for each outcome
-        for outcome_name, outcome_list in outcomes_by_name.items():
-            if len(outcome_list) >= self.min_studies_for_meta:
-                meta_result = await self._calculate_pooled_effect(outcome_name, outcome_list, analysis_model)
-                meta_results.append(meta_result)
+        pooled_outcomes = np.flatnonzero(usable_counts >= max(self.min_studies_for_meta, 1))
+        if len(pooled_outcomes) == 0:
+            return []
+        group_map = np.full(len(outcome_names), -1)
+        group_map[pooled_outcomes] = np.arange(len(pooled_outcomes))
+        selected = np.flatnonzero(usable & (group_map[outcome_groups] >= 0))
+        groups = group_map[outcome_groups[selected]]
+        n_groups = len(pooled_outcomes)
+        y, v = y[selected], v[selected]
+        
+        pooled = meta_analysis.pool(y, v, groups, n_groups, method, alpha)
+        participants = np.bincount(groups, weights=np.nan_to_num(meta_analysis.column(outcomes_data, "total_n")[selected]),
+                                   minlength=n_groups)
+        approximated_counts = np.bincount(groups, weights=approximated[selected], minlength=n_groups)
+        
+        # Ratio measures are pooled on the log scale and reported back-transformed
+        scale = np.exp if effect_size_type in meta_analysis.LOG_SCALE_TYPES else (lambda values: values)
+        z_crit = meta_analysis.z_critical(alpha)
+        
+        loo_by_group: Dict[int, List[Dict[str, Any]]] = {}
+        if leave_one_out:
+            omitted, loo = meta_analysis.leave_one_out(y, v, groups, n_groups, method, alpha)
+            loo_estimate, loo_lower, loo_upper = scale(loo["estimate"]), scale(loo["lower"]), scale(loo["upper"])
+            for row, study_index in enumerate(omitted):
+                if loo["k"][row] == 0:
+                    continue
+                outcome = outcomes_data[selected[study_index]]
+                loo_by_group.setdefault(int(groups[study_index]), []).append({
+                    "omitted_study": outcome.get("record_id", outcome.get("study_id", str(selected[study_index]))),
+                    "pooled_effect": float(loo_estimate[row]),
+                    "confidence_interval": [float(loo_lower[row]), float(loo_upper[row])],
+                    "tau_squared": float(loo["tau2"][row]),
+                    "heterogeneity_i2": float(loo["i2"][row])
+                })
+        
+        bootstrap = None
+        if bootstrap_samples > 0:
+            bootstrap = meta_analysis.bootstrap_intervals(y, v, groups, n_groups, method, bootstrap_samples, alpha, seed)
+            bootstrap = (scale(bootstrap[0]), scale(bootstrap[1]))
+        
+        estimate, lower, upper = scale(pooled["estimate"]), scale(pooled["lower"]), scale(pooled["upper"])
+        fixed_estimate = pooled["fixed_estimate"]
+        fixed_lower = scale(fixed_estimate - z_crit * pooled["fixed_se"])
+        fixed_upper = scale(fixed_estimate + z_crit * pooled["fixed_se"])
+        fixed_estimate = scale(fixed_estimate)
+        
+        meta_results = []
+        for group, outcome_index in enumerate(pooled_outcomes):
+            meta_results.append(MetaAnalysisResult(
+                outcome_name=outcome_names[outcome_index],
+                pooled_effect=float(estimate[group]),
+                ci=(float(lower[group]), float(upper[group])),
+                heterogeneity_i2=float(pooled["i2"][group]),
+                studies_included=int(pooled["k"][group]),
+                total_participants=int(participants[group]),
+                p_value=float(pooled["p_value"][group]),
+                model="fixed_effect" if method == "FE" else "random_effects",
+                tau2_method=None if method == "FE" else method,
+                effect_size_type=effect_size_type,
+                standard_error=float(pooled["se"][group]),
+                tau_squared=float(pooled["tau2"][group]),
+                q_statistic=float(pooled["q"][group]),
+                q_df=int(pooled["df"][group]),
+                fixed_effect={
+                    "pooled_effect": float(fixed_estimate[group]),
+                    "confidence_interval": [float(fixed_lower[group]), float(fixed_upper[group])],
+                    "standard_error": float(pooled["fixed_se"][group])
+                },
+                leave_one_out=loo_by_group.get(group) if leave_one_out else None,
+                bootstrap_ci=(float(bootstrap[0][group]), float(bootstrap[1][group])) if bootstrap else None,
+                studies_excluded=int(row_counts[outcome_index] - pooled["k"][group]),
+                variance_approximated=int(approximated_counts[group])
+            ))
         
         return meta_results
     
@@ -681,47 +827,54 @@ class SynthesisReviewService:
     
     async def _calculate_effect_sizes(self, study_data: List[Dict[str, Any]], 
                                     effect_size_type: str) -> List[Dict[str, Any]]:
-        """Calculate effect sizes for study data."""
-        effect_sizes = []
+        """Calculate effect sizes for all studies in one vectorized pass."""
+        y, v = meta_analysis.compute_effect_sizes(study_data, effect_size_type)
+        se = np.sqrt(v)
+        z_crit = meta_analysis.z_critical(self.significance_level)
+        lower, upper = y - z_crit * se, y + z_crit * se
         
-        for study in study_data:
+        # Odds ratios are computed on the log scale; standard errors stay on it
+        log_scale = effect_size_type in meta_analysis.LOG_SCALE_TYPES
+        if log_scale:
+            y, lower, upper = np.exp(y), np.exp(lower), np.exp(upper)
+        null_effect = 1.0 if log_scale else 0.0
+        
+        effect_sizes = []
+        for index, study in enumerate(study_data):
             study_id = study.get("id", str(uuid.uuid4()))
             
-            # Extract numeric data for effect size calculation
-            try:
-                if effect_size_type == "cohens_d":
-                    effect_size = await self._calculate_cohens_d(study)
-                elif effect_size_type == "odds_ratio":
-                    effect_size = await self._calculate_odds_ratio(study)
-                elif effect_size_type == "mean_difference":
-                    effect_size = await self._calculate_mean_difference(study)
-                else:
-                    effect_size = {"value": 0.0, "ci": [0.0, 0.0], "error": f"Unknown effect size type: {effect_size_type}"}
-                
+            if not np.isfinite(y[index]):
+                logger.warning(f"Failed to calculate effect size for study {study_id}: missing or invalid group data")
                 effect_sizes.append({
                     "study_id": study_id,
                     "effect_size_type": effect_size_type,
-                    "effect_size": effect_size["value"],
-                    "confidence_interval": effect_size.get("ci", []),
-                    "standard_error": effect_size.get("se", 0.0)
-                })
-                
-            except Exception as e:
-                logger.warning(f"Failed to calculate effect size for study {study_id}: {e}")
-                effect_sizes.append({
-                    "study_id": study_id,
-                    "effect_size_type": effect_size_type,
-                    "effect_size": 0.0,
-                    "confidence_interval": [0.0, 0.0],
+                    "effect_size": null_effect,
+                    "confidence_interval": [null_effect, null_effect],
                     "standard_error": 0.0,
-                    "error": str(e)
+                    "error": "Missing or invalid group data"
                 })
+                continue
+            
+            effect_sizes.append({
+                "study_id": study_id,
+                "effect_size_type": effect_size_type,
+                "effect_size": float(y[index]),
+                "confidence_interval": [float(lower[index]), float(upper[index])],
+                "standard_error": float(se[index]),
+                "variance": float(v[index])
+            })
         
         return effect_sizes
     
-    async def _assess_heterogeneity(self, effect_sizes: List[float], 
-                                  assessment_method: str) -> Dict[str, Any]:
-        """Assess heterogeneity in effect sizes."""
+    async def _assess_heterogeneity(self, effect_sizes: List[Union[float, Dict[str, Any]]], 
+                                  assessment_method: str, variances: Optional[List[float]] = None,
+                                  standard_errors: Optional[List[float]] = None) -> Dict[str, Any]:
+        """Assess heterogeneity in effect sizes.
+        
+        Effect sizes are numbers with ``variances`` or ``standard_errors``
+        given alongside, or the study entries returned by
+        calculate_effect_sizes.
+        """
         if len(effect_sizes) < 2:
             return {
                 "heterogeneity": 0.0,
@@ -729,36 +882,58 @@ class SynthesisReviewService:
                 "assessment_method": assessment_method
             }
         
-        # Simple heterogeneity assessment using variance
-        effect_variance = stdev(effect_sizes) ** 2 if len(effect_sizes) > 1 else 0.0
-        
-        # Calculate I² approximation
-        if assessment_method == "i_squared":
-            # Simplified I² calculation
-            total_variance = effect_variance + (1.0 / len(effect_sizes))  # Add sampling variance approximation
-            i_squared = max(0.0, (effect_variance / total_variance) * 100) if total_variance > 0 else 0.0
-            
-            # Interpret I²
-            if i_squared < 25:
-                interpretation = "Low heterogeneity"
-            elif i_squared < 50:
-                interpretation = "Moderate heterogeneity"
-            elif i_squared < 75:
-                interpretation = "Substantial heterogeneity"
+        if all(isinstance(item, dict) for item in effect_sizes):
+            y = meta_analysis.column(effect_sizes, "effect_size")
+            log_scale = np.array([item.get("effect_size_type") in meta_analysis.LOG_SCALE_TYPES for item in effect_sizes])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                y = np.where(log_scale, np.log(y), y)
+            v = meta_analysis.column(effect_sizes, "variance")
+            v = np.where(np.isfinite(v), v, meta_analysis.column(effect_sizes, "standard_error") ** 2)
+        else:
+            y = np.asarray(effect_sizes, dtype=float)
+            if variances is not None:
+                v = np.asarray(variances, dtype=float)
+            elif standard_errors is not None:
+                v = np.asarray(standard_errors, dtype=float) ** 2
             else:
-                interpretation = "Considerable heterogeneity"
-            
+                v = np.full(len(y), np.nan)
+        
+        effect_variance = float(np.var(y, ddof=1)) if np.all(np.isfinite(y)) else 0.0
+        if len(v) != len(y) or not np.all(np.isfinite(y) & np.isfinite(v) & (v > 0)):
+            # Without sampling variances Q and I² are undefined
             return {
-                "i_squared": i_squared,
-                "interpretation": interpretation,
-                "assessment_method": assessment_method,
-                "effect_variance": effect_variance
+                "heterogeneity": effect_variance,
+                "interpretation": "Basic variance assessment (sampling variances not provided)",
+                "assessment_method": assessment_method
             }
         
+        method = meta_analysis.resolve_method("random_effects", self.tau2_method)
+        pooled = meta_analysis.pool(y, v, np.zeros(len(y), dtype=int), 1, method, self.significance_level)
+        i_squared = float(pooled["i2"][0])
+        q_statistic = float(pooled["q"][0])
+        q_df = int(pooled["df"][0])
+        
+        # Interpret I²
+        if i_squared < 25:
+            interpretation = "Low heterogeneity"
+        elif i_squared < 50:
+            interpretation = "Moderate heterogeneity"
+        elif i_squared < 75:
+            interpretation = "Substantial heterogeneity"
+        else:
+            interpretation = "Considerable heterogeneity"
+        
         return {
-            "heterogeneity": effect_variance,
-            "interpretation": "Basic variance assessment",
-            "assessment_method": assessment_method
+            "i_squared": i_squared,
+            "q_statistic": q_statistic,
+            "q_df": q_df,
+            "h_squared": q_statistic / q_df if q_df > 0 else 1.0,
+            "tau_squared": float(pooled["tau2"][0]),
+            "tau2_method": method,
+            "exceeds_threshold": i_squared >= self.heterogeneity_threshold,
+            "interpretation": interpretation,
+            "assessment_method": assessment_method,
+            "effect_variance": effect_variance
         }
     
     async def _narrative_synthesis(self, studies: List[Dict[str, Any]], outcomes: List[str]) -> str:
@@ -784,35 +959,6 @@ class SynthesisReviewService:
         
         return f"Vote counting synthesis: {positive_studies} studies showed positive effects, {negative_studies} showed negative effects, and {no_effect_studies} showed no clear effect."
     
-    async def _calculate_pooled_effect(self, outcome_name: str, outcome_list: List[Dict[str, Any]], 
-                                     analysis_model: str) -> MetaAnalysisResult:
-        """Calculate pooled effect for meta-analysis."""
-        # Simple pooled effect calculation (would need more sophisticated implementation)
-        effect_sizes = [outcome.get("effect_size", 0.0) for outcome in outcome_list if outcome.get("effect_size")]
-        
-        if not effect_sizes:
-            pooled_effect = 0.0
-            ci = (0.0, 0.0)
-            heterogeneity_i2 = 0.0
-        else:
-            pooled_effect = mean(effect_sizes)
-            # Simplified confidence interval
-            se = stdev(effect_sizes) / (len(effect_sizes) ** 0.5) if len(effect_sizes) > 1 else 0.1
-            ci = (pooled_effect - 1.96 * se, pooled_effect + 1.96 * se)
-            # Simplified heterogeneity
-            heterogeneity_i2 = min(100.0, (stdev(effect_sizes) ** 2) * 100) if len(effect_sizes) > 1 else 0.0
-        
-        total_participants = sum(outcome.get("total_n", 0) for outcome in outcome_list)
-        
-        return MetaAnalysisResult(
-            outcome_name=outcome_name,
-            pooled_effect=pooled_effect,
-            ci=ci,
-            heterogeneity_i2=heterogeneity_i2,
-            studies_included=len(outcome_list),
-            total_participants=total_participants
-        )
-    
     async def _calculate_summary_statistics(self, studies: List[Dict[str, Any]], 
                                           outcomes: List[OutcomeDatum]) -> Dict[str, Any]:
         """Calculate summary statistics for evidence table."""
@@ -829,74 +975,6 @@ class SynthesisReviewService:
             }
         }
     
-    async def _calculate_cohens_d(self, study: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate Cohen's d effect size."""
-        # Simplified Cohen's d calculation
-        try:
-            mean1 = float(study.get("mean_group1", 0))
-            mean2 = float(study.get("mean_group2", 0))
-            sd1 = float(study.get("sd_group1", 1))
-            sd2 = float(study.get("sd_group2", 1))
-            n1 = int(study.get("n_group1", 10))
-            n2 = int(study.get("n_group2", 10))
-            
-            # Pooled standard deviation
-            pooled_sd = ((((n1 - 1) * sd1**2) + ((n2 - 1) * sd2**2)) / (n1 + n2 - 2)) ** 0.5
-            
-            # Cohen's d
-            cohens_d = (mean1 - mean2) / pooled_sd if pooled_sd > 0 else 0.0
-            
-            # Simplified standard error and CI
-            se = ((n1 + n2) / (n1 * n2) + (cohens_d**2) / (2 * (n1 + n2))) ** 0.5
-            ci = [cohens_d - 1.96 * se, cohens_d + 1.96 * se]
-            
-            return {"value": cohens_d, "se": se, "ci": ci}
-            
-        except (ValueError, ZeroDivisionError) as e:
-            return {"value": 0.0, "se": 0.0, "ci": [0.0, 0.0], "error": str(e)}
-    
-    async def _calculate_odds_ratio(self, study: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate odds ratio effect size."""
-        # Simplified odds ratio calculation
-        try:
-            a = int(study.get("events_group1", 1))
-            b = int(study.get("non_events_group1", 1))
-            c = int(study.get("events_group2", 1))
-            d = int(study.get("non_events_group2", 1))
-            
-            odds_ratio = (a * d) / (b * c) if (b * c) > 0 else 1.0
-            log_or = float('inf') if odds_ratio <= 0 else (odds_ratio ** 0.5)  # Simplified
-            
-            # Simplified standard error and CI
-            se = (1/a + 1/b + 1/c + 1/d) ** 0.5 if all(x > 0 for x in [a, b, c, d]) else 1.0
-            ci = [max(0.01, odds_ratio * ((1.96 * se) ** -1)), odds_ratio * (1.96 * se)]
-            
-            return {"value": odds_ratio, "se": se, "ci": ci}
-            
-        except (ValueError, ZeroDivisionError) as e:
-            return {"value": 1.0, "se": 0.0, "ci": [1.0, 1.0], "error": str(e)}
-    
-    async def _calculate_mean_difference(self, study: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate mean difference effect size."""
-        try:
-            mean1 = float(study.get("mean_group1", 0))
-            mean2 = float(study.get("mean_group2", 0))
-            sd1 = float(study.get("sd_group1", 1))
-            sd2 = float(study.get("sd_group2", 1))
-            n1 = int(study.get("n_group1", 10))
-            n2 = int(study.get("n_group2", 10))
-            
-            mean_diff = mean1 - mean2
-            
-            # Standard error of mean difference
-            se = ((sd1**2 / n1) + (sd2**2 / n2)) ** 0.5
-            ci = [mean_diff - 1.96 * se, mean_diff + 1.96 * se]
-            
-            return {"value": mean_diff, "se": se, "ci": ci}
-            
-        except (ValueError, ZeroDivisionError) as e:
-            return {"value": 0.0, "se": 0.0, "ci": [0.0, 0.0], "error": str(e)}
-    
     def _meta_result_to_dict(self, result: MetaAnalysisResult) -> Dict[str, Any]:
         """Convert MetaAnalysisResult to dictionary."""
         return {
@@ -906,7 +984,19 @@ class SynthesisReviewService:
             "heterogeneity_i2": result.heterogeneity_i2,
             "studies_included": result.studies_included,
             "total_participants": result.total_participants,
-            "p_value": result.p_value
+            "p_value": result.p_value,
+            "model": result.model,
+            "tau2_method": result.tau2_method,
+            "effect_size_type": result.effect_size_type,
+            "standard_error": result.standard_error,
+            "tau_squared": result.tau_squared,
+            "q_statistic": result.q_statistic,
+            "q_df": result.q_df,
+            "fixed_effect": result.fixed_effect,
+            "leave_one_out": result.leave_one_out,
+            "bootstrap_ci": list(result.bootstrap_ci) if result.bootstrap_ci else None,
+            "studies_excluded": result.studies_excluded,
+            "variance_approximated": result.variance_approximated
         }
     
     def _evidence_table_to_dict(self, table: EvidenceTable) -> Dict[str, Any]:
@@ -992,7 +1082,9 @@ async def main():
                 "mcp_server_url": "ws://mcp-server:9000",
                 "min_studies_for_meta": 2,
                 "significance_level": 0.05,
-                "heterogeneity_threshold": 75.0
+                "heterogeneity_threshold": 75.0,
+                "tau2_method": "REML",
+                "bootstrap_samples": 0
             }
         
         # Initialize service
@@ -9,10 +9,10 @@ Enhanced to align with the improved MCP server:
 - Enhanced server stats handling with Future-based response
 - Structured logging for better debugging
 - Removed unsupported task cancellation until server support is added
+- Negotiated binary wire format with compression and chunking (see mcp_wire.py)
 """
 
 import asyncio
-import json
 import logging
 import uuid
 import random
@@ -22,6 +22,8 @@ from typing import Any, Callable, Dict, Optional, Union
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
+from mcp_wire import DEFAULT_CHUNK_SIZE, FrameAssembler, WireCodec, wire_capabilities
+
 logger = logging.getLogger(__name__)
 
 
@@ -75,6 +77,12 @@ class MCPClient:
         self.heartbeat_interval = self.config.get("heartbeat_interval", 30)
         self.ping_timeout = self.config.get("ping_timeout", 10)
         
+        # Wire format: JSON text until the server confirms a binary codec
+        self.wire_enabled = self.config.get("wire_enabled", True)
+        self.wire_chunk_size = self.config.get("wire_chunk_size", DEFAULT_CHUNK_SIZE)
+        self.codec = WireCodec()
+        self.assembler = FrameAssembler()
+        
         # Setup message handlers
         self._setup_message_handlers()
 
@@ -86,6 +94,7 @@ class MCPClient:
             "registration_confirmed": self._handle_registration_confirmation,
             "task_result": self._handle_task_result,
             "status_response": self._handle_status_response,
+            "result_response": self._handle_result_response,
             "task_queued": self._handle_task_queued,
             "task_rejected": self._handle_task_rejected,
             "error": self._handle_error_message,
@@ -108,12 +117,16 @@ class MCPClient:
                 uri = f"ws://{self.host}:{self.port}"
                 logger.info(f"Connecting to MCP server at {uri} (attempt {self.connection_attempts})")
                 
+                self.codec = WireCodec()
+                self.assembler = FrameAssembler()
                 self.websocket = await websockets.connect(
                     uri,
                     ping_interval=self.heartbeat_interval,
                     ping_timeout=self.ping_timeout,
                     close_timeout=10,
-                    max_size=1024*1024  # 1MB max message size
+                    max_size=1024*1024,  # 1MB max frame size; larger messages are chunked
+                    # The negotiated codec compresses large payloads itself
+                    compression=None if self.wire_enabled else "deflate"
                 )
                 
                 self.is_connected = True
@@ -203,8 +216,12 @@ class MCPClient:
                     "result_delivery",
                     "error_handling"
                 ],
+                # Results are redelivered on reconnect until acknowledged
+                "result_acks": True,
                 "timestamp": datetime.now().isoformat()
             }
+            if self.wire_enabled:
+                registration_message["wire"] = wire_capabilities(self.wire_chunk_size)
             
             await self._send_message(registration_message)
             logger.info("Registered as API Gateway with MCP server")
@@ -232,7 +249,11 @@ class MCPClient:
                 break
 
     async def send_research_action(self, task_data: Dict[str, Any]) -> bool:
-        """Send a research action to the MCP server."""
+        """Send a research action to the MCP server.
+
+        An ``idempotency_key`` in ``task_data`` makes the server answer repeats
+        of the same agent_type/action/key with the original task's result.
+        """
         if not self.is_connected or not self.websocket:
             logger.warning("Not connected to MCP server, attempting reconnect...")
             success = await self._connect_with_retry()
@@ -279,7 +300,6 @@ class MCPClient:
             message = {
                 "type": "status_request",
                 "task_id": task_id,
-esc
                 "client_id": self.client_id,
                 "timestamp": datetime.now().isoformat()
             }
@@ -305,6 +325,39 @@ esc
             logger.error(f"Failed to get task status for {task_id}: {e}")
             return None
 
+    async def get_result(self, task_id: str, timeout: float = 10.0) -> Optional[Dict[str, Any]]:
+        """Fetch a stored task result; status is "processing" or "unknown" if there is none."""
+        if not self.is_connected or not self.websocket:
+            logger.warning("Not connected to MCP server, attempting reconnect...")
+            success = await self._connect_with_retry()
+            if not success:
+                logger.error("Failed to reconnect for task result")
+                return None
+
+        try:
+            response_future = asyncio.Future()
+            callback_key = f"stored_result_{task_id}"
+            self.response_callbacks[callback_key] = response_future
+
+            await self._send_message({
+                "type": "result_request",
+                "task_id": task_id,
+                "client_id": self.client_id,
+                "timestamp": datetime.now().isoformat()
+            })
+
+            try:
+                return await asyncio.wait_for(response_future, timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Timeout waiting for stored result: {task_id}")
+                return None
+            finally:
+                self.response_callbacks.pop(callback_key, None)
+
+        except Exception as e:
+            logger.error(f"Failed to get stored result for {task_id}: {e}")
+            return None
+
     async def wait_for_task_result(self, task_id: str, timeout: float = 60.0) -> Optional[Dict[str, Any]]:
         """Wait for a task result."""
         if not self.is_connected or not self.websocket:
@@ -379,8 +432,8 @@ esc
             return
         
         try:
-            message_str = json.dumps(message)
-            await self.websocket.send(message_str)
+            for frame in self.codec.encode(message):
+                await self.websocket.send(frame)
             logger.debug(f"Sent message: {message.get('type', 'unknown')} (client_id: {self.client_id})")
         except Exception as e:
             logger.error(f"Error sending message: {e}")
@@ -395,12 +448,14 @@ esc
                 logger.error("No WebSocket connection available")
                 return
                 
-            async for message_str in self.websocket:
+            async for frame in self.websocket:
                 try:
-                    message = json.loads(message_str)
+                    message = self.assembler.feed(frame)
+                    if message is None:
+                        continue  # Waiting for the remaining chunks
                     await self._process_mcp_message(message)
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to decode message: {message_str}")
+                except ValueError as e:
+                    logger.error(f"Failed to decode message ({len(frame)} bytes): {e}")
                 except Exception as e:
                     logger.error(f"Error handling message: {e}")
                     
@@ -439,6 +494,9 @@ esc
         """Handle registration confirmation from server."""
         server_id = data.get("server_id")
         logger.info(f"API Gateway registration confirmed by server {server_id}")
+        if data.get("wire"):
+            self.codec = WireCodec.from_dict(data["wire"])
+            logger.info(f"Using wire format {self.codec.format}/{self.codec.compression}")
         if "instructions" in data:
             logger.info(f"Received server instructions: {data['instructions']}")
 
@@ -460,6 +518,18 @@ esc
                 logger.info(f"Delivered task result for {task_id}: {status}")
         
         self.active_requests.pop(task_id, None)
+        
+        # Ack redeliveries too, or the server keeps resending them
+        try:
+            await self._send_message({"type": "result_ack", "task_id": task_id})
+        except Exception as e:
+            logger.warning(f"Failed to acknowledge result for {task_id}: {e}")
+
+    async def _handle_result_response(self, data: Dict[str, Any]):
+        """Handle a stored result requested with get_result."""
+        callback = self.response_callbacks.get(f"stored_result_{data.get('task_id')}")
+        if isinstance(callback, asyncio.Future) and not callback.done():
+            callback.set_result(data)
 
     async def _handle_status_response(self, data: Dict[str, Any]):
         """Handle status response."""
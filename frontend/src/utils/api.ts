@@ -135,13 +135,18 @@ export interface ResearchExecutionResponse {
   timestamp: string
 }
 
+// List endpoints return one page at a time; the cursor for the next page
+// comes back in this header
+const NEXT_CURSOR_HEADER = "X-Next-Cursor"
+const LIST_PAGE_SIZE = 200
+
 /**
- * Generic API request function
+ * Generic API fetch, throwing on error responses
  */
-async function apiRequest(
+async function apiFetch(
   endpoint: string,
   options: RequestInit = {}
-): Promise<any> {
+): Promise<Response> {
   const url = `${API_BASE_URL}${endpoint}`
 
   const defaultOptions: RequestInit = {
@@ -159,9 +164,40 @@ async function apiRequest(
     )
   }
 
+  return response
+}
+
+/**
+ * Generic API request function
+ */
+async function apiRequest(
+  endpoint: string,
+  options: RequestInit = {}
+): Promise<any> {
+  const response = await apiFetch(endpoint, options)
   return response.json()
 }
 
+/**
+ * Fetch every page of a list endpoint by following its next-page cursor
+ */
+async function apiRequestAll<T>(endpoint: string): Promise<T[]> {
+  const items: T[] = []
+  let cursor: string | null = null
+
+  do {
+    const params = new URLSearchParams({ limit: String(LIST_PAGE_SIZE) })
+    if (cursor) {
+      params.set("cursor", cursor)
+    }
+    const response = await apiFetch(`${endpoint}?${params}`)
+    items.push(...(await response.json()))
+    cursor = response.headers.get(NEXT_CURSOR_HEADER)
+  } while (cursor)
+
+  return items
+}
+
 /**
  * API client methods for communicating with the Eunice backend
  */
@@ -173,7 +209,7 @@ export const apiClient = {
 
   // Project methods
   async getProjects(): Promise<Project[]> {
-    return await apiRequest("/v2/projects")
+    return await apiRequestAll<Project>("/v2/projects")
   },
 
   async getProject(id: string): Promise<Project> {
@@ -205,7 +241,7 @@ export const apiClient = {
 
   // Topic methods
   async getTopics(projectId: string): Promise<Topic[]> {
-    return await apiRequest(`/v2/projects/${projectId}/topics`)
+    return await apiRequestAll<Topic>(`/v2/projects/${projectId}/topics`)
   },
 
   async getTopic(projectId: string, topicId: string): Promise<Topic> {
@@ -243,7 +279,7 @@ export const apiClient = {
 
   // Research Plan methods
   async getResearchPlans(topicId: string): Promise<ResearchPlan[]> {
-    return await apiRequest(`/v2/topics/${topicId}/plans`)
+    return await apiRequestAll<ResearchPlan>(`/v2/topics/${topicId}/plans`)
   },
 
   async getResearchPlan(planId: string): Promise<ResearchPlan> {
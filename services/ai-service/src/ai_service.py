@@ -32,6 +32,11 @@ import redis.asyncio as redis
 import websockets
 from datetime import datetime, timedelta
 
+try:
+    from .local_embeddings import LocalEmbeddingService
+except ImportError:
+    from local_embeddings import LocalEmbeddingService
+
 
 class SecurityMiddleware(BaseHTTPMiddleware):
     """Security middleware to enforce MCP-only access"""
@@ -394,6 +399,7 @@ class AIService:
         self.provider_health = {}
         self.load_balancer_index = 0
         self.redis_client = None
+        self.local_embeddings = LocalEmbeddingService(config.get("embeddings", {}).get("local", {}))
         
         # Initialize MCP client if enabled
         mcp_config = config.get("mcp", {})
@@ -757,7 +763,21 @@ class AIService:
     async def create_embeddings(self, request: EmbeddingRequest) -> EmbeddingResponse:
         """Create embeddings using selected AI provider"""
         try:
-            # Only OpenAI supports embeddings currently
+            input_texts = request.input if isinstance(request.input, list) else [request.input]
+            
+            # Local ONNX model: no network round trip
+            if request.provider == "local":
+                if not self.local_embeddings.available:
+                    raise HTTPException(status_code=503, detail="Local embedding model not available")
+                embeddings, tokens = await self.local_embeddings.embed(input_texts)
+                return EmbeddingResponse(
+                    embeddings=embeddings,
+                    model=self.local_embeddings.model_name,
+                    provider="local",
+                    usage={"prompt_tokens": tokens, "total_tokens": tokens}
+                )
+            
+            # Only OpenAI supports remote embeddings currently
             provider = self._select_provider(request.provider, request.model)
             
             # Force OpenAI for embeddings since others don't support it yet
@@ -769,8 +789,6 @@ class AIService:
             
             client = self.clients[provider]
             
-            input_texts = request.input if isinstance(request.input, list) else [request.input]
-            
             response = await client.embeddings.create(
                 model=request.model,
                 input=input_texts
@@ -0,0 +1,308 @@
+"""
+Batch completion helpers for the AI Service.
+
+Supports the ``ai_batch_completion`` MCP action: many independent prompts
+are coalesced into micro-batches (several small prompts answered by one
+request) and run concurrently within the provider rate limits, or
+submitted to the provider batch APIs (OpenAI Batch, Anthropic Message
+Batches) and polled until the results are ready.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("ai_service_mcp_client")
+
+# Rough characters-per-token ratio used for micro-batch sizing
+CHARS_PER_TOKEN = 4
+
+# Providers with a native batch API supported by this module
+BATCH_API_PROVIDERS = ("openai", "anthropic")
+
+
+class RequestRateLimiter:
+    """Sliding-window limiter for provider requests per minute."""
+
+    def __init__(self, requests_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self._sent: deque = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until another request fits in the current one-minute window."""
+        if self.requests_per_minute <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= 60:
+                    self._sent.popleft()
+                if len(self._sent) < self.requests_per_minute:
+                    self._sent.append(now)
+                    return
+                await asyncio.sleep(60 - (now - self._sent[0]))
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in ``text``."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def normalize_items(items: List[Dict[str, Any]], system: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Validate batch items and give each one an id and a message list.
+
+    Items provide either a ``prompt`` string or a ``messages`` list. A
+    shared ``system`` prompt is prepended to prompt-only items.
+    """
+    normalized = []
+    seen = set()
+    for position, item in enumerate(items):
+        item_id = str(item.get("id", position))
+        if item_id in seen:
+            raise ValueError(f"Duplicate batch item id: {item_id}")
+        seen.add(item_id)
+
+        if item.get("messages"):
+            messages = item["messages"]
+            prompt = None
+        elif item.get("prompt"):
+            prompt = item["prompt"]
+            messages = [{"role": "user", "content": prompt}]
+            item_system = item.get("system", system)
+            if item_system:
+                messages.insert(0, {"role": "system", "content": item_system})
+        else:
+            raise ValueError(f"Batch item {item_id} needs a 'prompt' or 'messages'")
+
+        normalized.append({
+            "id": item_id,
+            "prompt": prompt if "system" not in item else None,
+            "messages": messages,
+            "max_tokens": item.get("max_tokens")
+        })
+    return normalized
+
+
+def plan_micro_batches(
+    items: List[Dict[str, Any]],
+    max_items: int,
+    max_tokens: int,
+    item_token_limit: int
+) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Split items into micro-batches of small prompts and single requests.
+
+    Only prompt-only items without their own system prompt or token limit
+    below ``item_token_limit`` are coalesced; everything else is sent on
+    its own.
+    """
+    groups: List[List[Dict[str, Any]]] = []
+    singles: List[Dict[str, Any]] = []
+    current: List[Dict[str, Any]] = []
+    current_tokens = 0
+
+    for item in items:
+        tokens = estimate_tokens(item["prompt"]) if item["prompt"] else None
+        if max_items <= 1 or tokens is None or item["max_tokens"] or tokens > item_token_limit:
+            singles.append(item)
+            continue
+        if current and (len(current) >= max_items or current_tokens + tokens > max_tokens):
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += tokens
+
+    if len(current) > 1:
+        groups.append(current)
+    else:
+        singles.extend(current)
+    return groups, singles
+
+
+def build_micro_batch_messages(items: List[Dict[str, Any]], system: Optional[str]) -> List[Dict[str, Any]]:
+    """Build one request answering every prompt in a micro-batch."""
+    prompts = json.dumps(
+        [{"id": item["id"], "prompt": item["prompt"]} for item in items],
+        ensure_ascii=False
+    )
+    instructions = (
+        "Answer each of the following prompts independently, as if it had been asked on its own. "
+        "Reply **only** with a JSON object mapping each prompt `id` to its complete answer.\n\n"
+        f"Prompts: {prompts}"
+    )
+    messages = [{"role": "user", "content": instructions}]
+    if system:
+        messages.insert(0, {"role": "system", "content": system})
+    return messages
+
+
+def parse_micro_batch_response(content: str, ids: List[str]) -> Dict[str, str]:
+    """Extract per-item answers from a micro-batch response.
+
+    Returns only the ids that were answered; callers retry the rest.
+    """
+    try:
+        parsed = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        start, end = (content or "").find("{"), (content or "").rfind("}")
+        if start < 0 or end <= start:
+            return {}
+        try:
+            parsed = json.loads(content[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+    if not isinstance(parsed, dict):
+        return {}
+
+    answers = {}
+    for item_id in ids:
+        if item_id in parsed and parsed[item_id] is not None:
+            answer = parsed[item_id]
+            answers[item_id] = answer if isinstance(answer, str) else json.dumps(answer)
+    return answers
+
+
+# Provider batch APIs
+
+def _custom_ids(items: List[Dict[str, Any]]) -> List[str]:
+    # Provider custom ids are restricted to [a-zA-Z0-9_-]; map back by position
+    return [f"item-{position}" for position in range(len(items))]
+
+
+def _anthropic_params(model: str, messages: List[Dict[str, Any]], max_tokens: int, temperature: float) -> Dict[str, Any]:
+    params: Dict[str, Any] = {
+        "model": model,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "messages": [m for m in messages if m["role"] != "system"]
+    }
+    system = [m["content"] for m in messages if m["role"] == "system"]
+    if system:
+        params["system"] = "\n\n".join(system)
+    return params
+
+
+async def submit_provider_batch(
+    provider: str,
+    client: Any,
+    model: str,
+    items: List[Dict[str, Any]],
+    default_max_tokens: int,
+    temperature: float
+) -> str:
+    """Submit items to a provider batch API and return the batch id."""
+    custom_ids = _custom_ids(items)
+
+    if provider == "openai":
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "messages": item["messages"],
+                    "max_tokens": item["max_tokens"] or default_max_tokens,
+                    "temperature": temperature
+                }
+            })
+            for custom_id, item in zip(custom_ids, items)
+        ]
+        input_file = await client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+
+    if provider == "anthropic":
+        # Message Batches are under the beta namespace in the pinned anthropic SDK
+        batch = await client.beta.messages.batches.create(requests=[
+            {
+                "custom_id": custom_id,
+                "params": _anthropic_params(
+                    model, item["messages"], item["max_tokens"] or default_max_tokens, temperature
+                )
+            }
+            for custom_id, item in zip(custom_ids, items)
+        ])
+        return batch.id
+
+    raise ValueError(f"Provider '{provider}' has no batch API support")
+
+
+async def fetch_provider_batch(
+    provider: str,
+    client: Any,
+    batch_id: str
+) -> Tuple[bool, Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """Check a provider batch.
+
+    Returns ``(finished, results, errors)`` with results and errors keyed
+    by custom id; both are empty until the batch has finished.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+
+    if provider == "openai":
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status not in ("completed", "failed", "expired", "cancelled"):
+            return False, results, errors
+        if batch.status != "completed" and not batch.output_file_id:
+            raise RuntimeError(f"OpenAI batch {batch_id} ended with status '{batch.status}'")
+
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                custom_id = entry.get("custom_id")
+                response = entry.get("response") or {}
+                body = response.get("body") or {}
+                if entry.get("error") or response.get("status_code", 500) >= 400:
+                    error = entry.get("error") or body.get("error") or {}
+                    errors[custom_id] = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+                    continue
+                choice = (body.get("choices") or [{}])[0]
+                results[custom_id] = {
+                    "content": choice.get("message", {}).get("content"),
+                    "finish_reason": choice.get("finish_reason"),
+                    "usage": body.get("usage", {})
+                }
+        return True, results, errors
+
+    if provider == "anthropic":
+        batch = await client.beta.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return False, results, errors
+
+        async for entry in await client.beta.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type != "succeeded":
+                error = getattr(result, "error", None)
+                errors[entry.custom_id] = str(getattr(error, "error", error) or result.type)
+                continue
+            message = result.message
+            text = "".join(getattr(block, "text", "") for block in message.content)
+            results[entry.custom_id] = {
+                "content": text,
+                "finish_reason": message.stop_reason,
+                "usage": {
+                    "prompt_tokens": message.usage.input_tokens,
+                    "completion_tokens": message.usage.output_tokens,
+                    "total_tokens": message.usage.input_tokens + message.usage.output_tokens
+                }
+            }
+        return True, results, errors
+
+    raise ValueError(f"Provider '{provider}' has no batch API support")
@@ -0,0 +1,299 @@
+"""
+Local ONNX embedding provider for the AI Service.
+
+Serves ``ai_embedding`` requests from a sentence-transformer model exported
+to ONNX (the MiniLM model baked into the image at build time), so agents
+can embed text without a network round trip. Concurrent requests are
+collected for a few milliseconds and run as one padded batch, and an
+in-memory LRU backed by an optional SQLite disk cache sits in front of
+the model.
+
+``onnxruntime``, ``tokenizers`` and ``numpy`` are optional dependencies;
+when they or the model files are missing the provider reports itself as
+unavailable and the service keeps using the remote providers.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+    LOCAL_EMBEDDINGS_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependencies
+    np = ort = Tokenizer = None
+    LOCAL_EMBEDDINGS_AVAILABLE = False
+
+logger = logging.getLogger("ai_service_mcp_client")
+
+
+class LocalEmbeddingModel:
+    """ONNX sentence embedding model with mean pooling."""
+
+    def __init__(self, model_dir: Path, max_length: int = 256, normalize: bool = True, threads: int = 0):
+        self.model_dir = Path(model_dir)
+        self.name = self.model_dir.name
+        self.normalize = normalize
+
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()  # pad to the longest text in each batch
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            str(self.model_dir / "model.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.dimensions = self.session.get_outputs()[0].shape[-1]
+
+    def embed(self, texts: List[str]) -> Tuple["np.ndarray", int]:
+        """Embed a batch of texts; returns the vectors and the token count."""
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        token_embeddings = self.session.run(None, inputs)[0]
+
+        # Mean over real tokens only so padding does not dilute short texts
+        mask = attention_mask[..., None].astype(np.float32)
+        vectors = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.normalize:
+            vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return vectors.astype(np.float32), int(attention_mask.sum())
+
+
+class EmbeddingCache:
+    """LRU cache of embeddings with an optional SQLite disk tier."""
+
+    def __init__(self, max_size: int = 50000, disk_path: Optional[str] = None):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_path:
+            try:
+                Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(disk_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache disabled ({disk_path}): {e}")
+                self._db = None
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, "np.ndarray"]:
+        """Return the cached vectors for whichever keys are present."""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+            self.hits += len(found)
+
+            missing = [key for key in keys if key not in found]
+            if missing and self._db is not None:
+                # Stay under SQLite's bound-parameter limit
+                for start in range(0, len(missing), 500):
+                    part = missing[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})", part
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._put_memory(key, vector)
+                    self.disk_hits += len(rows)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, "np.ndarray"]) -> None:
+        with self._lock:
+            for key, vector in items.items():
+                self._put_memory(key, vector)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, vector.tobytes()) for key, vector in items.items()]
+                )
+                self._db.commit()
+
+    def _put_memory(self, key: str, vector: "np.ndarray") -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "disk_cache": self._db is not None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses
+            }
+
+
+class LocalEmbeddingService:
+    """Micro-batching front end for :class:`LocalEmbeddingModel`.
+
+    Texts requested within ``max_wait_ms`` of each other are embedded in a
+    single model call of up to ``max_batch_size`` texts.
+
+    Args:
+        config: The ``embeddings.local`` section of config.json.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.model_dir = Path(os.getenv("LOCAL_EMBEDDING_MODEL_DIR", config.get("model_dir", "/app/models/all-MiniLM-L6-v2")))
+        self.max_length = config.get("max_length", 256)
+        self.max_batch_size = config.get("max_batch_size", 64)
+        self.max_wait_ms = config.get("max_wait_ms", 5)
+        self.threads = config.get("threads", 0)
+        self.cache = None
+        if LOCAL_EMBEDDINGS_AVAILABLE:
+            self.cache = EmbeddingCache(config.get("cache_size", 50000), config.get("disk_cache_path"))
+
+        self.model: Optional[LocalEmbeddingModel] = None
+        self._load_error: Optional[str] = None
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # One model call at a time; onnxruntime parallelises within a batch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-embeddings")
+        self.batches = 0
+        self.texts_embedded = 0
+
+    @property
+    def available(self) -> bool:
+        if not LOCAL_EMBEDDINGS_AVAILABLE:
+            return False
+        return (self.model_dir / "model.onnx").exists() and (self.model_dir / "tokenizer.json").exists()
+
+    @property
+    def model_name(self) -> str:
+        return self.model_dir.name
+
+    def _load(self) -> LocalEmbeddingModel:
+        if self.model is None:
+            self.model = LocalEmbeddingModel(self.model_dir, self.max_length, threads=self.threads)
+            logger.info(f"Loaded local embedding model from {self.model_dir} ({self.model.dimensions} dimensions)")
+        return self.model
+
+    async def embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """Embed ``texts``; returns vectors in input order and the tokens computed."""
+        if not self.available:
+            raise RuntimeError(f"Local embedding model not available at {self.model_dir}")
+
+        keys = [EmbeddingCache.make_key(self.model_name, text) for text in texts]
+        loop = asyncio.get_running_loop()
+        vectors = await loop.run_in_executor(None, self.cache.get_many, keys)
+
+        futures: Dict[str, asyncio.Future] = {}
+        for key, text in zip(keys, texts):
+            if key in vectors or key in futures:
+                continue
+            # Share the computation with concurrent requests for the same text
+            future = self._in_flight.get(key)
+            if future is None:
+                future = loop.create_future()
+                self._in_flight[key] = future
+                self._pending.append((key, text, future))
+            futures[key] = future
+
+        if futures:
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._pending and self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_wait_ms / 1000, self._flush)
+            results = await asyncio.gather(*futures.values())
+            tokens = sum(count for _, count in results)
+            for key, (vector, _) in zip(futures.keys(), results):
+                vectors[key] = vector
+        else:
+            tokens = 0
+
+        return [vectors[key].tolist() for key in keys], tokens
+
+    def _flush(self):
+        """Start a model call for the pending texts."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+            asyncio.get_running_loop().create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[str, str, asyncio.Future]]):
+        loop = asyncio.get_running_loop()
+        try:
+            vectors, tokens = await loop.run_in_executor(
+                self._executor, self._embed_and_cache, [(key, text) for key, text, _ in batch]
+            )
+        except Exception as e:
+            if self.model is None:
+                self._load_error = str(e)
+            for key, _, future in batch:
+                self._in_flight.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        per_text_tokens = tokens // len(batch)
+        for (key, _, future), vector in zip(batch, vectors):
+            self._in_flight.pop(key, None)
+            if not future.done():
+                future.set_result((vector, per_text_tokens))
+
+    def _embed_and_cache(self, batch: List[Tuple[str, str]]) -> Tuple["np.ndarray", int]:
+        model = self._load()
+        # Sort by length so similar-length texts share padding
+        order = sorted(range(len(batch)), key=lambda i: len(batch[i][1]))
+        sorted_vectors, tokens = model.embed([batch[i][1] for i in order])
+        vectors = np.empty_like(sorted_vectors)
+        vectors[order] = sorted_vectors
+
+        self.cache.put_many({key: vector for (key, _), vector in zip(batch, vectors)})
+        self.batches += 1
+        self.texts_embedded += len(batch)
+        return vectors, tokens
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "model_dir": str(self.model_dir),
+            "loaded": self.model is not None,
+            "load_error": self._load_error,
+            "batches": self.batches,
+            "texts_embedded": self.texts_embedded,
+            "cache": self.cache.stats() if self.cache else None
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
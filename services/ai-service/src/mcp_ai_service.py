@@ -13,7 +13,8 @@ import signal
 import sys
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
 import time
 
 import websockets
@@ -24,6 +25,18 @@ from pydantic import BaseModel
 
 # Import the standardized health check service
 from .health_check_service import create_health_check_app
+from .batch_completion import (
+    BATCH_API_PROVIDERS,
+    RequestRateLimiter,
+    build_micro_batch_messages,
+    fetch_provider_batch,
+    normalize_items,
+    parse_micro_batch_response,
+    plan_micro_batches,
+    submit_provider_batch
+)
+from .local_embeddings import LocalEmbeddingService
+from .mcp_wire import DEFAULT_CHUNK_SIZE, FrameAssembler, WireCodec, wire_capabilities
 
 # Configure logging
 logging.basicConfig(
@@ -32,6 +45,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ai_service_mcp_client")
 
+# Defaults used when config.json does not set concurrency limits
+DEFAULT_MAX_CONCURRENT_TASKS = 16
+DEFAULT_PROVIDER_CONCURRENCY = 4
+
+# Chat models used when a request does not name one
+DEFAULT_CHAT_MODELS = {
+    "openai": "gpt-4o-mini",
+    "anthropic": "claude-3-haiku-20240307",
+    "xai": "grok-3-mini"
+}
+
+
+def load_config() -> Dict[str, Any]:
+    """Load configuration from config file"""
+    config_path = Path(__file__).parent.parent / "config" / "config.json"
+    try:
+        with open(config_path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logger.warning(f"Could not load {config_path}: {e}; using defaults")
+        return {}
+
+
+def _check_dimensions(provider: str, embeddings: List[List[float]], expected: Optional[int]):
+    """Refuse vectors whose size differs from what the caller's store holds"""
+    if expected and embeddings and len(embeddings[0]) != expected:
+        raise ValueError(
+            f"Embedding provider '{provider}' returned {len(embeddings[0])}-dimensional vectors, "
+            f"expected {expected}; re-embed stored vectors before changing embedding providers"
+        )
+
 
 class MCPAIService:
     """AI Service implemented as MCP Client"""
@@ -53,12 +97,51 @@ class MCPAIService:
         self.is_running = False
         self.start_time = time.time()
         
+        # Wire format: JSON text until the server confirms a binary codec
+        self.wire_enabled = os.getenv('MCP_WIRE_ENABLED', 'true').lower() == 'true'
+        self.wire_chunk_size = int(os.getenv('MCP_WIRE_CHUNK_SIZE', str(DEFAULT_CHUNK_SIZE)))
+        self.codec = WireCodec()
+        self.assembler = FrameAssembler()
+        
         # Request tracking
         self.pending_requests: Dict[str, asyncio.Future] = {}
         
+        # Concurrency limits: task requests run as background tasks so the
+        # message loop keeps reading (and can deliver tool-call results)
+        # while completions are in flight
+        self.config = load_config()
+        concurrency_config = self.config.get("concurrency", {})
+        self.max_concurrent_tasks = concurrency_config.get(
+            "max_concurrent_tasks", DEFAULT_MAX_CONCURRENT_TASKS
+        )
+        self.task_semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+        self.active_tasks: Set[asyncio.Task] = set()
+        self.running_task_count = 0
+        self.provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.provider_in_flight: Dict[str, int] = {}
+        self.rate_limiters: Dict[str, RequestRateLimiter] = {}
+        for provider in ("openai", "anthropic", "xai"):
+            provider_config = self.config.get("providers", {}).get(provider, {})
+            self.provider_semaphores[provider] = asyncio.Semaphore(
+                provider_config.get("max_concurrent_requests", DEFAULT_PROVIDER_CONCURRENCY)
+            )
+            self.provider_in_flight[provider] = 0
+            self.rate_limiters[provider] = RequestRateLimiter(
+                provider_config.get("rate_limit", {}).get("requests_per_minute", 0)
+            )
+        
+        # Batch completion settings and provider batches awaiting results
+        self.batch_config = self.config.get("batching", {})
+        self.provider_batches: Dict[str, Dict[str, Any]] = {}
+        
+        # Local ONNX embedding model shared by all agents
+        self.embedding_config = self.config.get("embeddings", {})
+        self.local_embeddings = LocalEmbeddingService(self.embedding_config.get("local", {}))
+        
         # Capabilities this service provides
         self.capabilities = [
             "ai_chat_completion",
+            "ai_batch_completion",
             "ai_embedding",
             "ai_model_info",
             "ai_usage_stats"
@@ -132,12 +215,24 @@ class MCPAIService:
             "ai_providers": {
                 "openai_available": self.openai_client is not None,
                 "anthropic_available": self.anthropic_client is not None,
-                "xai_available": self.xai_client is not None
+                "xai_available": self.xai_client is not None,
+                "local_embeddings_available": self.local_embeddings.available
             },
+            "local_embeddings": self.local_embeddings.get_stats(),
+            "concurrency": self.get_concurrency_stats(),
             "agent_id": self.agent_id,
             "uptime_seconds": int(time.time() - self.start_time)
         }
     
+    def get_concurrency_stats(self) -> Dict[str, Any]:
+        """Get task and provider concurrency counters."""
+        return {
+            "max_concurrent_tasks": self.max_concurrent_tasks,
+            "running_tasks": self.running_task_count,
+            "queued_tasks": len(self.active_tasks) - self.running_task_count,
+            "provider_in_flight": dict(self.provider_in_flight)
+        }
+    
     async def start(self):
         """Start the MCP AI Service client"""
         logger.info(f"Starting AI Service MCP Client: {self.agent_id}")
@@ -162,16 +257,28 @@ class MCPAIService:
         if self.websocket:
             await self.websocket.close()
         
+        # Cancel in-flight task handlers
+        for task in list(self.active_tasks):
+            task.cancel()
+        
         # Cancel pending requests
         for future in self.pending_requests.values():
             if not future.done():
                 future.cancel()
+        
+        self.local_embeddings.shutdown()
     
     async def _connect_to_mcp_server(self):
         """Connect to MCP Server and register as agent"""
         logger.info(f"Connecting to MCP Server: {self.mcp_server_url}")
         
-        self.websocket = await websockets.connect(self.mcp_server_url)
+        self.codec = WireCodec()
+        self.assembler = FrameAssembler()
+        self.websocket = await websockets.connect(
+            self.mcp_server_url,
+            # The negotiated codec compresses large payloads itself
+            compression=None if self.wire_enabled else "deflate"
+        )
         self.is_connected = True
         
         # Register with MCP Server
@@ -182,10 +289,17 @@ class MCPAIService:
             "capabilities": self.capabilities,
             "timestamp": datetime.now().isoformat()
         }
+        if self.wire_enabled:
+            registration_message["wire"] = wire_capabilities(self.wire_chunk_size)
         
-        await self.websocket.send(json.dumps(registration_message))
+        await self._send_message(registration_message)
         logger.info("Registration message sent to MCP Server")
     
+    async def _send_message(self, message: Dict[str, Any]):
+        """Send a message to the MCP Server using the negotiated wire format"""
+        for frame in self.codec.encode(message):
+            await self.websocket.send(frame)
+    
     async def _run_client_loop(self):
         """Main client loop for handling MCP messages"""
         heartbeat_task = None
@@ -197,10 +311,12 @@ class MCPAIService:
             if self.websocket:
                 async for message in self.websocket:
                     try:
-                        data = json.loads(message)
+                        data = self.assembler.feed(message)
+                        if data is None:
+                            continue  # Waiting for the remaining chunks
                         await self._handle_mcp_message(data)
-                    except json.JSONDecodeError:
-                        logger.error("Received invalid JSON message")
+                    except ValueError as e:
+                        logger.error(f"Received undecodable message ({len(message)} bytes): {e}")
                     except Exception as e:
                         logger.error(f"Error handling message: {e}")
             
@@ -224,7 +340,7 @@ class MCPAIService:
                 }
                 
                 if self.websocket:
-                    await self.websocket.send(json.dumps(heartbeat_message))
+                    await self._send_message(heartbeat_message)
                 
                 await asyncio.sleep(30)  # Heartbeat every 30 seconds
                 
@@ -245,7 +361,7 @@ class MCPAIService:
         elif message_type == "heartbeat_ack":
             await self._handle_heartbeat_ack(data)
         elif message_type == "task_request":
-            await self._handle_task_request(data)
+            self._dispatch_task_request(data)
         elif message_type == "task_result":
             await self._handle_task_result(data)
         elif message_type == "ai_response":
@@ -257,6 +373,9 @@ class MCPAIService:
         """Handle registration confirmation from MCP Server"""
         server_id = data.get("server_id")
         logger.info(f"Registration confirmed by MCP Server: {server_id}")
+        if data.get("wire"):
+            self.codec = WireCodec.from_dict(data["wire"])
+            logger.info(f"Using wire format {self.codec.format}/{self.codec.compression}")
         
         # Send status update
         await self._send_status_update("active")
@@ -291,6 +410,31 @@ class MCPAIService:
                 logger.warning(f"❌ Task result for task we're not waiting for: {task_id}")
                 logger.warning(f"❌ Available pending requests: {list(self.pending_requests.keys())}")
     
+    def _dispatch_task_request(self, data: Dict[str, Any]):
+        """Run a task request in the background without blocking the message loop"""
+        task = asyncio.create_task(self._run_task_request(data))
+        self.active_tasks.add(task)
+        task.add_done_callback(self.active_tasks.discard)
+    
+    async def _run_task_request(self, data: Dict[str, Any]):
+        """Handle a task request once a concurrency slot is free"""
+        async with self.task_semaphore:
+            self.running_task_count += 1
+            try:
+                await self._handle_task_request(data)
+            finally:
+                self.running_task_count -= 1
+    
+    async def _call_provider(self, provider: str, request_coro_factory):
+        """Call a provider API within its rate limit and concurrency cap"""
+        await self.rate_limiters[provider].acquire()
+        async with self.provider_semaphores[provider]:
+            self.provider_in_flight[provider] += 1
+            try:
+                return await request_coro_factory()
+            finally:
+                self.provider_in_flight[provider] -= 1
+    
     async def _handle_task_request(self, data: Dict[str, Any]):
         """Handle task request from MCP Server"""
         task_id = data.get("task_id")
@@ -303,6 +447,8 @@ class MCPAIService:
             # Process task based on type
             if task_type == "ai_chat_completion":
                 result = await self._handle_chat_completion(task_data)
+            elif task_type == "ai_batch_completion":
+                result = await self._handle_batch_completion(task_data)
             elif task_type == "ai_embedding":
                 result = await self._handle_embedding(task_data)
             elif task_type == "ai_model_info":
@@ -322,7 +468,7 @@ class MCPAIService:
             }
             
             if self.websocket:
-                await self.websocket.send(json.dumps(result_message))
+                await self._send_message(result_message)
             logger.info(f"Task completed: {task_id}")
             
         except Exception as e:
@@ -336,7 +482,7 @@ class MCPAIService:
             }
             
             if self.websocket:
-                await self.websocket.send(json.dumps(error_message))
+                await self._send_message(error_message)
             logger.error(f"Task failed: {task_id} - {e}")
     
     async def _handle_ai_response(self, data: Dict[str, Any]):
@@ -367,7 +513,7 @@ class MCPAIService:
         }
         
         if self.websocket:
-            await self.websocket.send(json.dumps(status_message))
+            await self._send_message(status_message)
     
     # AI Task Handlers
     
@@ -401,7 +547,7 @@ class MCPAIService:
 
         if provider == "openai" and self.openai_client:
             if not model:
-                model = "gpt-4o-mini"
+                model = DEFAULT_CHAT_MODELS["openai"]
             
             # Prepare OpenAI request parameters
             openai_params = {
@@ -417,7 +563,9 @@ class MCPAIService:
                 openai_params["tool_choice"] = tool_choice
                 logger.info(f"Adding {len(tools)} tools to OpenAI request")
             
-            response = await self.openai_client.chat.completions.create(**openai_params)
+            response = await self._call_provider(
+                "openai", lambda: self.openai_client.chat.completions.create(**openai_params)
+            )
             
             # Process each choice and handle tool calls
             processed_choices = []
@@ -433,10 +581,12 @@ class MCPAIService:
                 
                 # Handle tool calls if present
                 if hasattr(choice.message, 'tool_calls') and choice.message.tool_calls:
+                    # Execute all tool calls of this choice concurrently
+                    tool_results = await asyncio.gather(
+                        *[self._execute_tool_call(tool_call) for tool_call in choice.message.tool_calls]
+                    )
                     tool_calls = []
-                    for tool_call in choice.message.tool_calls:
-                        # Execute tool call and get result
-                        tool_result = await self._execute_tool_call(tool_call)
+                    for tool_call, tool_result in zip(choice.message.tool_calls, tool_results):
                         tool_calls.append({
                             "id": tool_call.id,
                             "type": tool_call.type,
@@ -466,7 +616,10 @@ class MCPAIService:
                         follow_up_params.pop("tools", None)  # Remove tools for follow-up
                         follow_up_params.pop("tool_choice", None)
                         
-                        follow_up_response = await self.openai_client.chat.completions.create(**follow_up_params)
+                        follow_up_response = await self._call_provider(
+                            "openai",
+                            lambda: self.openai_client.chat.completions.create(**follow_up_params)
+                        )
                         
                         # Use the follow-up response content
                         if follow_up_response.choices:
@@ -497,7 +650,7 @@ class MCPAIService:
         
         elif provider == "anthropic" and self.anthropic_client:
             if not model:
-                model = "claude-3-haiku-20240307"
+                model = DEFAULT_CHAT_MODELS["anthropic"]
             
             # Convert messages to Anthropic format
             system_prompt = None
@@ -518,7 +671,9 @@ class MCPAIService:
             if system_prompt:
                 kwargs["system"] = system_prompt
             
-            response = await self.anthropic_client.messages.create(**kwargs)
+            response = await self._call_provider(
+                "anthropic", lambda: self.anthropic_client.messages.create(**kwargs)
+            )
             
             # Get text content from response
             content = ""
@@ -555,14 +710,14 @@ class MCPAIService:
         
         elif provider == "xai" and self.xai_client:
             if not model:
-                model = "grok-3-mini"
+                model = DEFAULT_CHAT_MODELS["xai"]
             
-            response = await self.xai_client.chat.completions.create(
+            response = await self._call_provider("xai", lambda: self.xai_client.chat.completions.create(
                 model=model,
                 messages=messages,
                 **{k: v for k, v in task_data.items() 
                    if k not in ["provider", "messages", "model"]}
-            )
+            ))
             
             # Process each choice to extract JSON from markdown if present
             processed_choices = []
@@ -594,20 +749,249 @@ class MCPAIService:
         else:
             raise ValueError(f"Provider '{provider}' not available or not configured")
     
-    async def _handle_embedding(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle embedding request"""
+    def _provider_client(self, provider: str):
+        """Return the client for a provider, or None if not configured"""
+        return {
+            "openai": self.openai_client,
+            "anthropic": self.anthropic_client,
+            "xai": self.xai_client
+        }.get(provider)
+    
+    async def _handle_batch_completion(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a batch of independent chat completions.
+        
+        Small prompts are coalesced into micro-batches and everything runs
+        concurrently within the provider limits. Large batches (or
+        ``mode="batch_api"``) go to the provider batch API instead; pass the
+        returned ``batch_id`` again to keep polling an unfinished batch.
+        """
         provider = task_data.get("provider", "openai")
-        text = task_data.get("text", "")
+        if not self._provider_client(provider):
+            raise ValueError(f"Provider '{provider}' not available or not configured")
+        
+        if task_data.get("batch_id"):
+            return await self._wait_for_provider_batch(task_data["batch_id"], task_data)
+        
+        model = task_data.get("model") or DEFAULT_CHAT_MODELS[provider]
+        items = normalize_items(task_data.get("items", []), task_data.get("system"))
+        if not items:
+            raise ValueError("Batch completion requires at least one item")
+        max_items = self.batch_config.get("max_items", 10000)
+        if len(items) > max_items:
+            raise ValueError(f"Batch has {len(items)} items; the limit is {max_items}")
+        
+        mode = task_data.get("mode", "auto")
+        use_batch_api = mode == "batch_api" or (
+            mode == "auto"
+            and provider in BATCH_API_PROVIDERS
+            and len(items) >= self.batch_config.get("batch_api_min_items", 1000)
+        )
+        
+        if use_batch_api:
+            if provider not in BATCH_API_PROVIDERS:
+                raise ValueError(f"Provider '{provider}' has no batch API support")
+            batch_id = await self._call_provider(provider, lambda: submit_provider_batch(
+                provider,
+                self._provider_client(provider),
+                model,
+                items,
+                task_data.get("max_tokens", self.batch_config.get("default_max_tokens", 500)),
+                task_data.get("temperature", 0.0)
+            ))
+            self.provider_batches[batch_id] = {
+                "provider": provider,
+                "model": model,
+                "ids": [item["id"] for item in items]
+            }
+            logger.info(f"Submitted {len(items)} items to {provider} batch API: {batch_id}")
+            return await self._wait_for_provider_batch(batch_id, task_data)
+        
+        return await self._run_concurrent_batch(provider, model, items, task_data)
+    
+    async def _run_concurrent_batch(
+        self,
+        provider: str,
+        model: str,
+        items: List[Dict[str, Any]],
+        task_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run batch items as concurrent (micro-batched) chat completions"""
+        default_max_tokens = task_data.get("max_tokens", self.batch_config.get("default_max_tokens", 500))
+        temperature = task_data.get("temperature", 0.0)
+        groups, singles = plan_micro_batches(
+            items,
+            max_items=task_data.get("micro_batch_size", self.batch_config.get("micro_batch_size", 10)),
+            max_tokens=self.batch_config.get("micro_batch_max_tokens", 4000),
+            item_token_limit=self.batch_config.get("micro_batch_item_tokens", 400)
+        )
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        totals = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        
+        async def complete(messages: List[Dict[str, Any]], max_tokens: int):
+            response = await self._handle_chat_completion({
+                "provider": provider,
+                "model": model,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": temperature
+            })
+            usage = response.get("usage", {})
+            totals["requests"] += 1
+            for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                totals[key] += usage.get(key) or 0
+            choice = response["choices"][0]
+            return choice["message"]["content"], choice.get("finish_reason"), usage
+        
+        async def run_single(item: Dict[str, Any]):
+            try:
+                content, finish_reason, usage = await complete(
+                    item["messages"], item["max_tokens"] or default_max_tokens
+                )
+                results[item["id"]] = {"content": content, "finish_reason": finish_reason, "usage": usage}
+            except Exception as e:
+                errors[item["id"]] = str(e)
+        
+        async def run_group(group: List[Dict[str, Any]]):
+            answers: Dict[str, str] = {}
+            try:
+                content, _, _ = await complete(
+                    build_micro_batch_messages(group, task_data.get("system")),
+                    min(default_max_tokens * len(group), self.batch_config.get("micro_batch_response_tokens", 4000))
+                )
+                answers = parse_micro_batch_response(content, [item["id"] for item in group])
+            except Exception as e:
+                logger.warning(f"Micro-batch of {len(group)} items failed: {e}")
+            
+            for item in group:
+                if item["id"] in answers:
+                    results[item["id"]] = {"content": answers[item["id"]], "micro_batch": True}
+            # Items the micro-batch did not answer are retried on their own
+            await asyncio.gather(*[run_single(item) for item in group if item["id"] not in answers])
+        
+        await asyncio.gather(
+            *[run_group(group) for group in groups],
+            *[run_single(item) for item in singles]
+        )
+        
+        logger.info(
+            f"Batch completion finished: {len(results)}/{len(items)} succeeded "
+            f"with {totals['requests']} requests"
+        )
+        return {
+            "provider": provider,
+            "model": model,
+            "mode": "concurrent",
+            "status": "completed",
+            "results": {item["id"]: results[item["id"]] for item in items if item["id"] in results},
+            "errors": {item["id"]: errors[item["id"]] for item in items if item["id"] in errors},
+            "summary": {
+                "total": len(items),
+                "succeeded": len(results),
+                "failed": len(errors),
+                "micro_batches": len(groups),
+                **totals
+            }
+        }
+    
+    async def _wait_for_provider_batch(self, batch_id: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Poll a provider batch until it finishes or the wait budget runs out"""
+        batch = self.provider_batches.get(batch_id) or {
+            # Submitted before a restart: item ids are reported as custom ids
+            "provider": task_data.get("provider", "openai"),
+            "model": task_data.get("model"),
+            "ids": None
+        }
+        provider = batch["provider"]
+        client = self._provider_client(provider)
+        poll_interval = self.batch_config.get("poll_interval_seconds", 15)
+        deadline = time.monotonic() + task_data.get(
+            "max_wait_seconds", self.batch_config.get("max_wait_seconds", 600)
+        )
+        
+        response = {"provider": provider, "model": batch["model"], "mode": "batch_api", "batch_id": batch_id}
+        while True:
+            finished, batch_results, batch_errors = await self._call_provider(
+                provider, lambda: fetch_provider_batch(provider, client, batch_id)
+            )
+            if finished:
+                break
+            if time.monotonic() + poll_interval > deadline:
+                logger.info(f"Provider batch {batch_id} still running; returning for later polling")
+                return {**response, "status": "in_progress"}
+            await asyncio.sleep(poll_interval)
+        
+        self.provider_batches.pop(batch_id, None)
+        ids = batch["ids"]
+        
+        def item_id(custom_id: str) -> str:
+            if ids is None:
+                return custom_id
+            return ids[int(custom_id.rsplit("-", 1)[1])]
+        
+        results = {item_id(custom_id): result for custom_id, result in batch_results.items()}
+        errors = {item_id(custom_id): error for custom_id, error in batch_errors.items()}
+        for missing in (ids or []):
+            if missing not in results and missing not in errors:
+                errors[missing] = "No result returned by provider batch"
+        
+        return {
+            **response,
+            "status": "completed",
+            "results": results,
+            "errors": errors,
+            "summary": {
+                "total": len(ids) if ids is not None else len(results) + len(errors),
+                "succeeded": len(results),
+                "failed": len(errors)
+            }
+        }
+    
+    async def _handle_embedding(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle embedding request for a single text or a list of texts
+        
+        Vectors from different providers have different sizes (local MiniLM 384,
+        text-embedding-3-small 1536) and must not end up in the same store, so an
+        unavailable provider is an error rather than a reason to switch, and
+        default-provider results are checked against ``embeddings.dimensions``.
+        """
+        provider = task_data.get("provider") or self.embedding_config.get("default_provider", "openai")
+        text = task_data.get("text", task_data.get("input", ""))
         model = task_data.get("model")
+        expected_dimensions = task_data.get("dimensions")
+        if expected_dimensions is None and not task_data.get("provider"):
+            expected_dimensions = self.embedding_config.get("dimensions")
+        
+        if provider == "local" and not self.local_embeddings.available:
+            raise ValueError("Local embedding model not available")
+        
+        if provider == "local":
+            texts = text if isinstance(text, list) else [text]
+            embeddings, tokens = await self.local_embeddings.embed(texts)
+            _check_dimensions("local", embeddings, expected_dimensions)
+            return {
+                "data": [
+                    {"embedding": embedding, "index": index}
+                    for index, embedding in enumerate(embeddings)
+                ],
+                "model": self.local_embeddings.model_name,
+                "usage": {
+                    "prompt_tokens": tokens,
+                    "total_tokens": tokens
+                },
+                "provider": "local"
+            }
         
         if provider == "openai" and self.openai_client:
             if not model:
                 model = "text-embedding-3-small"
             
-            response = await self.openai_client.embeddings.create(
+            response = await self._call_provider("openai", lambda: self.openai_client.embeddings.create(
                 model=model,
                 input=text
-            )
+            ))
+            _check_dimensions("openai", [embedding.embedding for embedding in response.data], expected_dimensions)
             
             return {
                 "data": [
@@ -652,12 +1036,18 @@ class MCPAIService:
                 {"provider": "xai", "model": "grok-3-mini", "type": "chat"}
             ])
         
+        if self.local_embeddings.available:
+            available_models.append(
+                {"provider": "local", "model": self.local_embeddings.model_name, "type": "embedding"}
+            )
+        
         return {
             "available_models": available_models,
             "providers_configured": {
                 "openai": self.openai_client is not None,
                 "anthropic": self.anthropic_client is not None,
-                "xai": self.xai_client is not None
+                "xai": self.xai_client is not None,
+                "local": self.local_embeddings.available
             }
         }
     
@@ -730,16 +1120,18 @@ class MCPAIService:
                 logger.warning("MCP connection not available for Google search")
                 return {"error": "MCP connection not available"}
             
-            # Send search request to network agent via MCP
+            # Register the future before sending: the message loop keeps
+            # running, so the result can arrive before send() returns
             task_id = search_request["data"]["task_id"]
-            await self.websocket.send(json.dumps(search_request))
+            future = asyncio.get_running_loop().create_future()
+            self.pending_requests[task_id] = future
+            
+            # Send search request to network agent via MCP
+            await self._send_message(search_request)
             logger.info(f"Google search request sent via MCP: {query}")
             
             # Wait for response
             try:
-                future = asyncio.Future()
-                self.pending_requests[task_id] = future
-                
                 response_data = await asyncio.wait_for(future, timeout=60.0)
                 
                 if (response_data.get("type") == "task_result" and 
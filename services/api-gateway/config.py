@@ -48,6 +48,25 @@ class Config:
     MCP_CONNECTION_RETRY_ATTEMPTS = int(os.getenv("MCP_CONNECTION_RETRY_ATTEMPTS", "3"))
     MCP_CONNECTION_RETRY_DELAY = int(os.getenv("MCP_CONNECTION_RETRY_DELAY", "5"))
     
+    # Streaming exports: rows read per database round trip
+    EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "500"))
+    
+    # Literature search: seconds to wait for the database agent
+    LITERATURE_SEARCH_TIMEOUT = int(os.getenv("LITERATURE_SEARCH_TIMEOUT", "30"))
+    
+    # Streaming imports: records per database agent batch, and seconds to wait for each batch
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+    IMPORT_BATCH_TIMEOUT = int(os.getenv("IMPORT_BATCH_TIMEOUT", "120"))
+    
+    # Execution progress: SQLite file for progress events (empty keeps them in memory only), seconds between
+    # writes, seconds an execution without events is kept, seconds to wait for the research manager to
+    # accept an execution, and seconds between keep-alives on progress streams
+    EXECUTION_EVENTS_DB = os.getenv("EXECUTION_EVENTS_DB", "/app/tmp/execution_events.db")
+    EXECUTION_EVENTS_FLUSH_INTERVAL = float(os.getenv("EXECUTION_EVENTS_FLUSH_INTERVAL", "1.0"))
+    EXECUTION_EVENTS_RETENTION = int(os.getenv("EXECUTION_EVENTS_RETENTION", "86400"))
+    EXECUTION_DISPATCH_TIMEOUT = int(os.getenv("EXECUTION_DISPATCH_TIMEOUT", "300"))
+    EXECUTION_STREAM_KEEPALIVE = int(os.getenv("EXECUTION_STREAM_KEEPALIVE", "15"))
+    
     # Rate Limiting (future feature)
     RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "1000"))
     RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "3600"))  # 1 hour
@@ -80,7 +99,8 @@ class Config:
             "allow_origins": cls.CORS_ORIGINS,
             "allow_credentials": True,
             "allow_methods": ["*"],
-            "allow_headers": ["*"]
+            "allow_headers": ["*"],
+            "expose_headers": ["X-Next-Cursor"]
         }
     
     @classmethod
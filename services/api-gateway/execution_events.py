@@ -0,0 +1,409 @@
+"""
+Execution Event Store for API Gateway
+
+Tracks research executions from the progress events their agents send
+over MCP (``progress_event`` messages relayed by the MCP server):
+
+- Every event is folded into the execution's live state, which is kept in
+  memory, so a progress snapshot is a dictionary lookup
+- The research manager reports the workflow (stage, finished nodes and the
+  share of a node each outstanding delegation stands for); literature,
+  screening and synthesis agents report their own tasks (counts, ETA).
+  Progress is the finished nodes plus the weighted progress of the tasks
+- Server-sent event streams subscribe to an execution and are pushed the
+  new state after every event; a slow stream skips intermediate states
+  instead of holding up the others
+- Events are appended to SQLite and states upserted in batches by a
+  background task, so a restarted gateway picks executions up where they
+  were; executions without events for the retention period are dropped
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stages an execution goes through, in order
+EXECUTION_STAGES = ["initializing", "planning", "literature_search", "screening", "synthesis", "writing", "completed"]
+
+# Research manager stage -> execution stage
+STAGE_ALIASES = {
+    "literature_review": "literature_search",
+    "systematic_review": "screening",
+    "complete": "completed",
+}
+
+FINAL_STATUSES = ("completed", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS execution_events (
+    execution_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    received_at REAL NOT NULL,
+    agent_type TEXT,
+    task_id TEXT,
+    stage TEXT,
+    status TEXT,
+    completed REAL,
+    total REAL,
+    eta_seconds REAL,
+    message TEXT,
+    PRIMARY KEY (execution_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS execution_states (
+    execution_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    delegations TEXT NOT NULL,
+    started REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_execution_states_updated ON execution_states (updated);
+"""
+
+
+@dataclass
+class _Execution:
+    state: Dict[str, Any]
+    started: float
+    updated: float
+    # delegation task id -> share of a workflow node
+    delegations: Dict[str, float] = field(default_factory=dict)
+    subscribers: Set[asyncio.Queue] = field(default_factory=set)
+
+
+class ExecutionEventStore:
+    """Live execution states built from progress events, persisted in SQLite."""
+
+    def __init__(self, path: Optional[str] = None, flush_interval: float = 1.0, retention: int = 86400):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.retention = retention
+        self.executions: Dict[str, _Execution] = {}
+        self.db: Optional[sqlite3.Connection] = None
+        self._events: List[Tuple[Any, ...]] = []
+        self._dirty: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Open the database, load the executions still retained and start writing batches."""
+        if self.path:
+            try:
+                await asyncio.to_thread(self._open)
+                loaded = await asyncio.to_thread(self._load_states, time.time() - self.retention)
+                self.executions.update(loaded)
+                logger.info(f"Loaded {len(loaded)} executions from {self.path}")
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Execution events are not persisted, cannot open {self.path}: {e}")
+                self.db = None
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            self._flusher = None
+        for task in list(self._tasks):
+            task.cancel()
+        await self.flush()
+        if self.db:
+            self.db.close()
+            self.db = None
+
+    # States
+
+    def register(self, execution_id: str, **details: Any) -> Dict[str, Any]:
+        """Start tracking an execution the gateway just submitted."""
+        now = datetime.now().isoformat()
+        execution = _Execution(state={
+            "execution_id": execution_id,
+            "status": "initiated",
+            "progress_percentage": 0.0,
+            "current_stage": "initializing",
+            "stages": EXECUTION_STAGES,
+            "completed_steps": 0,
+            "total_steps": 0,
+            "estimated_time_remaining": None,
+            "message": None,
+            "error": None,
+            "tasks": {},
+            "started_at": now,
+            "last_updated": now,
+            "last_event_id": 0,
+            **details
+        }, started=time.time(), updated=time.time())
+        self.executions[execution_id] = execution
+        self._dirty.add(execution_id)
+        return self.snapshot(execution_id)
+
+    def snapshot(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of an execution, or None if it is not tracked."""
+        execution = self.executions.get(execution_id)
+        if execution is None:
+            return None
+        # Task entries are replaced, never changed in place
+        return dict(execution.state, tasks=dict(execution.state["tasks"]))
+
+    # Events
+
+    async def handle_progress_event(self, data: Dict[str, Any]):
+        """MCP message handler for ``progress_event``."""
+        execution_id = data.get("execution_id")
+        if not execution_id:
+            logger.warning("Received progress event without execution_id")
+            return
+        self.apply(execution_id, data)
+
+    def apply(self, execution_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Fold one progress event into the execution's state and notify its subscribers."""
+        execution = self.executions.get(execution_id)
+        if execution is None:
+            # Started by another gateway, or before a restart without persistence
+            self.register(execution_id)
+            execution = self.executions[execution_id]
+
+        state = execution.state
+        now = time.time()
+        status = event.get("status") or "running"
+        message = event.get("message") or None
+
+        if event.get("agent_type") == "research_manager":
+            if state["status"] not in FINAL_STATUSES:
+                state["status"] = status
+            stage = STAGE_ALIASES.get(event.get("stage"), event.get("stage"))
+            if stage and stage != "failed":
+                state["current_stage"] = stage
+            if event.get("total"):
+                state["completed_steps"] = event.get("completed") or 0
+                state["total_steps"] = event["total"]
+            if "delegations" in event:
+                execution.delegations = event.get("delegations") or {}
+            if status == "failed":
+                state["error"] = message
+        else:
+            task_id = event.get("task_id") or event.get("agent_type") or "unknown"
+            state["tasks"][task_id] = {
+                "agent_type": event.get("agent_type"),
+                "stage": event.get("stage"),
+                "status": status,
+                "completed": event.get("completed"),
+                "total": event.get("total"),
+                "eta_seconds": event.get("eta_seconds"),
+                "message": message,
+                "updated_at": datetime.fromtimestamp(now).isoformat()
+            }
+            if state["status"] == "initiated":
+                state["status"] = "running"
+
+        if state["status"] == "completed":
+            state["current_stage"] = "completed"
+        state["message"] = message or state["message"]
+        state["progress_percentage"], state["estimated_time_remaining"] = self._progress(execution, now)
+        state["last_updated"] = datetime.fromtimestamp(now).isoformat()
+        state["last_event_id"] += 1
+        execution.updated = now
+
+        self._events.append((
+            execution_id, state["last_event_id"], now, event.get("agent_type"), event.get("task_id"),
+            event.get("stage"), status, event.get("completed"), event.get("total"), event.get("eta_seconds"), message
+        ))
+        self._dirty.add(execution_id)
+        self._publish(execution)
+        return state
+
+    @staticmethod
+    def _progress(execution: _Execution, now: float) -> Tuple[float, Optional[float]]:
+        """Percentage done and linearly extrapolated seconds remaining."""
+        state = execution.state
+        if state["status"] == "completed":
+            return 100.0, 0.0
+        if not state["total_steps"]:
+            return 0.0, None
+
+        done = state["completed_steps"]
+        for task_id, share in execution.delegations.items():
+            task = state["tasks"].get(task_id)
+            if task and task["total"] and task["status"] != "failed":
+                done += share * min(1.0, (task["completed"] or 0) / task["total"])
+        percentage = min(100.0, 100.0 * done / state["total_steps"])
+
+        if not 0 < percentage < 100 or state["status"] == "failed":
+            return round(percentage, 1), None
+        elapsed = now - execution.started
+        return round(percentage, 1), round(elapsed * (100 - percentage) / percentage, 1)
+
+    # Subscriptions
+
+    def subscribe(self, execution_id: str) -> Optional[asyncio.Queue]:
+        """Queue that receives the execution's state after each event; None if it is not tracked."""
+        execution = self.executions.get(execution_id)
+        if execution is None:
+            return None
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        execution.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, execution_id: str, queue: asyncio.Queue):
+        execution = self.executions.get(execution_id)
+        if execution is not None:
+            execution.subscribers.discard(queue)
+
+    def _publish(self, execution: _Execution):
+        if not execution.subscribers:
+            return
+        snapshot = self.snapshot(execution.state["execution_id"])
+        for queue in execution.subscribers:
+            # Each state supersedes the last, so a subscriber that fell behind only gets the newest
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+
+    # Dispatch
+
+    def watch_dispatch(self, execution_id: str, result: Awaitable[Optional[Dict[str, Any]]]):
+        """Fail the execution if the research manager's answer to its dispatch is a failure.
+
+        ``result`` is awaited in the background; a timeout (None) leaves the
+        execution to its progress events.
+        """
+        async def watch():
+            data = await result
+            if not data:
+                return
+            outcome = data.get("result") if isinstance(data.get("result"), dict) else {}
+            if data.get("status") in ("failed", "error", "timeout") or outcome.get("status") == "failed":
+                state = self.executions[execution_id].state if execution_id in self.executions else {}
+                self.apply(execution_id, {
+                    "agent_type": "research_manager",
+                    "stage": state.get("current_stage"),
+                    "status": "failed",
+                    "message": outcome.get("error") or data.get("error") or "Research coordination failed"
+                })
+
+        task = asyncio.create_task(watch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # Persistence
+
+    async def flush(self):
+        """Write pending events and changed states."""
+        if not self._events and not self._dirty:
+            return
+        events, self._events = self._events, []
+        dirty, self._dirty = self._dirty, set()
+        if self.db is None:
+            return
+        states = [
+            (execution_id, json.dumps(execution.state, separators=(",", ":")),
+             json.dumps(execution.delegations, separators=(",", ":")), execution.started, execution.updated)
+            for execution_id, execution in ((execution_id, self.executions.get(execution_id)) for execution_id in dirty)
+            if execution is not None
+        ]
+        try:
+            await asyncio.to_thread(self._write, events, states)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to persist {len(events)} execution events: {e}")
+
+    async def _flush_loop(self):
+        last_prune = time.time()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+                if time.time() - last_prune > 60:
+                    last_prune = time.time()
+                    await self._prune()
+            except Exception as e:
+                logger.error(f"Execution event flush failed: {e}")
+
+    async def _prune(self):
+        """Drop executions without events for ``retention`` seconds."""
+        cutoff = time.time() - self.retention
+        expired = [
+            execution_id for execution_id, execution in self.executions.items()
+            if execution.updated < cutoff and not execution.subscribers
+        ]
+        for execution_id in expired:
+            del self.executions[execution_id]
+        if self.db is not None:
+            await asyncio.to_thread(self._delete_idle, cutoff)
+        if expired:
+            logger.info(f"Pruned {len(expired)} idle executions")
+
+    def _open(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def _load_states(self, updated_after: float) -> Dict[str, _Execution]:
+        rows = self.db.execute(
+            "SELECT execution_id, state, delegations, started, updated FROM execution_states WHERE updated > ?",
+            (updated_after,)
+        ).fetchall()
+        return {
+            execution_id: _Execution(
+                state=json.loads(state), started=started, updated=updated, delegations=json.loads(delegations)
+            )
+            for execution_id, state, delegations, started, updated in rows
+        }
+
+    def _write(self, events: List[Tuple[Any, ...]], states: List[Tuple[Any, ...]]):
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                "INSERT OR IGNORE INTO execution_events (execution_id, seq, received_at, agent_type, task_id, "
+                "stage, status, completed, total, eta_seconds, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                events
+            )
+            self.db.executemany(
+                "INSERT INTO execution_states (execution_id, state, delegations, started, updated) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (execution_id) DO UPDATE SET "
+                "state = excluded.state, delegations = excluded.delegations, updated = excluded.updated",
+                states
+            )
+
+    def _delete_idle(self, cutoff: float):
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.execute(
+                "DELETE FROM execution_events WHERE execution_id IN "
+                "(SELECT execution_id FROM execution_states WHERE updated < ?)",
+                (cutoff,)
+            )
+            self.db.execute("DELETE FROM execution_states WHERE updated < ?", (cutoff,))
+
+
+# Global instance
+execution_events: Optional[ExecutionEventStore] = None
+
+
+def get_execution_events() -> Optional[ExecutionEventStore]:
+    """Get the global execution event store, None before initialization."""
+    return execution_events
+
+
+async def initialize_execution_events(mcp_client, path: Optional[str], flush_interval: float,
+                                      retention: int) -> ExecutionEventStore:
+    """Create the global execution event store and subscribe it to MCP progress events."""
+    global execution_events
+    execution_events = ExecutionEventStore(path, flush_interval, retention)
+    await execution_events.start()
+    mcp_client.add_message_handler("progress_event", execution_events.handle_progress_event)
+    return execution_events
+
+
+async def close_execution_events():
+    """Flush and close the global execution event store."""
+    global execution_events
+    if execution_events:
+        await execution_events.close()
+        execution_events = None
@@ -32,6 +32,7 @@ from mcp_client import MCPClient
 
 # Import database service client for direct read access
 from native_database_client import get_native_database, initialize_native_database, close_native_database
+from execution_events import initialize_execution_events, close_execution_events
 
 # Import hierarchical data models for v2 endpoints
 from src.data_models.hierarchical_data_models import (
@@ -302,6 +303,14 @@ async def lifespan(app: FastAPI):
         # Set MCP client for V2 API
         await set_v2_mcp_client()
         
+        # Track research executions from the agents' progress events
+        await initialize_execution_events(
+            gateway.mcp_client,
+            Config.EXECUTION_EVENTS_DB,
+            Config.EXECUTION_EVENTS_FLUSH_INTERVAL,
+            Config.EXECUTION_EVENTS_RETENTION
+        )
+        
         logger.info(json.dumps({
             "event": "application_startup_success",
             "timestamp": datetime.utcnow().isoformat()
@@ -324,6 +333,7 @@ async def lifespan(app: FastAPI):
     }))
     try:
         await gateway.shutdown()
+        await close_execution_events()
         await close_native_database()
         logger.info(json.dumps({
             "event": "application_shutdown_success",
@@ -354,7 +364,8 @@ app.add_middleware(
     allow_origins=cors_config["allow_origins"],
     allow_credentials=cors_config["allow_credentials"],
     allow_methods=cors_config["allow_methods"],
-    allow_headers=cors_config["allow_headers"]
+    allow_headers=cors_config["allow_headers"],
+    expose_headers=cors_config["expose_headers"]
 )
 
 # Include V2 hierarchical API routes
@@ -7,10 +7,10 @@ Handles WebSocket communication with improved MCP server featuring:
 - Enhanced message routing and task handling
 - Better error handling and logging
 - Graceful shutdown with resource cleanup
+- Negotiated binary wire format with compression and chunking (mcp_wire.py)
 """
 
 import asyncio
-import json
 import logging
 import uuid
 import random
@@ -20,6 +20,8 @@ from typing import Any, Callable, Dict, Optional, Union
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
+from mcp_wire import DEFAULT_CHUNK_SIZE, FrameAssembler, WireCodec, wire_capabilities
+
 logger = logging.getLogger(__name__)
 
 
@@ -68,6 +70,12 @@ class MCPClient:
         self.heartbeat_interval = self.config.get("heartbeat_interval", 30)
         self.ping_timeout = self.config.get("ping_timeout", 10)
         
+        # Wire format: JSON text until the server confirms a binary codec
+        self.wire_enabled = self.config.get("wire_enabled", True)
+        self.wire_chunk_size = self.config.get("wire_chunk_size", DEFAULT_CHUNK_SIZE)
+        self.codec = WireCodec()
+        self.assembler = FrameAssembler()
+        
         # Setup message handlers
         self._setup_message_handlers()
 
@@ -101,12 +109,16 @@ class MCPClient:
                 uri = f"ws://{self.host}:{self.port}"
                 logger.info(f"Connecting to MCP server at {uri} (attempt {self.connection_attempts})")
                 
+                self.codec = WireCodec()
+                self.assembler = FrameAssembler()
                 self.websocket = await websockets.connect(
                     uri,
                     ping_interval=self.heartbeat_interval,
                     ping_timeout=self.ping_timeout,
                     close_timeout=10,
-                    max_size=1024*1024  # 1MB max message size
+                    max_size=1024*1024,  # 1MB max frame size; larger messages are chunked
+                    # The negotiated codec compresses large payloads itself
+                    compression=None if self.wire_enabled else "deflate"
                 )
                 
                 self.is_connected = True
@@ -208,6 +220,8 @@ class MCPClient:
                 ],
                 "timestamp": datetime.now().isoformat()
             }
+            if self.wire_enabled:
+                registration_message["wire"] = wire_capabilities(self.wire_chunk_size)
             
             await self._send_message(registration_message)
             logger.info("Registered as API Gateway with enhanced MCP server")
@@ -429,8 +443,8 @@ class MCPClient:
             pass
         
         try:
-            message_str = json.dumps(message)
-            await self.websocket.send(message_str)
+            for frame in self.codec.encode(message):
+                await self.websocket.send(frame)
             logger.debug(f"Sent message: {message.get('type', 'unknown')}")
         except Exception as e:
             logger.error(f"Error sending message: {e}")
@@ -445,12 +459,14 @@ class MCPClient:
                 logger.error("No websocket connection available")
                 return
                 
-            async for message_str in self.websocket:
+            async for frame in self.websocket:
                 try:
-                    message = json.loads(message_str)
+                    message = self.assembler.feed(frame)
+                    if message is None:
+                        continue  # Waiting for the remaining chunks
                     await self._process_mcp_message(message)
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to decode message: {message_str}")
+                except ValueError as e:
+                    logger.error(f"Failed to decode message ({len(frame)} bytes): {e}")
                 except Exception as e:
                     logger.error(f"Error handling message: {e}")
                     
@@ -490,6 +506,9 @@ class MCPClient:
         """Handle registration confirmation from server."""
         server_id = data.get("server_id")
         logger.info(f"API Gateway registration confirmed by server {server_id}")
+        if data.get("wire"):
+            self.codec = WireCodec.from_dict(data["wire"])
+            logger.info(f"Using wire format {self.codec.format}/{self.codec.compression}")
         
         # Process any additional server instructions if present
         if "instructions" in data:
@@ -11,21 +11,75 @@ Features:
 - Read-only operations enforcement
 - Connection pooling with configurable pool sizes
 - Transaction isolation for consistency
+- Server-side cursors for streaming large result sets
+- JSON/JSONB decoded by the driver (orjson when installed)
+- Indexed full-text and trigram search over literature records
 """
 
 import asyncio
+import base64
 import json
 import logging
 import os
 import decimal
-from typing import Dict, List, Optional, Any, Union
+from typing import AsyncIterator, Dict, List, Optional, Any, Union
 from contextlib import asynccontextmanager
 
 import asyncpg
 from fastapi import HTTPException
 
+try:
+    import orjson
+except ImportError:  # optional dependency, falls back to the json module
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+LITERATURE_JSON_FIELDS = ("authors", "mesh_terms", "categories", "metadata")
+
+# kind -> (research_plans column, key of the record array inside it)
+LITERATURE_RESULT_ARRAYS = {
+    "initial": ("initial_literature_results", "records"),
+    "reviewed": ("reviewed_literature_results", "reviewed_results"),
+}
+
+
+def _json_dumps(value: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+
+def _json_loads(value: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque pagination cursor holding the sort key of the last row returned."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = 2) -> List[Any]:
+    """Sort key from a cursor made by encode_cursor; ValueError if it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _literature_array(kind: str) -> str:
+    """SQL for a plan's literature result array, or an empty array if it has none."""
+    column, key = LITERATURE_RESULT_ARRAYS[kind]
+    return (
+        f"CASE jsonb_typeof({column} -> '{key}') WHEN 'array' "
+        f"THEN {column} -> '{key}' ELSE '[]'::jsonb END"
+    )
+
 
 class NativeDatabaseClient:
     """
@@ -76,7 +130,8 @@ class NativeDatabaseClient:
                 min_size=self.min_size,
                 max_size=self.max_size,
                 command_timeout=self.command_timeout,
-                server_settings=self.server_settings
+                server_settings=self.server_settings,
+                init=self._init_connection
             )
             
             # Test the connection
@@ -93,6 +148,17 @@ class NativeDatabaseClient:
             self._initialized = False
             return False
     
+    @staticmethod
+    async def _init_connection(conn):
+        """Decode JSON and JSONB columns in the driver instead of returning strings."""
+        for type_name in ("json", "jsonb"):
+            await conn.set_type_codec(
+                type_name,
+                encoder=_json_dumps,
+                decoder=_json_loads,
+                schema="pg_catalog"
+            )
+    
     async def close(self):
         """Close the database connection pool."""
         if self.pool:
@@ -139,13 +205,19 @@ class NativeDatabaseClient:
                 "error": str(e)
             }
     
-    async def get_projects(self, status_filter: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    async def get_projects(
+        self,
+        status_filter: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[List[Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        List all projects with optional filtering.
+        List all projects with optional filtering, most recently updated first.
         
         Args:
             status_filter: Filter by project status
             limit: Limit number of results
+            after: (updated_at, id) of the last project of the previous page
             
         Returns:
             List of project dictionaries
@@ -155,19 +227,24 @@ class NativeDatabaseClient:
                 # Build query with optional filters
                 query = "SELECT id, name, description, status, created_at, updated_at, metadata FROM projects"
                 params = []
+                conditions = []
                 
                 if status_filter:
-                    query += " WHERE status = $1"
                     params.append(status_filter)
+                    conditions.append(f"status = ${len(params)}")
                 
-                query += " ORDER BY created_at DESC"
+                if after:
+                    params.extend(after)
+                    conditions.append(f"(updated_at, id) < (${len(params) - 1}, ${len(params)})")
+                
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                
+                query += " ORDER BY updated_at DESC, id DESC"
                 
                 if limit:
-                    if params:
-                        query += f" LIMIT ${len(params) + 1}"
-                    else:
-                        query += " LIMIT $1"
                     params.append(limit)
+                    query += f" LIMIT ${len(params)}"
                 
                 rows = await conn.fetch(query, *params)
                 
@@ -241,37 +318,52 @@ class NativeDatabaseClient:
             logger.error(f"Failed to fetch project {project_id}: {e}")
             raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
     
-    async def get_research_topics(self, project_id: Optional[str] = None, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    async def get_research_topics(
+        self,
+        project_id: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[List[Any]] = None,
+        status_filter: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Get research topics, optionally filtered by project.
+        Get research topics, optionally filtered by project and status, most recently updated first.
         
         Args:
             project_id: Optional project ID filter
             limit: Maximum number of topics to return
             offset: Number of topics to skip
+            after: (updated_at, id) of the last topic of the previous page
+            status_filter: Optional status filter
             
         Returns:
             List of research topic dictionaries
         """
         try:
             async with self.get_connection() as conn:
+                query = "SELECT id, name, description, project_id, status, created_at, updated_at FROM research_topics"
+                params = []
+                conditions = []
+                
                 if project_id:
-                    query = """
-                        SELECT id, name, description, project_id, created_at, updated_at 
-                        FROM research_topics 
-                        WHERE project_id = $1 
-                        ORDER BY created_at DESC 
-                        LIMIT $2 OFFSET $3
-                    """
-                    rows = await conn.fetch(query, project_id, limit, offset)
-                else:
-                    query = """
-                        SELECT id, name, description, project_id, created_at, updated_at 
-                        FROM research_topics 
-                        ORDER BY created_at DESC 
-                        LIMIT $1 OFFSET $2
-                    """
-                    rows = await conn.fetch(query, limit, offset)
+                    params.append(project_id)
+                    conditions.append(f"project_id = ${len(params)}")
+                
+                if status_filter:
+                    params.append(status_filter)
+                    conditions.append(f"status = ${len(params)}")
+                
+                if after:
+                    params.extend(after)
+                    conditions.append(f"(updated_at, id) < (${len(params) - 1}, ${len(params)})")
+                
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                
+                params.extend([limit, offset])
+                query += f" ORDER BY updated_at DESC, id DESC LIMIT ${len(params) - 1} OFFSET ${len(params)}"
+                
+                rows = await conn.fetch(query, *params)
                 
                 return [
                     {
@@ -279,7 +371,7 @@ class NativeDatabaseClient:
                         "project_id": str(row['project_id']),
                         "name": row['name'],
                         "description": row['description'] or "",
-                        "status": "active",  # Default status
+                        "status": row['status'] or "active",
                         "created_at": row['created_at'].isoformat() if row['created_at'] else None,
                         "updated_at": row['updated_at'].isoformat() if row['updated_at'] else None,
                         "plans_count": 0,  # Count fields
@@ -308,7 +400,7 @@ class NativeDatabaseClient:
         try:
             async with self.get_connection() as conn:
                 query = """
-                    SELECT id, name, description, project_id, created_at, updated_at 
+                    SELECT id, name, description, project_id, status, created_at, updated_at 
                     FROM research_topics 
                     WHERE id = $1
                 """
@@ -321,7 +413,7 @@ class NativeDatabaseClient:
                         "project_id": str(row['project_id']),
                         "name": row['name'],
                         "description": row['description'] or "",
-                        "status": "active",  # Default status
+                        "status": row['status'] or "active",
                         "created_at": row['created_at'].isoformat() if row['created_at'] else None,
                         "updated_at": row['updated_at'].isoformat() if row['updated_at'] else None,
                         "plans_count": 0,  # Count fields
@@ -336,31 +428,56 @@ class NativeDatabaseClient:
             logger.error(f"Failed to fetch research topic {topic_id}: {e}")
             raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
-    async def get_research_plans(self, topic_id: str, status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_research_plans(
+        self,
+        topic_id: str,
+        status_filter: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[List[Any]] = None,
+        include_structure: bool = True
+    ) -> List[Dict[str, Any]]:
         """
-        Get research plans for a topic.
+        Get research plans for a topic, most recently updated first.
+        
+        Literature results are not loaded; each plan carries their record counts
+        instead. Use get_plan_literature_results to page through them.
         
         Args:
             topic_id: Topic ID
             status_filter: Optional status filter
+            limit: Limit number of results
+            after: (updated_at, id) of the last plan of the previous page
+            include_structure: Load plan_structure
             
         Returns:
             List of research plan dictionaries
         """
         try:
             async with self.get_connection() as conn:
-                query = """
-                    SELECT id, name, description, topic_id, plan_type, status, created_at, updated_at, metadata, plan_structure, plan_approved, estimated_cost, actual_cost, initial_literature_results, reviewed_literature_results
+                # Literature result blobs can run to megabytes; only their sizes are listed
+                structure_column = "plan_structure" if include_structure else "NULL::jsonb AS plan_structure"
+                query = f"""
+                    SELECT id, name, description, topic_id, plan_type, status, created_at, updated_at, metadata, {structure_column}, plan_approved, estimated_cost, actual_cost,
+                           jsonb_array_length({_literature_array("initial")}) AS initial_literature_count,
+                           jsonb_array_length({_literature_array("reviewed")}) AS reviewed_literature_count
                     FROM research_plans 
                     WHERE topic_id = $1
                 """
                 params = [topic_id]
                 
                 if status_filter:
-                    query += " AND status = $2"
                     params.append(status_filter)
+                    query += f" AND status = ${len(params)}"
+                
+                if after:
+                    params.extend(after)
+                    query += f" AND (updated_at, id) < (${len(params) - 1}, ${len(params)})"
                 
-                query += " ORDER BY created_at DESC"
+                query += " ORDER BY updated_at DESC, id DESC"
+                
+                if limit:
+                    params.append(limit)
+                    query += f" LIMIT ${len(params)}"
                 
                 rows = await conn.fetch(query, *params)
                 
@@ -389,38 +506,6 @@ class NativeDatabaseClient:
                     else:
                         plan_structure = {}
                     
-                    # Parse initial_literature_results from database
-                    initial_literature_results = row.get('initial_literature_results')
-                    if initial_literature_results is None:
-                        initial_literature_results = {}
-                    elif isinstance(initial_literature_results, str):
-                        try:
-                            initial_literature_results = json.loads(initial_literature_results)
-                        except Exception as e:
-                            print(f"DEBUG: Failed to parse initial_literature_results string: {e}")
-                            initial_literature_results = {}
-                    elif isinstance(initial_literature_results, dict):
-                        # JSONB column returns dict directly
-                        initial_literature_results = initial_literature_results
-                    else:
-                        initial_literature_results = {}
-                    
-                    # Parse reviewed_literature_results from database
-                    reviewed_literature_results = row.get('reviewed_literature_results')
-                    if reviewed_literature_results is None:
-                        reviewed_literature_results = {}
-                    elif isinstance(reviewed_literature_results, str):
-                        try:
-                            reviewed_literature_results = json.loads(reviewed_literature_results)
-                        except Exception as e:
-                            print(f"DEBUG: Failed to parse reviewed_literature_results string: {e}")
-                            reviewed_literature_results = {}
-                    elif isinstance(reviewed_literature_results, dict):
-                        # JSONB column returns dict directly
-                        reviewed_literature_results = reviewed_literature_results
-                    else:
-                        reviewed_literature_results = {}
-                    
                     plans.append({
                         "id": str(row['id']),
                         "topic_id": str(row['topic_id']) if row['topic_id'] else None,
@@ -437,8 +522,8 @@ class NativeDatabaseClient:
                         "completed_tasks": 0,
                         "progress": 0.0,
                         "plan_structure": plan_structure,  # Use parsed structure
-                        "initial_literature_results": initial_literature_results,
-                        "reviewed_literature_results": reviewed_literature_results,
+                        "initial_literature_count": row['initial_literature_count'],
+                        "reviewed_literature_count": row['reviewed_literature_count'],
                         "metadata": metadata
                     })
                 
@@ -448,20 +533,29 @@ class NativeDatabaseClient:
             logger.error(f"Failed to fetch research plans for topic {topic_id}: {e}")
             raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
-    async def get_research_plan(self, plan_id: str) -> Optional[Dict[str, Any]]:
+    async def get_research_plan(self, plan_id: str, include_literature: bool = True) -> Optional[Dict[str, Any]]:
         """
         Get a specific research plan by ID.
         
         Args:
             plan_id: Plan ID
+            include_literature: Load the literature result blobs; record counts are always included
             
         Returns:
             Research plan dictionary or None if not found
         """
         try:
             async with self.get_connection() as conn:
-                query = """
-                    SELECT id, name, description, topic_id, plan_type, status, created_at, updated_at, metadata, plan_structure, plan_approved, estimated_cost, actual_cost, initial_literature_results, reviewed_literature_results
+                literature_columns = (
+                    "initial_literature_results, reviewed_literature_results"
+                    if include_literature
+                    else "NULL::jsonb AS initial_literature_results, NULL::jsonb AS reviewed_literature_results"
+                )
+                query = f"""
+                    SELECT id, name, description, topic_id, plan_type, status, created_at, updated_at, metadata, plan_structure, plan_approved, estimated_cost, actual_cost,
+                           {literature_columns},
+                           jsonb_array_length({_literature_array("initial")}) AS initial_literature_count,
+                           jsonb_array_length({_literature_array("reviewed")}) AS reviewed_literature_count
                     FROM research_plans 
                     WHERE id = $1
                 """
@@ -543,6 +637,8 @@ class NativeDatabaseClient:
                         "plan_structure": plan_structure,
                         "initial_literature_results": initial_literature_results,
                         "reviewed_literature_results": reviewed_literature_results,
+                        "initial_literature_count": row['initial_literature_count'],
+                        "reviewed_literature_count": row['reviewed_literature_count'],
                         "metadata": metadata
                     }
                 return None
@@ -551,6 +647,57 @@ class NativeDatabaseClient:
             logger.error(f"Failed to fetch research plan {plan_id}: {e}")
             raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
+    async def get_plan_literature_results(self, plan_id: str, kind: str, offset: int = 0, limit: int = 50) -> Optional[Dict[str, Any]]:
+        """
+        Get one page of a plan's initial or reviewed literature results.
+        
+        The record array is sliced server-side with jsonb_array_elements, so only
+        the requested page is transferred and decoded.
+        
+        Args:
+            plan_id: Plan ID
+            kind: "initial" or "reviewed"
+            offset: Number of records to skip
+            limit: Maximum number of records to return
+            
+        Returns:
+            Dictionary with total, items and the remaining result fields as metadata,
+            or None if the plan is not found
+        """
+        column, key = LITERATURE_RESULT_ARRAYS[kind]
+        try:
+            async with self.get_connection() as conn:
+                query = f"""
+                    SELECT jsonb_array_length({_literature_array(kind)}) AS total,
+                           COALESCE((
+                               SELECT jsonb_agg(element.value ORDER BY element.position)
+                               FROM jsonb_array_elements({_literature_array(kind)}) WITH ORDINALITY AS element(value, position)
+                               WHERE element.position > $2 AND element.position <= $2 + $3
+                           ), '[]'::jsonb) AS items,
+                           CASE jsonb_typeof({column}) WHEN 'object' THEN {column} - '{key}' ELSE '{{}}'::jsonb END AS summary
+                    FROM research_plans
+                    WHERE id = $1
+                """
+                
+                row = await conn.fetchrow(query, plan_id, offset, limit)
+                
+                if not row:
+                    return None
+                
+                return {
+                    "plan_id": plan_id,
+                    "kind": kind,
+                    "offset": offset,
+                    "limit": limit,
+                    "total": row['total'],
+                    "items": row['items'],
+                    "metadata": row['summary']
+                }
+                
+        except Exception as e:
+            logger.error(f"Failed to fetch {kind} literature results for plan {plan_id}: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
+
     async def get_tasks(self, plan_id: str, status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get tasks for a research plan.
@@ -737,6 +884,116 @@ class NativeDatabaseClient:
             logger.error(f"Failed to get project stats for {project_id}: {e}")
             raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
+    async def get_projects_stats(self, project_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get statistics for several projects in one query.
+        
+        Args:
+            project_ids: Project IDs
+            
+        Returns:
+            Statistics dictionaries keyed by project ID; projects without topics are omitted
+        """
+        try:
+            async with self.get_connection() as conn:
+                rows = await conn.fetch("""
+                    SELECT rt.project_id AS id,
+                           COUNT(DISTINCT rt.id) AS topics_count,
+                           COUNT(DISTINCT rp.id) AS plans_count,
+                           COUNT(t.id) AS tasks_count,
+                           COUNT(t.id) FILTER (WHERE t.status = 'completed') AS completed_tasks
+                    FROM research_topics rt
+                    LEFT JOIN research_plans rp ON rp.topic_id = rt.id
+                    LEFT JOIN tasks t ON t.plan_id = rp.id
+                    WHERE rt.project_id = ANY($1::varchar[])
+                    GROUP BY rt.project_id
+                """, project_ids)
+                
+                return {
+                    str(row['id']): {
+                        "topics_count": row['topics_count'],
+                        "plans_count": row['plans_count'],
+                        "tasks_count": row['tasks_count'],
+                        "total_cost": 0.0,  # Cost calculation will be implemented when cost columns are added to database
+                        "completion_rate": (row['completed_tasks'] / row['tasks_count'] * 100) if row['tasks_count'] > 0 else 0.0
+                    }
+                    for row in rows
+                }
+                
+        except Exception as e:
+            logger.error(f"Failed to get stats for projects: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
+
+    async def get_topics_stats(self, topic_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get plan and task statistics for several research topics in one query.
+        
+        Args:
+            topic_ids: Topic IDs
+            
+        Returns:
+            Statistics dictionaries keyed by topic ID; topics without plans are omitted
+        """
+        try:
+            async with self.get_connection() as conn:
+                rows = await conn.fetch("""
+                    SELECT rp.topic_id AS id,
+                           COUNT(DISTINCT rp.id) AS plans_count,
+                           COUNT(t.id) AS tasks_count,
+                           COUNT(t.id) FILTER (WHERE t.status = 'completed') AS completed_tasks
+                    FROM research_plans rp
+                    LEFT JOIN research_tasks t ON t.plan_id = rp.id
+                    WHERE rp.topic_id = ANY($1::varchar[])
+                    GROUP BY rp.topic_id
+                """, topic_ids)
+                
+                return {
+                    str(row['id']): {
+                        "plans_count": row['plans_count'],
+                        "tasks_count": row['tasks_count'],
+                        "completion_rate": (row['completed_tasks'] / row['tasks_count'] * 100) if row['tasks_count'] > 0 else 0.0
+                    }
+                    for row in rows
+                }
+                
+        except Exception as e:
+            logger.error(f"Failed to get stats for research topics: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
+
+    async def get_plans_stats(self, plan_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get task statistics for several research plans in one query.
+        
+        Args:
+            plan_ids: Plan IDs
+            
+        Returns:
+            Statistics dictionaries keyed by plan ID; plans without tasks are omitted
+        """
+        try:
+            async with self.get_connection() as conn:
+                rows = await conn.fetch("""
+                    SELECT plan_id AS id,
+                           COUNT(*) AS tasks_count,
+                           COUNT(*) FILTER (WHERE status = 'completed') AS completed_tasks
+                    FROM research_tasks
+                    WHERE plan_id = ANY($1::varchar[])
+                    GROUP BY plan_id
+                """, plan_ids)
+                
+                return {
+                    str(row['id']): {
+                        "tasks_count": row['tasks_count'],
+                        "completed_tasks": row['completed_tasks'],
+                        "progress": (row['completed_tasks'] / row['tasks_count'] * 100) if row['tasks_count'] > 0 else 0.0
+                    }
+                    for row in rows
+                }
+                
+        except Exception as e:
+            logger.error(f"Failed to get stats for research plans: {e}")
+            raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
+
     async def get_project_hierarchy(self, project_id: str) -> Optional[Dict[str, Any]]:
         """
         Get complete project hierarchy with topics, plans, and tasks.
@@ -790,6 +1047,54 @@ class NativeDatabaseClient:
             logger.error(f"Failed to get project hierarchy for {project_id}: {e}")
             raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
+    async def iter_literature_records(self, project_id: str, page_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a project's literature records through a server-side cursor.
+        
+        Rows are fetched page_size at a time inside one read-only, repeatable-read
+        transaction, so memory stays bounded and the whole stream sees one snapshot.
+        
+        Args:
+            project_id: Project whose records to read
+            page_size: Rows fetched per round trip
+            
+        Yields:
+            Literature record dictionaries
+        """
+        query = """
+            SELECT id, title, authors, project_id, doi, external_id, year, journal, abstract, url,
+                   citation_count, source, publication_type, mesh_terms, categories,
+                   created_at, updated_at, metadata
+            FROM literature_records
+            WHERE project_id = $1
+            ORDER BY created_at, id
+        """
+        async with self.get_connection() as conn:
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                cursor = await conn.cursor(query, project_id)
+                while True:
+                    rows = await cursor.fetch(page_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield self._literature_record(row)
+    
+    @staticmethod
+    def _literature_record(row) -> Dict[str, Any]:
+        """Convert a literature_records row to a serializable dictionary."""
+        record = dict(row)
+        for key, value in record.items():
+            if key in LITERATURE_JSON_FIELDS and isinstance(value, str):
+                try:
+                    record[key] = json.loads(value)
+                except ValueError:
+                    pass
+            elif hasattr(value, 'isoformat'):
+                record[key] = value.isoformat()
+            elif isinstance(value, decimal.Decimal):
+                record[key] = float(value)
+        return record
+    
     async def execute_read_query(self, query: str, params: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
         """
         Execute a read-only query against the database.
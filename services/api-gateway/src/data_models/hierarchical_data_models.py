@@ -23,6 +23,8 @@ TaskStage = Literal[
 TaskType = Literal["research", "analysis", "synthesis", "validation", "literature_review", "systematic_review", "meta_analysis"]
 PlanType = Literal["comprehensive", "quick", "deep", "custom"]
 ResearchDepth = Literal["undergraduate", "masters", "phd"]
+LiteratureResultKind = Literal["initial", "reviewed"]
+ExecutionStatus = Literal["initiated", "running", "completed", "failed"]
 
 
 def generate_uuid() -> str:
@@ -428,6 +430,20 @@ class ResearchPlanResponse(BaseModel):
     plan_structure: Dict[str, Any] = Field(default_factory=dict)
     initial_literature_results: Dict[str, Any] = Field(default_factory=dict)
     reviewed_literature_results: Dict[str, Any] = Field(default_factory=dict)
+    initial_literature_count: int = 0
+    reviewed_literature_count: int = 0
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class LiteratureResultsPage(BaseModel):
+    """One page of a research plan's initial or reviewed literature results."""
+
+    plan_id: str
+    kind: LiteratureResultKind
+    offset: int
+    limit: int
+    total: int
+    items: List[Dict[str, Any]] = Field(default_factory=list)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -560,3 +576,38 @@ class ResearchExecutionResponse(BaseModel):
     status: str = "initiated"
     progress_url: str
     timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+    events_url: Optional[str] = None
+
+
+class ExecutionTaskProgress(BaseModel):
+    """Progress an agent reported for its part of a research execution."""
+    
+    agent_type: Optional[str] = None
+    stage: Optional[str] = None
+    status: str
+    completed: Optional[float] = None
+    total: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    message: Optional[str] = None
+    updated_at: str
+
+
+class ExecutionProgressResponse(BaseModel):
+    """Live progress of a research execution."""
+    
+    execution_id: str
+    status: ExecutionStatus
+    progress_percentage: float
+    current_stage: str
+    stages: List[str] = Field(default_factory=list)
+    completed_steps: float = 0
+    total_steps: int = 0
+    estimated_time_remaining: Optional[float] = None
+    message: Optional[str] = None
+    error: Optional[str] = None
+    tasks: Dict[str, ExecutionTaskProgress] = Field(default_factory=dict)
+    started_at: str
+    last_updated: str
+    last_event_id: int = 0
+    topic_id: Optional[str] = None
+    plan_id: Optional[str] = None
@@ -11,6 +11,10 @@ Features:
 - Format conversion and standardization
 - Bulk import / export operations
 - Progress tracking for large datasets-Error handling and recovery mechanisms
+- Streaming export: records are serialized batch by batch and optionally
+  gzip / zstd compressed on the fly, so exports run in constant memory
+- Streaming import: RIS, CSV, PubMed XML and JSON Lines are parsed
+  incrementally into batches of literature records, with resumable offsets
 
 Author: Eunice AI System
 Date: July 2025
@@ -24,15 +28,38 @@ import logging
 import re
 import tempfile
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass
+import zlib
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, only needed for zstd exports
+    zstandard = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Records serialized per chunk when streaming an export, or parsed per batch when streaming an import
+STREAM_BATCH_SIZE = 500
+
 
 class DataFormat(Enum):
     """Supported data formats"""
@@ -101,6 +128,19 @@ class ImportResult:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class ImportCheckpoint:
+    """Resumable position in an import stream
+
+    ``offset`` is the byte offset just past the last emitted record and
+    ``records`` the number of records emitted so far. Line-based formats
+    resume by seeking to ``offset``; XML resumes by skipping ``records``.
+    """
+
+    offset: int = 0
+    records: int = 0
+
+
 @dataclass
 class ExportResult:
     """Data export operation result"""
@@ -436,39 +476,339 @@ class FormatConverter:
         ris_lines = []
 
         for ref in references:
-            # Reference type
-            ref_type = ref.get("type", "JOUR")
-            ris_lines.append(f"TY -{ref_type}")
-
-            # Map common fields
-            field_mapping = {
-                "title": "TI",
-                "author": "AU",
-                "journal": "JO",
-                "year": "PY",
-                "volume": "VL",
-                "issue": "IS",
-                "pages": "SP",
-                "doi": "DO",
-                "url": "UR",
-                "abstract": "AB",
-                "keywords": "KW",
-            }
+            ris_lines.extend(FormatConverter.ris_reference_lines(ref))
 
-            for json_field, ris_tag in field_mapping.items():
-                if json_field in ref:
-                    value = ref[json_field]
-                    if isinstance(value, list):
-                        for v in value:
-                            ris_lines.append(f"{ris_tag} -{v}")
-                    else:
-                        ris_lines.append(f"{ris_tag} -{value}")
+        return "\n".join(ris_lines)
 
-            # End reference
-            ris_lines.append("ER -")
-            ris_lines.append("")  # Empty line between references
+    @staticmethod
+    def ris_reference_lines(ref: Dict[str, Any]) -> List[str]:
+        """RIS lines of one reference, ending with the blank line between references"""
+
+        # Reference type
+        ref_type = ref.get("type", "JOUR")
+        ris_lines = [f"TY -{ref_type}"]
+
+        # Map common fields
+        field_mapping = {
+            "title": "TI",
+            "author": "AU",
+            "authors": "AU",
+            "journal": "JO",
+            "year": "PY",
+            "publication_year": "PY",
+            "volume": "VL",
+            "issue": "IS",
+            "pages": "SP",
+            "doi": "DO",
+            "url": "UR",
+            "abstract": "AB",
+            "keywords": "KW",
+        }
 
-        return "\n".join(ris_lines)
+        for json_field, ris_tag in field_mapping.items():
+            if json_field in ref and ref[json_field] is not None:
+                value = ref[json_field]
+                if isinstance(value, list):
+                    for v in value:
+                        ris_lines.append(f"{ris_tag} -{v}")
+                else:
+                    ris_lines.append(f"{ris_tag} -{value}")
+
+        # End reference
+        ris_lines.append("ER -")
+        ris_lines.append("")  # Empty line between references
+        return ris_lines
+
+
+class StreamingImportParser:
+    """Incremental parsers over binary streams, yielding normalized literature records
+
+    Records have the shape the database agent's ``store_literature_records``
+    action takes (title, authors, doi, external_id, year, journal, abstract,
+    url, source, publication_type, mesh_terms, categories, raw_data). Only
+    the record being parsed is held in memory.
+    """
+
+    FORMATS = (DataFormat.RIS, DataFormat.CSV, DataFormat.XML, DataFormat.JSONL)
+
+    # "TY  - JOUR" (standard) and "TY -JOUR" (as written by json_to_ris)
+    RIS_TAG = re.compile(r"^([A-Z][A-Z0-9])  ?- ?(.*)$")
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        format_type: DataFormat,
+        checkpoint: Optional[ImportCheckpoint] = None,
+        engine: Optional["ImportEngine"] = None,
+        encoding: str = "utf-8",
+        xml_record_tag: str = "PubmedArticle",
+    ):
+        if format_type not in self.FORMATS:
+            raise ValueError(f"Unsupported streaming import format: {format_type}")
+
+        self.stream = stream
+        self.format_type = format_type
+        self.checkpoint = checkpoint or ImportCheckpoint()
+        self.engine = engine or ImportEngine()
+        self.encoding = encoding
+        self.xml_record_tag = xml_record_tag
+
+    def __iter__(self) -> Iterator[Tuple[Dict[str, Any], ImportCheckpoint]]:
+        """Records with the checkpoint to resume from after each"""
+        if self.format_type == DataFormat.RIS:
+            return self._parse_ris()
+        elif self.format_type == DataFormat.CSV:
+            return self._parse_csv()
+        elif self.format_type == DataFormat.XML:
+            return self._parse_xml()
+        return self._parse_jsonl()
+
+    def batches(
+        self, batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[Tuple[List[Dict[str, Any]], ImportCheckpoint]]:
+        """Batches of records with the checkpoint after each batch"""
+        batch: List[Dict[str, Any]] = []
+        checkpoint = self.checkpoint
+        for record, checkpoint in self:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch, checkpoint
+                batch = []
+        if batch:
+            yield batch, checkpoint
+
+    def _lines(self, offset: int) -> Iterator[Tuple[str, int]]:
+        """Decoded lines from ``offset``, each with the byte offset just past it"""
+        self.stream.seek(offset)
+        for raw in iter(self.stream.readline, b""):
+            line = raw.decode(self.encoding, errors="replace")
+            if offset == 0:
+                line = line.lstrip("\ufeff")
+            offset += len(raw)
+            yield line, offset
+
+    def _parse_ris(self) -> Iterator[Tuple[Dict[str, Any], ImportCheckpoint]]:
+        """Line state machine: TY opens a reference, ER closes it, untagged lines continue the last field"""
+        records = self.checkpoint.records
+        current: Optional[Dict[str, List[str]]] = None
+        last_tag = None
+        offset = self.checkpoint.offset
+
+        for line, offset in self._lines(self.checkpoint.offset):
+            line = line.rstrip("\r\n")
+            match = self.RIS_TAG.match(line)
+            if match:
+                tag, value = match.group(1), match.group(2).strip()
+                if tag == "TY":
+                    current = {"TY": [value]}
+                    last_tag = tag
+                elif tag == "ER":
+                    if current is not None:
+                        records += 1
+                        yield self._normalize_ris(current), ImportCheckpoint(offset, records)
+                    current = None
+                    last_tag = None
+                elif current is not None:
+                    current.setdefault(tag, []).append(value)
+                    last_tag = tag
+            elif current is not None and last_tag and line.strip():
+                # Wrapped field value
+                current[last_tag][-1] = f"{current[last_tag][-1]} {line.strip()}".strip()
+
+        # Reference without a closing ER at the end of the file
+        if current is not None:
+            records += 1
+            yield self._normalize_ris(current), ImportCheckpoint(offset, records)
+
+    def _parse_csv(self) -> Iterator[Tuple[Dict[str, Any], ImportCheckpoint]]:
+        """csv reader over decoded lines, so quoted multi-line fields work"""
+        position = {"offset": self.checkpoint.offset}
+
+        def tracked(lines: Iterator[Tuple[str, int]]) -> Iterator[str]:
+            for line, offset in lines:
+                position["offset"] = offset
+                yield line
+
+        header_reader = csv.reader(tracked(self._lines(0)))
+        header = [name.strip().lower() for name in next(header_reader, [])]
+        if not header:
+            return
+        start = max(self.checkpoint.offset, position["offset"])
+
+        records = self.checkpoint.records
+        for row in csv.reader(tracked(self._lines(start))):
+            if not any(field.strip() for field in row):
+                continue
+            records += 1
+            yield (
+                self._normalize_mapping(dict(zip(header, row)), "csv_import"),
+                ImportCheckpoint(position["offset"], records),
+            )
+
+    def _parse_jsonl(self) -> Iterator[Tuple[Dict[str, Any], ImportCheckpoint]]:
+        records = self.checkpoint.records
+        for line, offset in self._lines(self.checkpoint.offset):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError(f"JSON Lines record at byte {offset} is not an object")
+            records += 1
+            yield (
+                self._normalize_mapping({k.lower(): v for k, v in item.items()}, "jsonl_import"),
+                ImportCheckpoint(offset, records),
+            )
+
+    def _parse_xml(self) -> Iterator[Tuple[Dict[str, Any], ImportCheckpoint]]:
+        """iterparse, clearing each record element once converted"""
+        self.stream.seek(0)
+        context = ET.iterparse(self.stream, events=("start", "end"))
+        _, root = next(context)
+        index = 0
+
+        for event, element in context:
+            if event != "end" or element.tag != self.xml_record_tag:
+                continue
+            index += 1
+            if index > self.checkpoint.records:
+                if element.tag == "PubmedArticle":
+                    record = self._normalize_pubmed(element)
+                else:
+                    record = self._normalize_mapping(
+                        {child.tag.lower(): "".join(child.itertext()).strip() for child in element},
+                        "xml_import",
+                    )
+                yield record, ImportCheckpoint(0, index)
+            element.clear()
+            root.clear()
+
+    # Normalization
+
+    def _record(self, **fields: Any) -> Dict[str, Any]:
+        record = {
+            "title": "",
+            "authors": [],
+            "doi": "",
+            "external_id": "",
+            "year": None,
+            "journal": "",
+            "abstract": "",
+            "url": "",
+            "source": "",
+            "publication_type": "",
+            "mesh_terms": [],
+            "categories": [],
+            "raw_data": {},
+        }
+        record.update({key: value for key, value in fields.items() if value not in (None, "", [], {})})
+        return record
+
+    def _normalize_ris(self, ref: Dict[str, List[str]]) -> Dict[str, Any]:
+        def first(*tags: str) -> Optional[str]:
+            for tag in tags:
+                if ref.get(tag):
+                    return ref[tag][0]
+            return None
+
+        pages = "-".join(p for p in (first("SP"), first("EP")) if p)
+        return self._record(
+            title=first("TI", "T1"),
+            authors=ref.get("AU", []) + ref.get("A1", []),
+            doi=first("DO"),
+            external_id=first("AN", "ID"),
+            year=self.engine._parse_year(first("PY", "Y1", "DA")),
+            journal=first("JO", "JF", "T2", "JA"),
+            abstract=first("AB", "N2"),
+            url=first("UR"),
+            source="ris_import",
+            publication_type=first("TY"),
+            categories=ref.get("KW", []),
+            raw_data={
+                key: value
+                for key, value in (("volume", first("VL")), ("issue", first("IS")), ("pages", pages))
+                if value
+            },
+        )
+
+    def _normalize_mapping(self, row: Dict[str, Any], source: str) -> Dict[str, Any]:
+        """Normalize a CSV row or JSON object with lowercase keys"""
+
+        def first(*keys: str) -> Any:
+            for key in keys:
+                if row.get(key) not in (None, ""):
+                    return row[key]
+            return None
+
+        authors = first("authors", "author")
+        keywords = first("keywords", "categories")
+        mesh_terms = first("mesh_terms", "mesh")
+        return self._record(
+            title=first("title"),
+            authors=authors if isinstance(authors, list) else self.engine._parse_authors(authors or ""),
+            doi=first("doi"),
+            external_id=str(first("external_id", "pmid", "id", "study_id") or ""),
+            year=self.engine._parse_year(first("year", "publication_year", "py")),
+            journal=first("journal", "source_title", "journal_name"),
+            abstract=first("abstract"),
+            url=first("url", "link"),
+            source=source,
+            publication_type=first("publication_type", "type"),
+            categories=keywords if isinstance(keywords, list) else self.engine._parse_keywords(keywords or ""),
+            mesh_terms=mesh_terms if isinstance(mesh_terms, list) else self.engine._parse_keywords(mesh_terms or ""),
+        )
+
+    def _normalize_pubmed(self, element: ET.Element) -> Dict[str, Any]:
+        citation = element.find("MedlineCitation")
+        if citation is None:
+            citation = element
+        article = citation.find("Article")
+        if article is None:
+            article = citation
+
+        def text(node: Optional[ET.Element]) -> str:
+            return "".join(node.itertext()).strip() if node is not None else ""
+
+        pmid = citation.findtext("PMID") or ""
+        authors = []
+        for author in article.findall("AuthorList/Author"):
+            name = " ".join(
+                part for part in (author.findtext("LastName"), author.findtext("Initials") or author.findtext("ForeName")) if part
+            )
+            authors.append(name or author.findtext("CollectiveName") or "")
+
+        abstract_parts = []
+        for part in article.findall("Abstract/AbstractText"):
+            label = part.get("Label")
+            abstract_parts.append(f"{label}: {text(part)}" if label else text(part))
+
+        doi = ""
+        for location in article.findall("ELocationID"):
+            if location.get("EIdType") == "doi":
+                doi = text(location)
+        if not doi:
+            for article_id in element.findall("PubmedData/ArticleIdList/ArticleId"):
+                if article_id.get("IdType") == "doi":
+                    doi = text(article_id)
+
+        pub_date = article.find("Journal/JournalIssue/PubDate")
+        year = None
+        if pub_date is not None:
+            year = self.engine._parse_year(pub_date.findtext("Year") or pub_date.findtext("MedlineDate"))
+
+        return self._record(
+            title=text(article.find("ArticleTitle")),
+            authors=[name for name in authors if name],
+            doi=doi,
+            external_id=pmid,
+            year=year,
+            journal=article.findtext("Journal/Title"),
+            abstract=" ".join(abstract_parts),
+            url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" if pmid else "",
+            source="pubmed",
+            publication_type=article.findtext("PublicationTypeList/PublicationType"),
+            mesh_terms=[text(d) for d in citation.findall("MeshHeadingList/MeshHeading/DescriptorName")],
+            categories=[text(k) for k in citation.findall("KeywordList/Keyword")],
+        )
 
 
 class ImportEngine:
@@ -563,6 +903,61 @@ class ImportEngine:
                 metadata={},
             )
 
+    async def stream_import(
+        self,
+        stream: BinaryIO,
+        format_type: DataFormat,
+        sink: Callable[[List[Dict[str, Any]], ImportCheckpoint], Awaitable[Any]],
+        checkpoint: Optional[ImportCheckpoint] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        queue_size: int = 2,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Parse a stream in a worker thread while ``sink`` writes the batches parsed before
+
+        At most ``queue_size`` parsed batches wait for the sink, so memory is
+        bounded by the batch size. Yields a progress dict after each batch is
+        written, holding the checkpoint to resume from.
+        """
+
+        parser = StreamingImportParser(stream, format_type, checkpoint, engine=self)
+        batches = parser.batches(batch_size)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+
+        async def produce():
+            try:
+                while True:
+                    item = await asyncio.to_thread(next, batches, None)
+                    await queue.put(item)
+                    if item is None:
+                        break
+            except Exception as e:
+                await queue.put(e)
+
+        producer = asyncio.create_task(produce())
+        start_time = datetime.now()
+        records = 0
+        batch_count = 0
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+
+                batch, batch_checkpoint = item
+                await sink(batch, batch_checkpoint)
+                records += len(batch)
+                batch_count += 1
+                yield {
+                    "records": records,
+                    "batches": batch_count,
+                    "checkpoint": asdict(batch_checkpoint),
+                    "elapsed_seconds": (datetime.now() - start_time).total_seconds(),
+                }
+        finally:
+            producer.cancel()
+
     def _parse_csv(self, csv_data: str) -> Dict[str, Any]:
         """Parse CSV data"""
         return self.converter.csv_to_json(csv_data)
@@ -842,9 +1237,153 @@ class ImportEngine:
         return 0
 
 
+class StreamCompressor:
+    """Incremental gzip / zstd compression of an export stream"""
+
+    TYPES = ("none", "gzip", "zstd")
+
+    def __init__(self, compression: str = "none"):
+        if compression not in self.TYPES:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+
+        self.compression = compression
+        if compression == "gzip":
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        elif compression == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        else:
+            self._compressor = None
+
+    @staticmethod
+    def available() -> List[str]:
+        return [c for c in StreamCompressor.TYPES if c != "zstd" or zstandard is not None]
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it, so every chunk can be sent as soon as it is ready"""
+        if self._compressor is None:
+            return data
+        if self.compression == "gzip":
+            return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self._compressor is None:
+            return b""
+        return self._compressor.flush()
+
+
+class ExportStreamWriter:
+    """Serializes records batch by batch; the output of all calls concatenated is the export"""
+
+    def __init__(
+        self,
+        engine: "ExportEngine",
+        format_type: DataFormat,
+        record_key: str = "studies",
+        fields: Optional[List[str]] = None,
+    ):
+        if format_type not in ExportEngine.STREAMING_FORMATS:
+            raise ValueError(f"Unsupported streaming export format: {format_type}")
+
+        self.engine = engine
+        self.format_type = format_type
+        self.record_key = record_key
+        self.fields = fields
+        self.records_written = 0
+        self._started = False
+        self._buffer = io.StringIO()
+        self._csv_writer = None
+
+    def write(self, records: List[Dict[str, Any]]) -> str:
+        """Serialize a batch of records, preceded by the header on the first call"""
+        chunk = [] if self._started else [self._header(records)]
+        self._started = True
+
+        if self.format_type in (DataFormat.CSV, DataFormat.TSV):
+            self._buffer.seek(0)
+            self._buffer.truncate()
+            for record in records:
+                self._csv_writer.writerow(self.engine._flatten_dict(record))
+            chunk.append(self._buffer.getvalue())
+        elif self.format_type == DataFormat.JSON:
+            for index, record in enumerate(records):
+                separator = ",\n" if self.records_written or index else "\n"
+                chunk.append(separator + json.dumps(record, default=str))
+        elif self.format_type == DataFormat.JSONL:
+            chunk.extend(json.dumps(record, default=str) + "\n" for record in records)
+        elif self.format_type == DataFormat.RIS:
+            for record in records:
+                chunk.append("\n".join(FormatConverter.ris_reference_lines(record)) + "\n")
+        elif self.format_type == DataFormat.XML:
+            tag = self.record_key[:-1] if self.record_key.endswith("s") else "item"
+            for record in records:
+                element = ET.Element(tag)
+                self.engine._dict_to_xml(record, element)
+                chunk.append(ET.tostring(element, encoding="unicode"))
+
+        self.records_written += len(records)
+        return "".join(chunk)
+
+    def close(self) -> str:
+        """Serialize the footer (and the header, if no record was written)"""
+        chunk = "" if self._started else self._header([])
+        self._started = True
+
+        if self.format_type == DataFormat.JSON:
+            chunk += "\n]}\n"
+        elif self.format_type == DataFormat.XML:
+            chunk += f"</{self.record_key}></systematic_review_data>"
+        return chunk
+
+    def _header(self, first_records: List[Dict[str, Any]]) -> str:
+        if self.format_type in (DataFormat.CSV, DataFormat.TSV):
+            # Columns come from the first batch unless given; later extra keys are dropped
+            if self.fields is None:
+                fields = set()
+                for record in first_records:
+                    fields.update(self.engine._flatten_dict(record).keys())
+                self.fields = sorted(fields)
+            self._csv_writer = csv.DictWriter(
+                self._buffer,
+                fieldnames=self.fields,
+                extrasaction="ignore",
+                delimiter="\t" if self.format_type == DataFormat.TSV else ",",
+            )
+            self._csv_writer.writeheader()
+            header = self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+            return header
+        if self.format_type == DataFormat.JSON:
+            return "{" + json.dumps(self.record_key) + ": ["
+        if self.format_type == DataFormat.XML:
+            metadata = ET.Element("metadata")
+            ET.SubElement(metadata, "export_timestamp").text = datetime.now(
+                timezone.utc
+            ).isoformat()
+            ET.SubElement(metadata, "format").text = "xml"
+            return (
+                "<systematic_review_data>"
+                + ET.tostring(metadata, encoding="unicode")
+                + f"<{self.record_key}>"
+            )
+        return ""
+
+
 class ExportEngine:
     """Data export engine with format conversion and validation"""
 
+    STREAMING_FORMATS = (
+        DataFormat.CSV,
+        DataFormat.TSV,
+        DataFormat.JSON,
+        DataFormat.JSONL,
+        DataFormat.RIS,
+        DataFormat.XML,
+    )
+
     def __init__(self):
         self.converter = FormatConverter()
         self.validator = DataValidator(ValidationLevel.LENIENT)
@@ -926,6 +1465,54 @@ class ExportEngine:
                 metadata={},
             )
 
+    def iter_export(
+        self,
+        records: Iterable[Dict[str, Any]],
+        format_type: DataFormat,
+        record_key: str = "studies",
+        fields: Optional[List[str]] = None,
+        compression: str = "none",
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[bytes]:
+        """Export records as a stream of encoded (and optionally compressed) chunks"""
+
+        writer = ExportStreamWriter(self, format_type, record_key, fields)
+        compressor = StreamCompressor(compression)
+        batch: List[Dict[str, Any]] = []
+
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield compressor.compress(writer.write(batch).encode("utf-8"))
+                batch = []
+        if batch:
+            yield compressor.compress(writer.write(batch).encode("utf-8"))
+        yield compressor.compress(writer.close().encode("utf-8")) + compressor.finish()
+
+    async def aiter_export(
+        self,
+        records: AsyncIterable[Dict[str, Any]],
+        format_type: DataFormat,
+        record_key: str = "studies",
+        fields: Optional[List[str]] = None,
+        compression: str = "none",
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Export records read from an async source (e.g. a database cursor) as a stream of chunks"""
+
+        writer = ExportStreamWriter(self, format_type, record_key, fields)
+        compressor = StreamCompressor(compression)
+        batch: List[Dict[str, Any]] = []
+
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield compressor.compress(writer.write(batch).encode("utf-8"))
+                batch = []
+        if batch:
+            yield compressor.compress(writer.write(batch).encode("utf-8"))
+        yield compressor.compress(writer.close().encode("utf-8")) + compressor.finish()
+
     def _export_csv(self, data: Dict[str, Any]) -> str:
         """Export data as CSV"""
 
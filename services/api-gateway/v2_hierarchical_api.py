@@ -3,11 +3,14 @@
 import asyncio
 import json
 import logging
+import shutil
+import tempfile
 from typing import List, Optional
 from datetime import datetime
-from uuid import uuid4
+from uuid import NAMESPACE_URL, uuid4, uuid5
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Path, Query, Response, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from src.data_models.hierarchical_data_models import (
     # Request models
@@ -16,12 +19,25 @@ from src.data_models.hierarchical_data_models import (
     ProjectUpdate, ResearchTopicUpdate, ResearchPlanUpdate,
     # Response models
     ProjectResponse, ResearchTopicResponse, ResearchPlanResponse, ResearchExecutionResponse,
+    LiteratureResultsPage, ExecutionProgressResponse,
     # Utility models
-    SuccessResponse, ProjectHierarchy, ProjectStats, TopicStats, PlanStats
+    SuccessResponse, ProjectHierarchy, ProjectStats, TopicStats, PlanStats,
+    LiteratureResultKind
+)
+
+from src.database.specialized.data_export import (
+    DataFormat,
+    ExportEngine,
+    ImportCheckpoint,
+    ImportEngine,
+    StreamCompressor,
+    StreamingImportParser,
 )
 
 # Import database and MCP client access
-from native_database_client import get_native_database
+from config import Config
+from native_database_client import decode_cursor, encode_cursor, get_native_database
+from execution_events import FINAL_STATUSES, get_execution_events
 
 logger = logging.getLogger(__name__)
 
@@ -56,12 +72,83 @@ def get_mcp_client():
     return _mcp_client
 
 
+def get_execution_store():
+    """Dependency to get the execution event store."""
+    store = get_execution_events()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Execution tracking not available")
+    return store
+
+
 # Override dependencies with actual implementations (backward compatibility)
 def override_dependencies(database_dependency, mcp_client_dependency):
     """Override the dependency functions with actual implementations."""
     pass  # No longer needed with direct approach
 
 
+# =============================================================================
+# LIST PAGINATION HELPERS
+# =============================================================================
+
+# Lists are keyset-paginated on (updated_at, id); the cursor for the next page
+# is returned in this header so list bodies stay plain JSON arrays
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+LIST_INCLUDES = {"stats"}
+
+
+def parse_list_cursor(cursor: Optional[str]) -> Optional[list]:
+    """(updated_at, id) from a list cursor, or None for the first page."""
+    if not cursor:
+        return None
+    try:
+        updated_at, item_id = decode_cursor(cursor)
+        return [datetime.fromisoformat(updated_at), str(item_id)]
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_list_fields(fields: Optional[str], model) -> Optional[set]:
+    """Fields requested with ``fields=``, always including id; None for all fields."""
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Use any of: {', '.join(model.model_fields)}"
+        )
+    return requested | {"id"}
+
+
+def parse_list_include(include: Optional[str]) -> set:
+    requested = {value.strip() for value in (include or "").split(",") if value.strip()}
+    unknown = requested - LIST_INCLUDES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}. Use: stats")
+    return requested
+
+
+def page_list(rows: List[dict], limit: int) -> tuple:
+    """Trim rows fetched with limit + 1 to the page, with the cursor for the next page."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1]["updated_at"], rows[-1]["id"]])
+
+
+def list_response(items: list, fields: Optional[set], next_cursor: Optional[str], response: Response):
+    """Response models, or only the requested fields of them, with the next-page cursor header."""
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    if fields is None:
+        response.headers.update(headers)
+        return items
+    return JSONResponse(
+        content=[item.model_dump(mode="json", include=fields) for item in items],
+        headers=headers
+    )
+
+
 # =============================================================================
 # PROJECT ENDPOINTS
 # =============================================================================
@@ -129,50 +216,31 @@ async def create_project(
 
 @v2_router.get("/projects", response_model=List[ProjectResponse])
 async def list_projects(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by project status"),
-    limit: Optional[int] = Query(None, description="Limit number of results"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    include: Optional[str] = Query(None, description="include=stats adds topic/plan/task counts"),
     db=Depends(get_database),
 ):
-    """List all projects."""
+    """List projects, most recently updated first, one page at a time."""
+    after = parse_list_cursor(cursor)
+    selected = parse_list_fields(fields, ProjectResponse)
+    includes = parse_list_include(include)
     try:
-        # Use database client to get projects
-        projects = await db.get_projects(status_filter=status, limit=limit)
+        projects = await db.get_projects(status_filter=status, limit=limit + 1, after=after)
+        projects, next_cursor = page_list(projects, limit)
         
-        # For each project, get the statistics to populate topic/plan/task counts
-        enriched_projects = []
-        for project in projects:
-            try:
-                stats = await db.get_project_stats(project["id"])
-                if stats:
-                    # Merge project data with statistics
-                    enriched_project = {**project, **stats}
-                    enriched_projects.append(enriched_project)
-                else:
-                    # If no stats available, add default values
-                    enriched_project = {
-                        **project,
-                        "topics_count": 0,
-                        "plans_count": 0, 
-                        "tasks_count": 0,
-                        "total_cost": 0.0,
-                        "completion_rate": 0.0
-                    }
-                    enriched_projects.append(enriched_project)
-            except Exception as e:
-                logger.warning(f"Failed to get stats for project {project['id']}: {e}")
-                # Add default values if stats fail
-                enriched_project = {
-                    **project,
-                    "topics_count": 0,
-                    "plans_count": 0,
-                    "tasks_count": 0, 
-                    "total_cost": 0.0,
-                    "completion_rate": 0.0
-                }
-                enriched_projects.append(enriched_project)
+        # Statistics for the returned page only, in one query
+        if "stats" in includes and projects:
+            stats = await db.get_projects_stats([project["id"] for project in projects])
+            projects = [{**project, **stats.get(project["id"], {})} for project in projects]
                 
-        return [ProjectResponse(**project) for project in enriched_projects]
+        return list_response([ProjectResponse(**project) for project in projects], selected, next_cursor, response)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -398,11 +466,19 @@ async def create_research_topic(
 
 @v2_router.get("/projects/{project_id}/topics", response_model=List[ResearchTopicResponse])
 async def list_research_topics(
+    response: Response,
     project_id: str = Path(..., description="Project ID"),
     status: Optional[str] = Query(None, description="Filter by topic status"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    include: Optional[str] = Query(None, description="include=stats adds plan/task counts"),
     db=Depends(get_database),
 ):
-    """List all research topics for a project."""
+    """List a project's research topics, most recently updated first, one page at a time."""
+    after = parse_list_cursor(cursor)
+    selected = parse_list_fields(fields, ResearchTopicResponse)
+    includes = parse_list_include(include)
     try:
         # First check if project exists
         existing_project = await db.get_project(project_id)
@@ -410,35 +486,15 @@ async def list_research_topics(
             raise HTTPException(status_code=404, detail="Project not found")
 
         # Get topics for the project using database client
-        topics = await db.get_research_topics(project_id=project_id)
-        
-        # Apply status filter if provided
-        if status:
-            topics = [topic for topic in topics if topic.get("status") == status]
-        
-        # Enhance each topic with actual plan and task counts
-        enriched_topics = []
-        for topic in topics:
-            try:
-                # Get research plans for this topic to get actual counts
-                plans = await db.get_research_plans(topic["id"])
-                plans_count = len(plans) if plans else 0
-                
-                # For tasks count, we'd need to aggregate across all plans
-                # For now, using the default 0 from the database client
-                # This could be enhanced by adding a get_topic_stats method
-                enhanced_topic = {
-                    **topic,
-                    "plans_count": plans_count,
-                    # tasks_count remains 0 for now until we add proper aggregation
-                }
-                enriched_topics.append(enhanced_topic)
-            except Exception as e:
-                logger.warning(f"Failed to get enhanced stats for topic {topic['id']}: {e}")
-                # Use the original topic data if enhancement fails
-                enriched_topics.append(topic)
+        topics = await db.get_research_topics(project_id=project_id, limit=limit + 1, after=after, status_filter=status)
+        topics, next_cursor = page_list(topics, limit)
+
+        # Statistics for the returned page only, in one query
+        if "stats" in includes and topics:
+            stats = await db.get_topics_stats([topic["id"] for topic in topics])
+            topics = [{**topic, **stats.get(topic["id"], {})} for topic in topics]
         
-        return [ResearchTopicResponse(**topic) for topic in enriched_topics]
+        return list_response([ResearchTopicResponse(**topic) for topic in topics], selected, next_cursor, response)
 
     except HTTPException:
         raise
@@ -981,11 +1037,19 @@ async def generate_ai_research_plan(
 
 @v2_router.get("/topics/{topic_id}/plans", response_model=List[ResearchPlanResponse])
 async def list_research_plans(
+    response: Response,
     topic_id: str = Path(..., description="Topic ID"),
     status: Optional[str] = Query(None, description="Filter by plan status"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    include: Optional[str] = Query(None, description="include=stats adds task counts and progress"),
     db=Depends(get_database),
 ):
-    """List all research plans for a topic."""
+    """List a topic's research plans, most recently updated first, one page at a time."""
+    after = parse_list_cursor(cursor)
+    selected = parse_list_fields(fields, ResearchPlanResponse)
+    includes = parse_list_include(include)
     try:
         # First check if topic exists
         existing_topic = await db.get_research_topic(topic_id)
@@ -993,41 +1057,21 @@ async def list_research_plans(
             raise HTTPException(status_code=404, detail="Research topic not found")
 
         # Get plans for the topic using database client
-        plans = await db.get_research_plans(topic_id)
-        
-        # Apply status filter if provided
-        if status:
-            plans = [plan for plan in plans if plan.get("status") == status]
+        plans = await db.get_research_plans(
+            topic_id,
+            status_filter=status,
+            limit=limit + 1,
+            after=after,
+            include_structure=selected is None or "plan_structure" in selected,
+        )
+        plans, next_cursor = page_list(plans, limit)
         
-        # Enhance each plan with task counts
-        enriched_plans = []
-        for plan in plans:
-            try:
-                # Get tasks for this plan to get actual counts
-                tasks = await db.get_tasks(plan["id"])
-                tasks_count = len(tasks) if tasks else 0
-                completed_tasks = len([t for t in (tasks or []) if t.get("status") == "completed"])
-                progress = (completed_tasks / tasks_count * 100) if tasks_count > 0 else 0.0
-                
-                enhanced_plan = {
-                    **plan,
-                    "tasks_count": tasks_count,
-                    "completed_tasks": completed_tasks,
-                    "progress": progress,
-                }
-                enriched_plans.append(enhanced_plan)
-            except Exception as e:
-                logger.warning(f"Failed to get enhanced stats for plan {plan['id']}: {e}")
-                # Use the original plan data if enhancement fails
-                enhanced_plan = {
-                    **plan,
-                    "tasks_count": 0,
-                    "completed_tasks": 0,
-                    "progress": 0.0,
-                }
-                enriched_plans.append(enhanced_plan)
+        # Statistics for the returned page only, in one query
+        if "stats" in includes and plans:
+            stats = await db.get_plans_stats([plan["id"] for plan in plans])
+            plans = [{**plan, **stats.get(plan["id"], {})} for plan in plans]
         
-        return [ResearchPlanResponse(**plan) for plan in enriched_plans]
+        return list_response([ResearchPlanResponse(**plan) for plan in plans], selected, next_cursor, response)
 
     except HTTPException:
         raise
@@ -1038,12 +1082,13 @@ async def list_research_plans(
 @v2_router.get("/plans/{plan_id}", response_model=ResearchPlanResponse)
 async def get_research_plan(
     plan_id: str = Path(..., description="Plan ID"),
+    include_literature: bool = Query(True, description="Include the literature result blobs; use /plans/{plan_id}/literature/{kind} to page through them instead"),
     db=Depends(get_database),
 ):
     """Get a specific research plan."""
     try:
         # Get plan using database client
-        plan = await db.get_research_plan(plan_id)
+        plan = await db.get_research_plan(plan_id, include_literature=include_literature)
         if not plan:
             raise HTTPException(status_code=404, detail="Research plan not found")
 
@@ -1077,6 +1122,28 @@ async def get_research_plan(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@v2_router.get("/plans/{plan_id}/literature/{kind}", response_model=LiteratureResultsPage)
+async def get_plan_literature_results(
+    plan_id: str = Path(..., description="Plan ID"),
+    kind: LiteratureResultKind = Path(..., description="Literature results: initial or reviewed"),
+    offset: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of records to return"),
+    db=Depends(get_database),
+):
+    """Page through a plan's initial or reviewed literature results."""
+    try:
+        page = await db.get_plan_literature_results(plan_id, kind, offset=offset, limit=limit)
+        if not page:
+            raise HTTPException(status_code=404, detail="Research plan not found")
+
+        return LiteratureResultsPage(**page)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @v2_router.put("/plans/{plan_id}", response_model=ResearchPlanResponse)
 async def update_research_plan(
     plan_update: ResearchPlanUpdate,
@@ -1184,7 +1251,7 @@ async def delete_research_plan(
     """Delete a research plan and all its related data."""
     try:
         # First check if plan exists
-        existing_plan = await db.get_research_plan(plan_id)
+        existing_plan = await db.get_research_plan(plan_id, include_literature=False)
         if not existing_plan:
             raise HTTPException(status_code=404, detail="Research plan not found")
 
@@ -1372,8 +1439,22 @@ async def execute_research_task(
                 detail="Research coordination service not available"
             )
         
+        # Registered before sending, so no progress event or dispatch failure is missed
+        events = get_execution_events()
+        if events is not None:
+            events.register(execution_id, topic_id=topic_id, plan_id=approved_plan.get("id"))
+            events.watch_dispatch(
+                execution_id, mcp_client.wait_for_task_result(execution_id, timeout=Config.EXECUTION_DISPATCH_TIMEOUT)
+            )
+        
         success = await mcp_client.send_research_action(mcp_payload)
         if not success:
+            if events is not None:
+                events.apply(execution_id, {
+                    "agent_type": "research_manager",
+                    "status": "failed",
+                    "message": "Failed to initiate research workflow"
+                })
             raise HTTPException(
                 status_code=503, 
                 detail="Failed to initiate research workflow"
@@ -1395,7 +1476,8 @@ async def execute_research_task(
             estimated_cost=depth_config["estimated_cost"],
             estimated_duration=depth_config["estimated_duration"],
             status="initiated",
-            progress_url=f"/v2/executions/{execution_id}/progress"
+            progress_url=f"/v2/executions/{execution_id}/progress",
+            events_url=f"/v2/executions/{execution_id}/events"
         )
         
     except HTTPException:
@@ -1467,7 +1549,7 @@ async def get_plan_stats(
     """Get plan statistics."""
     try:
         # First check if plan exists
-        existing_plan = await db.get_research_plan(plan_id)
+        existing_plan = await db.get_research_plan(plan_id, include_literature=False)
         if not existing_plan:
             raise HTTPException(status_code=404, detail="Plan not found")
 
@@ -1570,36 +1652,324 @@ async def get_project_hierarchy(
 
 
 # =============================================================================
-# EXECUTION PROGRESS ENDPOINT
+# LITERATURE EXPORT ENDPOINT
 # =============================================================================
 
-@v2_router.get("/executions/{execution_id}/progress")
-async def get_execution_progress(
-    execution_id: str = Path(..., description="Execution ID"),
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    DataFormat.CSV: ("text/csv", "csv"),
+    DataFormat.TSV: ("text/tab-separated-values", "tsv"),
+    DataFormat.JSON: ("application/json", "json"),
+    DataFormat.JSONL: ("application/x-ndjson", "jsonl"),
+    DataFormat.RIS: ("application/x-research-info-systems", "ris"),
+    DataFormat.XML: ("application/xml", "xml"),
+}
+
+# compression -> (media type, file extension suffix)
+EXPORT_COMPRESSION = {
+    "gzip": ("application/gzip", ".gz"),
+    "zstd": ("application/zstd", ".zst"),
+}
+
+
+@v2_router.get("/projects/{project_id}/literature/export")
+async def export_project_literature(
+    project_id: str = Path(..., description="Project ID"),
+    format: str = Query("csv", description="Export format: csv, tsv, json, jsonl, ris or xml"),
+    compression: str = Query("none", description="Compression: none, gzip or zstd"),
     db=Depends(get_database),
 ):
-    """Get progress information for a research execution."""
+    """Stream a project's literature records as a file download.
+    
+    Records are read through a server-side cursor and serialized and compressed
+    chunk by chunk, so the export starts immediately and runs in constant memory.
+    """
     try:
-        # For now, return a simple progress structure
-        # In a full implementation, this would track actual progress
-        return {
-            "execution_id": execution_id,
-            "status": "in_progress",
-            "progress_percentage": 0,
-            "current_stage": "initializing",
-            "stages": [
-                "initializing",
-                "planning", 
-                "literature_search",
-                "screening",
-                "synthesis",
-                "writing",
-                "completed"
-            ],
-            "estimated_time_remaining": "unknown",
-            "last_updated": datetime.now().isoformat()
+        format_type = DataFormat(format)
+    except ValueError:
+        format_type = None
+    if format_type not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported export format: {format}. Use one of: {', '.join(f.value for f in EXPORT_FORMATS)}"
+        )
+    if compression not in StreamCompressor.available():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported compression: {compression}. Use one of: {', '.join(StreamCompressor.available())}"
+        )
+
+    existing_project = await db.get_project(project_id)
+    if not existing_project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    media_type, extension = EXPORT_FORMATS[format_type]
+    if compression in EXPORT_COMPRESSION:
+        media_type, suffix = EXPORT_COMPRESSION[compression]
+        extension += suffix
+
+    chunks = ExportEngine().aiter_export(
+        db.iter_literature_records(project_id, page_size=Config.EXPORT_PAGE_SIZE),
+        format_type,
+        record_key="studies",
+        compression=compression,
+        batch_size=Config.EXPORT_PAGE_SIZE,
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="literature-{project_id}.{extension}"'}
+    )
+
+
+# =============================================================================
+# LITERATURE SEARCH ENDPOINT
+# =============================================================================
+
+@v2_router.get("/projects/{project_id}/literature/search")
+async def search_project_literature(
+    project_id: str = Path(..., description="Project ID"),
+    q: str = Query(..., min_length=1, description="Search query"),
+    mode: str = Query("fulltext", description="fulltext (ranked title/abstract match) or title (fuzzy title match)"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    min_similarity: float = Query(0.3, gt=0, le=1, description="Title mode: minimum trigram similarity"),
+    db=Depends(get_database),
+    mcp_client=Depends(get_mcp_client),
+):
+    """Search a project's stored literature records.
+    
+    Full-text mode accepts web-search syntax ("quoted phrases", OR, -excluded)
+    and ranks by ts_rank_cd; title mode ranks by trigram similarity, which
+    also finds near-duplicate titles. Pages follow ``next_cursor``. The
+    query runs in the database agent's ``search_literature_records`` action.
+    """
+    if mode not in ("fulltext", "title"):
+        raise HTTPException(status_code=400, detail=f"Unsupported search mode: {mode}. Use fulltext or title")
+
+    existing_project = await db.get_project(project_id)
+    if not existing_project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not (mcp_client and mcp_client.is_connected):
+        raise HTTPException(status_code=503, detail="Database agent not available")
+
+    task_data = {
+        "task_id": str(uuid4()),
+        "context_id": f"literature-search-{project_id}",
+        "agent_type": "database",
+        "action": "search_literature_records",
+        "payload": {
+            "project_id": project_id,
+            "query": q,
+            "mode": mode,
+            "limit": limit,
+            "cursor": cursor,
+            "min_similarity": min_similarity,
         }
-        
-    except Exception as e:
-        logger.error(f"Error getting execution progress: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    }
+    if not await mcp_client.send_research_action(task_data):
+        raise HTTPException(status_code=503, detail="Failed to send search to database agent")
+    task_result = await mcp_client.wait_for_task_result(task_data["task_id"], timeout=Config.LITERATURE_SEARCH_TIMEOUT)
+    if not task_result:
+        raise HTTPException(status_code=504, detail="Database agent did not answer the search")
+
+    results = task_result.get("result")
+    if task_result.get("status") != "completed" or not isinstance(results, dict) or results.get("status") != "completed":
+        error = results.get("error") if isinstance(results, dict) else task_result.get("error")
+        if error == "Invalid cursor":
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        raise HTTPException(status_code=500, detail=f"Literature search failed: {error or 'unknown error'}")
+
+    return {
+        "project_id": project_id,
+        "query": q,
+        "mode": mode,
+        "records": results["records"],
+        "count": results["count"],
+        "next_cursor": results["next_cursor"],
+    }
+
+
+# =============================================================================
+# LITERATURE IMPORT ENDPOINT
+# =============================================================================
+
+def _import_record_id(project_id: str, lit_review_id: str, position: int, record: dict) -> str:
+    """Deterministic record id, so a batch sent again after a resume is not stored twice
+    
+    Records without a DOI or external id are keyed by their position in the
+    import, since titles may be empty or repeated.
+    """
+    key = record.get("doi") or record.get("external_id") or f"{lit_review_id}#{position}"
+    return str(uuid5(NAMESPACE_URL, f"{project_id}:{key.lower()}"))
+
+
+@v2_router.post("/projects/{project_id}/literature/import")
+async def import_project_literature(
+    project_id: str = Path(..., description="Project ID"),
+    file: UploadFile = File(..., description="RIS, CSV, PubMed XML or JSON Lines file"),
+    format: str = Query("ris", description="Import format: ris, csv, xml or jsonl"),
+    lit_review_id: Optional[str] = Query(None, description="Literature review the records belong to; pass it back when resuming"),
+    offset: int = Query(0, ge=0, description="Resume: byte offset from the last checkpoint"),
+    records: int = Query(0, ge=0, description="Resume: records imported before the last checkpoint"),
+    db=Depends(get_database),
+    mcp_client=Depends(get_mcp_client),
+):
+    """Stream a bulk import into the project's literature records.
+    
+    The upload is parsed incrementally and stored in batches through the
+    database agent, with the next batch parsed while the previous one is
+    written. The response is a JSON Lines stream of progress events; each
+    carries the checkpoint to pass back as ``offset`` and ``records`` to
+    resume an interrupted import.
+    """
+    try:
+        format_type = DataFormat(format)
+    except ValueError:
+        format_type = None
+    if format_type not in StreamingImportParser.FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported import format: {format}. Use one of: {', '.join(f.value for f in StreamingImportParser.FORMATS)}"
+        )
+
+    existing_project = await db.get_project(project_id)
+    if not existing_project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not (mcp_client and mcp_client.is_connected):
+        raise HTTPException(status_code=503, detail="Database agent not available")
+
+    lit_review_id = lit_review_id or f"import-{uuid4()}"
+
+    # The upload is closed once this handler returns, before the response body streams
+    upload = tempfile.TemporaryFile()
+    await asyncio.to_thread(shutil.copyfileobj, file.file, upload)
+
+    async def store_batch(batch: List[dict], checkpoint: ImportCheckpoint):
+        # The checkpoint is taken after the batch, so it starts len(batch) records earlier
+        first = checkpoint.records - len(batch)
+        for position, record in enumerate(batch, start=first):
+            record["internal_id"] = _import_record_id(project_id, lit_review_id, position, record)
+        task_data = {
+            "task_id": str(uuid4()),
+            "context_id": f"literature-import-{lit_review_id}",
+            "agent_type": "database",
+            "action": "store_literature_records",
+            "payload": {
+                "lit_review_id": lit_review_id,
+                "project_id": project_id,
+                "records": batch,
+                "metadata": {"source": "bulk_import", "filename": file.filename},
+            }
+        }
+        if not await mcp_client.send_research_action(task_data):
+            raise RuntimeError("Failed to send batch to database agent")
+        task_result = await mcp_client.wait_for_task_result(task_data["task_id"], timeout=Config.IMPORT_BATCH_TIMEOUT)
+        agent_response = (task_result or {}).get("result")
+        if not task_result or task_result.get("status") != "completed" or (
+            isinstance(agent_response, dict) and agent_response.get("status") == "failed"
+        ):
+            error = agent_response.get("error") if isinstance(agent_response, dict) else None
+            raise RuntimeError(error or "Database agent did not store the batch")
+        response = agent_response if isinstance(agent_response, dict) else {}
+        stored = response.get("stored_count", 0)
+        if stored < len(batch):
+            # Resuming from the last checkpoint re-sends this batch; stored records are skipped by id
+            failures = response.get("failed_records") or []
+            detail = f": {failures[0]['error']}" if failures else ""
+            raise RuntimeError(f"Database agent stored {stored} of {len(batch)} records{detail}")
+
+    async def events():
+        checkpoint = {"offset": offset, "records": records}
+        try:
+            async for progress in ImportEngine().stream_import(
+                upload,
+                format_type,
+                store_batch,
+                checkpoint=ImportCheckpoint(offset=offset, records=records),
+                batch_size=Config.IMPORT_BATCH_SIZE,
+            ):
+                checkpoint = progress["checkpoint"]
+                yield json.dumps({"event": "progress", "lit_review_id": lit_review_id, **progress}) + "\n"
+            yield json.dumps({"event": "completed", "lit_review_id": lit_review_id, "checkpoint": checkpoint}) + "\n"
+        except Exception as e:
+            logger.error(f"Literature import for project {project_id} failed: {e}")
+            yield json.dumps({
+                "event": "failed",
+                "lit_review_id": lit_review_id,
+                "error": str(e),
+                "checkpoint": checkpoint,
+            }) + "\n"
+        finally:
+            upload.close()
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+# =============================================================================
+# EXECUTION PROGRESS ENDPOINT
+# =============================================================================
+
+@v2_router.get("/executions/{execution_id}/progress", response_model=ExecutionProgressResponse)
+async def get_execution_progress(
+    execution_id: str = Path(..., description="Execution ID"),
+    events=Depends(get_execution_store),
+):
+    """Get the current progress of a research execution.
+    
+    Served from the gateway's in-memory execution state; nothing is read
+    from the database.
+    """
+    state = events.snapshot(execution_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Execution not found")
+    return state
+
+
+def _sse_message(state: dict) -> str:
+    event = state["status"] if state["status"] in FINAL_STATUSES else "progress"
+    data = json.dumps(state, separators=(",", ":"))
+    return f"id: {state['last_event_id']}\nevent: {event}\ndata: {data}\n\n"
+
+
+@v2_router.get("/executions/{execution_id}/events")
+async def stream_execution_events(
+    execution_id: str = Path(..., description="Execution ID"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    events=Depends(get_execution_store),
+):
+    """Stream the progress of a research execution as server-sent events.
+    
+    Every message carries the execution's full state (as returned by the
+    progress endpoint) with the event counter as its id. The current state
+    is sent first unless the client resumes with an up-to-date
+    ``Last-Event-ID``; a client that falls behind skips intermediate
+    states. The stream ends after the ``completed`` or ``failed`` event.
+    """
+    queue = events.subscribe(execution_id)
+    if queue is None:
+        raise HTTPException(status_code=404, detail="Execution not found")
+    
+    async def stream():
+        try:
+            state = events.snapshot(execution_id)
+            sent = state["last_event_id"]
+            if last_event_id != str(sent):
+                yield _sse_message(state)
+            while state["status"] not in FINAL_STATUSES:
+                try:
+                    state = await asyncio.wait_for(queue.get(), timeout=Config.EXECUTION_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if state["last_event_id"] > sent:
+                    sent = state["last_event_id"]
+                    yield _sse_message(state)
+        finally:
+            events.unsubscribe(execution_id, queue)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
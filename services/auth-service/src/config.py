@@ -21,6 +21,15 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Token validation cache
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_MAX_SIZE: int = 10000
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    HASHING_WORKERS: int = 0  # 0 = one worker per CPU core
+    HASHING_QUEUE_SIZE: int = 32
+    
     # Service Settings
     HOST: str = "0.0.0.0"
     PORT: int = 8013
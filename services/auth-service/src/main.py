@@ -10,7 +10,7 @@ import os
 import secrets
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Optional
+from typing import Annotated, Dict, List, Optional
 from io import BytesIO
 import base64
 import shutil
@@ -20,10 +20,10 @@ import psutil
 
 from jose import JWTError, jwt
 from fastapi import Depends, FastAPI, HTTPException, status, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, FileResponse
-from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr, Field
 from sqlmodel import Session, SQLModel, create_engine, select
 
@@ -35,13 +35,19 @@ from .models import (
 from .database import get_session, create_db_and_tables
 from .config import get_settings
 from .two_factor import TwoFactorAuthService
-from .two_factor import TwoFactorAuthService
+from .password_hashing import HashingPoolSaturated, PasswordHasher
+from .token_cache import TokenRevocationList, UserStatus, UserStatusCache
 
 # Password change request model
 class PasswordChangeRequest(BaseModel):
     current_password: str
     new_password: str = Field(..., min_length=8)
 
+
+# Batch token validation request model
+class ValidateTokensRequest(BaseModel):
+    tokens: List[str] = Field(..., max_length=1000)
+
 # Initialize settings
 settings = get_settings()
 
@@ -67,8 +73,29 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Role-based permissions (resource:action)
+ROLE_PERMISSIONS = {
+    "admin": ["*:*"],  # Admin has all permissions
+    "researcher": [
+        "literature:read", "literature:search", "literature:create",
+        "research:read", "research:create", "research:update",
+        "planning:read", "planning:create", "planning:update",
+        "memory:read", "memory:create", "memory:update",
+        "executor:read", "executor:create",
+        "writer:read", "writer:create", "writer:update"
+    ],
+    "collaborator": [
+        "literature:read", "research:read", "research:comment",
+        "planning:read", "memory:read", "writer:read"
+    ]
+}
+
+# Password hashing pool (bcrypt runs off the event loop)
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    max_workers=settings.HASHING_WORKERS,
+    max_queue=settings.HASHING_QUEUE_SIZE
+)
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -76,18 +103,46 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 # Initialize 2FA service
 tfa_service = TwoFactorAuthService()
 
+# Token validation fast path: cached user status and revoked tokens
+user_status_cache = UserStatusCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
+token_revocations = TokenRevocationList()
+
 # Session dependency
 SessionDep = Annotated[Session, Depends(get_session)]
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def hashing_pool_busy() -> HTTPException:
+    """Build the back-pressure response used when the hashing pool is full."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
+async def verify_password_and_update(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Verify a password, returning a new hash if the stored one is outdated."""
+    try:
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
+    except HashingPoolSaturated:
+        raise hashing_pool_busy()
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    valid, _ = await verify_password_and_update(plain_password, hashed_password)
+    return valid
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    try:
+        return await password_hasher.hash(password)
+    except HashingPoolSaturated:
+        raise hashing_pool_busy()
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -98,7 +153,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    # Fractional iat so a token issued right after a revocation is not
+    # mistaken for one issued before it
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc).timestamp()})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -107,7 +164,7 @@ def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token."""
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc).timestamp(), "type": "refresh"})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -115,8 +172,64 @@ def create_refresh_token(data: dict) -> str:
 async def get_user_by_email(session: Session, email: str) -> Optional[User]:
     """Get user by email."""
     statement = select(User).where(User.email == email)
-    result = session.exec(statement).first()
-    return result
+    return await run_in_threadpool(lambda: session.exec(statement).first())
+
+
+def _load_user_statuses(session: Session, emails: List[str]) -> Dict[str, UserStatus]:
+    """Load status snapshots for several users in one query (blocking)."""
+    statement = select(User).where(User.email.in_(emails))
+    return {
+        user.email: UserStatus(
+            user_id=user.id,
+            email=user.email,
+            role=user.role,
+            is_disabled=user.is_disabled
+        )
+        for user in session.exec(statement).all()
+    }
+
+
+async def get_user_statuses(session: Session, emails: List[str]) -> Dict[str, UserStatus]:
+    """Get user status snapshots, querying the database only for cache misses."""
+    statuses = {}
+    missing = []
+    for email in dict.fromkeys(emails):
+        cached = user_status_cache.get(email)
+        if cached is None:
+            missing.append(email)
+        else:
+            statuses[email] = cached
+
+    if missing:
+        loaded = await run_in_threadpool(_load_user_statuses, session, missing)
+        for user_status in loaded.values():
+            user_status_cache.put(user_status)
+        statuses.update(loaded)
+
+    return statuses
+
+
+def invalidate_user(*emails: str, revoke_tokens: bool = False) -> None:
+    """Drop cached status for users and optionally revoke their tokens."""
+    user_status_cache.invalidate(*emails)
+    if revoke_tokens:
+        for email in emails:
+            token_revocations.revoke(email)
+
+
+def decode_service_token(token: str) -> dict:
+    """Decode a JWT and reject tokens without a subject or that were revoked."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    email = payload.get("sub")
+    if email is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if token_revocations.is_revoked(email, payload.get("iat")):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return payload
 
 
 async def authenticate_user(session: Session, email: str, password: str) -> Optional[User]:
@@ -125,8 +238,15 @@ async def authenticate_user(session: Session, email: str, password: str) -> Opti
     
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await verify_password_and_update(password, user.hashed_password)
+    if not valid:
         return None
+    
+    # Transparently upgrade hashes created with outdated parameters
+    if new_hash:
+        user.hashed_password = new_hash
+        session.add(user)
+        await run_in_threadpool(session.commit)
     return user
 
 
@@ -143,6 +263,8 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], sessio
         email = payload.get("sub")
         if email is None:
             raise credentials_exception
+        if token_revocations.is_revoked(email, payload.get("iat")):
+            raise credentials_exception
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
@@ -167,6 +289,12 @@ def on_startup():
     create_db_and_tables()
 
 
+@app.on_event("shutdown")
+def on_shutdown():
+    """Stop the password hashing workers."""
+    password_hasher.shutdown()
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -179,6 +307,13 @@ async def health_check():
     }
 
 
+# Password hashing metrics endpoint
+@app.get("/metrics/password-hashing")
+async def password_hashing_metrics():
+    """Report hashing pool utilisation and per-operation latency."""
+    return password_hasher.metrics()
+
+
 # Debug CORS configuration endpoint  
 @app.get("/debug/cors")
 async def debug_cors():
@@ -203,7 +338,7 @@ async def register_user(user_data: UserCreate, session: SessionDep):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     db_user = User(
         email=user_data.email,
         first_name=user_data.first_name,
@@ -216,6 +351,7 @@ async def register_user(user_data: UserCreate, session: SessionDep):
     session.add(db_user)
     session.commit()
     session.refresh(db_user)
+    invalidate_user(db_user.email)
     
     return db_user
 
@@ -334,10 +470,12 @@ async def update_user_me(
 ):
     """Update current user information."""
     user_data = user_update.model_dump(exclude_unset=True)
+    previous_email = current_user.email
     
     # Hash password if provided
-    if "password" in user_data:
-        user_data["hashed_password"] = get_password_hash(user_data.pop("password"))
+    password_changed = "password" in user_data
+    if password_changed:
+        user_data["hashed_password"] = await get_password_hash(user_data.pop("password"))
     
     # Update user
     for field, value in user_data.items():
@@ -346,6 +484,7 @@ async def update_user_me(
     session.add(current_user)
     session.commit()
     session.refresh(current_user)
+    invalidate_user(previous_email, current_user.email, revoke_tokens=password_changed)
     
     return current_user
 
@@ -359,6 +498,7 @@ async def delete_user_me(
     """Delete current user account."""
     session.delete(current_user)
     session.commit()
+    invalidate_user(current_user.email, revoke_tokens=True)
     
     return {"message": "Account successfully deleted"}
 
@@ -390,6 +530,7 @@ async def delete_user_by_id(
     
     session.delete(user_to_delete)
     session.commit()
+    invalidate_user(user_to_delete.email, revoke_tokens=True)
     
     return {"message": f"User {user_to_delete.email} (ID: {user_id}) successfully deleted"}
 
@@ -398,26 +539,63 @@ async def delete_user_by_id(
 @app.post("/validate-token")
 async def validate_token(token: str, session: SessionDep):
     """Validate a JWT token and return user info (for service-to-service auth)."""
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email = payload.get("sub")
-        role = payload.get("role", "researcher")
-        
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        
-        user = await get_user_by_email(session, email)
+    payload = decode_service_token(token)
+    email = payload["sub"]
+    
+    user = (await get_user_statuses(session, [email])).get(email)
+    if user is None or user.is_disabled:
+        raise HTTPException(status_code=401, detail="User not found or disabled")
+    
+    return {
+        "valid": True,
+        "email": email,
+        "role": user.role,
+        "user_id": user.user_id
+    }
+
+
+# Batch token validation endpoint (for other services)
+@app.post("/validate-tokens")
+async def validate_tokens(request: ValidateTokensRequest, session: SessionDep):
+    """Validate many JWT tokens at once, resolving users with a single lookup."""
+    payloads = []
+    for token in request.tokens:
+        try:
+            payloads.append((decode_service_token(token), None))
+        except HTTPException as e:
+            payloads.append((None, e.detail))
+    
+    users = await get_user_statuses(
+        session, [payload["sub"] for payload, _ in payloads if payload]
+    )
+    
+    results = []
+    for payload, error in payloads:
+        if payload is None:
+            results.append({"valid": False, "error": error})
+            continue
+        user = users.get(payload["sub"])
         if user is None or user.is_disabled:
-            raise HTTPException(status_code=401, detail="User not found or disabled")
-        
-        return {
+            results.append({"valid": False, "error": "User not found or disabled"})
+            continue
+        results.append({
             "valid": True,
-            "email": email,
-            "role": role,
-            "user_id": user.id
-        }
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+            "email": user.email,
+            "role": user.role,
+            "user_id": user.user_id
+        })
+    
+    return {"results": results}
+
+
+# Token revocation feed (for services that cache validation results)
+@app.get("/revocations")
+async def get_revocations(since_version: int = 0):
+    """Return token revocations newer than the given version."""
+    return {
+        "version": token_revocations.version,
+        "revocations": token_revocations.changes_since(since_version)
+    }
 
 
 # Refresh token endpoint
@@ -431,6 +609,8 @@ async def refresh_access_token(refresh_token: str, session: SessionDep):
         
         if email is None or token_type != "refresh":
             raise HTTPException(status_code=401, detail="Invalid refresh token")
+        if token_revocations.is_revoked(email, payload.get("iat")):
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
         
         user = await get_user_by_email(session, email)
         if user is None or user.is_disabled:
@@ -462,55 +642,31 @@ async def check_permission(
     session: SessionDep
 ):
     """Check if user has permission for a specific resource and action."""
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email = payload.get("sub")
-        role = payload.get("role", "researcher")
-        
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        
-        user = await get_user_by_email(session, email)
-        if user is None or user.is_disabled:
-            raise HTTPException(status_code=401, detail="User not found or disabled")
-        
-        # Basic RBAC logic (can be extended)
-        permissions = {
-            "admin": ["*:*"],  # Admin has all permissions
-            "researcher": [
-                "literature:read", "literature:search", "literature:create",
-                "research:read", "research:create", "research:update",
-                "planning:read", "planning:create", "planning:update",
-                "memory:read", "memory:create", "memory:update",
-                "executor:read", "executor:create",
-                "writer:read", "writer:create", "writer:update"
-            ],
-            "collaborator": [
-                "literature:read", "research:read", "research:comment",
-                "planning:read", "memory:read", "writer:read"
-            ]
-        }
-        
-        user_permissions = permissions.get(role, [])
-        required_permission = f"{resource}:{action}"
-        
-        # Check if user has specific permission or wildcard
-        has_permission = (
-            required_permission in user_permissions or
-            "*:*" in user_permissions or
-            f"{resource}:*" in user_permissions
-        )
-        
-        return {
-            "has_permission": has_permission,
-            "email": email,
-            "role": role,
-            "resource": resource,
-            "action": action
-        }
-        
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    payload = decode_service_token(token)
+    email = payload["sub"]
+    
+    user = (await get_user_statuses(session, [email])).get(email)
+    if user is None or user.is_disabled:
+        raise HTTPException(status_code=401, detail="User not found or disabled")
+    
+    # Basic RBAC logic (can be extended)
+    user_permissions = ROLE_PERMISSIONS.get(user.role, [])
+    required_permission = f"{resource}:{action}"
+    
+    # Check if user has specific permission or wildcard
+    has_permission = (
+        required_permission in user_permissions or
+        "*:*" in user_permissions or
+        f"{resource}:*" in user_permissions
+    )
+    
+    return {
+        "has_permission": has_permission,
+        "email": email,
+        "role": user.role,
+        "resource": resource,
+        "action": action
+    }
 
 
 # User profile update endpoint
@@ -532,6 +688,7 @@ async def update_user_profile(
             )
     
     # Update user fields
+    previous_email = current_user.email
     update_data = user_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         if hasattr(current_user, field):
@@ -540,6 +697,7 @@ async def update_user_profile(
     session.add(current_user)
     session.commit()
     session.refresh(current_user)
+    invalidate_user(previous_email, current_user.email)
     
     return current_user
 
@@ -554,18 +712,19 @@ async def change_password(
     """Change the current user's password."""
     
     # Verify current password
-    if not verify_password(password_change.current_password, current_user.hashed_password):
+    if not await verify_password(password_change.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Hash and update new password
-    new_hashed_password = get_password_hash(password_change.new_password)
+    new_hashed_password = await get_password_hash(password_change.new_password)
     current_user.hashed_password = new_hashed_password
     
     session.add(current_user)
     session.commit()
+    invalidate_user(current_user.email, revoke_tokens=True)
     
     return {"message": "Password changed successfully"}
 
@@ -912,7 +1071,7 @@ async def disable_2fa(
         )
     
     # Verify password
-    if not verify_password(disable_data.password, current_user.hashed_password):
+    if not await verify_password(disable_data.password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect password"
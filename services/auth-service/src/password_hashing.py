@@ -0,0 +1,137 @@
+"""
+Password hashing executor for the Authentication Service
+
+Runs bcrypt hashing and verification in a bounded process pool so that
+CPU-heavy password work never blocks the event loop. Callers beyond the
+pool capacity are rejected instead of queueing without limit, and
+per-operation latency is recorded to help tune the bcrypt cost factor.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+# Per-process crypt contexts by cost factor, created lazily inside each worker
+_worker_contexts: Dict[int, CryptContext] = {}
+
+
+def _build_context(rounds: int) -> CryptContext:
+    """Create the bcrypt context; hashes with any other cost need an update."""
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds
+    )
+
+
+def _get_worker_context(rounds: int) -> CryptContext:
+    if rounds not in _worker_contexts:
+        _worker_contexts[rounds] = _build_context(rounds)
+    return _worker_contexts[rounds]
+
+
+def _hash_password(password: str, rounds: int) -> str:
+    return _get_worker_context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return _get_worker_context(rounds).verify_and_update(password, hashed_password)
+
+
+class HashingPoolSaturated(Exception):
+    """Raised when the hashing pool has no free capacity for a new request."""
+
+
+class OperationStats:
+    """Running latency statistics for one hashing operation."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class PasswordHasher:
+    """Bounded process pool for bcrypt hashing and verification.
+
+    Args:
+        rounds: bcrypt cost factor for new hashes. Existing hashes with a
+            different cost are flagged for rehashing on verification.
+        max_workers: Number of worker processes (defaults to CPU count).
+        max_queue: Requests allowed to wait for a worker before new
+            requests are rejected with :class:`HashingPoolSaturated`.
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: int = 0, max_queue: int = 32):
+        self.rounds = rounds
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.capacity = self.max_workers + max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self.rejected = 0
+        self.stats: Dict[str, OperationStats] = {
+            "hash": OperationStats(),
+            "verify": OperationStats(),
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def _run(self, operation: str, func, *args):
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            raise HashingPoolSaturated(f"Password {operation} pool is saturated")
+
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+            self.stats[operation].record((time.perf_counter() - started) * 1000)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost factor."""
+        return await self._run("hash", _hash_password, password, self.rounds)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password, returning a replacement hash if it is outdated."""
+        return await self._run("verify", _verify_and_update, password, hashed_password, self.rounds)
+
+    def metrics(self) -> dict:
+        """Return pool utilisation and per-operation latency statistics."""
+        return {
+            "bcrypt_rounds": self.rounds,
+            "workers": self.max_workers,
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+            "rejected": self.rejected,
+            "operations": {name: stats.to_dict() for name, stats in self.stats.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
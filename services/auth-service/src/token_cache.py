@@ -0,0 +1,130 @@
+"""
+Token validation cache for the Authentication Service
+
+Provides an in-process TTL/LRU cache of user status snapshots and a
+versioned token revocation list, so service-to-service token checks
+can be answered without a database round trip on every request.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class UserStatus:
+    """Immutable snapshot of the user fields needed to validate a token."""
+    user_id: int
+    email: str
+    role: str
+    is_disabled: bool
+
+
+class UserStatusCache:
+    """Thread-safe LRU cache of user status snapshots with a TTL.
+
+    Entries expire after ``ttl_seconds`` so changes made outside this
+    process (e.g. ``manage_users.py``) are picked up eventually; changes
+    made through the service invalidate entries explicitly.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 30.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, UserStatus]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, email: str) -> Optional[UserStatus]:
+        """Return the cached status for ``email`` or None if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user_status = entry
+            if expires_at < time.monotonic():
+                del self._entries[email]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return user_status
+
+    def put(self, user_status: UserStatus) -> None:
+        """Store a status snapshot, evicting the least recently used entry."""
+        with self._lock:
+            self._entries[user_status.email] = (
+                time.monotonic() + self.ttl_seconds, user_status
+            )
+            self._entries.move_to_end(user_status.email)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *emails: str) -> None:
+        """Drop cached entries for the given emails."""
+        with self._lock:
+            for email in emails:
+                self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class TokenRevocationList:
+    """Versioned list of per-user token revocations.
+
+    Revoking a user records the revocation time; any token for that user
+    issued at or before that time is rejected, so ``iat`` claims should
+    carry sub-second precision. Each
+    revocation bumps a monotonically increasing version so other services
+    can pull incremental updates with :meth:`changes_since`.
+    """
+
+    def __init__(self):
+        self._revoked_at: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def revoke(self, email: str) -> int:
+        """Revoke all tokens issued to ``email`` so far; return new version."""
+        with self._lock:
+            self.version += 1
+            self._revoked_at[email] = (self.version, time.time())
+            return self.version
+
+    def is_revoked(self, email: str, issued_at: Optional[float]) -> bool:
+        """Check whether a token issued at ``issued_at`` has been revoked."""
+        with self._lock:
+            entry = self._revoked_at.get(email)
+        if entry is None:
+            return False
+        if issued_at is None:
+            return True
+        return float(issued_at) <= entry[1]
+
+    def changes_since(self, version: int) -> List[dict]:
+        """Return revocations with a version greater than ``version``."""
+        with self._lock:
+            return [
+                {"email": email, "version": entry_version, "revoked_at": revoked_at}
+                for email, (entry_version, revoked_at) in self._revoked_at.items()
+                if entry_version > version
+            ]
+
@@ -260,7 +260,11 @@ async def initialize_schema():
                 categories JSONB DEFAULT '[]',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                metadata JSONB DEFAULT '{}'
+                metadata JSONB DEFAULT '{}',
+                search_vector TSVECTOR GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(abstract, '')), 'B')
+                ) STORED
             )
         """)
         
@@ -299,6 +303,10 @@ async def initialize_schema():
         await conn.execute("CREATE INDEX IF NOT EXISTS idx_research_plans_status ON research_plans(status)")
         await conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
         await conn.execute("CREATE INDEX IF NOT EXISTS idx_research_tasks_status ON research_tasks(status)")
+        # Keyset pagination of list endpoints on (updated_at, id)
+        await conn.execute("CREATE INDEX IF NOT EXISTS idx_projects_updated ON projects(updated_at, id)")
+        await conn.execute("CREATE INDEX IF NOT EXISTS idx_research_topics_project_updated ON research_topics(project_id, updated_at, id)")
+        await conn.execute("CREATE INDEX IF NOT EXISTS idx_research_plans_topic_updated ON research_plans(topic_id, updated_at, id)")
         
         # Create simplified sync triggers between tasks and research_tasks
         logger.info("Creating simplified sync triggers...")
@@ -548,6 +556,32 @@ async def run_migrations():
         else:
             logger.info("reviewed_literature_results column already exists")
         
+        # Check if search_vector column exists in literature_records
+        search_vector_exists = await conn.fetchval("""
+            SELECT EXISTS (
+                SELECT 1 FROM information_schema.columns 
+                WHERE table_name='literature_records' AND column_name='search_vector'
+            )
+        """)
+        if not search_vector_exists:
+            logger.info("Adding search_vector column to literature_records table (rewrites the table)...")
+            await conn.execute("""
+                ALTER TABLE literature_records 
+                ADD COLUMN search_vector TSVECTOR GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(abstract, '')), 'B')
+                ) STORED
+            """)
+            logger.info("Successfully added search_vector column")
+        else:
+            logger.info("search_vector column already exists")
+        
+        # Full-text and trigram indexes for literature search
+        logger.info("Creating literature search indexes...")
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        await conn.execute("CREATE INDEX IF NOT EXISTS idx_literature_records_search_vector ON literature_records USING GIN (search_vector)")
+        await conn.execute("CREATE INDEX IF NOT EXISTS idx_literature_records_title_trgm ON literature_records USING GIN (title gin_trgm_ops)")
+        
         await conn.close()
         logger.info("Database migrations completed successfully!")
         
@@ -0,0 +1,274 @@
+"""
+Shared state for running several MCP server nodes.
+
+In cluster mode each node keeps its own websocket connections but writes
+the entity registry, the task table and the pending-message queues to a
+shared store, and hands messages for entities connected to another node
+to that node over a bus. Agents and gateways can connect to any node.
+
+RedisClusterStore is the production store. LocalClusterStore keeps the
+same state in process memory, for a single node or for several nodes
+running in one process in tests.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - optional dependency
+    aioredis = None
+
+logger = logging.getLogger("mcp_server")
+
+BusHandler = Callable[[bytes], Awaitable[None]]
+
+# Seconds after its last heartbeat that a node is considered gone
+DEFAULT_NODE_TTL = 30
+
+
+class ClusterStore(ABC):
+    """Registry, task table and message bus shared by the server nodes."""
+
+    def __init__(self, node_ttl: int = DEFAULT_NODE_TTL):
+        self.node_ttl = node_ttl
+        self.node_id: Optional[str] = None
+
+    @abstractmethod
+    async def start(self, node_id: str, on_message: BusHandler):
+        """Join the cluster and deliver bus messages for this node to ``on_message``."""
+
+    @abstractmethod
+    async def stop(self):
+        """Leave the cluster."""
+
+    @abstractmethod
+    async def heartbeat(self):
+        """Mark this node as alive for another ``node_ttl`` seconds."""
+
+    @abstractmethod
+    async def live_nodes(self) -> Set[str]:
+        pass
+
+    @abstractmethod
+    async def put_entity(self, entity_id: str, info: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    async def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def list_entities(self) -> Dict[str, Dict[str, Any]]:
+        pass
+
+    async def release_entity(self, entity_id: str, node_id: str):
+        """Mark an entity disconnected unless it has since reconnected to another node."""
+        info = await self.get_entity(entity_id)
+        if info and info.get("node_id") == node_id:
+            info["status"] = "disconnected"
+            await self.put_entity(entity_id, info)
+
+    @abstractmethod
+    async def put_task(self, task_id: str, task: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def pop_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a task; returns None if another node already did."""
+
+    @abstractmethod
+    async def list_tasks(self) -> Dict[str, Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def push_pending(self, entity_id: str, frame: bytes):
+        pass
+
+    @abstractmethod
+    async def pop_pending(self, entity_id: str) -> List[bytes]:
+        pass
+
+    @abstractmethod
+    async def publish(self, node_id: str, payload: bytes):
+        """Send ``payload`` to the bus handler of ``node_id``."""
+
+
+class LocalClusterState:
+    """In-memory state shared by the LocalClusterStore instances given it."""
+
+    def __init__(self):
+        self.entities: Dict[str, Dict[str, Any]] = {}
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.pending: Dict[str, List[bytes]] = {}
+        self.nodes: Dict[str, float] = {}  # node_id -> last heartbeat
+        self.handlers: Dict[str, BusHandler] = {}
+
+
+class LocalClusterStore(ClusterStore):
+    """Process-local stand-in for RedisClusterStore."""
+
+    def __init__(self, state: Optional[LocalClusterState] = None, node_ttl: int = DEFAULT_NODE_TTL):
+        super().__init__(node_ttl)
+        self.state = state or LocalClusterState()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self, node_id: str, on_message: BusHandler):
+        self.node_id = node_id
+        self.state.handlers[node_id] = on_message
+        await self.heartbeat()
+
+    async def stop(self):
+        self.state.handlers.pop(self.node_id, None)
+        self.state.nodes.pop(self.node_id, None)
+
+    async def heartbeat(self):
+        self.state.nodes[self.node_id] = time.monotonic()
+
+    async def live_nodes(self) -> Set[str]:
+        cutoff = time.monotonic() - self.node_ttl
+        return {node for node, seen in self.state.nodes.items() if seen >= cutoff}
+
+    async def put_entity(self, entity_id: str, info: Dict[str, Any]):
+        self.state.entities[entity_id] = dict(info)
+
+    async def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        info = self.state.entities.get(entity_id)
+        return dict(info) if info else None
+
+    async def list_entities(self) -> Dict[str, Dict[str, Any]]:
+        return {entity_id: dict(info) for entity_id, info in self.state.entities.items()}
+
+    async def put_task(self, task_id: str, task: Dict[str, Any]):
+        self.state.tasks[task_id] = dict(task)
+
+    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        task = self.state.tasks.get(task_id)
+        return dict(task) if task else None
+
+    async def pop_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self.state.tasks.pop(task_id, None)
+
+    async def list_tasks(self) -> Dict[str, Dict[str, Any]]:
+        return {task_id: dict(task) for task_id, task in self.state.tasks.items()}
+
+    async def push_pending(self, entity_id: str, frame: bytes):
+        self.state.pending.setdefault(entity_id, []).append(bytes(frame))
+
+    async def pop_pending(self, entity_id: str) -> List[bytes]:
+        return self.state.pending.pop(entity_id, [])
+
+    async def publish(self, node_id: str, payload: bytes):
+        handler = self.state.handlers.get(node_id)
+        if handler is None:
+            raise ConnectionError(f"Node {node_id} is not on the bus")
+        # Deliver asynchronously, like a real bus
+        task = asyncio.create_task(handler(bytes(payload)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+class RedisClusterStore(ClusterStore):
+    """Cluster state in Redis hashes and lists, with pub/sub as the bus.
+
+    Node heartbeats are scores (last seen, unix time) in one sorted set, so
+    the live nodes are a single range query.
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "mcp", node_ttl: int = DEFAULT_NODE_TTL):
+        super().__init__(node_ttl)
+        if aioredis is None:
+            raise RuntimeError("redis package is required for RedisClusterStore")
+        self.redis = aioredis.from_url(redis_url)
+        self.prefix = prefix
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    async def start(self, node_id: str, on_message: BusHandler):
+        self.node_id = node_id
+        await self.heartbeat()
+        self._pubsub = self.redis.pubsub()
+        await self._pubsub.subscribe(self._key("bus", node_id))
+        self._reader = asyncio.create_task(self._read_bus(on_message))
+
+    async def _read_bus(self, on_message: BusHandler):
+        async for message in self._pubsub.listen():
+            if message.get("type") != "message":
+                continue
+            try:
+                await on_message(message["data"])
+            except Exception as e:
+                logger.error(f"Error handling cluster bus message: {e}")
+
+    async def stop(self):
+        if self._reader:
+            self._reader.cancel()
+        if self._pubsub:
+            await self._pubsub.unsubscribe()
+            await self._pubsub.close()
+        await self.redis.zrem(self._key("nodes"), self.node_id)
+        await self.redis.close()
+
+    async def heartbeat(self):
+        now = time.time()
+        key = self._key("nodes")
+        async with self.redis.pipeline(transaction=False) as pipe:
+            # Also drop nodes that have been gone for a while
+            await pipe.zadd(key, {self.node_id: now}).zremrangebyscore(key, "-inf", now - 10 * self.node_ttl).execute()
+
+    async def live_nodes(self) -> Set[str]:
+        nodes = await self.redis.zrangebyscore(self._key("nodes"), time.time() - self.node_ttl, "+inf")
+        return {node.decode() for node in nodes}
+
+    async def put_entity(self, entity_id: str, info: Dict[str, Any]):
+        await self.redis.hset(self._key("entities"), entity_id, json.dumps(info, default=str))
+
+    async def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.redis.hget(self._key("entities"), entity_id)
+        return json.loads(raw) if raw else None
+
+    async def list_entities(self) -> Dict[str, Dict[str, Any]]:
+        raw = await self.redis.hgetall(self._key("entities"))
+        return {key.decode(): json.loads(value) for key, value in raw.items()}
+
+    async def put_task(self, task_id: str, task: Dict[str, Any]):
+        await self.redis.hset(self._key("tasks"), task_id, json.dumps(task, default=str))
+
+    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.redis.hget(self._key("tasks"), task_id)
+        return json.loads(raw) if raw else None
+
+    async def pop_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        key = self._key("tasks")
+        async with self.redis.pipeline(transaction=True) as pipe:
+            raw, removed = await pipe.hget(key, task_id).hdel(key, task_id).execute()
+        return json.loads(raw) if raw and removed else None
+
+    async def list_tasks(self) -> Dict[str, Dict[str, Any]]:
+        raw = await self.redis.hgetall(self._key("tasks"))
+        return {key.decode(): json.loads(value) for key, value in raw.items()}
+
+    async def push_pending(self, entity_id: str, frame: bytes):
+        await self.redis.rpush(self._key("pending", entity_id), bytes(frame))
+
+    async def pop_pending(self, entity_id: str) -> List[bytes]:
+        key = self._key("pending", entity_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            frames, _ = await pipe.lrange(key, 0, -1).delete(key).execute()
+        return frames
+
+    async def publish(self, node_id: str, payload: bytes):
+        receivers = await self.redis.publish(self._key("bus", node_id), bytes(payload))
+        if not receivers:
+            raise ConnectionError(f"Node {node_id} is not on the bus")
@@ -22,11 +22,15 @@ class EnhancedMCPServerConfig:
     websocket_ping_interval: int = int(os.getenv("WS_PING_INTERVAL", "30"))
     websocket_ping_timeout: int = int(os.getenv("WS_PING_TIMEOUT", "60"))
     websocket_max_size: int = int(os.getenv("WS_MAX_SIZE", "1048576"))  # 1MB
+    wire_compress_threshold: int = int(os.getenv("MCP_WIRE_COMPRESS_THRESHOLD", "16384"))  # 16KB
+    wire_chunk_size: int = int(os.getenv("MCP_WIRE_CHUNK_SIZE", "524288"))  # 512KB, below WS_MAX_SIZE
     
     # Task Management
     max_concurrent_tasks: int = int(os.getenv("MCP_MAX_CONCURRENT_TASKS", "100"))
     task_timeout: int = int(os.getenv("MCP_TASK_TIMEOUT", "300"))
     retry_attempts: int = int(os.getenv("MCP_RETRY_ATTEMPTS", "3"))
+    result_ttl: int = int(os.getenv("MCP_RESULT_TTL", "3600"))  # seconds results stay redeliverable
+    result_max_bytes: int = int(os.getenv("MCP_RESULT_MAX_BYTES", "268435456"))  # 256MB of stored result frames
     
     # Agent Registry
     agent_registry_ttl: int = int(os.getenv("AGENT_REGISTRY_TTL", "300"))
@@ -51,6 +55,8 @@ class EnhancedMCPServerConfig:
     cluster_enabled: bool = os.getenv("CLUSTER_ENABLED", "false").lower() == "true"
     cluster_discovery_method: str = os.getenv("CLUSTER_DISCOVERY", "redis")  # redis, kubernetes, consul
     cluster_node_id: str = os.getenv("CLUSTER_NODE_ID", "")
+    cluster_node_ttl: int = int(os.getenv("CLUSTER_NODE_TTL", "30"))  # seconds without heartbeat before a node is dead
+    cluster_key_prefix: str = os.getenv("CLUSTER_KEY_PREFIX", "mcp")
     
     # Kubernetes Discovery
     kubernetes_namespace: str = os.getenv("KUBERNETES_NAMESPACE", "default")
@@ -5,25 +5,33 @@ Addresses routing and connection issues by:
 - Implementing pending messages queue per entity_id for handling temporary disconnects
 - Using entity_id consistently for sending messages
 - Preserving tasks until successful send or buffer
-- Improved late result delivery for AI services
+- Durable task results with requester acks, redelivery and idempotency keys
 - Added task timeout cleanup
 - More robust logging and error handling
 - Added support for API Gateway with status_request handling
+- Negotiated binary wire format (orjson/msgpack, zstd/zlib, chunking) per connection
+- Zero-copy relay: task bodies are routed on their envelope and forwarded undecoded
+- Optional cluster mode: shared registry/task table and an inter-node bus (cluster.py)
 """
 
 import asyncio
-import json
 import logging
 import os
 import signal
 import sys
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
+from cluster import ClusterStore, RedisClusterStore
+from result_store import DEFAULT_RESULT_MAX_BYTES, DEFAULT_RESULT_TTL, MemoryResultStore, RedisResultStore, ResultStore, new_entry
+from mcp_wire import (DEFAULT_CHUNK_SIZE, DEFAULT_COMPRESS_THRESHOLD, DEFAULT_MAX_MESSAGE_SIZE,
+                      FrameAssembler, RawBody, WireCodec, available_compression,
+                      available_formats, negotiate)
+
 # Setup basic logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,27 +43,54 @@ logger = logging.getLogger("mcp_server")
 class MCPServer:
     """Improved MCP Server with better connectivity handling"""
 
-    def __init__(self, host: str = "0.0.0.0", port: int = 9000):
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 9000,
+        wire_compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+        wire_chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cluster: Optional[ClusterStore] = None,
+        node_id: Optional[str] = None,
+        results: Optional[ResultStore] = None
+    ):
         self.host = host
         self.port = port
         self.is_running = False
         self.server_id = str(uuid.uuid4())
         
+        # Cluster mode: registry, tasks and pending messages live in the shared
+        # store; the local dicts below only cover this node's connections
+        self.cluster = cluster
+        self.node_id = node_id or self.server_id
+        self._background_tasks: List[asyncio.Task] = []
+        # Messages cross the bus as binary frames; relay bodies stay encoded
+        self.bus_codec = WireCodec(
+            available_formats()[0], "none", binary=True, chunk_size=DEFAULT_MAX_MESSAGE_SIZE,
+            accepted_formats=available_formats(), accepted_compression=available_compression()
+        )
+        self.bus_assembler = FrameAssembler(lazy_bodies=True)
+        
         # Connection management
         self.clients: Dict[str, websockets.WebSocketServerProtocol] = {}  # client_id -> ws
         self.agent_registry: Dict[str, Dict[str, Any]] = {}  # entity_id -> info
         self.agent_connections: Dict[str, str] = {}  # entity_id -> client_id
         self.connection_to_entity: Dict[str, str] = {}  # client_id -> entity_id
         
+        # Wire format per connection; clients that never negotiate get JSON text frames
+        self.wire_compress_threshold = wire_compress_threshold
+        self.wire_chunk_size = wire_chunk_size
+        self.codecs: Dict[str, WireCodec] = {}  # client_id -> codec
+        self.assemblers: Dict[str, FrameAssembler] = {}  # client_id -> frame decoder
+        self.legacy_codec = WireCodec()
+        
         # Pending messages for disconnected entities
         self.pending_messages: Dict[str, List[Dict[str, Any]]] = {}  # entity_id -> list of messages
         
         # Task management
         self.active_tasks: Dict[str, Dict[str, Any]] = {}
         
-        # Task result buffer for late-arriving responses
-        self.task_result_buffer: Dict[str, Dict[str, Any]] = {}
-        self.max_buffer_age = 300  # Keep buffered results for 5 minutes
+        # Task results, kept until acknowledged and reusable for duplicate submissions
+        self.results = results or MemoryResultStore()
         self.task_timeout = 3600  # 1 hour timeout for active tasks
         
         logger.info(f"Improved MCP Server initialized: {self.server_id}")
@@ -74,8 +109,13 @@ class MCPServer:
                 ping_timeout=60,
             )
             
+            if self.cluster:
+                await self.cluster.start(self.node_id, self._handle_bus_message)
+                self._background_tasks.append(asyncio.create_task(self._cluster_heartbeat_loop()))
+                logger.info(f"Joined MCP cluster as node {self.node_id}")
+            
             # Start background cleanup task
-            asyncio.create_task(self._background_cleanup())
+            self._background_tasks.append(asyncio.create_task(self._background_cleanup()))
             
             self.is_running = True
             logger.info("Improved MCP Server started successfully")
@@ -101,12 +141,23 @@ class MCPServer:
             self.websocket_server.close()
             await self.websocket_server.wait_closed()
         
+        for task in self._background_tasks:
+            task.cancel()
+        self._background_tasks.clear()
+        
+        if self.cluster:
+            for entity_id in list(self.agent_connections):
+                await self.cluster.release_entity(entity_id, self.node_id)
+            await self.cluster.stop()
+        
         logger.info("Improved MCP Server stopped")
     
     async def _handle_connection(self, websocket):
         """Handle new WebSocket connection"""
         client_id = str(uuid.uuid4())
         self.clients[client_id] = websocket
+        # Leave relay bodies encoded; only the routing envelope is decoded here
+        self.assemblers[client_id] = FrameAssembler(lazy_bodies=True)
         
         logger.info(f"New client connected: {client_id}")
         
@@ -121,10 +172,15 @@ class MCPServer:
         finally:
             await self._cleanup_client(client_id)
     
-    async def _handle_message(self, client_id: str, message: str):
+    async def _handle_message(self, client_id: str, message: Union[str, bytes]):
         """Handle incoming message from client"""
         try:
-            data = json.loads(message)
+            assembler = self.assemblers.get(client_id)
+            if assembler is None:
+                return
+            data = assembler.feed(message)
+            if data is None:
+                return  # Waiting for the remaining chunks
             message_type = data.get("type")
             
             logger.info(f"Received message from {client_id}: {message_type}")
@@ -143,13 +199,19 @@ class MCPServer:
                 await self._handle_heartbeat(client_id, data)
             elif message_type == "status_request":
                 await self._handle_status_request(client_id, data)
+            elif message_type == "result_ack":
+                await self._handle_result_ack(client_id, data)
+            elif message_type == "result_request":
+                await self._handle_result_request(client_id, data)
+            elif message_type == "progress_event":
+                await self._handle_progress_event(client_id, data)
             elif message_type == "gateway_unregister" or message_type == "agent_unregister":
                 await self._cleanup_client(client_id)
             else:
                 logger.warning(f"Unknown message type from {client_id}: {message_type}")
                 
-        except json.JSONDecodeError:
-            logger.error(f"Invalid JSON from {client_id}")
+        except ValueError as e:
+            logger.error(f"Undecodable message from {client_id}: {e}")
         except Exception as e:
             logger.error(f"Message handling error for {client_id}: {e}")
     
@@ -163,6 +225,8 @@ class MCPServer:
             await self._send_error(client_id, "Missing agent_id or agent_type")
             return
         
+        codec = self._negotiate_wire(client_id, data.get("wire"))
+        
         # Register agent
         self.agent_registry[agent_id] = {
             "client_id": client_id,
@@ -170,21 +234,26 @@ class MCPServer:
             "capabilities": capabilities,
             "status": "active",
             "registered_at": datetime.now(),
+            "wire_format": codec.format if codec.binary else "text",
+            "result_acks": bool(data.get("result_acks")),
         }
         
         self.agent_connections[agent_id] = client_id
         self.connection_to_entity[client_id] = agent_id
+        await self._publish_entity(agent_id)
         
         # Send registration confirmation
         await self._send_to_entity(agent_id, {
             "type": "registration_confirmed",
             "agent_id": agent_id,
             "server_id": self.server_id,
+            "wire": codec.to_dict() if codec.binary else None,
             "timestamp": datetime.now().isoformat()
         })
         
-        # Deliver any pending messages
+        # Deliver any pending messages and results not yet acknowledged
         await self._deliver_pending_messages(agent_id)
+        await self._redeliver_results(agent_id)
         
         logger.info(f"Agent registered: {agent_id} ({agent_type}) with capabilities: {capabilities}")
     
@@ -198,6 +267,8 @@ class MCPServer:
             await self._send_error(client_id, "Missing client_id or client_type")
             return
         
+        codec = self._negotiate_wire(client_id, data.get("wire"))
+        
         # Register gateway
         self.agent_registry[gateway_id] = {
             "client_id": client_id,
@@ -205,32 +276,146 @@ class MCPServer:
             "capabilities": capabilities,
             "status": "active",
             "registered_at": datetime.now(),
+            "wire_format": codec.format if codec.binary else "text",
+            "result_acks": bool(data.get("result_acks")),
         }
         
         self.agent_connections[gateway_id] = client_id
         self.connection_to_entity[client_id] = gateway_id
+        await self._publish_entity(gateway_id)
         
         # Send registration confirmation
         await self._send_to_entity(gateway_id, {
             "type": "registration_confirmed",
             "client_id": gateway_id,
             "server_id": self.server_id,
+            "wire": codec.to_dict() if codec.binary else None,
             "timestamp": datetime.now().isoformat()
         })
         
-        # Deliver any pending messages
+        # Deliver any pending messages and results not yet acknowledged
         await self._deliver_pending_messages(gateway_id)
+        await self._redeliver_results(gateway_id)
         
         logger.info(f"Gateway registered: {gateway_id} ({gateway_type})")
     
+    def _negotiate_wire(self, client_id: str, offer: Optional[Dict[str, Any]]) -> WireCodec:
+        """Pick the wire format for a connection from the client's offer"""
+        codec = negotiate(offer, self.wire_compress_threshold, self.wire_chunk_size)
+        self.codecs[client_id] = codec
+        if codec.binary:
+            logger.info(f"Wire format for {client_id}: {codec.format}/{codec.compression}")
+        return codec
+    
+    async def _send_frames(self, client_id: str, message: Dict[str, Any]):
+        """Encode message with the connection's codec and send it"""
+        ws = self.clients[client_id]
+        for frame in self.codecs.get(client_id, self.legacy_codec).encode(message):
+            await ws.send(frame)
+    
+    # Registry, task table and cross-node delivery
+    
+    async def _publish_entity(self, entity_id: str):
+        """Record a locally connected entity in the cluster registry"""
+        if not self.cluster:
+            return
+        info = self.agent_registry[entity_id]
+        await self.cluster.put_entity(entity_id, {
+            "agent_type": info["agent_type"],
+            "capabilities": info["capabilities"],
+            "status": info["status"],
+            "registered_at": info["registered_at"].isoformat(),
+            "result_acks": info["result_acks"],
+            "node_id": self.node_id
+        })
+    
+    async def _find_agents(self, agent_type: str, action: str) -> List[str]:
+        """Active agents of agent_type that can run action; other nodes are asked only when none is local"""
+        def suitable(info: Dict[str, Any]) -> bool:
+            return (info["agent_type"] == agent_type and
+                    info["status"] == "active" and
+                    action in info.get("capabilities", []))
+        
+        agents = [agent_id for agent_id, info in self.agent_registry.items() if suitable(info)]
+        if self.cluster and not agents:
+            live_nodes = await self.cluster.live_nodes()
+            agents += [
+                agent_id for agent_id, info in (await self.cluster.list_entities()).items()
+                if agent_id not in agents and info.get("node_id") in live_nodes and suitable(info)
+            ]
+        return agents
+    
+    async def _store_task(self, task_id: str, task: Dict[str, Any], idempotency_scope: Optional[str] = None):
+        self.active_tasks[task_id] = task
+        await self.results.put(new_entry(task_id, task["requester_id"], idempotency_scope))
+        if idempotency_scope:
+            await self.results.bind_key(idempotency_scope, task_id)
+        if self.cluster:
+            # Routing fields only; the payload has already gone to the agent
+            shared = {key: _isoformat(value) for key, value in task.items() if key != "data"}
+            shared["node_id"] = self.node_id
+            await self.cluster.put_task(task_id, shared)
+    
+    async def _lookup_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        task = self.active_tasks.get(task_id)
+        if task is None and self.cluster:
+            task = await self.cluster.get_task(task_id)
+        return task
+    
+    async def _pop_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a finished task; None if it is unknown or already finished"""
+        task = self.active_tasks.pop(task_id, None)
+        if self.cluster:
+            # The shared table is authoritative: no entry means another node finished it
+            shared = await self.cluster.pop_task(task_id)
+            if shared is None:
+                return None
+            return task or shared
+        return task
+    
+    async def _buffer_message(self, entity_id: str, message: Dict[str, Any]):
+        if self.cluster:
+            # Shared so the entity gets it whichever node it reconnects to
+            await self.cluster.push_pending(entity_id, self.bus_codec.encode(message)[0])
+        else:
+            self.pending_messages.setdefault(entity_id, []).append(message)
+    
+    async def _forward_to_node(self, entity_id: str, message: Dict[str, Any]) -> bool:
+        """Hand a message for a remote entity to the node it is connected to"""
+        info = await self.cluster.get_entity(entity_id)
+        if not info or info.get("status") != "active" or info.get("node_id") == self.node_id:
+            return False
+        try:
+            frame = self.bus_codec.encode(message)[0]
+            await self.cluster.publish(info["node_id"], entity_id.encode() + b"\0" + frame)
+            logger.info(f"Message forwarded to {entity_id} via node {info['node_id']}: {message.get('type')}")
+            return True
+        except Exception as e:
+            logger.warning(f"Forwarding to node {info['node_id']} failed for {entity_id}: {e}")
+            return False
+    
+    async def _handle_bus_message(self, payload: bytes):
+        """Deliver a message forwarded by another node"""
+        entity_id, _, frame = bytes(payload).partition(b"\0")
+        message = self.bus_assembler.feed(frame)
+        await self._send_to_entity(entity_id.decode(), message)
+    
+    async def _cluster_heartbeat_loop(self):
+        while True:
+            try:
+                await self.cluster.heartbeat()
+            except Exception as e:
+                logger.error(f"Cluster heartbeat failed: {e}")
+            await asyncio.sleep(self.cluster.node_ttl / 3)
+    
     async def _deliver_pending_messages(self, entity_id: str):
         """Deliver buffered messages to newly connected entity"""
-        if entity_id not in self.pending_messages:
+        pending = self.pending_messages.pop(entity_id, [])
+        if self.cluster:
+            pending += [self.bus_assembler.feed(frame) for frame in await self.cluster.pop_pending(entity_id)]
+        if not pending:
             return
         
-        pending = self.pending_messages[entity_id].copy()
-        self.pending_messages.pop(entity_id, None)
-        
         for msg in pending:
             success = await self._send_to_entity(entity_id, msg)
             if not success:
@@ -260,13 +445,13 @@ class MCPServer:
                 await self._send_to_entity(requester_entity_id, {"type": "error", "message": "Missing agent_type or action"})
                 return
             
+            # Serve duplicate submissions from the original task
+            idempotency_scope = _idempotency_scope(agent_type, action, task_data.get("idempotency_key"))
+            if idempotency_scope and await self._reuse_task(requester_entity_id, task_id, idempotency_scope, notify_queued=True):
+                return
+            
             # Find suitable agents
-            suitable_agents = [
-                agent_id for agent_id, info in self.agent_registry.items()
-                if (info["agent_type"] == agent_type and 
-                    info["status"] == "active" and 
-                    action in info.get("capabilities", []))
-            ]
+            suitable_agents = await self._find_agents(agent_type, action)
             
             if not suitable_agents:
                 error_msg = f"No active {agent_type} agents found with capability: {action}"
@@ -282,10 +467,9 @@ class MCPServer:
             
             # Select first available agent
             selected_agent = suitable_agents[0]
-            agent_client_id = self.agent_registry[selected_agent]["client_id"]
             
             # Store task
-            self.active_tasks[task_id] = {
+            await self._store_task(task_id, {
                 "id": task_id,
                 "type": action,
                 "agent_type": agent_type,
@@ -295,10 +479,10 @@ class MCPServer:
                 "assigned_agent": selected_agent,
                 "status": "processing",
                 "created_at": datetime.now(),
-            }
+            }, idempotency_scope)
             
             # Send task to agent
-            await self._send_message(agent_client_id, {
+            await self._send_to_entity(selected_agent, {
                 "type": "task_request",
                 "task_id": task_id,
                 "task_type": action,
@@ -334,6 +518,9 @@ class MCPServer:
                 return
             
             task_data = data.get("data", {})
+            if isinstance(task_data, RawBody):
+                # Relayed as an agent-bound task_request; routing fields are inside the body
+                task_data = task_data.decode()
             
             task_id = task_data.get("task_id", str(uuid.uuid4()))
             agent_type = task_data.get("agent_type")
@@ -352,13 +539,13 @@ class MCPServer:
                 })
                 return
             
+            # Serve duplicate submissions from the original task
+            idempotency_scope = _idempotency_scope(agent_type, action, task_data.get("idempotency_key"))
+            if idempotency_scope and await self._reuse_task(requester_entity_id, task_id, idempotency_scope):
+                return
+            
             # Find suitable agents
-            suitable_agents = [
-                agent_id for agent_id, info in self.agent_registry.items()
-                if (info["agent_type"] == agent_type and 
-                    info["status"] == "active" and 
-                    action in info.get("capabilities", []))
-            ]
+            suitable_agents = await self._find_agents(agent_type, action)
             
             if not suitable_agents:
                 error_msg = f"No active {agent_type} agents found with capability: {action}"
@@ -373,10 +560,9 @@ class MCPServer:
             
             # Select first available agent
             selected_agent = suitable_agents[0]
-            agent_client_id = self.agent_registry[selected_agent]["client_id"]
             
             # Store task
-            self.active_tasks[task_id] = {
+            await self._store_task(task_id, {
                 "id": task_id,
                 "type": action,
                 "agent_type": agent_type,
@@ -386,10 +572,10 @@ class MCPServer:
                 "assigned_agent": selected_agent,
                 "status": "processing",
                 "created_at": datetime.now(),
-            }
+            }, idempotency_scope)
             
             # Send task to agent
-            await self._send_message(agent_client_id, {
+            await self._send_to_entity(selected_agent, {
                 "type": "task_request",
                 "task_id": task_id,
                 "task_type": action,
@@ -416,8 +602,14 @@ class MCPServer:
             logger.error("Received task result with no task_id")
             return
         
+        # Agents that only report failure inside the result must not have it stored (and reused) as completed;
+        # relayed bodies stay encoded here and are checked in _reuse_task instead
+        if status == "completed" and isinstance(result, dict) and _result_failed(result):
+            status = "failed"
+        
         logger.info(f"Received task result for {task_id}: {status}")
         
+        # result is still encoded (RawBody) when the agent sent a relay frame
         message = {
             "type": "task_result",
             "task_id": task_id,
@@ -426,88 +618,210 @@ class MCPServer:
             "error": error
         }
         
-        if task_id in self.active_tasks:
-            task = self.active_tasks[task_id]
-            requester_id = task["requester_id"]
-            
-            success = await self._send_to_entity(requester_id, message)
-            
-            if success:
-                logger.info(f"Task result delivered successfully for {task_id}")
-                del self.active_tasks[task_id]
-            else:
-                logger.warning(f"Buffering task result for {task_id} due to delivery failure")
-                del self.active_tasks[task_id]
-        else:
-            logger.warning(f"Late task result for {task_id}, attempting delivery")
-            self.task_result_buffer[task_id] = {
-                "message": message,
-                "received_at": datetime.now(),
-                "attempts": 0
-            }
-            await self._attempt_late_delivery(task_id)
+        task = await self._pop_task(task_id)
+        if task is None:
+            # Timed out or unknown: keep it for the requester (if known) and get_result
+            logger.warning(f"Late task result for {task_id}, storing it")
+        
+        entry = await self.results.complete(
+            task_id, status, self.bus_codec.encode(message)[0],
+            requester_id=task["requester_id"] if task else None
+        )
+        
+        if await self._deliver_result(task_id):
+            logger.info(f"Task result delivered successfully for {task_id}")
+        elif entry["requester_id"]:
+            logger.warning(f"Task result for {task_id} stored until {entry['requester_id']} reconnects")
+        
+        # Duplicate submissions that were waiting on this task
+        for alias_id in entry["subscribers"]:
+            await self._copy_result(task_id, alias_id)
     
-    async def _attempt_late_delivery(self, task_id: str):
-        """Attempt to deliver a buffered task result"""
-        if task_id not in self.task_result_buffer:
+    async def _handle_progress_event(self, client_id: str, data: Dict[str, Any]):
+        """Relay an execution progress event to the gateway that started the execution"""
+        execution_id = data.get("execution_id")
+        if not execution_id:
+            logger.warning(f"Received progress event with no execution_id from {client_id}")
             return
         
-        buffered = self.task_result_buffer[task_id]
-        buffered["attempts"] += 1
+        # The execution's task finishes once its workflow is dispatched; the stored result still names the requester
+        entry = await self.results.get(execution_id)
+        requester_id = entry["requester_id"] if entry else None
+        if not requester_id:
+            task = await self._lookup_task(execution_id)
+            requester_id = task["requester_id"] if task else None
         
-        ai_services = [
-            agent_id for agent_id, info in self.agent_registry.items()
-            if info["agent_type"] == "ai_service" and agent_id in self.agent_connections
-        ]
+        # Only final events are buffered; a missed intermediate one is superseded by the next
+        final = data.get("status") in ("completed", "failed")
+        if requester_id and await self._send_to_entity(requester_id, data, buffer=final):
+            return
         
-        delivered = False
-        for ai_id in ai_services:
-            success = await self._send_to_entity(ai_id, buffered["message"])
-            if success:
-                delivered = True
-                logger.info(f"Late delivery successful to {ai_id} for {task_id}")
-                break
+        # Requester unknown or gone (e.g. a restarted gateway): every connected gateway may serve the execution
+        for entity_id, info in list(self.agent_registry.items()):
+            if info["agent_type"] == "api_gateway" and info["status"] == "active" and entity_id != requester_id:
+                await self._send_to_entity(entity_id, data, buffer=False)
+    
+    async def _deliver_result(self, task_id: str) -> bool:
+        """Send a stored result to its requester"""
+        entry = await self.results.get(task_id)
+        frame = await self.results.get_message(task_id)
+        if not entry or frame is None or not entry["requester_id"]:
+            return False
+        
+        requester_id = entry["requester_id"]
+        # Not buffered: the result store already holds it for redelivery
+        sent = await self._send_to_entity(requester_id, self.bus_assembler.feed(frame), buffer=False)
+        if sent:
+            await self.results.mark_delivered(task_id, acked=not await self._uses_result_acks(requester_id))
+        return sent
+    
+    async def _copy_result(self, original_id: str, task_id: str, requester_id: Optional[str] = None):
+        """Answer task_id with the stored result of original_id"""
+        frame = await self.results.get_message(original_id)
+        original = await self.results.get(original_id)
+        if frame is None or original is None:
+            return
+        
+        if task_id != original_id:
+            entry = await self.results.get(task_id) or new_entry(task_id, requester_id)
+            entry["requester_id"] = requester_id or entry["requester_id"]
+            await self.results.put(entry)
+            message = self.bus_assembler.feed(frame)
+            message.update(task_id=task_id, original_task_id=original_id, cached=True)
+            frame = self.bus_codec.encode(message)[0]
+        elif requester_id:
+            # Same task resubmitted, possibly by a new requester id
+            original["requester_id"] = requester_id
+            await self.results.put(original)
+        
+        await self.results.complete(task_id, original["status"], frame)
+        await self._deliver_result(task_id)
+    
+    async def _reuse_task(self, requester_id: str, task_id: str, scope: str, notify_queued: bool = False) -> bool:
+        """Serve a submission whose idempotency key was seen before; False to run it"""
+        original_id = await self.results.find_key(scope)
+        original = await self.results.get(original_id) if original_id else None
+        if original is None:
+            return False
+        
+        if original["status"] == "processing":
+            if await self._lookup_task(original_id) is None:
+                return False  # Lost without a result; run it again
+            if task_id != original_id:
+                await self.results.put(new_entry(task_id, requester_id))
+                original["subscribers"].append(task_id)
+                await self.results.put(original)
+            logger.info(f"Task {task_id} attached to in-flight duplicate {original_id}")
+            if notify_queued:
+                await self._send_to_entity(requester_id, {
+                    "type": "task_queued",
+                    "data": {
+                        "task_id": task_id,
+                        "duplicate_of": original_id,
+                        "status": "processing"
+                    }
+                })
+            return True
+        
+        if original["status"] != "completed":
+            return False  # Failed or timed out; let the caller retry
         
+        frame = await self.results.get_message(original_id)
+        if frame is None or _result_failed(self.bus_assembler.feed(frame).get("result")):
+            return False  # The agent reported a failure inside its result
+        
+        logger.info(f"Task {task_id} served from stored result of {original_id}")
+        await self._copy_result(original_id, task_id, requester_id)
+        return True
+    
+    async def _redeliver_results(self, entity_id: str):
+        """Resend results the entity has not acknowledged"""
+        delivered = 0
+        for task_id in await self.results.unacked(entity_id):
+            delivered += await self._deliver_result(task_id)
         if delivered:
-            del self.task_result_buffer[task_id]
-        else:
-            logger.warning(f"Late delivery failed for {task_id} after {buffered['attempts']} attempts")
+            logger.info(f"Redelivered {delivered} unacknowledged results to {entity_id}")
     
-    async def _cleanup_task_buffer(self):
-        """Clean up old entries from the task result buffer"""
-        current_time = datetime.now()
-        expired = [
-            tid for tid, buf in self.task_result_buffer.items()
-            if (current_time - buf["received_at"]).total_seconds() > self.max_buffer_age
-        ]
-        for tid in expired:
-            logger.info(f"Cleaning up expired buffered result for {tid}")
-            del self.task_result_buffer[tid]
+    async def _uses_result_acks(self, entity_id: str) -> bool:
+        info = self.agent_registry.get(entity_id)
+        if info is None and self.cluster:
+            info = await self.cluster.get_entity(entity_id)
+        return bool(info and info.get("result_acks"))
+    
+    async def _handle_result_ack(self, client_id: str, data: Dict[str, Any]):
+        """Handle a requester confirming it has processed results"""
+        entity_id = self.connection_to_entity.get(client_id)
+        if not entity_id:
+            await self._send_error(client_id, "Unregistered client")
+            return
+        
+        task_ids = data.get("task_ids") or [data.get("task_id")]
+        for task_id in filter(None, task_ids):
+            if not await self.results.ack(task_id, entity_id):
+                logger.debug(f"Ignoring ack for {task_id} from {entity_id}")
+    
+    async def _handle_result_request(self, client_id: str, data: Dict[str, Any]):
+        """Handle get_result queries"""
+        entity_id = self.connection_to_entity.get(client_id)
+        if not entity_id:
+            await self._send_error(client_id, "Unregistered client")
+            return
+        
+        task_id = data.get("task_id")
+        entry = await self.results.get(task_id) if task_id else None
+        frame = await self.results.get_message(task_id) if entry else None
+        response = {
+            "type": "result_response",
+            "task_id": task_id,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        if entry and frame is not None and entry["status"] != "processing":
+            message = self.bus_assembler.feed(frame)
+            response.update(status=entry["status"], result=message.get("result"), error=message.get("error"))
+        else:
+            task = await self._lookup_task(task_id) if task_id else None
+            response.update(status="processing" if task else "unknown", result=None, error=None)
+        
+        await self._send_to_entity(entity_id, response)
     
     async def _cleanup_expired_tasks(self):
         """Clean up expired active tasks"""
         current_time = datetime.now()
-        expired = []
-        for tid, task in self.active_tasks.items():
-            age = (current_time - task["created_at"]).total_seconds()
-            if age > self.task_timeout:
-                expired.append(tid)
-                message = {
-                    "type": "task_result",
-                    "task_id": tid,
-                    "status": "timeout",
-                    "error": "Task timed out"
-                }
-                await self._send_to_entity(task["requester_id"], message)
-        
-        for tid in expired:
-            del self.active_tasks[tid]
+        tasks = dict(self.active_tasks)
+        if self.cluster:
+            shared_tasks = await self.cluster.list_tasks()
+            # Drop local copies of tasks another node has completed
+            for tid in [tid for tid in tasks if tid not in shared_tasks]:
+                del tasks[tid]
+                self.active_tasks.pop(tid, None)
+            # Also time out tasks created by nodes that have left the cluster
+            live_nodes = await self.cluster.live_nodes()
+            for tid, task in shared_tasks.items():
+                if tid not in tasks and task.get("node_id") not in live_nodes:
+                    tasks[tid] = task
+        
+        for tid, task in tasks.items():
+            age = (current_time - _parse_datetime(task["created_at"])).total_seconds()
+            if age <= self.task_timeout:
+                continue
+            # Another node may have completed it already
+            if await self._pop_task(tid) is None:
+                continue
+            # Stored like any result; a late real result replaces it
+            await self.results.complete(tid, "timeout", self.bus_codec.encode({
+                "type": "task_result",
+                "task_id": tid,
+                "status": "timeout",
+                "error": "Task timed out"
+            })[0], requester_id=task["requester_id"])
+            await self._deliver_result(tid)
     
     async def _background_cleanup(self):
         """Background task for cleanups"""
         while self.is_running:
             try:
-                await self._cleanup_task_buffer()
+                await self.results.expire()
                 await self._cleanup_expired_tasks()
             except Exception as e:
                 logger.error(f"Background cleanup error: {e}")
@@ -538,12 +852,12 @@ class MCPServer:
         }
         
         if task_id:
-            task = self.active_tasks.get(task_id)
+            task = await self._lookup_task(task_id)
             response["task_id"] = task_id
             response["data"] = {
                 "status": task["status"] if task else "unknown",
                 "assigned_agent": task.get("assigned_agent") if task else None,
-                "created_at": task["created_at"].isoformat() if task else None
+                "created_at": _isoformat(task["created_at"]) if task else None
             }
         else:
             response["data"] = self.get_status()
@@ -551,23 +865,26 @@ class MCPServer:
         await self._send_to_entity(entity_id, response)
         logger.info(f"Sent status response to {entity_id}" + (f" for task {task_id}" if task_id else ""))
     
-    async def _send_to_entity(self, entity_id: str, message: Dict[str, Any]) -> bool:
+    async def _send_to_entity(self, entity_id: str, message: Dict[str, Any], buffer: bool = True) -> bool:
         """Send message to entity, buffer if disconnected"""
         current_client_id = self.agent_connections.get(entity_id)
         if not current_client_id or current_client_id not in self.clients:
-            logger.warning(f"No active connection for {entity_id}, buffering message")
-            self.pending_messages.setdefault(entity_id, []).append(message)
+            if self.cluster and await self._forward_to_node(entity_id, message):
+                return True
+            if buffer:
+                logger.warning(f"No active connection for {entity_id}, buffering message")
+                await self._buffer_message(entity_id, message)
             return False
         
         try:
-            ws = self.clients[current_client_id]
-            await ws.send(json.dumps(message))
+            await self._send_frames(current_client_id, message)
             logger.info(f"Message sent to {entity_id} ({current_client_id}): {message.get('type')}")
             return True
         except Exception as e:
             logger.error(f"Send failed to {entity_id} ({current_client_id}): {e}")
             await self._cleanup_client(current_client_id)
-            self.pending_messages.setdefault(entity_id, []).append(message)
+            if buffer:
+                await self._buffer_message(entity_id, message)
             return False
     
     async def _send_error(self, client_id: str, error_message: str):
@@ -585,8 +902,7 @@ class MCPServer:
             return False
         
         try:
-            ws = self.clients[client_id]
-            await ws.send(json.dumps(message))
+            await self._send_frames(client_id, message)
             return True
         except Exception as e:
             logger.error(f"Direct send failed to {client_id}: {e}")
@@ -597,38 +913,90 @@ class MCPServer:
         """Clean up client connection"""
         entity_id = self.connection_to_entity.pop(client_id, None)
         self.clients.pop(client_id, None)
+        self.codecs.pop(client_id, None)
+        self.assemblers.pop(client_id, None)
         
         if entity_id:
             if entity_id in self.agent_connections and self.agent_connections[entity_id] == client_id:
                 del self.agent_connections[entity_id]
             if entity_id in self.agent_registry:
                 self.agent_registry[entity_id]["status"] = "disconnected"
+            if self.cluster:
+                await self.cluster.release_entity(entity_id, self.node_id)
             logger.info(f"Entity disconnected: {entity_id}")
     
     def get_status(self):
         """Get server status"""
         return {
             "server_id": self.server_id,
+            "node_id": self.node_id,
+            "cluster_enabled": self.cluster is not None,
             "is_running": self.is_running,
             "active_agents": len(self.agent_registry),
             "active_tasks": len(self.active_tasks),
             "pending_messages": {k: len(v) for k, v in self.pending_messages.items()},
+            "bodies_forwarded": sum(codec.bodies_forwarded for codec in self.codecs.values()),
             "registered_agents": {
                 agent_id: {
                     "type": info["agent_type"],
                     "capabilities": info["capabilities"],
-                    "status": info["status"]
+                    "status": info["status"],
+                    "wire_format": info.get("wire_format", "text")
                 }
                 for agent_id, info in self.agent_registry.items()
             }
         }
 
 
+def _idempotency_scope(agent_type: str, action: str, idempotency_key: Optional[str]) -> Optional[str]:
+    return f"{agent_type}:{action}:{idempotency_key}" if idempotency_key else None
+
+
+def _result_failed(result: Any) -> bool:
+    """Whether an agent's result body reports a failure (relayed bodies are decoded to check)"""
+    if isinstance(result, RawBody):
+        try:
+            result = result.decode()
+        except Exception:
+            return False
+    return isinstance(result, dict) and result.get("status") in ("failed", "error")
+
+
+def _isoformat(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _parse_datetime(value: Any) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
 async def main():
     """Main entry point"""
+    cluster = None
+    if os.getenv("CLUSTER_ENABLED", "false").lower() == "true":
+        cluster = RedisClusterStore(
+            os.getenv("REDIS_URL", "redis://localhost:6379"),
+            prefix=os.getenv("CLUSTER_KEY_PREFIX", "mcp"),
+            node_ttl=int(os.getenv("CLUSTER_NODE_TTL", "30"))
+        )
+    
+    result_ttl = int(os.getenv("MCP_RESULT_TTL", str(DEFAULT_RESULT_TTL)))
+    if cluster:
+        results = RedisResultStore(cluster.redis, prefix=cluster.prefix, ttl=result_ttl)
+    else:
+        results = MemoryResultStore(
+            ttl=result_ttl,
+            max_bytes=int(os.getenv("MCP_RESULT_MAX_BYTES", str(DEFAULT_RESULT_MAX_BYTES)))
+        )
+    
     server = MCPServer(
         host=os.getenv("HOST", "0.0.0.0"),
-        port=int(os.getenv("PORT", "9000"))
+        port=int(os.getenv("PORT", "9000")),
+        wire_compress_threshold=int(os.getenv("MCP_WIRE_COMPRESS_THRESHOLD", str(DEFAULT_COMPRESS_THRESHOLD))),
+        wire_chunk_size=int(os.getenv("MCP_WIRE_CHUNK_SIZE", str(DEFAULT_CHUNK_SIZE))),
+        cluster=cluster,
+        node_id=os.getenv("CLUSTER_NODE_ID") or None,
+        results=results
     )
     
     # Setup signal handlers
@@ -0,0 +1,266 @@
+"""
+Task result store for the MCP server.
+
+Every task gets an entry when it is routed. The entry records the
+requester and, when one was given, the idempotency key. The agent's
+result is stored on the entry before delivery is attempted.
+
+Requesters that registered with ``result_acks`` confirm each result with
+a ``result_ack`` message. Results they have not acknowledged are
+delivered again when they reconnect. Other requesters count as
+acknowledged once the send succeeded.
+
+Entries stay queryable with ``result_request`` and reusable for duplicate
+submissions until ``ttl`` seconds after their last update.
+
+Result messages are stored as encoded wire frames, so relay bodies are
+kept as they arrived. The in-memory store caps the total size of those
+frames; past ``max_bytes`` it drops the least recently used bodies,
+acknowledged ones first, and keeps the entry metadata. A task whose body
+was dropped is run again on a duplicate submission.
+"""
+
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("mcp_server")
+
+DEFAULT_RESULT_TTL = 3600
+DEFAULT_RESULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def new_entry(task_id: str, requester_id: Optional[str], idempotency_scope: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "task_id": task_id,
+        "requester_id": requester_id,
+        "idempotency_scope": idempotency_scope,
+        "status": "processing",
+        "subscribers": [],   # task ids of duplicate submissions waiting on this one
+        "delivered": False,
+        "acked": False,
+        "updated_at": time.time()
+    }
+
+
+class ResultStore(ABC):
+    """Result entries keyed by task id, plus the idempotency key index."""
+
+    def __init__(self, ttl: int = DEFAULT_RESULT_TTL):
+        self.ttl = ttl
+
+    @abstractmethod
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return the entry without its message."""
+
+    @abstractmethod
+    async def put(self, entry: Dict[str, Any]):
+        """Create or update an entry (metadata only)."""
+
+    @abstractmethod
+    async def get_message(self, task_id: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def put_message(self, task_id: str, frame: bytes):
+        pass
+
+    @abstractmethod
+    async def bind_key(self, scope: str, task_id: str):
+        """Map an idempotency scope to the task that serves it."""
+
+    @abstractmethod
+    async def find_key(self, scope: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def add_unacked(self, requester_id: str, task_id: str):
+        pass
+
+    @abstractmethod
+    async def remove_unacked(self, requester_id: str, task_id: str):
+        pass
+
+    @abstractmethod
+    async def unacked(self, requester_id: str) -> List[str]:
+        pass
+
+    async def expire(self):
+        """Drop entries older than the TTL (stores without key expiry)."""
+
+    async def complete(
+        self, task_id: str, status: str, frame: bytes, requester_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Store a result; creates the entry if the task was not known."""
+        entry = await self.get(task_id) or new_entry(task_id, requester_id)
+        await self.put_message(task_id, frame)
+        entry.update(status=status, delivered=False, acked=False, updated_at=time.time())
+        await self.put(entry)
+        if entry["requester_id"]:
+            await self.add_unacked(entry["requester_id"], task_id)
+        return entry
+
+    async def mark_delivered(self, task_id: str, acked: bool):
+        entry = await self.get(task_id)
+        if not entry:
+            return
+        entry["delivered"] = True
+        entry["acked"] = entry["acked"] or acked
+        await self.put(entry)
+        if entry["acked"] and entry["requester_id"]:
+            await self.remove_unacked(entry["requester_id"], task_id)
+
+    async def ack(self, task_id: str, requester_id: str) -> bool:
+        entry = await self.get(task_id)
+        if not entry or entry["requester_id"] != requester_id:
+            return False
+        await self.mark_delivered(task_id, acked=True)
+        return True
+
+
+class MemoryResultStore(ResultStore):
+    """Result store in process memory (standalone server or tests)."""
+
+    def __init__(
+        self, ttl: int = DEFAULT_RESULT_TTL, max_entries: int = 10000, max_bytes: int = DEFAULT_RESULT_MAX_BYTES
+    ):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._messages: "OrderedDict[str, bytes]" = OrderedDict()  # least recently used first
+        self._message_bytes = 0
+        self._keys: Dict[str, str] = {}
+        self._unacked: Dict[str, List[str]] = {}
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(task_id)
+        return dict(entry, subscribers=list(entry["subscribers"])) if entry else None
+
+    async def put(self, entry: Dict[str, Any]):
+        self._entries[entry["task_id"]] = dict(entry, subscribers=list(entry["subscribers"]))
+        if len(self._entries) > self.max_entries:
+            await self.expire()
+
+    async def get_message(self, task_id: str) -> Optional[bytes]:
+        frame = self._messages.get(task_id)
+        if frame is not None:
+            self._messages.move_to_end(task_id)
+        return frame
+
+    async def put_message(self, task_id: str, frame: bytes):
+        self._drop_message(task_id)
+        self._messages[task_id] = bytes(frame)
+        self._message_bytes += len(frame)
+        if self._message_bytes > self.max_bytes:
+            self._evict_messages(keep=task_id)
+
+    def _drop_message(self, task_id: str):
+        frame = self._messages.pop(task_id, None)
+        if frame is not None:
+            self._message_bytes -= len(frame)
+
+    def _evict_messages(self, keep: str):
+        """Drop result bodies until the byte budget holds, acknowledged ones first."""
+        candidates = [task_id for task_id in self._messages if task_id != keep]
+        acked = [task_id for task_id in candidates if self._entries.get(task_id, {}).get("acked", True)]
+        unacked = [task_id for task_id in candidates if not self._entries.get(task_id, {}).get("acked", True)]
+        for task_id in acked + unacked:
+            if self._message_bytes <= self.max_bytes:
+                break
+            if not self._entries.get(task_id, {}).get("acked", True):
+                logger.warning(f"Result store over {self.max_bytes} bytes; dropping unacknowledged result {task_id}")
+            self._drop_message(task_id)
+
+    @property
+    def message_bytes(self) -> int:
+        return self._message_bytes
+
+    async def bind_key(self, scope: str, task_id: str):
+        self._keys[scope] = task_id
+
+    async def find_key(self, scope: str) -> Optional[str]:
+        task_id = self._keys.get(scope)
+        return task_id if task_id in self._entries else None
+
+    async def add_unacked(self, requester_id: str, task_id: str):
+        pending = self._unacked.setdefault(requester_id, [])
+        if task_id not in pending:
+            pending.append(task_id)
+
+    async def remove_unacked(self, requester_id: str, task_id: str):
+        pending = self._unacked.get(requester_id, [])
+        if task_id in pending:
+            pending.remove(task_id)
+        if not pending:
+            self._unacked.pop(requester_id, None)
+
+    async def unacked(self, requester_id: str) -> List[str]:
+        return [task_id for task_id in self._unacked.get(requester_id, []) if task_id in self._entries]
+
+    async def expire(self):
+        cutoff = time.time() - self.ttl
+        expired = {task_id for task_id, entry in self._entries.items() if entry["updated_at"] < cutoff}
+        # Past the size cap drop the oldest entries as well
+        overflow = len(self._entries) - len(expired) - self.max_entries
+        if overflow > 0:
+            remaining = sorted(
+                (entry["updated_at"], task_id) for task_id, entry in self._entries.items() if task_id not in expired
+            )
+            expired.update(task_id for _, task_id in remaining[:overflow])
+
+        for task_id in expired:
+            self._entries.pop(task_id, None)
+            self._drop_message(task_id)
+        self._keys = {scope: task_id for scope, task_id in self._keys.items() if task_id in self._entries}
+        for requester_id in list(self._unacked):
+            self._unacked[requester_id] = [t for t in self._unacked[requester_id] if t in self._entries]
+            if not self._unacked[requester_id]:
+                del self._unacked[requester_id]
+
+
+class RedisResultStore(ResultStore):
+    """Result store in Redis; every key carries the TTL."""
+
+    def __init__(self, redis, prefix: str = "mcp", ttl: int = DEFAULT_RESULT_TTL):
+        super().__init__(ttl)
+        self.redis = redis
+        self.prefix = prefix
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.redis.get(self._key("result", task_id))
+        return json.loads(raw) if raw else None
+
+    async def put(self, entry: Dict[str, Any]):
+        await self.redis.set(self._key("result", entry["task_id"]), json.dumps(entry), ex=self.ttl)
+
+    async def get_message(self, task_id: str) -> Optional[bytes]:
+        return await self.redis.get(self._key("result_body", task_id))
+
+    async def put_message(self, task_id: str, frame: bytes):
+        await self.redis.set(self._key("result_body", task_id), bytes(frame), ex=self.ttl)
+
+    async def bind_key(self, scope: str, task_id: str):
+        await self.redis.set(self._key("idempotency", scope), task_id, ex=self.ttl)
+
+    async def find_key(self, scope: str) -> Optional[str]:
+        task_id = await self.redis.get(self._key("idempotency", scope))
+        return task_id.decode() if task_id else None
+
+    async def add_unacked(self, requester_id: str, task_id: str):
+        key = self._key("unacked", requester_id)
+        await self.redis.sadd(key, task_id)
+        await self.redis.expire(key, self.ttl)
+
+    async def remove_unacked(self, requester_id: str, task_id: str):
+        await self.redis.srem(self._key("unacked", requester_id), task_id)
+
+    async def unacked(self, requester_id: str) -> List[str]:
+        members = await self.redis.smembers(self._key("unacked", requester_id))
+        return [member.decode() for member in members]
@@ -0,0 +1,12 @@
+"""
+Import paths for the AI service modules
+"""
+
+import sys
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parents[2] / "services" / "ai-service"
+
+# Helper modules are imported directly; mcp_ai_service runs as src.mcp_ai_service
+sys.path.insert(0, str(SERVICE_DIR / "src"))
+sys.path.insert(0, str(SERVICE_DIR))
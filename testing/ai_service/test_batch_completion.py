@@ -0,0 +1,127 @@
+"""
+Tests for the AI service's batch completion helpers
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import batch_completion
+from batch_completion import (
+    RequestRateLimiter,
+    build_micro_batch_messages,
+    fetch_provider_batch,
+    normalize_items,
+    parse_micro_batch_response,
+    plan_micro_batches,
+)
+
+
+def test_normalize_items_assigns_ids_and_system_prompts():
+    items = normalize_items([
+        {"prompt": "one"},
+        {"id": "b", "prompt": "two", "system": "Be brief"},
+        {"messages": [{"role": "user", "content": "three"}]},
+    ], system="Shared")
+    assert [item["id"] for item in items] == ["0", "b", "2"]
+    assert items[0]["messages"][0] == {"role": "system", "content": "Shared"}
+    assert items[1]["messages"][0]["content"] == "Be brief"
+    # Items with their own system prompt or messages are never coalesced
+    assert [item["prompt"] for item in items] == ["one", None, None]
+
+
+@pytest.mark.parametrize("items", [
+    [{"id": "a", "prompt": "x"}, {"id": "a", "prompt": "y"}],
+    [{"id": "a"}],
+])
+def test_normalize_items_rejects_bad_items(items):
+    with pytest.raises(ValueError):
+        normalize_items(items)
+
+
+def test_micro_batches_respect_item_and_token_caps():
+    items = normalize_items(
+        [{"prompt": "x" * 40} for _ in range(5)]
+        + [{"prompt": "y" * 4000}, {"prompt": "z", "max_tokens": 10}]
+    )
+    groups, singles = plan_micro_batches(items, max_items=2, max_tokens=1000, item_token_limit=200)
+    assert [[item["id"] for item in group] for group in groups] == [["0", "1"], ["2", "3"]]
+    assert [item["id"] for item in singles] == ["5", "6", "4"]
+
+
+def test_micro_batching_disabled_sends_everything_alone():
+    items = normalize_items([{"prompt": "a"}, {"prompt": "b"}])
+    groups, singles = plan_micro_batches(items, max_items=1, max_tokens=1000, item_token_limit=200)
+    assert groups == []
+    assert len(singles) == 2
+
+
+def test_micro_batch_round_trip():
+    items = normalize_items([{"id": "q1", "prompt": "2+2?"}, {"id": "q2", "prompt": "Capital of France?"}])
+    messages = build_micro_batch_messages(items, system="Terse")
+    assert messages[0]["role"] == "system"
+    assert '"id": "q1"' in messages[1]["content"]
+
+    reply = 'Sure! {"q1": "4", "q2": {"city": "Paris"}} Hope that helps.'
+    answers = parse_micro_batch_response(reply, ["q1", "q2", "q3"])
+    assert answers == {"q1": "4", "q2": json.dumps({"city": "Paris"})}
+
+
+@pytest.mark.parametrize("reply", ["no json here", "[1, 2]", None, '{"q1": null}'])
+def test_unanswered_micro_batch_items_are_left_for_retry(reply):
+    assert parse_micro_batch_response(reply, ["q1"]) == {}
+
+
+async def test_rate_limiter_waits_for_the_window(monkeypatch):
+    now = [1000.0]
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(batch_completion.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(batch_completion.asyncio, "sleep", fake_sleep)
+
+    limiter = RequestRateLimiter(2)
+    await limiter.acquire()
+    now[0] += 10
+    await limiter.acquire()
+    await limiter.acquire()
+    assert sleeps == [50.0]
+
+
+class FakeOpenAI:
+    def __init__(self, batch, files):
+        self.batches = SimpleNamespace(retrieve=self._retrieve)
+        self.files = SimpleNamespace(content=self._content)
+        self.batch = batch
+        self._files = files
+
+    async def _retrieve(self, batch_id):
+        return self.batch
+
+    async def _content(self, file_id):
+        return SimpleNamespace(text="\n".join(json.dumps(line) for line in self._files[file_id]))
+
+
+async def test_openai_batch_results_and_errors_are_keyed_by_custom_id():
+    client = FakeOpenAI(
+        SimpleNamespace(status="completed", output_file_id="out", error_file_id="err"),
+        {
+            "out": [{"custom_id": "item-0", "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": "hello"}, "finish_reason": "stop"}], "usage": {"total_tokens": 3}
+            }}}],
+            "err": [{"custom_id": "item-1", "response": {"status_code": 400, "body": {"error": {"message": "bad"}}}}],
+        },
+    )
+    finished, results, errors = await fetch_provider_batch("openai", client, "batch")
+    assert finished
+    assert results == {"item-0": {"content": "hello", "finish_reason": "stop", "usage": {"total_tokens": 3}}}
+    assert errors == {"item-1": "bad"}
+
+
+async def test_unfinished_openai_batch_returns_nothing():
+    client = FakeOpenAI(SimpleNamespace(status="in_progress", output_file_id=None, error_file_id=None), {})
+    assert await fetch_provider_batch("openai", client, "batch") == (False, {}, {})
@@ -0,0 +1,102 @@
+"""
+Tests for the AI service's local embedding provider
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from local_embeddings import EmbeddingCache, LocalEmbeddingService
+
+
+class FakeModel:
+    """Stands in for the ONNX model: the vector encodes the text length."""
+
+    dimensions = 2
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        vectors = np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+        return vectors, sum(len(text.split()) for text in texts)
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    directory = tmp_path / "all-MiniLM-L6-v2"
+    directory.mkdir()
+    (directory / "model.onnx").write_bytes(b"")
+    (directory / "tokenizer.json").write_text("{}")
+    return directory
+
+
+def make_service(model_dir, **config):
+    service = LocalEmbeddingService({"model_dir": str(model_dir), "max_wait_ms": 20, **config})
+    service.model = FakeModel()
+    return service
+
+
+def test_unavailable_without_model_files(tmp_path):
+    service = LocalEmbeddingService({"model_dir": str(tmp_path / "missing")})
+    assert not service.available
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.embed(["text"]))
+
+
+async def test_concurrent_requests_share_one_batch(model_dir):
+    service = make_service(model_dir)
+    first, second = await asyncio.gather(
+        service.embed(["a long piece of text", "b"]),
+        service.embed(["cc"]),
+    )
+    assert service.model.calls == [["b", "cc", "a long piece of text"]]
+    assert [vector[0] for vector in first[0]] == [20.0, 1.0]
+    assert [vector[0] for vector in second[0]] == [2.0]
+    service.shutdown()
+
+
+async def test_batches_are_capped(model_dir):
+    service = make_service(model_dir, max_batch_size=2)
+    vectors, _ = await service.embed(["a", "bb", "ccc", "dddd", "eeeee"])
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert sorted(len(call) for call in service.model.calls) == [1, 2, 2]
+    service.shutdown()
+
+
+async def test_cached_texts_are_not_recomputed(model_dir):
+    service = make_service(model_dir)
+    await service.embed(["alpha", "beta"])
+    vectors, tokens = await service.embed(["beta", "alpha", "beta"])
+    assert [vector[0] for vector in vectors] == [4.0, 5.0, 4.0]
+    assert tokens == 0
+    assert len(service.model.calls) == 1
+    service.shutdown()
+
+
+async def test_duplicate_texts_are_embedded_once(model_dir):
+    service = make_service(model_dir)
+    await asyncio.gather(service.embed(["same", "same"]), service.embed(["same"]))
+    assert service.model.calls == [["same"]]
+    service.shutdown()
+
+
+def test_cache_evicts_least_recently_used():
+    cache = EmbeddingCache(max_size=2)
+    vector = np.zeros(2, dtype=np.float32)
+    cache.put_many({"a": vector, "b": vector})
+    cache.get_many(["a"])
+    cache.put_many({"c": vector})
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "cache" / "embeddings.db")
+    EmbeddingCache(disk_path=path).put_many({"key": np.array([0.5, 1.5], dtype=np.float32)})
+
+    cache = EmbeddingCache(disk_path=path)
+    found = cache.get_many(["key"])
+    assert found["key"].tolist() == [0.5, 1.5]
+    assert cache.stats()["disk_hits"] == 1
@@ -0,0 +1,143 @@
+"""
+Tests for concurrent task handling in the AI service's MCP client
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("anthropic")
+
+from src.mcp_ai_service import MCPAIService
+
+
+class LoopbackSocket:
+    """Answers each google_search request from inside send(), before it returns."""
+
+    def __init__(self, service, delays=None):
+        self.service = service
+        self.delays = delays or {}
+        self.sent = []
+
+    async def send(self, frame):
+        request = json.loads(frame)
+        self.sent.append(request)
+        task_id = request["data"]["task_id"]
+        query = request["data"]["payload"]["query"]
+
+        async def reply():
+            await asyncio.sleep(self.delays.get(query, 0))
+            await self.service._handle_task_result({
+                "type": "task_result", "task_id": task_id, "status": "completed",
+                "result": {"items": [query]},
+            })
+
+        if query in self.delays:
+            asyncio.create_task(reply())
+        else:
+            await reply()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    for key in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "XAI_API_KEY"):
+        monkeypatch.delenv(key, raising=False)
+    return MCPAIService()
+
+
+def blocking_handler(service):
+    """Replace task handling with one that waits for a release and tracks peak concurrency."""
+    release = asyncio.Event()
+    state = {"running": 0, "peak": 0, "done": []}
+
+    async def handle(data):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await release.wait()
+        state["running"] -= 1
+        state["done"].append(data["task_id"])
+
+    service._handle_task_request = handle
+    return release, state
+
+
+async def test_task_requests_do_not_block_the_message_loop(service):
+    release, state = blocking_handler(service)
+    await service._handle_mcp_message({"type": "task_request", "task_id": "t1"})
+    await asyncio.sleep(0)
+
+    assert state["running"] == 1
+    assert len(service.active_tasks) == 1
+    release.set()
+    await asyncio.gather(*service.active_tasks)
+    assert state["done"] == ["t1"]
+    assert not service.active_tasks
+
+
+async def test_running_tasks_are_capped(service):
+    service.max_concurrent_tasks = 2
+    service.task_semaphore = asyncio.Semaphore(2)
+    release, state = blocking_handler(service)
+    for index in range(5):
+        service._dispatch_task_request({"task_id": f"t{index}"})
+    await asyncio.sleep(0)
+
+    assert service.get_concurrency_stats() == {
+        "max_concurrent_tasks": 2, "running_tasks": 2, "queued_tasks": 3,
+        "provider_in_flight": {"openai": 0, "anthropic": 0, "xai": 0},
+    }
+    release.set()
+    await asyncio.gather(*list(service.active_tasks))
+    assert state["peak"] == 2
+    assert sorted(state["done"]) == [f"t{index}" for index in range(5)]
+
+
+async def test_provider_calls_are_capped_per_provider(service):
+    service.provider_semaphores["anthropic"] = asyncio.Semaphore(1)
+    release = asyncio.Event()
+    peaks = {"openai": 0, "anthropic": 0}
+
+    def call(provider):
+        async def request():
+            peaks[provider] = max(peaks[provider], service.provider_in_flight[provider])
+            await release.wait()
+            return provider
+        return request
+
+    calls = [asyncio.create_task(service._call_provider(provider, call(provider)))
+             for provider in ("openai", "openai", "openai", "anthropic", "anthropic")]
+    await asyncio.sleep(0)
+    assert service.provider_in_flight == {"openai": 3, "anthropic": 1, "xai": 0}
+
+    release.set()
+    assert await asyncio.gather(*calls) == ["openai"] * 3 + ["anthropic"] * 2
+    assert peaks == {"openai": 3, "anthropic": 1}
+    assert service.provider_in_flight == {"openai": 0, "anthropic": 0, "xai": 0}
+
+
+async def test_provider_slot_is_released_on_failure(service):
+    async def failing():
+        raise RuntimeError("rate limited")
+
+    with pytest.raises(RuntimeError):
+        await service._call_provider("xai", failing)
+    assert service.provider_in_flight["xai"] == 0
+
+
+async def test_search_result_arriving_during_send_is_not_lost(service):
+    service.websocket = LoopbackSocket(service)
+    result = await asyncio.wait_for(service._execute_google_search({"query": "statins"}), timeout=1)
+    assert result == {"items": ["statins"]}
+    assert service.pending_requests == {}
+
+
+async def test_tool_calls_wait_on_their_own_results(service):
+    service.websocket = LoopbackSocket(service, delays={"slow": 0.05, "fast": 0})
+    slow, fast = await asyncio.wait_for(asyncio.gather(
+        service._execute_google_search({"query": "slow"}),
+        service._execute_google_search({"query": "fast"}),
+    ), timeout=1)
+    assert slow == {"items": ["slow"]}
+    assert fast == {"items": ["fast"]}
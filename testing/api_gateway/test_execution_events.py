@@ -0,0 +1,109 @@
+"""
+Tests for the gateway's execution event store
+"""
+
+import asyncio
+import time
+
+from execution_events import ExecutionEventStore
+
+
+def manager(**event):
+    return {"agent_type": "research_manager", **event}
+
+
+def test_progress_counts_finished_nodes_and_delegated_work():
+    store = ExecutionEventStore()
+    store.register("exec")
+    store.apply("exec", manager(stage="literature_review", completed=1, total=4, delegations={"lit-1": 1.0}))
+    state = store.apply("exec", {"agent_type": "literature", "task_id": "lit-1", "completed": 50, "total": 100})
+
+    assert state["current_stage"] == "literature_search"
+    assert state["status"] == "running"
+    assert state["progress_percentage"] == 37.5
+    assert state["estimated_time_remaining"] is not None
+    assert state["tasks"]["lit-1"]["completed"] == 50
+    assert state["last_event_id"] == 2
+
+
+def test_failed_tasks_do_not_count():
+    store = ExecutionEventStore()
+    store.apply("exec", manager(completed=0, total=2, delegations={"t": 1.0}))
+    state = store.apply("exec", {"agent_type": "screening", "task_id": "t", "status": "failed", "completed": 5, "total": 5})
+    assert state["progress_percentage"] == 0.0
+
+
+def test_final_status_sticks():
+    store = ExecutionEventStore()
+    store.apply("exec", manager(status="completed"))
+    state = store.apply("exec", manager(status="running", stage="synthesis"))
+    assert state["status"] == "completed"
+    assert state["progress_percentage"] == 100.0
+
+
+def test_snapshot_is_a_copy():
+    store = ExecutionEventStore()
+    store.apply("exec", {"agent_type": "literature", "task_id": "t"})
+    snapshot = store.snapshot("exec")
+    store.apply("exec", {"agent_type": "literature", "task_id": "u"})
+    assert set(snapshot["tasks"]) == {"t"}
+    assert store.snapshot("missing") is None
+
+
+async def test_slow_subscriber_gets_the_latest_state():
+    store = ExecutionEventStore()
+    store.register("exec")
+    queue = store.subscribe("exec")
+    for completed in range(3):
+        store.apply("exec", manager(completed=completed, total=4))
+    assert queue.qsize() == 1
+    assert (await queue.get())["completed_steps"] == 2
+    store.unsubscribe("exec", queue)
+    assert store.subscribe("missing") is None
+
+
+async def test_rejected_dispatch_fails_the_execution():
+    store = ExecutionEventStore()
+    store.register("exec")
+
+    async def answer():
+        return {"status": "completed", "result": {"status": "failed", "error": "no plan"}}
+
+    store.watch_dispatch("exec", answer())
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    state = store.snapshot("exec")
+    assert state["status"] == "failed"
+    assert state["error"] == "no plan"
+
+
+async def test_states_survive_a_restart(tmp_path):
+    path = str(tmp_path / "events" / "execution_events.db")
+    store = ExecutionEventStore(path, flush_interval=60)
+    await store.start()
+    store.register("exec", research_plan_id="plan")
+    store.apply("exec", manager(completed=1, total=2, delegations={"t": 0.5}))
+    await store.close()
+
+    restarted = ExecutionEventStore(path, flush_interval=60)
+    await restarted.start()
+    state = restarted.snapshot("exec")
+    assert state["research_plan_id"] == "plan"
+    assert state["last_event_id"] == 1
+    assert restarted.executions["exec"].delegations == {"t": 0.5}
+    count = restarted.db.execute("SELECT COUNT(*) FROM execution_events").fetchone()[0]
+    assert count == 1
+    await restarted.close()
+
+
+async def test_idle_executions_are_pruned(tmp_path):
+    store = ExecutionEventStore(str(tmp_path / "events.db"), flush_interval=60, retention=60)
+    await store.start()
+    store.apply("old", manager(total=1))
+    store.apply("new", manager(total=1))
+    store.executions["old"].updated = time.time() - 120
+    await store.flush()
+    await store._prune()
+
+    assert set(store.executions) == {"new"}
+    await store.close()
@@ -0,0 +1,107 @@
+"""
+Tests for keyset pagination of the v2 list endpoints
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from v2_hierarchical_api import NEXT_CURSOR_HEADER, get_database, v2_router
+
+
+class FakeDatabase:
+    """Projects ordered by (updated_at, id) descending, as the native client returns them."""
+
+    def __init__(self, count):
+        start = datetime(2026, 1, 1)
+        # Pairs of projects share an updated_at so the id breaks ties
+        self.projects = [
+            {
+                "id": f"project-{i:02d}",
+                "name": f"Project {i}",
+                "description": "",
+                "status": "active",
+                "created_at": start.isoformat(),
+                "updated_at": (start + timedelta(minutes=i // 2)).isoformat(),
+                "metadata": {},
+            }
+            for i in range(count)
+        ]
+        self.calls = []
+        self.stats_calls = []
+
+    async def get_projects(self, status_filter=None, limit=None, after=None):
+        self.calls.append((limit, after))
+        rows = sorted(self.projects, key=lambda p: (p["updated_at"], p["id"]), reverse=True)
+        if after:
+            rows = [p for p in rows if (datetime.fromisoformat(p["updated_at"]), p["id"]) < tuple(after)]
+        return rows[:limit]
+
+    async def get_projects_stats(self, project_ids):
+        self.stats_calls.append(project_ids)
+        return {project_id: {"topics_count": 2} for project_id in project_ids}
+
+
+@pytest.fixture
+def database():
+    return FakeDatabase(7)
+
+
+@pytest.fixture
+def client(database):
+    app = FastAPI()
+    app.include_router(v2_router)
+    app.dependency_overrides[get_database] = lambda: database
+    return TestClient(app)
+
+
+def test_pages_cover_every_project_once(client, database):
+    seen = []
+    cursor = None
+    while True:
+        response = client.get("/v2/projects", params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        seen.extend(project["id"] for project in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    expected = sorted(database.projects, key=lambda p: (p["updated_at"], p["id"]), reverse=True)
+    assert seen == [project["id"] for project in expected]
+    # One extra row is fetched to detect the next page
+    assert [limit for limit, _ in database.calls] == [4, 4, 4]
+
+
+def test_last_page_has_no_cursor(client):
+    response = client.get("/v2/projects", params={"limit": 10})
+    assert len(response.json()) == 7
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/v2/projects", params={"cursor": "garbage"}).status_code == 400
+
+
+def test_fields_projection_keeps_id(client):
+    response = client.get("/v2/projects", params={"limit": 2, "fields": "name"})
+    assert response.json() == [{"id": "project-06", "name": "Project 6"}, {"id": "project-05", "name": "Project 5"}]
+    assert response.headers[NEXT_CURSOR_HEADER]
+
+
+def test_unknown_field_is_rejected(client):
+    assert client.get("/v2/projects", params={"fields": "name,secret"}).status_code == 400
+
+
+def test_stats_are_opt_in(client, database):
+    plain = client.get("/v2/projects", params={"limit": 2}).json()
+    assert database.stats_calls == []
+    assert plain[0]["topics_count"] == 0
+
+    with_stats = client.get("/v2/projects", params={"limit": 2, "include": "stats"}).json()
+    assert database.stats_calls == [["project-06", "project-05"]]
+    assert with_stats[0]["topics_count"] == 2
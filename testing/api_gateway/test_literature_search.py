@@ -0,0 +1,75 @@
+"""
+Tests for the literature search endpoint, which runs in the database agent
+"""
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from v2_hierarchical_api import get_database, get_mcp_client, v2_router
+
+
+class FakeDatabase:
+    async def get_project(self, project_id):
+        return {"id": project_id} if project_id == "project" else None
+
+
+class FakeMCPClient:
+    is_connected = True
+
+    def __init__(self, result):
+        self.result = result
+        self.sent = []
+
+    async def send_research_action(self, task_data):
+        self.sent.append(task_data)
+        return True
+
+    async def wait_for_task_result(self, task_id, timeout):
+        return self.result
+
+
+def make_client(mcp_client):
+    app = FastAPI()
+    app.include_router(v2_router)
+    app.dependency_overrides[get_database] = lambda: FakeDatabase()
+    app.dependency_overrides[get_mcp_client] = lambda: mcp_client
+    return TestClient(app)
+
+
+def test_search_is_sent_to_the_database_agent():
+    mcp_client = FakeMCPClient({
+        "status": "completed",
+        "result": {"status": "completed", "records": [{"id": "r1", "score": 0.5}], "count": 1, "next_cursor": "abc"},
+    })
+    response = make_client(mcp_client).get(
+        "/v2/projects/project/literature/search", params={"q": "exercise", "mode": "title", "cursor": "xyz"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["records"] == [{"id": "r1", "score": 0.5}]
+    assert response.json()["next_cursor"] == "abc"
+    task = mcp_client.sent[0]
+    assert (task["agent_type"], task["action"]) == ("database", "search_literature_records")
+    assert task["payload"] == {
+        "project_id": "project", "query": "exercise", "mode": "title", "limit": 20, "cursor": "xyz", "min_similarity": 0.3
+    }
+
+
+def test_invalid_cursor_from_the_agent_is_a_client_error():
+    mcp_client = FakeMCPClient({"status": "completed", "result": {"status": "failed", "error": "Invalid cursor"}})
+    response = make_client(mcp_client).get("/v2/projects/project/literature/search", params={"q": "x", "cursor": "bad"})
+    assert response.status_code == 400
+
+
+def test_agent_timeout_is_reported():
+    response = make_client(FakeMCPClient(None)).get("/v2/projects/project/literature/search", params={"q": "x"})
+    assert response.status_code == 504
+
+
+def test_unknown_project():
+    response = make_client(FakeMCPClient(None)).get("/v2/projects/other/literature/search", params={"q": "x"})
+    assert response.status_code == 404
@@ -0,0 +1,134 @@
+"""
+Tests for JSONB decoding and paging through a plan's literature results
+"""
+
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import native_database_client
+from native_database_client import NativeDatabaseClient, _json_dumps, _json_loads, _literature_array
+from v2_hierarchical_api import get_database, v2_router
+
+
+class CodecConnection:
+    def __init__(self):
+        self.codecs = {}
+
+    async def set_type_codec(self, type_name, encoder, decoder, schema):
+        self.codecs[type_name] = (encoder, decoder, schema)
+
+
+class PageConnection:
+    """Answers the page query from an in-memory literature result, the way the SQL slices it."""
+
+    def __init__(self, result):
+        self.result = result
+        self.queries = []
+
+    async def fetchrow(self, query, plan_id, offset, limit):
+        self.queries.append((query, plan_id, offset, limit))
+        if plan_id != "plan-1":
+            return None
+        records = self.result.get("records", [])
+        return {
+            "total": len(records),
+            "items": records[offset:offset + limit],
+            "summary": {key: value for key, value in self.result.items() if key != "records"},
+        }
+
+
+def client_with(conn):
+    client = NativeDatabaseClient("postgresql://localhost/test")
+    client._initialized = True
+    client.pool = object()
+
+    @asynccontextmanager
+    async def get_connection():
+        yield conn
+
+    client.get_connection = get_connection
+    return client
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_codec_round_trips(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(native_database_client, "orjson", None)
+    value = {"records": [{"title": "Statins", "year": 2020}], "query": "ä"}
+    assert json.loads(_json_dumps(value)) == value
+    assert _json_loads(_json_dumps(value)) == value
+
+
+async def test_pool_connections_decode_json_and_jsonb():
+    conn = CodecConnection()
+    await NativeDatabaseClient._init_connection(conn)
+    assert set(conn.codecs) == {"json", "jsonb"}
+    encoder, decoder, schema = conn.codecs["jsonb"]
+    assert schema == "pg_catalog"
+    assert decoder(encoder({"a": [1, 2]})) == {"a": [1, 2]}
+
+
+def test_literature_array_sql_falls_back_to_an_empty_array():
+    assert _literature_array("initial") == (
+        "CASE jsonb_typeof(initial_literature_results -> 'records') WHEN 'array' "
+        "THEN initial_literature_results -> 'records' ELSE '[]'::jsonb END"
+    )
+    assert "reviewed_literature_results -> 'reviewed_results'" in _literature_array("reviewed")
+
+
+async def test_page_query_slices_in_sql():
+    result = {"records": [{"id": index} for index in range(7)], "query": "statins"}
+    conn = PageConnection(result)
+    page = await client_with(conn).get_plan_literature_results("plan-1", "initial", offset=5, limit=5)
+
+    assert page == {
+        "plan_id": "plan-1", "kind": "initial", "offset": 5, "limit": 5, "total": 7,
+        "items": [{"id": 5}, {"id": 6}], "metadata": {"query": "statins"},
+    }
+    query, *params = conn.queries[0]
+    assert params == ["plan-1", 5, 5]
+    assert "WITH ORDINALITY" in query
+    assert "element.position > $2 AND element.position <= $2 + $3" in query
+    assert "initial_literature_results - 'records'" in query
+
+
+async def test_unknown_plan_has_no_page():
+    client = client_with(PageConnection({}))
+    assert await client.get_plan_literature_results("missing", "reviewed") is None
+
+
+@pytest.fixture
+def api():
+    database = client_with(PageConnection({"records": [{"id": index} for index in range(3)], "query": "q"}))
+    app = FastAPI()
+    app.include_router(v2_router)
+    app.dependency_overrides[get_database] = lambda: database
+    return TestClient(app)
+
+
+def test_literature_endpoint_pages(api):
+    response = api.get("/v2/plans/plan-1/literature/initial", params={"offset": 1, "limit": 1})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["items"] == [{"id": 1}]
+    assert body["total"] == 3
+    assert body["metadata"] == {"query": "q"}
+
+
+@pytest.mark.parametrize("path, params, status", [
+    ("/v2/plans/missing/literature/initial", {}, 404),
+    ("/v2/plans/plan-1/literature/other", {}, 422),
+    ("/v2/plans/plan-1/literature/initial", {"limit": 501}, 422),
+    ("/v2/plans/plan-1/literature/initial", {"offset": -1}, 422),
+])
+def test_literature_endpoint_rejects_bad_requests(api, path, params, status):
+    assert api.get(path, params=params).status_code == status
@@ -6,12 +6,17 @@ based on the authentication system test checklist.
 """
 
 import json
+import time
+from types import SimpleNamespace
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
+from jose import jwt
+from sqlmodel import Session, SQLModel, create_engine, select
 from sqlmodel.pool import StaticPool
 
-from src.main import app, get_session
+from src import token_cache
+from src.main import app, get_session, password_hasher, user_status_cache
 from src.models import User
 from src.two_factor import TwoFactorAuthService
 
@@ -34,6 +39,7 @@ def client_fixture(session: Session):
         return session
 
     app.dependency_overrides[get_session] = get_session_override
+    user_status_cache.clear()
 
     client = TestClient(app)
     yield client
@@ -268,6 +274,49 @@ class TestTokenManagement:
         assert response.status_code == 401
         assert "Invalid token" in response.json()["detail"]
 
+    def test_batch_token_validation(self, client: TestClient):
+        """Test batch token validation resolves each token independently."""
+        user_data = TEST_USERS["researcher"]
+        client.post("/register", json=user_data)
+        login_response = client.post("/token", data={
+            "username": user_data["email"],
+            "password": user_data["password"]
+        })
+        token = login_response.json()["access_token"]
+        
+        response = client.post("/validate-tokens", json={
+            "tokens": [token, "invalid_token", token]
+        })
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert len(results) == 3
+        assert results[0]["valid"] == True
+        assert results[0]["email"] == user_data["email"]
+        assert results[1]["valid"] == False
+        assert "Invalid token" in results[1]["error"]
+        assert results[2] == results[0]
+
+    def test_token_validation_after_account_deletion(self, client: TestClient):
+        """Test cached validation is invalidated when the account is deleted."""
+        user_data = TEST_USERS["researcher"]
+        client.post("/register", json=user_data)
+        login_response = client.post("/token", data={
+            "username": user_data["email"],
+            "password": user_data["password"]
+        })
+        token = login_response.json()["access_token"]
+        
+        # First validation populates the cache
+        response = client.post(f"/validate-token?token={token}")
+        assert response.status_code == 200
+        
+        client.delete("/users/me", headers={"Authorization": f"Bearer {token}"})
+        response = client.post(f"/validate-token?token={token}")
+        assert response.status_code == 401
+        
+        revocations = client.get("/revocations").json()
+        assert user_data["email"] in [r["email"] for r in revocations["revocations"]]
+
     def test_refresh_token(self, client: TestClient):
         """Test token refresh functionality."""
         user_data = TEST_USERS["researcher"]
@@ -628,6 +677,35 @@ class TestUserManagement:
         })
         assert login_response.status_code == 200
 
+    def test_password_change_revokes_tokens_from_the_same_second(self, client: TestClient, monkeypatch):
+        """Test that a password change revokes tokens issued moments before it."""
+        user_data = TEST_USERS["researcher"]
+        token = self._get_user_token(client, "researcher")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        # Revoke a millisecond after the token was issued
+        issued_at = jwt.get_unverified_claims(token)["iat"]
+        monkeypatch.setattr(token_cache, "time", SimpleNamespace(
+            time=lambda: issued_at + 0.001, monotonic=time.monotonic
+        ))
+
+        password_data = {
+            "current_password": user_data["password"],
+            "new_password": "NewPassword123!"
+        }
+        response = client.post("/change-password", json=password_data, headers=headers)
+        assert response.status_code == 200
+
+        # A token issued after the revocation is accepted
+        login_response = client.post("/token", data={
+            "username": user_data["email"],
+            "password": "NewPassword123!"
+        })
+        new_headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        assert client.get("/users/me", headers=headers).status_code == 401
+        assert client.get("/users/me", headers=new_headers).status_code == 200
+
     def test_password_change_wrong_current_password(self, client: TestClient):
         """Test password change with wrong current password."""
         token = self._get_user_token(client, "researcher")
@@ -656,6 +734,32 @@ class TestSecurityFeatures:
         assert "password" not in data
         assert "hashed_password" not in data
 
+    def test_password_rehashed_on_login(self, client: TestClient, session: Session, monkeypatch):
+        """Test outdated password hashes are upgraded transparently on login."""
+        user_data = TEST_USERS["researcher"]
+        monkeypatch.setattr(password_hasher, "rounds", 4)
+        client.post("/register", json=user_data)
+        
+        monkeypatch.setattr(password_hasher, "rounds", 5)
+        login_response = client.post("/token", data={
+            "username": user_data["email"],
+            "password": user_data["password"]
+        })
+        assert login_response.status_code == 200
+        
+        user = session.exec(select(User).where(User.email == user_data["email"])).first()
+        assert user.hashed_password.startswith("$2b$05$")
+
+    def test_password_hashing_back_pressure(self, client: TestClient, monkeypatch):
+        """Test saturated hashing pool rejects requests with 429."""
+        monkeypatch.setattr(password_hasher, "capacity", 0)
+        response = client.post("/register", json=TEST_USERS["researcher"])
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        
+        metrics = client.get("/metrics/password-hashing").json()
+        assert metrics["rejected"] >= 1
+
     def test_sql_injection_prevention(self, client: TestClient):
         """Test SQL injection prevention in user input."""
         # Try SQL injection in registration
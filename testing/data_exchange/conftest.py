@@ -0,0 +1,10 @@
+"""
+Import path for the API gateway's data exchange module
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[2] / "services" / "api-gateway" / "src" / "database" / "specialized")
+)
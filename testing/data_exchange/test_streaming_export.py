@@ -0,0 +1,73 @@
+"""
+Tests for streaming literature exports
+"""
+
+import csv
+import io
+import json
+import xml.etree.ElementTree as ET
+import zlib
+
+import pytest
+
+from data_export import DataFormat, ExportEngine, StreamCompressor, StreamingImportParser
+
+RECORDS = [
+    {"title": f"Paper {i}", "year": 2000 + i, "doi": f"10.1/{i}", "authors": ["Smith, J"]}
+    for i in range(7)
+]
+
+
+def export(format_type, records=RECORDS, **kwargs):
+    return b"".join(ExportEngine().iter_export(records, format_type, batch_size=3, **kwargs)).decode()
+
+
+@pytest.mark.parametrize("records", [RECORDS, []])
+def test_json_export_is_one_document(records):
+    assert json.loads(export(DataFormat.JSON, records)) == {"studies": records}
+
+
+def test_jsonl_export_round_trips_through_the_import_parser():
+    data = export(DataFormat.JSONL).encode()
+    imported = [record for record, _ in StreamingImportParser(io.BytesIO(data), DataFormat.JSONL)]
+    assert [(record["title"], record["year"], record["doi"]) for record in imported] == [
+        (record["title"], record["year"], record["doi"]) for record in RECORDS
+    ]
+
+
+def test_csv_header_comes_from_the_first_batch():
+    records = RECORDS[:3] + [dict(RECORDS[3], extra="dropped")]
+    rows = list(csv.DictReader(io.StringIO(export(DataFormat.CSV, records))))
+    assert len(rows) == 4
+    assert "extra" not in rows[0]
+    assert rows[3]["title"] == "Paper 3"
+
+
+def test_xml_export_is_well_formed():
+    root = ET.fromstring(export(DataFormat.XML))
+    assert [study.findtext("title") for study in root.find("studies")] == [r["title"] for r in RECORDS]
+
+
+async def test_async_export_matches_sync_export():
+    async def source():
+        for record in RECORDS:
+            yield record
+
+    chunks = [chunk async for chunk in ExportEngine().aiter_export(source(), DataFormat.JSONL, batch_size=3)]
+    assert b"".join(chunks).decode() == export(DataFormat.JSONL)
+
+
+def test_gzip_chunks_decode_incrementally():
+    chunks = list(ExportEngine().iter_export(RECORDS, DataFormat.JSONL, compression="gzip", batch_size=3))
+    assert len(chunks) == 4
+    decoder = zlib.decompressobj(31)
+    # Every chunk is flushed, so each decodes to whole records as it arrives
+    first = decoder.decompress(chunks[0]).decode()
+    assert first.count("\n") == 3
+    rest = b"".join(decoder.decompress(chunk) for chunk in chunks[1:])
+    assert (first + rest.decode()) == export(DataFormat.JSONL)
+
+
+def test_unknown_compression_is_rejected():
+    with pytest.raises(ValueError):
+        StreamCompressor("brotli")
@@ -0,0 +1,103 @@
+"""
+Tests for streaming literature imports
+"""
+
+import io
+import json
+
+import pytest
+
+from data_export import DataFormat, ImportCheckpoint, ImportEngine, StreamingImportParser
+
+RIS = (
+    "TY  - JOUR\n"
+    "TI  - Exercise and\n"
+    "  depression\n"
+    "AU  - Smith, J\n"
+    "PY  - 2020\n"
+    "DO  - 10.1000/one\n"
+    "ER  - \n"
+    "TY  - JOUR\n"
+    "TI  - Sleep and mood\n"
+    "PY  - 2021\n"
+    "ER  - \n"
+    "TY  - JOUR\n"
+    "TI  - Diet trials\n"
+)
+
+CSV = 'title,year,doi\n"A study, with comma",2019,10.1/a\n\n"Multi\nline title",2020,10.1/b\nThird,2021,\n'
+
+
+def parse(data: str, format_type: DataFormat, checkpoint=None):
+    return list(StreamingImportParser(io.BytesIO(data.encode()), format_type, checkpoint))
+
+
+def test_ris_records_and_wrapped_fields():
+    records = [record for record, _ in parse(RIS, DataFormat.RIS)]
+    assert [record["title"] for record in records] == ["Exercise and depression", "Sleep and mood", "Diet trials"]
+    assert records[0]["doi"] == "10.1000/one"
+    assert records[0]["year"] == 2020
+
+
+@pytest.mark.parametrize("format_type, data", [
+    (DataFormat.RIS, RIS),
+    (DataFormat.CSV, CSV),
+    (DataFormat.JSONL, "\n".join(json.dumps({"title": f"Paper {i}", "year": 2000 + i}) for i in range(5)) + "\n"),
+])
+def test_resume_from_any_checkpoint_yields_the_rest(format_type, data):
+    full = parse(data, format_type)
+    for done, (_, checkpoint) in enumerate(full, start=1):
+        resumed = parse(data, format_type, checkpoint)
+        assert [record for record, _ in resumed] == [record for record, _ in full[done:]]
+        assert [c.records for _, c in resumed] == list(range(done + 1, len(full) + 1))
+
+
+def test_csv_quoted_fields_and_blank_rows():
+    records = [record for record, _ in parse(CSV, DataFormat.CSV)]
+    assert [record["title"] for record in records] == ["A study, with comma", "Multi\nline title", "Third"]
+
+
+def test_xml_resume_skips_records():
+    articles = "".join(
+        f"<PubmedArticle><MedlineCitation><PMID>{i}</PMID><Article><ArticleTitle>Title {i}</ArticleTitle>"
+        f"</Article></MedlineCitation></PubmedArticle>"
+        for i in range(1, 4)
+    )
+    data = f"<PubmedArticleSet>{articles}</PubmedArticleSet>"
+    resumed = parse(data, DataFormat.XML, ImportCheckpoint(records=2))
+    assert [record["title"] for record, _ in resumed] == ["Title 3"]
+    assert resumed[0][1].records == 3
+
+
+def test_jsonl_rejects_non_objects():
+    with pytest.raises(ValueError):
+        parse('{"title": "ok"}\n[1, 2]\n', DataFormat.JSONL)
+
+
+async def test_stream_import_batches_with_checkpoints():
+    data = "\n".join(json.dumps({"title": f"Paper {i}"}) for i in range(5)) + "\n"
+    stored = []
+
+    async def sink(batch, checkpoint):
+        stored.append(([record["title"] for record in batch], checkpoint.records))
+
+    progress = [
+        event async for event in ImportEngine().stream_import(io.BytesIO(data.encode()), DataFormat.JSONL, sink, batch_size=2)
+    ]
+    assert stored == [(["Paper 0", "Paper 1"], 2), (["Paper 2", "Paper 3"], 4), (["Paper 4"], 5)]
+    assert [event["records"] for event in progress] == [2, 4, 5]
+    assert progress[-1]["checkpoint"]["offset"] == len(data)
+
+
+async def test_stream_import_stops_at_a_failed_batch():
+    data = "\n".join(json.dumps({"title": f"Paper {i}"}) for i in range(6)) + "\n"
+
+    async def sink(batch, checkpoint):
+        if checkpoint.records > 2:
+            raise RuntimeError("store failed")
+
+    progress = []
+    with pytest.raises(RuntimeError):
+        async for event in ImportEngine().stream_import(io.BytesIO(data.encode()), DataFormat.JSONL, sink, batch_size=2):
+            progress.append(event)
+    assert [event["checkpoint"]["records"] for event in progress] == [2]
@@ -0,0 +1,67 @@
+"""
+Import path for the database agent, and an in-memory stand-in for its asyncpg pool
+"""
+
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "agents" / "database" / "src"))
+
+
+class FakeConnection:
+    """Records statements; ``fail`` decides which INSERTs raise."""
+
+    def __init__(self, fail=None, rows=None):
+        self.fail = fail or (lambda args: False)
+        self.rows = rows or []
+        self.executed = []
+        self.fetched = []
+        self.savepoints = 0
+        self.rolled_back = 0
+
+    @asynccontextmanager
+    async def transaction(self, readonly=False):
+        self.savepoints += 1
+        try:
+            yield
+        except Exception:
+            self.rolled_back += 1
+            raise
+
+    async def execute(self, query, *args):
+        if "INSERT" in query and self.fail(args):
+            raise ValueError(f"bad record {args[0]}")
+        self.executed.append((query, args))
+
+    async def fetch(self, query, *args):
+        self.fetched.append((query, args))
+        return self.rows[:args[2]] if len(args) > 2 else self.rows
+
+
+class FakePool:
+    def __init__(self, connection):
+        self.connection = connection
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.connection
+
+
+@pytest.fixture
+def service():
+    pytest.importorskip("asyncpg")
+    from database_service import DatabaseAgentService
+
+    return DatabaseAgentService({})
+
+
+@pytest.fixture
+def connect(service):
+    def attach(**kwargs):
+        connection = FakeConnection(**kwargs)
+        service.db_pool = FakePool(connection)
+        return connection
+    return attach
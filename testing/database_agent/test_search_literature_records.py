@@ -0,0 +1,60 @@
+"""
+Tests for keyset pagination in the database agent's search_literature_records action
+"""
+
+
+def rows(count):
+    return [
+        {"id": f"id-{i}", "title": f"Paper {i}", "authors": '["Smith, J"]', "score": 1.0 - i / 10}
+        for i in range(count)
+    ]
+
+
+async def search(service, **data):
+    return await service._handle_search_literature_records({"project_id": "project", "query": "exercise", **data})
+
+
+async def test_first_page_returns_cursor_for_the_next(service, connect):
+    connection = connect(rows=rows(3))
+    result = await search(service, limit=2)
+
+    assert result["status"] == "completed"
+    assert [record["id"] for record in result["records"]] == ["id-0", "id-1"]
+    assert result["records"][0]["authors"] == ["Smith, J"]
+    assert service._decode_cursor(result["next_cursor"]) == [0.9, "id-1"]
+
+    query, args = connection.fetched[0]
+    assert args == ("project", "exercise", 3)
+    assert "< ($4::real, $5)" not in query
+
+
+async def test_cursor_continues_after_the_last_row(service, connect):
+    connection = connect(rows=rows(1))
+    result = await search(service, limit=2, cursor=service._encode_cursor([0.9, "id-1"]))
+
+    query, args = connection.fetched[0]
+    assert "(ts_rank_cd(search_vector, websearch_to_tsquery('english', $2)), id) < ($4::real, $5)" in query
+    assert args == ("project", "exercise", 3, 0.9, "id-1")
+    assert result["next_cursor"] is None
+
+
+async def test_title_mode_sets_the_trigram_threshold(service, connect):
+    connection = connect(rows=rows(1))
+    await search(service, mode="title", min_similarity=0.5)
+
+    assert connection.executed[0][1] == ("0.5",)
+    query, _ = connection.fetched[0]
+    assert "title % $2" in query
+    assert "similarity(title, $2) AS score" in query
+
+
+async def test_invalid_cursor_is_rejected(service, connect):
+    connection = connect()
+    result = await search(service, cursor="not-a-cursor")
+    assert result == {"status": "failed", "error": "Invalid cursor", "timestamp": result["timestamp"]}
+    assert connection.fetched == []
+
+
+async def test_unknown_mode_is_rejected(service, connect):
+    connect()
+    assert (await search(service, mode="semantic"))["status"] == "failed"
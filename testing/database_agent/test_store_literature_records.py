@@ -0,0 +1,36 @@
+"""
+Tests for the database agent's store_literature_records action
+"""
+
+
+def records(count):
+    return [{"internal_id": f"id-{i}", "title": f"Paper {i}", "year": "2020"} for i in range(count)]
+
+
+async def test_stores_every_record(service, connect):
+    connection = connect()
+    result = await service._handle_store_literature_records({"lit_review_id": "review", "records": records(3)})
+    assert result["status"] == "completed"
+    assert result["stored_count"] == 3
+    assert result["failed_count"] == 0
+    assert [args[0] for _, args in connection.executed] == ["id-0", "id-1", "id-2"]
+
+
+async def test_a_bad_record_does_not_abort_the_rest(service, connect):
+    connection = connect(fail=lambda args: args[0] == "id-1")
+    result = await service._handle_store_literature_records({"lit_review_id": "review", "records": records(4)})
+
+    assert result["stored_count"] == 3
+    assert result["failed_count"] == 1
+    assert result["failed_records"][0]["index"] == 1
+    assert result["failed_records"][0]["id"] == "id-1"
+    # One outer transaction plus one savepoint per record; only the bad one rolled back
+    assert connection.savepoints == 5
+    assert connection.rolled_back == 1
+    assert [args[0] for _, args in connection.executed] == ["id-0", "id-2", "id-3"]
+
+
+async def test_requires_records(service, connect):
+    connect()
+    result = await service._handle_store_literature_records({"lit_review_id": "review", "records": []})
+    assert result["status"] == "failed"
@@ -0,0 +1,8 @@
+"""
+Import path for the executor agent modules
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "agents" / "executor" / "src"))
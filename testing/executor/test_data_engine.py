@@ -0,0 +1,123 @@
+"""
+Tests for the executor's columnar data plan engine
+"""
+
+import pytest
+
+import data_engine
+from data_engine import DataPlanError, execute_plan, read_chunk
+
+STUDIES = [
+    {"id": i, "design": "rct" if i % 2 else "cohort", "year": 2010 + i, "n": 10 * (i + 1)}
+    for i in range(10)
+]
+
+
+def run(steps, **kwargs):
+    return execute_plan({"source": {"data": STUDIES}, "steps": steps}, kwargs.pop("work_dir", None), **kwargs)
+
+
+def test_filter_group_and_sort(tmp_path):
+    result = run([
+        {"op": "filter", "conditions": [{"column": "year", "operator": ">=", "value": 2013}]},
+        {"op": "group_by", "by": ["design"], "aggregations": {"n": ["sum", "count"]}},
+        {"op": "sort", "by": ["n_sum"], "ascending": False},
+    ], work_dir=tmp_path)
+    assert result["records"] == [
+        {"design": "rct", "n_sum": 280, "n_count": 4},
+        {"design": "cohort", "n_sum": 210, "n_count": 3},
+    ]
+    assert result["columns"] == ["design", "n_sum", "n_count"]
+
+
+def test_filter_any_mode_and_null_values(tmp_path):
+    data = [{"title": "Exercise trial", "year": 2020}, {"title": None, "year": 2001}, {"title": "Diet", "year": None}]
+    result = execute_plan({
+        "source": {"data": data},
+        "steps": [{"op": "filter", "mode": "any", "conditions": [
+            {"column": "title", "operator": "contains", "value": "EXERCISE"},
+            {"column": "year", "operator": "<", "value": 2005},
+        ]}],
+    }, tmp_path)
+    assert [record["year"] for record in result["records"]] == [2020, 2001]
+
+
+def test_join_with_a_csv_source(tmp_path):
+    result = run([
+        {"op": "join", "right": {"csv": "id,quality\n1,high\n2,low\n"}, "on": "id"},
+        {"op": "select", "columns": ["id", "quality"]},
+    ], work_dir=tmp_path)
+    assert result["records"] == [{"id": 1, "quality": "high"}, {"id": 2, "quality": "low"}]
+
+
+def test_pivot_flattens_columns(tmp_path):
+    result = run([{"op": "pivot", "index": "design", "columns": "year", "values": "n", "aggfunc": "sum",
+                   "fill_value": 0}, {"op": "limit", "n": 1}], work_dir=tmp_path)
+    assert result["records"][0]["design"] == "cohort"
+    assert result["records"][0]["2010"] == 10
+    assert result["records"][0]["2011"] == 0
+
+
+def test_seeded_sample_is_repeatable(tmp_path):
+    first = run([{"op": "sample", "n": 3, "seed": 7}], work_dir=tmp_path)["records"]
+    assert first == run([{"op": "sample", "n": 3, "seed": 7}], work_dir=tmp_path)["records"]
+    assert len(first) == 3
+
+
+@pytest.mark.parametrize("steps, message", [
+    ([{"op": "explode"}], "unknown op"),
+    ([{"op": "filter", "column": "missing", "value": 1}], "Unknown columns"),
+    ([{"op": "group_by", "by": ["design"], "aggregations": {"n": "mode"}}], "Unknown aggregations"),
+])
+def test_invalid_steps_name_the_step(tmp_path, steps, message):
+    with pytest.raises(DataPlanError, match=message) as error:
+        run(steps, work_dir=tmp_path)
+    assert str(error.value).startswith("Step 0")
+
+
+def test_files_outside_the_work_dir_are_rejected(tmp_path):
+    with pytest.raises(DataPlanError):
+        execute_plan({"source": {"file": "../secrets.csv"}}, tmp_path)
+
+
+def test_large_inline_result_spills_to_a_file(tmp_path):
+    result = run([], work_dir=tmp_path, max_inline_rows=5, preview_rows=2)
+    assert result["spilled"]
+    assert result["format"] == ("parquet" if data_engine.ARROW_AVAILABLE else "csv")
+    assert len(result["preview"]) == 2
+    assert "records" not in result
+    assert (tmp_path / result["file"]).exists()
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow", "csv", "jsonl"])
+def test_read_chunk_pages_through_every_row(tmp_path, monkeypatch, fmt):
+    if fmt in ("parquet", "arrow") and not data_engine.ARROW_AVAILABLE:
+        pytest.skip("pyarrow is not installed")
+    # Small row groups so pages span several of them
+    monkeypatch.setattr(data_engine, "ROW_GROUP_SIZE", 3)
+    result = execute_plan({"source": {"data": STUDIES}, "output": {"format": fmt}}, tmp_path)
+
+    rows, offset = [], 0
+    while offset is not None:
+        page = read_chunk({"file": result["file"], "offset": offset, "limit": 4}, tmp_path)
+        assert page["total_rows"] == len(STUDIES)
+        rows.extend(page["records"])
+        offset = page["next_offset"]
+    assert [row["id"] for row in rows] == list(range(10))
+    assert rows[3] == STUDIES[3]
+
+
+def test_read_chunk_selects_columns_and_caps_the_page(tmp_path):
+    result = execute_plan({"source": {"data": STUDIES}, "output": {"format": "csv"}}, tmp_path)
+    page = read_chunk({"file": result["file"], "offset": 8, "limit": 50, "columns": ["id"]}, tmp_path, max_rows=5)
+    assert page["records"] == [{"id": 8}, {"id": 9}]
+    assert page["next_offset"] is None
+
+
+def test_stream_output_sends_chunks(tmp_path):
+    chunks = []
+    result = execute_plan(
+        {"source": {"data": STUDIES}, "output": {"format": "stream", "chunk_size": 4}}, tmp_path, on_chunk=chunks.append
+    )
+    assert result["chunks"] == 3
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
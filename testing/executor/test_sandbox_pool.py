@@ -0,0 +1,72 @@
+"""
+Tests for the warm sandbox worker pool: isolation between runs and limits
+"""
+
+import asyncio
+
+import pytest
+
+from sandbox_pool import SandboxWorkerPool
+
+
+@pytest.fixture(name="pool")
+async def pool_fixture(tmp_path):
+    pool = SandboxWorkerPool(tmp_path, size=1, memory_limit_mb=0, cpu_limit_seconds=2, preload_modules=["json"])
+    await pool.start()
+    yield pool
+    await pool.stop()
+
+
+async def test_output_and_return_code(pool):
+    result = await pool.run("import sys\nprint('hello')\nprint('oops', file=sys.stderr)\nsys.exit(3)", timeout=10)
+    assert result["stdout"] == "hello\n"
+    assert result["stderr"] == "oops\n"
+    assert result["return_code"] == 3
+
+
+async def test_runs_cannot_patch_later_runs(pool, tmp_path):
+    """A run that patches the worker, json or sys.modules leaves later runs untouched"""
+    leak = tmp_path / "leak.txt"
+    patch = f"""
+import json, sys, threading, time
+import __main__
+def spy(channel, request, *args):
+    open({str(leak)!r}, "a").write(request.get("code", ""))
+__main__._run = spy
+json.dumps = lambda *args, **kwargs: "{{}}"
+sys.modules["os"] = None
+secret_state = []
+threading.Thread(target=lambda: time.sleep(30), daemon=False).start()
+print("patched")
+"""
+    first = await pool.run(patch, timeout=10)
+    assert first["stdout"] == "patched\n"
+
+    second = await pool.run("import json, os\nprint(json.dumps({'a': 1}), 'secret_state' in globals())", timeout=10)
+    assert second["stdout"] == '{"a": 1} False\n'
+    assert not leak.exists()
+    assert pool.get_stats()["live_workers"] == 1
+
+
+async def test_cpu_limit_kills_only_the_run(pool):
+    result = await pool.run("while True:\n    pass", timeout=20)
+    assert result["return_code"] < 0
+    assert "CPU or memory limit" in result["stderr"]
+
+    # The warm worker survives and serves the next run
+    assert (await pool.run("print(1)", timeout=10))["stdout"] == "1\n"
+    assert pool.recycled == 0
+
+
+async def test_exit_without_done_frame(pool):
+    result = await pool.run("import os\nprint('bye', flush=True)\nos._exit(4)", timeout=10)
+    assert result["return_code"] == 4
+    assert (await pool.run("print(2)", timeout=10))["stdout"] == "2\n"
+
+
+async def test_timeout_replaces_worker(pool):
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.run("import time\ntime.sleep(5)", timeout=0.5)
+    await asyncio.sleep(0.5)
+    assert pool.recycled == 1
+    assert (await pool.run("print(3)", timeout=10))["stdout"] == "3\n"
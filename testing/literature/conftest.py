@@ -0,0 +1,11 @@
+"""
+Import paths for the literature agent package and its standalone helpers
+"""
+
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[2] / "agents" / "literature" / "src"
+
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(SRC / "literature_search"))
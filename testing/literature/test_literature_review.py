@@ -0,0 +1,127 @@
+"""
+Tests for the map-reduce AI literature review
+"""
+
+import asyncio
+import json
+
+import pytest
+
+ai_integration = pytest.importorskip("literature_search.ai_integration")
+AIIntegration = ai_integration.AIIntegration
+
+PLAN = {"objectives": ["Assess statins for primary prevention"]}
+
+
+class FakeAIService:
+    """Answers review requests: keeps R1, removes R2 and leaves the rest undecided."""
+
+    def __init__(self, fail_chunks=0, added=None):
+        self.integration = None
+        self.requests = []
+        self.fail_chunks = fail_chunks
+        self.added = added if added is not None else [{"title": "Added trial", "year": 2024}]
+        self.in_flight = 0
+        self.peak = 0
+
+    async def send(self, message):
+        self.requests.append(message)
+        asyncio.create_task(self.reply(message["data"]))
+
+    async def reply(self, data):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if data["task_id"].startswith("literature_review_chunk"):
+            if self.fail_chunks:
+                self.fail_chunks -= 1
+                content = "no JSON here"
+            else:
+                content = json.dumps({"keep": ["R1"], "removed": [{"ref": "R2", "reason": "off topic"}],
+                                      "summary": "chunk summary", "gaps": ["cost"]})
+        else:
+            content = json.dumps({"added": self.added, "discussion": "merged discussion"})
+        self.integration.handle_task_result({
+            "type": "task_result", "task_id": data["task_id"], "status": "completed",
+            "result": {"choices": [{"message": {"content": content}}]},
+        })
+
+
+class OpenSocket:
+    closed = False
+
+
+def make_integration(ai, **review_config):
+    integration = AIIntegration(OpenSocket(), "literature-1", ai.send,
+                                review_config={"chunk_tokens": 10_000, "max_records_per_chunk": 3,
+                                               "request_timeout": 1, **review_config})
+    ai.integration = integration
+    return integration
+
+
+def records(count):
+    return [{"title": f"Paper {index}", "abstract": "statins " * 30, "raw": "x" * 5000} for index in range(count)]
+
+
+def chunk_requests(ai):
+    return [request for request in ai.requests if request["data"]["task_id"].startswith("literature_review_chunk")]
+
+
+async def test_chunks_are_reviewed_and_merged():
+    ai = FakeAIService()
+    papers = records(7)
+    review = await make_integration(ai).review_literature(PLAN, papers)
+
+    # Chunks of 3, 3 and 1: R1 kept, R2 removed, R3 undecided in each
+    assert review["stats"]["chunks"] == 3
+    assert [paper["title"] for paper in review["removed"]] == ["Paper 1", "Paper 4"]
+    titles = [paper["title"] for paper in review["records"]]
+    assert titles == ["Paper 0", "Paper 2", "Paper 3", "Paper 5", "Paper 6", "Added trial"]
+    assert [paper.get("review_label") for paper in review["records"][:5]] == [None, "uncertain", None, "uncertain", None]
+    assert review["records"][-1]["source"] == "ai_review"
+    assert review["discussion"] == "merged discussion"
+    assert review["stats"]["kept"] == 3 and review["stats"]["uncertain"] == 2 and review["stats"]["added"] == 1
+
+
+async def test_prompts_leave_out_raw_source_data():
+    ai = FakeAIService()
+    await make_integration(ai).review_literature(PLAN, records(3))
+    prompt = chunk_requests(ai)[0]["data"]["payload"]["messages"][1]["content"]
+    assert '"ref":"R1"' in prompt
+    assert "xxxxx" not in prompt
+
+
+async def test_chunk_reviews_run_concurrently_under_the_cap():
+    ai = FakeAIService()
+    await make_integration(ai, max_concurrent_chunks=2, max_records_per_chunk=1).review_literature(PLAN, records(6))
+    assert len(chunk_requests(ai)) == 6
+    assert ai.peak == 2
+
+
+async def test_repeated_reviews_reuse_cached_chunk_reviews():
+    ai = FakeAIService()
+    integration = make_integration(ai)
+    first = await integration.review_literature(PLAN, records(6))
+    again = await integration.review_literature(PLAN, records(6))
+
+    assert len(chunk_requests(ai)) == 2
+    assert again["records"] == first["records"]
+    assert again["stats"]["cache"] == {"size": 2, "hits": 2, "misses": 2}
+
+
+async def test_unreviewable_chunks_keep_their_records():
+    ai = FakeAIService(fail_chunks=1)
+    review = await make_integration(ai, max_concurrent_chunks=1).review_literature(PLAN, records(4))
+
+    assert review["stats"]["failed_chunks"] == 1
+    assert [paper["title"] for paper in review["records"]] == ["Paper 0", "Paper 1", "Paper 2", "Paper 3", "Added trial"]
+    assert not any("review_label" in paper for paper in review["records"][:3])
+
+
+async def test_review_literature_results_returns_the_records():
+    ai = FakeAIService(added=[])
+    selected = await make_integration(ai).review_literature_results(PLAN, records(2))
+    assert [paper["title"] for paper in selected] == ["Paper 0"]
+
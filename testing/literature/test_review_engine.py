@@ -0,0 +1,88 @@
+"""
+Tests for the chunking and caching helpers of the map-reduce literature review
+"""
+
+import json
+
+from review_engine import (
+    ChunkReviewCache, compact_record, estimate_tokens, pack_chunks, serialize_records, trim_to_tokens,
+)
+
+
+def record(index, abstract_words=20):
+    return {
+        "title": f"Paper {index}",
+        "authors": ["Ada", "Ben", "Cy", "Dee"],
+        "year": 2020,
+        "doi": f"10.1/{index}",
+        "abstract": " ".join(["statins"] * abstract_words),
+        "raw_data": {"blob": "x" * 10_000},
+    }
+
+
+def test_trim_to_tokens_cuts_at_a_word_boundary():
+    assert trim_to_tokens("short text", 10) == "short text"
+    assert trim_to_tokens("alpha beta gamma delta", 3) == "alpha beta …"
+    assert trim_to_tokens(None, 3) == ""
+
+
+def test_compact_record_drops_raw_data_and_empty_fields():
+    compact = compact_record({**record(1), "journal": ""}, "R1", abstract_tokens=5)
+    assert compact["ref"] == "R1"
+    assert compact["authors"] == "Ada, Ben, Cy et al."
+    assert compact["abstract"].endswith("…")
+    assert "raw_data" not in compact and "journal" not in compact
+
+
+def test_records_serialize_one_per_line():
+    text = serialize_records([{"ref": "R1", "title": "Ä"}, {"ref": "R2"}])
+    assert text == '{"ref":"R1","title":"Ä"}\n{"ref":"R2"}'
+
+
+def test_chunks_respect_the_token_budget():
+    records = [record(index) for index in range(30)]
+    chunks = pack_chunks(records, chunk_tokens=200, abstract_tokens=50)
+    assert len(chunks) > 1
+    assert [item for chunk in chunks for item in chunk.records] == records
+    for chunk in chunks:
+        assert chunk.tokens <= 200
+        assert estimate_tokens(chunk.text) <= chunk.tokens
+        assert [compact["ref"] for compact in chunk.compact_records] == \
+            [f"R{position}" for position in range(1, len(chunk.records) + 1)]
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+
+
+def test_chunks_respect_the_record_cap_and_oversized_records():
+    assert [len(chunk.records) for chunk in pack_chunks([record(i) for i in range(7)], 10_000, 50, 3)] == [3, 3, 1]
+    # A record larger than the budget still gets a chunk of its own
+    chunks = pack_chunks([record(0, 500), record(1, 500)], chunk_tokens=50, abstract_tokens=1000)
+    assert [len(chunk.records) for chunk in chunks] == [1, 1]
+
+
+def test_refs_resolve_to_chunk_records():
+    chunk = pack_chunks([record(index) for index in range(3)], 10_000, 50)[0]
+    assert chunk.record_for_ref("R2")["title"] == "Paper 1"
+    assert chunk.record_for_ref("R4") is None
+    assert chunk.record_for_ref("R0") is None
+    assert chunk.record_for_ref("paper") is None
+
+
+def test_chunk_text_depends_only_on_its_records():
+    records = [record(index) for index in range(6)]
+    later = pack_chunks([record(99)] * 3 + records[3:], 10_000, 50, 3)[1]
+    assert later.text == pack_chunks(records, 10_000, 50, 3)[1].text
+    assert json.loads(later.text.splitlines()[0])["ref"] == "R1"
+
+
+def test_review_cache_is_keyed_by_plan_and_chunk():
+    cache = ChunkReviewCache(max_size=2)
+    key = ChunkReviewCache.make_key("plan", "chunk")
+    assert key != ChunkReviewCache.make_key("plan", "chunk 2")
+    assert key != ChunkReviewCache.make_key("planc", "hunk")
+
+    cache.put(key, {"keep": ["R1"]})
+    cache.put("b", {})
+    assert cache.get(key) == {"keep": ["R1"]}
+    cache.put("c", {})
+    assert cache.get("b") is None
+    assert cache.stats() == {"size": 2, "hits": 1, "misses": 1}
@@ -0,0 +1,164 @@
+"""
+Tests for routing between MCP server nodes that share cluster state
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from cluster import LocalClusterState, LocalClusterStore
+from mcp_server import MCPServer
+from mcp_wire import FrameAssembler
+from result_store import MemoryResultStore
+
+
+class FakeSocket:
+    """Stands in for a client's websocket; keeps the decoded messages sent to it."""
+
+    def __init__(self):
+        self.assembler = FrameAssembler()
+        self.received = []
+
+    async def send(self, frame):
+        message = self.assembler.feed(frame)
+        if message is not None:
+            self.received.append(message)
+
+    def of_type(self, message_type):
+        return [message for message in self.received if message["type"] == message_type]
+
+
+async def settle():
+    """Let bus deliveries scheduled by LocalClusterStore.publish run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+async def nodes():
+    state = LocalClusterState()
+    results = MemoryResultStore()
+    servers = []
+    for node_id in ("node-a", "node-b"):
+        server = MCPServer(cluster=LocalClusterStore(state), node_id=node_id, results=results)
+        await server.cluster.start(node_id, server._handle_bus_message)
+        servers.append(server)
+    yield servers
+    for server in servers:
+        await server.cluster.stop()
+
+
+async def connect(server, client_id, message):
+    socket = FakeSocket()
+    server.clients[client_id] = socket
+    server.assemblers[client_id] = FrameAssembler(lazy_bodies=True)
+    await server._handle_message(client_id, json.dumps(message))
+    return socket
+
+
+async def connect_agent(server, agent_id, capabilities=("search_literature",)):
+    return await connect(server, f"{agent_id}-conn", {
+        "type": "agent_register", "agent_id": agent_id,
+        "agent_type": "literature_search", "capabilities": list(capabilities),
+    })
+
+
+async def connect_gateway(server, gateway_id="gateway"):
+    return await connect(server, f"{gateway_id}-conn", {
+        "type": "gateway_register", "client_id": gateway_id, "client_type": "api_gateway",
+    })
+
+
+def research_action(task_id):
+    return {"type": "research_action", "data": {
+        "task_id": task_id, "agent_type": "literature_search",
+        "action": "search_literature", "payload": {"query": "statins"},
+    }}
+
+
+async def test_registration_is_published_with_the_node(nodes):
+    node_a, _ = nodes
+    await connect_agent(node_a, "search-1")
+
+    info = await node_a.cluster.get_entity("search-1")
+    assert info["node_id"] == "node-a"
+    assert info["capabilities"] == ["search_literature"]
+
+
+async def test_local_agents_are_preferred(nodes):
+    node_a, node_b = nodes
+    await connect_agent(node_a, "search-a")
+    await connect_agent(node_b, "search-b")
+
+    assert await node_b._find_agents("literature_search", "search_literature") == ["search-b"]
+
+
+async def test_remote_agents_are_found_on_live_nodes_only(nodes):
+    node_a, node_b = nodes
+    await connect_agent(node_a, "search-a")
+    assert await node_b._find_agents("literature_search", "search_literature") == ["search-a"]
+    assert await node_b._find_agents("literature_search", "screen_records") == []
+
+    await node_a.cluster.stop()
+    assert await node_b._find_agents("literature_search", "search_literature") == []
+
+
+async def test_task_and_result_cross_nodes(nodes):
+    node_a, node_b = nodes
+    agent = await connect_agent(node_a, "search-a")
+    gateway = await connect_gateway(node_b)
+
+    await node_b._handle_message("gateway-conn", json.dumps(research_action("t1")))
+    await settle()
+    [request] = agent.of_type("task_request")
+    assert request["task_id"] == "t1"
+    assert request["data"] == {"query": "statins"}
+    assert gateway.of_type("task_queued")[0]["data"]["assigned_agent"] == "search-a"
+
+    shared = await node_a.cluster.get_task("t1")
+    assert shared["node_id"] == "node-b"
+    assert "data" not in shared
+
+    await node_a._handle_message("search-a-conn", json.dumps({
+        "type": "task_result", "task_id": "t1", "status": "completed", "result": {"records": 3},
+    }))
+    await settle()
+    [result] = gateway.of_type("task_result")
+    assert result["result"] == {"records": 3}
+    assert await node_a.cluster.get_task("t1") is None
+
+
+async def test_pop_task_is_authoritative_across_nodes(nodes):
+    node_a, node_b = nodes
+    await connect_agent(node_a, "search-a")
+    await connect_gateway(node_b)
+    await node_b._handle_message("gateway-conn", json.dumps(research_action("t1")))
+    await settle()
+
+    assert (await node_a._pop_task("t1"))["requester_id"] == "gateway"
+    # node-b still holds its local copy, but the task already finished elsewhere
+    assert "t1" in node_b.active_tasks
+    assert await node_b._pop_task("t1") is None
+
+
+async def test_messages_for_disconnected_entities_are_shared(nodes):
+    node_a, node_b = nodes
+    await connect_gateway(node_a)
+    await node_a._cleanup_client("gateway-conn")
+
+    delivered = await node_a._send_to_entity("gateway", {"type": "task_queued", "data": {"task_id": "t1"}})
+    assert delivered is False
+    assert node_a.pending_messages == {}
+
+    gateway = await connect_gateway(node_b)
+    assert gateway.of_type("task_queued") == [{"type": "task_queued", "data": {"task_id": "t1"}}]
+    assert await node_b.cluster.pop_pending("gateway") == []
+
+
+async def test_forwarding_skips_entities_on_this_node(nodes):
+    node_a, _ = nodes
+    await connect_gateway(node_a)
+
+    assert await node_a._forward_to_node("gateway", {"type": "heartbeat"}) is False
+    assert await node_a._forward_to_node("unknown", {"type": "heartbeat"}) is False
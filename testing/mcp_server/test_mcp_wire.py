@@ -0,0 +1,127 @@
+"""
+Tests for the MCP wire format
+"""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+import mcp_wire
+from mcp_wire import FrameAssembler, WireCodec, WireError, available_compression, available_formats, negotiate
+
+REPO = Path(__file__).resolve().parents[2]
+
+MESSAGE = {
+    "type": "task_result",
+    "task_id": "t1",
+    "status": "completed",
+    "result": {"records": [{"title": f"Paper {i}", "year": 2000 + i} for i in range(200)]},
+}
+
+
+def decode(frames, assembler=None):
+    assembler = assembler or FrameAssembler()
+    results = [assembler.feed(frame) for frame in frames]
+    assert all(result is None for result in results[:-1])
+    return results[-1]
+
+
+def test_default_codec_sends_json_text():
+    frames = WireCodec().encode(MESSAGE)
+    assert len(frames) == 1 and isinstance(frames[0], str)
+    assert decode(frames) == MESSAGE
+
+
+@pytest.mark.parametrize("fmt", available_formats())
+@pytest.mark.parametrize("compression", ["none"] + available_compression())
+def test_binary_round_trip(fmt, compression):
+    codec = WireCodec(fmt, compression, binary=True, compress_threshold=64)
+    frames = codec.encode(MESSAGE)
+    assert isinstance(frames[0], bytes)
+    assert decode(frames) == MESSAGE
+
+
+def test_messages_without_a_body_use_message_frames():
+    frames = WireCodec(binary=True).encode({"type": "heartbeat", "timestamp": 1})
+    assert frames[0][:4] == mcp_wire.MESSAGE_MAGIC
+    assert decode(frames) == {"type": "heartbeat", "timestamp": 1}
+
+
+def test_small_payloads_are_not_compressed():
+    frame = WireCodec("json", "zlib", binary=True, compress_threshold=1 << 20).encode({"type": "ping"})[0]
+    assert frame[5:6] == b"n"
+
+
+def test_large_messages_are_chunked_and_reassembled():
+    codec = WireCodec(binary=True, chunk_size=1024)
+    frames = codec.encode(MESSAGE)
+    assert len(frames) > 1
+    assert all(len(frame) <= 1024 + mcp_wire._CHUNK_HEADER.size for frame in frames)
+
+    assembler = FrameAssembler()
+    # Chunks of two messages may interleave on one connection
+    other = codec.encode(dict(MESSAGE, task_id="t2"))
+    for first, second in zip(frames[:-1], other[:-1]):
+        assert assembler.feed(first) is None
+        assert assembler.feed(second) is None
+    assert assembler.feed(frames[-1]) == MESSAGE
+    assert assembler.feed(other[-1])["task_id"] == "t2"
+    assert assembler.pending == 0
+
+
+def test_duplicate_chunks_are_rejected():
+    frames = WireCodec(binary=True, chunk_size=1024).encode(MESSAGE)
+    assembler = FrameAssembler()
+    assembler.feed(frames[0])
+    with pytest.raises(WireError):
+        assembler.feed(frames[0])
+
+
+def test_oversized_messages_are_rejected():
+    frames = WireCodec(binary=True, chunk_size=1024).encode(MESSAGE)
+    with pytest.raises(WireError):
+        decode(frames, FrameAssembler(max_message_size=2048))
+
+
+def test_compression_bombs_are_rejected():
+    frames = WireCodec("json", "zlib", binary=True, compress_threshold=0).encode({"type": "x", "pad": "0" * 100000})
+    with pytest.raises(WireError):
+        FrameAssembler(max_message_size=1000).feed(frames[0])
+
+
+def test_stale_partial_messages_expire():
+    frames = WireCodec(binary=True, chunk_size=1024).encode(MESSAGE)
+    assembler = FrameAssembler(timeout=-1)
+    assembler.feed(frames[0])
+    assembler.feed(WireCodec(binary=True, chunk_size=1024).encode(MESSAGE)[0])
+    assert assembler.pending == 1
+
+
+def test_unknown_binary_frames_are_rejected():
+    with pytest.raises(WireError):
+        FrameAssembler().feed(b"XXXXpayload")
+
+
+def test_negotiation_picks_a_shared_codec():
+    codec = negotiate({"version": 1, "formats": ["json"], "compression": ["zlib"], "chunking": True,
+                       "max_chunk_size": 4096}, chunk_size=65536)
+    assert (codec.binary, codec.format, codec.compression, codec.chunk_size) == (True, "json", "zlib", 4096)
+    assert WireCodec.from_dict(codec.to_dict()).to_dict() == codec.to_dict()
+
+
+@pytest.mark.parametrize("offer", [None, {"version": 99}, "json"])
+def test_peers_without_a_valid_offer_keep_json_text(offer):
+    assert not negotiate(offer).binary
+
+
+def test_peers_without_chunking_get_whole_frames():
+    codec = negotiate({"version": 1, "formats": ["json"], "compression": []}, chunk_size=1024)
+    assert len(codec.encode(MESSAGE)) == 1
+
+
+def test_every_copy_of_the_module_is_identical():
+    copies = [path for path in REPO.glob("**/mcp_wire.py") if "node_modules" not in path.parts]
+    assert len(copies) > 1
+    digests = {hashlib.sha256(path.read_bytes()).hexdigest() for path in copies}
+    assert len(digests) == 1, [str(path.relative_to(REPO)) for path in copies]
@@ -0,0 +1,80 @@
+"""
+Tests for relaying message bodies through the MCP server without re-encoding them
+"""
+
+import pytest
+
+from mcp_wire import RELAY_MAGIC, FrameAssembler, RawBody, WireCodec
+
+RESULT = {"type": "task_result", "task_id": "t1", "status": "completed", "result": {"rows": list(range(500))}}
+
+
+def relay(frames):
+    """Decode frames the way the MCP server does, leaving bodies encoded."""
+    assembler = FrameAssembler(lazy_bodies=True)
+    message = None
+    for frame in frames:
+        message = assembler.feed(frame)
+    return message
+
+
+def test_relay_frames_leave_the_body_encoded():
+    frames = WireCodec("json", "zlib", binary=True, compress_threshold=0).encode(RESULT)
+    assert frames[0][:4] == RELAY_MAGIC
+
+    message = relay(frames)
+    assert isinstance(message["result"], RawBody)
+    assert message["task_id"] == "t1"
+    assert message["result"].decode() == RESULT["result"]
+
+
+def test_accepted_bodies_are_forwarded_verbatim():
+    message = relay(WireCodec("json", "zlib", binary=True, compress_threshold=0).encode(RESULT))
+    body = bytes(message["result"].data)
+
+    receiver = WireCodec("json", "none", binary=True, accepted_formats=["json"], accepted_compression=["zlib"])
+    frame = receiver.encode(dict(message, task_id="t2"))[0]
+    assert receiver.bodies_forwarded == 1
+    assert frame.endswith(body)
+    assert FrameAssembler().feed(frame) == dict(RESULT, task_id="t2")
+
+
+def test_bodies_the_peer_cannot_read_are_re_encoded():
+    message = relay(WireCodec("json", "zlib", binary=True, compress_threshold=0).encode(RESULT))
+
+    receiver = WireCodec("json", "none", binary=True, accepted_formats=["json"], accepted_compression=[])
+    frame = receiver.encode(message)[0]
+    assert receiver.bodies_forwarded == 0
+    assert FrameAssembler().feed(frame) == RESULT
+
+
+def test_raw_bodies_are_decoded_for_text_peers():
+    message = relay(WireCodec(binary=True).encode(RESULT))
+    assert FrameAssembler().feed(WireCodec().encode(message)[0]) == RESULT
+
+
+@pytest.mark.parametrize("message_type, path", [
+    ("task_request", ("data",)),
+    ("research_action", ("data", "payload")),
+])
+def test_nested_body_paths(message_type, path):
+    message = {"type": message_type, "data": {"task_id": "t1", "payload": {"query": "x" * 100}}}
+    expected_body = message
+    for key in path:
+        expected_body = expected_body[key]
+
+    relayed = relay(WireCodec(binary=True).encode(message))
+    parent = relayed
+    for key in path[:-1]:
+        parent = parent[key]
+    assert isinstance(parent[path[-1]], RawBody)
+    assert parent[path[-1]].decode() == expected_body
+    assert FrameAssembler().feed(WireCodec(binary=True).encode(relayed)[0]) == message
+
+
+def test_chunked_relay_frames_keep_raw_bodies():
+    frames = WireCodec("json", "zlib", binary=True, chunk_size=256, compress_threshold=0).encode(RESULT)
+    assert len(frames) > 1
+    message = relay(frames)
+    assert isinstance(message["result"], RawBody)
+    assert message["result"].decode() == RESULT["result"]
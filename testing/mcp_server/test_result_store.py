@@ -0,0 +1,84 @@
+"""
+Tests for the MCP server's in-memory result store
+"""
+
+import time
+
+from result_store import MemoryResultStore, new_entry
+
+
+async def test_result_stays_unacked_until_the_requester_acks():
+    store = MemoryResultStore()
+    await store.put(new_entry("t1", "gateway"))
+    await store.complete("t1", "completed", b"frame")
+    await store.mark_delivered("t1", acked=False)
+
+    assert await store.unacked("gateway") == ["t1"]
+    assert not await store.ack("t1", "someone-else")
+    assert await store.ack("t1", "gateway")
+    assert await store.unacked("gateway") == []
+    assert (await store.get("t1"))["acked"]
+
+
+async def test_delivery_without_acks_counts_as_acknowledged():
+    store = MemoryResultStore()
+    await store.complete("t1", "completed", b"frame", requester_id="agent")
+    await store.mark_delivered("t1", acked=True)
+    assert await store.unacked("agent") == []
+
+
+async def test_idempotency_key_follows_its_entry():
+    store = MemoryResultStore()
+    await store.put(new_entry("t1", "gateway", idempotency_scope="scope"))
+    await store.bind_key("scope", "t1")
+    assert await store.find_key("scope") == "t1"
+    assert await store.find_key("other") is None
+
+
+async def test_expire_drops_old_entries_keys_and_bodies():
+    store = MemoryResultStore(ttl=60)
+    await store.complete("old", "completed", b"x" * 10, requester_id="gateway")
+    await store.bind_key("scope", "old")
+    store._entries["old"]["updated_at"] = time.time() - 120
+    await store.complete("new", "completed", b"y" * 10, requester_id="gateway")
+
+    await store.expire()
+    assert await store.get("old") is None
+    assert await store.get_message("old") is None
+    assert await store.find_key("scope") is None
+    assert await store.unacked("gateway") == ["new"]
+    assert store.message_bytes == 10
+
+
+async def test_byte_budget_drops_acked_bodies_first():
+    store = MemoryResultStore(max_bytes=25)
+    await store.complete("acked", "completed", b"a" * 10, requester_id="gateway")
+    await store.ack("acked", "gateway")
+    await store.complete("pending", "completed", b"p" * 10, requester_id="gateway")
+    await store.complete("latest", "completed", b"l" * 10, requester_id="gateway")
+
+    assert await store.get_message("acked") is None
+    assert await store.get_message("pending") == b"p" * 10
+    assert await store.get_message("latest") == b"l" * 10
+    assert store.message_bytes == 20
+    # The entry outlives its body
+    assert (await store.get("acked"))["status"] == "completed"
+
+
+async def test_byte_budget_evicts_least_recently_used():
+    store = MemoryResultStore(max_bytes=25)
+    for task_id in ("a", "b"):
+        await store.complete(task_id, "completed", b"x" * 10, requester_id="gateway")
+        await store.ack(task_id, "gateway")
+    await store.get_message("a")
+    await store.complete("c", "completed", b"x" * 10, requester_id="gateway")
+
+    assert await store.get_message("a") is not None
+    assert await store.get_message("b") is None
+
+
+async def test_replacing_a_body_keeps_the_byte_count():
+    store = MemoryResultStore()
+    await store.complete("t1", "completed", b"x" * 10)
+    await store.complete("t1", "completed", b"x" * 4)
+    assert store.message_bytes == 4
@@ -0,0 +1,172 @@
+"""
+Tests for the network agent's pooled Google search client
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("tenacity")
+
+from google_search_service import GoogleSearchService, RateLimiter, SearchCache, SearchResponse, get_ssl_context
+
+CONFIG = {"google_search": {"api_key": "key", "search_engine_id": "engine", "default_page_size": 10,
+                            "rate_limit": {"max_requests_per_minute": 100, "max_requests_per_day": 1000}}}
+
+
+def response(query, page, count, total=95):
+    items = [{"title": f"{query} {page}.{index}", "link": f"https://example.org/{page}/{index}"}
+             for index in range(count)]
+    return SearchResponse({"searchInformation": {"totalResults": str(total)}, "items": items}, query, page)
+
+
+class FakeHTTPResponse:
+    def __init__(self, data):
+        self.data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self):
+        return self.data
+
+
+class FakeSession:
+    closed = False
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params):
+        self.requests.append(params)
+        return FakeHTTPResponse({"searchInformation": {"totalResults": "3"},
+                                 "items": [{"title": params["q"]}]})
+
+
+@pytest.fixture
+def service():
+    return GoogleSearchService(CONFIG)
+
+
+def test_try_acquire_reserves_until_the_limit():
+    limiter = RateLimiter(max_requests_per_day=100, max_requests_per_minute=3)
+    assert [limiter.try_acquire() for _ in range(5)] == [True, True, True, False, False]
+    assert limiter.daily_requests == 3
+
+
+def test_cache_key_normalises_the_query():
+    assert SearchCache.make_key("  Statin   Trials ", 1, 10, {"lr": "en"}) == \
+        SearchCache.make_key("statin trials", 1, 10, {"lr": "en"})
+    assert SearchCache.make_key("statin trials", 2, 10, {}) != SearchCache.make_key("statin trials", 1, 10, {})
+
+
+def test_cache_evicts_least_recently_used():
+    cache = SearchCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get_stats() == {"entries": 2, "ttl_seconds": 60, "hits": 3, "misses": 1}
+
+
+def test_cache_expires_and_can_be_disabled(monkeypatch):
+    import google_search_service
+
+    cache = SearchCache(ttl_seconds=10)
+    cache.put("a", 1)
+    now = google_search_service.time.monotonic()
+    monkeypatch.setattr(google_search_service.time, "monotonic", lambda: now + 11)
+    assert cache.get("a") is None
+
+    disabled = SearchCache(ttl_seconds=0)
+    disabled.put("a", 1)
+    assert disabled.get("a") is None
+
+
+def test_ssl_context_is_shared():
+    assert get_ssl_context() is get_ssl_context()
+
+
+async def test_session_is_reused_until_stopped(service):
+    session = service._get_session()
+    assert service._get_session() is session
+    await service.stop()
+    assert session.closed
+    assert service._session is None
+
+
+async def test_repeated_searches_are_served_from_cache(service):
+    session = FakeSession()
+    service._get_session = lambda: session
+
+    first = await service.search("statin trials")
+    again = await service.search("Statin  trials")
+    assert again is first
+    assert len(session.requests) == 1
+    assert service.rate_limiter.daily_requests == 1
+
+    await service.search("statin trials", page=2)
+    assert [params["start"] for params in session.requests] == [1, 11]
+
+
+async def test_pages_after_the_first_are_fetched_concurrently(service):
+    service.max_concurrent_pages = 3
+    in_flight = {"now": 0, "peak": 0}
+
+    async def search(query, page=1, **kwargs):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01 * (10 - page))
+        in_flight["now"] -= 1
+        return response(query, page, 10 if page < 10 else 5)
+
+    service.search = search
+    pages = await service.search_multiple_pages("statins", max_results=100)
+    assert [page.page for page in pages] == list(range(1, 11))
+    assert in_flight["peak"] == 3
+
+
+async def test_page_count_follows_total_results(service):
+    requested = []
+
+    async def search(query, page=1, **kwargs):
+        requested.append(page)
+        return response(query, page, 10, total=25)
+
+    service.search = search
+    pages = await service.search_multiple_pages("statins", max_results=100)
+    assert sorted(requested) == [1, 2, 3]
+    assert len(pages) == 3
+
+
+async def test_pages_stop_at_the_first_failure_or_short_page(service):
+    async def search(query, page=1, **kwargs):
+        if page == 4:
+            raise ValueError("Rate limit exceeded - please try again later")
+        return response(query, page, 5 if page == 6 else 10)
+
+    service.search = search
+    assert [page.page for page in await service.search_multiple_pages("statins", max_results=100)] == [1, 2, 3]
+
+    async def short(query, page=1, **kwargs):
+        return response(query, page, 4 if page == 2 else 10)
+
+    service.search = short
+    assert [page.page for page in await service.search_multiple_pages("statins", max_results=100)] == [1, 2]
+
+
+async def test_failed_first_page_returns_nothing(service):
+    async def search(query, page=1, **kwargs):
+        raise ValueError("boom")
+
+    service.search = search
+    assert await service.search_multiple_pages("statins", max_results=50) == []
@@ -0,0 +1,11 @@
+"""
+Import paths for the research manager package and the MCP server modules
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+sys.path.insert(0, str(ROOT / "agents" / "research-manager" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "mcp-server"))
@@ -0,0 +1,70 @@
+"""
+Regression tests for keeping in-use research contexts cached
+"""
+
+from research_manager.context_store import ResearchContextStore
+from research_manager.models import ResearchAction, ResearchContext
+from research_manager.workflow_dag import WorkflowDAG
+
+
+def make_context(task_id):
+    return ResearchContext(
+        task_id=task_id, plan_id="plan-1", task_description="Exercise and depression",
+        user_id="user-1", topic_id="topic-1"
+    )
+
+
+def make_dag(task_id):
+    return WorkflowDAG(task_id, [ResearchAction(
+        task_id="literature", context_id=task_id, agent_type="literature",
+        action="search_literature", payload={}
+    )])
+
+
+async def test_overflow_skips_contexts_with_running_workflows(tmp_path):
+    """A context whose workflow is running stays the same cached object"""
+    store = ResearchContextStore(str(tmp_path / "contexts.db"), max_cached=1)
+    running = make_context("running")
+    store[running.task_id] = running
+    await store.save_workflow(running, make_dag(running.task_id))
+
+    for index in range(3):
+        store[f"other-{index}"] = make_context(f"other-{index}")
+
+    assert store["running"] is running
+    assert store.get_workflow("running") is store.get_workflow("running")
+    assert store.cached_count == 2
+    store.close()
+
+
+async def test_idle_eviction_skips_running_workflows(tmp_path):
+    """Idle eviction saves and drops finished contexts but keeps running ones"""
+    store = ResearchContextStore(str(tmp_path / "contexts.db"), idle_timeout=0)
+    running, idle = make_context("running"), make_context("idle")
+    store[running.task_id] = running
+    store[idle.task_id] = idle
+    await store.save_workflow(running, make_dag(running.task_id))
+
+    assert await store.evict_idle() == 1
+    assert store["running"] is running
+    assert store["idle"] is not idle
+    store.close()
+
+
+async def test_async_writes_persist(tmp_path):
+    """Writes made off the event loop are read back by a new store"""
+    path = str(tmp_path / "contexts.db")
+    store = ResearchContextStore(path)
+    context = make_context("task-1")
+    store[context.task_id] = context
+    await store.save_workflow(context, make_dag(context.task_id))
+    await store.put_artifact(context.task_id, "node:literature", {"records": 2})
+    await store.append_records(context.task_id, "search_results", [{"id": 1}])
+    await store.append_records(context.task_id, "search_results", [{"id": 2}])
+    store.close()
+
+    reopened = ResearchContextStore(path)
+    assert reopened.workflow_ids() == ["task-1"]
+    assert reopened.get_artifact("task-1", "node:literature") == {"records": 2}
+    assert reopened.get_records("task-1", "search_results") == [{"id": 1}, {"id": 2}]
+    reopened.close()
@@ -0,0 +1,138 @@
+"""
+Regression tests for retrying failed workflow shards through the MCP server
+"""
+
+import pytest
+
+from mcp_server import MCPServer
+from mcp_wire import FrameAssembler, WireCodec
+from research_manager.context_store import ResearchContextStore
+from research_manager.models import ResearchContext
+from research_manager.workflow_orchestrator import WorkflowOrchestrator
+
+
+AGENTS = {
+    "literature-agent": ("literature", "search_literature"),
+    "synthesis-agent": ("synthesis_review", "synthesize_evidence"),
+    "screening-agent": ("screening", "screen_literature"),
+}
+
+
+class RoutedCommunicator:
+    """Sends delegations straight into an in-process MCP server"""
+
+    mcp_connected = True
+
+    def __init__(self, server: MCPServer):
+        self.server = server
+        self.keys = []
+
+    async def delegate_to_agent(self, task_id, agent_type, action_data, delegation_id=None, idempotency_key=None):
+        self.keys.append(idempotency_key)
+        await self.server._handle_research_action("rm-conn", {
+            "type": "research_action",
+            "data": {
+                "task_id": delegation_id,
+                "context_id": f"delegation-{task_id}",
+                "agent_type": agent_type,
+                "action": action_data.get("action", "search_literature"),
+                "payload": {**action_data, "original_task_id": task_id, "delegation_id": delegation_id},
+                "idempotency_key": idempotency_key
+            }
+        })
+        return {"delegated": True, "target_agent": agent_type, "delegation_id": delegation_id}
+
+    async def send_progress(self, task_id, progress):
+        pass
+
+
+class FakeService:
+    def __init__(self, store, communicator):
+        self.config = {"research_settings": {"max_retries": 2, "screening_parallelism": 2}}
+        self.active_contexts = store
+        self.mcp_communicator = communicator
+
+
+@pytest.fixture(name="server")
+def server_fixture():
+    server = MCPServer()
+    server.connection_to_entity["rm-conn"] = "research_manager"
+    for agent_id, (agent_type, action) in AGENTS.items():
+        server.agent_registry[agent_id] = {"agent_type": agent_type, "status": "active", "capabilities": [action]}
+
+    server.agent_inbox = []
+    server.manager_inbox = []
+
+    async def send_to_entity(entity_id, message, buffer=True):
+        inbox = server.agent_inbox if entity_id in AGENTS else server.manager_inbox
+        inbox.append((entity_id, message))
+        return True
+
+    server._send_to_entity = send_to_entity
+    return server
+
+
+async def test_failed_shard_is_rerun_with_new_key(server, tmp_path):
+    """A shard that fails once is sent to its agent again and the workflow completes"""
+    store = ResearchContextStore(str(tmp_path / "contexts.db"))
+    communicator = RoutedCommunicator(server)
+    orchestrator = WorkflowOrchestrator(FakeService(store, communicator))
+
+    context = ResearchContext(
+        task_id="task-1", plan_id="plan-1", task_description="Exercise and depression",
+        user_id="user-1", topic_id="topic-1",
+        metadata={"research_plan": {"questions": ["Does exercise help?"]}}
+    )
+    store[context.task_id] = context
+
+    started = await orchestrator.start_research_workflow(context)
+    assert started["workflow_started"]
+
+    literature_runs = 0
+    outcome = None
+    while server.agent_inbox:
+        agent_id, request = server.agent_inbox.pop(0)
+        if agent_id == "literature-agent":
+            literature_runs += 1
+            # Like the literature agent: the failure is only reported inside the result
+            result = ({"status": "failed", "error": "Search provider unavailable"} if literature_runs == 1
+                      else {"status": "completed", "records": [{"id": f"rec-{i}"} for i in range(4)]})
+        else:
+            result = {"status": "completed", "records": request["data"].get("literature_results", [])}
+
+        await server._handle_task_result(f"{agent_id}-conn", {"task_id": request["task_id"], "result": result})
+
+        while server.manager_inbox:
+            _, message = server.manager_inbox.pop(0)
+            if message["type"] == "task_result":
+                outcome = await orchestrator.handle_delegation_result(
+                    context, message["task_id"], message["status"], message["result"], message.get("error")
+                )
+
+    assert literature_runs == 2
+    assert communicator.keys[0] != communicator.keys[1]
+    assert outcome["workflow_completed"]
+    store.close()
+
+
+async def test_failed_result_is_not_reused(server):
+    """A stored result reporting failure inside its body is run again, relayed or not"""
+    for index, relayed in enumerate((False, True)):
+        scope_key = f"lit:{index}"
+        action = {"type": "research_action", "data": {
+            "task_id": f"first-{index}", "agent_type": "literature",
+            "action": "search_literature", "payload": {}, "idempotency_key": scope_key
+        }}
+        await server._handle_research_action("rm-conn", action)
+
+        message = {"type": "task_result", "task_id": f"first-{index}", "result": {"status": "failed", "error": "boom"}}
+        if relayed:
+            # Result body left encoded, as for an agent that negotiated the binary codec
+            message = FrameAssembler(lazy_bodies=True).feed(WireCodec(binary=True).encode(message)[0])
+        await server._handle_task_result("literature-agent-conn", message)
+
+        server.agent_inbox.clear()
+        action["data"]["task_id"] = f"second-{index}"
+        await server._handle_research_action("rm-conn", action)
+
+        assert [request["task_id"] for _, request in server.agent_inbox] == [f"second-{index}"]
@@ -0,0 +1,83 @@
+"""
+Tests for the screening agent's criteria matcher
+"""
+
+import pytest
+
+from criteria_matcher import CriteriaMatcher, stem
+
+
+@pytest.mark.parametrize("singular, plural", [
+    ("disease", "diseases"),
+    ("case", "cases"),
+    ("bias", "biases"),
+    ("analysis", "analyses"),
+    ("study", "studies"),
+    ("trial", "trials"),
+])
+def test_singular_and_plural_share_a_stem(singular, plural):
+    assert stem(singular) == stem(plural)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("rat", "rate"),
+    ("rats", "rates"),
+    ("rats", "rated"),
+    ("these", "thesis"),
+    ("these", "theses"),
+])
+def test_unrelated_words_keep_distinct_stems(first, second):
+    assert stem(first) != stem(second)
+
+
+@pytest.mark.parametrize("word, other", [
+    ("rate", "rated"),
+    ("include", "included"),
+    ("controlled", "control"),
+    ("process", "processes"),
+    ("dose", "doses"),
+])
+def test_inflections_share_a_stem(word, other):
+    assert stem(word) == stem(other)
+
+
+def test_animal_exclusion_ignores_rates():
+    matcher = CriteriaMatcher([{"name": "animal", "type": "exclude", "keywords": ["rats"]}])
+    assert matcher.match("Overall dropout rates were low") == ([], [])
+    assert matcher.match("Outcomes in a rat model") == ([0], [])
+
+
+@pytest.mark.parametrize("keyword, text", [
+    ("disease", "Patients with chronic diseases"),
+    ("diseases", "A rare disease cohort"),
+    ("cases", "One case was excluded"),
+    ("bias", "Risk of biases was assessed"),
+    ("meta-analysis", "Two meta-analyses were pooled"),
+    ("meta-analyses", "A meta analysis of cohorts"),
+    ("randomized", "Participants were randomised"),
+])
+def test_keyword_matches_other_number(keyword, text):
+    matcher = CriteriaMatcher([{"name": "criterion", "keywords": [keyword]}])
+    assert matcher.match(text) == ([0], [])
+
+
+def test_negation_is_scoped_to_negated_term():
+    matcher = CriteriaMatcher([
+        {"name": "randomized", "keywords": ["randomized"]},
+        {"name": "trial", "keywords": ["trial"]},
+        {"name": "rct", "keywords": ["randomized controlled trial"]},
+    ])
+    matched, negated = matcher.match("A non-randomized controlled trial of exercise")
+    assert matched == [1]
+    assert negated == [0, 2]
+
+
+def test_negation_skips_filler_words():
+    matcher = CriteriaMatcher([{"name": "bias", "keywords": ["bias"]}])
+    assert matcher.match("There was no evidence of bias") == ([], [0])
+    assert matcher.match("Bias was not assessed") == ([0], [])
+
+
+def test_negation_window_disabled():
+    matcher = CriteriaMatcher([{"name": "trial", "keywords": ["trial"]}], negation_window=0)
+    assert matcher.match("not a trial") == ([0], [])
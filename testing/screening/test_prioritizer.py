@@ -0,0 +1,126 @@
+"""
+Tests for the screening agent's prioritizer and recall stopping rule
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from prioritizer import LOGISTIC_MODEL, PRIOR_MODEL, ScreeningPrioritizer, recall_p_value
+
+RELEVANT = [f"Statin therapy reduced cardiovascular events in adults, trial {index}" for index in range(5)]
+IRRELEVANT = [f"Soil bacteria and crop yields in dry regions, survey {index}" for index in range(45)]
+
+
+def hypergeometric_cdf(seen, size, relevant, urn):
+    """P(X <= seen) for X relevant records in a sample of size drawn from the urn."""
+    return sum(math.comb(relevant, k) * math.comb(urn - relevant, size - k)
+               for k in range(seen + 1)) / math.comb(urn, size)
+
+
+@pytest.fixture
+def prioritizer():
+    prioritizer = ScreeningPrioritizer()
+    records = [(f"irr{index}", text, None) for index, text in enumerate(IRRELEVANT)]
+    records[10:10] = [(f"rel{index}", text, None) for index, text in enumerate(RELEVANT)]
+    prioritizer.add_records(records)
+    return prioritizer
+
+
+def test_no_screening_gives_no_evidence():
+    assert recall_p_value(np.zeros(0, dtype=np.int64), 100, 0.95) == 1.0
+
+
+def test_p_value_is_the_smallest_tail_test():
+    sequence = np.array([1] * 18 + [0, 1, 1] + [0] * 300)
+    unscreened = 50
+    p_value = recall_p_value(sequence, unscreened, 0.9)
+
+    found = 20
+    hypothesized = math.floor(found / 0.9) + 1
+    # The sample of everything screened after the last relevant record
+    whole_tail = hypergeometric_cdf(0, 300, hypothesized - found, 300 + unscreened)
+    assert p_value <= whole_tail + 1e-12
+    assert p_value < 0.01
+
+
+def test_recent_relevant_records_keep_p_value_high():
+    sequence = np.array([0] * 20 + [1, 0, 1, 1])
+    assert recall_p_value(sequence, 200, 0.95) > 0.5
+
+
+def test_impossible_hypothesis_is_rejected_outright():
+    # Too few records are left to hold the relevant ones the hypothesis needs
+    assert recall_p_value(np.array([1] * 10 + [0] * 5), 0, 0.95) == 0.0
+
+
+def test_prior_ranking_uses_the_query(prioritizer):
+    batch, _, model = prioritizer.next_batch(5, query="statin cardiovascular")
+    assert model == PRIOR_MODEL
+    assert {item["record_id"] for item in batch} == {f"rel{index}" for index in range(5)}
+    assert [item["rank"] for item in batch] == [1, 2, 3, 4, 5]
+
+
+def test_without_a_query_records_keep_arrival_order(prioritizer):
+    batch, _, _ = prioritizer.next_batch(3)
+    assert [item["record_id"] for item in batch] == ["irr0", "irr1", "irr2"]
+
+
+def test_classifier_ranks_relevant_records_first(prioritizer):
+    prioritizer.set_labels([("rel0", "include"), ("irr0", "exclude"), ("irr1", "exclude")])
+    batch, scores, model = prioritizer.next_batch(4)
+    assert model == LOGISTIC_MODEL
+    assert {item["record_id"] for item in batch} == {"rel1", "rel2", "rel3", "rel4"}
+    assert prioritizer.summary()["model_version"] == 1
+    assert np.all((scores >= 0) & (scores <= 1))
+
+
+def test_leased_and_decided_records_are_not_handed_out_again(prioritizer):
+    first, _, _ = prioritizer.next_batch(3, lease_seconds=60)
+    second, _, _ = prioritizer.next_batch(3, lease_seconds=60)
+    assert not {item["record_id"] for item in first} & {item["record_id"] for item in second}
+
+    prioritizer.set_labels([(first[0]["record_id"], "exclude")])
+    assert prioritizer.summary()["leased"] == 5
+    third, _, _ = prioritizer.next_batch(50)
+    assert len(third) == 50 - 6
+
+
+def test_unsure_clears_a_label(prioritizer):
+    prioritizer.set_labels([("rel0", "include"), ("rel0", "unsure")])
+    assert "rel0" not in prioritizer.labels
+
+
+def test_stopping_after_the_relevant_records_are_found(prioritizer):
+    screened = []
+    while True:
+        batch, scores, model = prioritizer.next_batch(5, query="statin cardiovascular")
+        prioritizer.set_labels([
+            (item["record_id"], "include" if item["record_id"].startswith("rel") else "exclude") for item in batch
+        ])
+        screened.extend(item["record_id"] for item in batch)
+        _, scores, model = prioritizer.next_batch(0)
+        status = prioritizer.stopping(scores, model, target_recall=0.8, confidence=0.95, min_screened=10)
+        if status["should_stop"] or not batch:
+            break
+
+    assert status["relevant_found"] == 5
+    assert status["should_stop"]
+    assert status["unscreened"] > 0
+    assert status["p_value"] < 0.05
+    assert status["irrelevant_streak"] == len(screened) - 5
+    assert status["estimated_recall"] is not None
+
+
+def test_stopping_waits_for_min_screened(prioritizer):
+    prioritizer.set_labels([(f"irr{index}", "exclude") for index in range(8)])
+    status = prioritizer.stopping(*prioritizer.scores(), target_recall=0.5, confidence=0.5, min_screened=10)
+    assert status["screened"] == 8
+    assert not status["should_stop"]
+
+
+def test_records_are_added_once(prioritizer):
+    assert prioritizer.add_records([("rel0", "duplicate", None), ("new", "Another statin trial", [0.1, 0.2])]) == 1
+    assert len(prioritizer) == 51
+    assert prioritizer.summary()["embedding_dim"] == 2
@@ -0,0 +1,132 @@
+"""
+Tests for the screening agent's append-only decision store
+"""
+
+import pytest
+
+from screening_store import ScreeningStore
+
+
+def decision(record_id, verdict, timestamp, reason="", stage="title_abstract"):
+    return {"record_id": record_id, "stage": stage, "decision": verdict, "reason": reason,
+            "confidence": 0.9, "timestamp": timestamp}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScreeningStore(str(tmp_path / "data" / "screening.db"))
+    yield store
+    store.close()
+
+
+def recount(store, session_id):
+    """Counters rebuilt from the current decisions, for comparison with the maintained ones."""
+    counts = {}
+    for row in store.get_decisions(session_id):
+        key = (row["stage"], row["decision"], row["reason"] if row["decision"] == "exclude" else "")
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def test_counters_follow_appends_and_revisions(store):
+    assert store.append_decisions("s1", [
+        decision("r1", "include", "2025-01-01T10:00:00"),
+        decision("r2", "exclude", "2025-01-01T10:01:00", reason="animal study"),
+        decision("r3", "exclude", "2025-01-01T10:02:00", reason="animal study"),
+        decision("r4", "uncertain", "2025-01-01T10:03:00", reason="no abstract"),
+    ]) == 0
+    assert store.counters("s1") == {
+        ("title_abstract", "include", ""): 1,
+        ("title_abstract", "exclude", "animal study"): 2,
+        ("title_abstract", "uncertain", ""): 1,
+    }
+
+    assert store.append_decisions("s1", [
+        decision("r2", "include", "2025-01-02T09:00:00"),
+        decision("r4", "exclude", "2025-01-02T09:01:00", reason="wrong population"),
+        decision("r1", "include", "2025-01-02T09:02:00", stage="full_text"),
+    ]) == 2
+    assert store.counters("s1") == {
+        ("title_abstract", "include", ""): 2,
+        ("title_abstract", "exclude", "animal study"): 1,
+        ("title_abstract", "exclude", "wrong population"): 1,
+        ("full_text", "include", ""): 1,
+    }
+    assert store.counters("s1") == recount(store, "s1")
+    assert store.total_decisions("s1") == 5
+
+
+def test_revisions_within_one_batch(store):
+    assert store.append_decisions("s1", [
+        decision("r1", "exclude", "2025-01-01T10:00:00", reason="animal study"),
+        decision("r1", "include", "2025-01-01T10:01:00"),
+    ]) == 1
+    assert store.counters("s1") == {("title_abstract", "include", ""): 1}
+    assert [row["decision"] for row in store.get_decisions("s1", include_history=True)] == ["exclude", "include"]
+    [current] = store.get_decisions("s1")
+    assert current["supersedes"] == store.get_decisions("s1", include_history=True)[0]["seq"]
+
+
+def test_as_of_rebuilds_past_counts(store):
+    store.append_decisions("s1", [
+        decision("r1", "exclude", "2025-01-01T10:00:00", reason="animal study"),
+        decision("r2", "include", "2025-01-01T11:00:00"),
+    ])
+    first_seq = store.last_seq("s1")
+    store.append_decisions("s1", [decision("r1", "include", "2025-01-02T10:00:00")])
+
+    before_revision = {
+        ("title_abstract", "exclude", "animal study"): 1,
+        ("title_abstract", "include", ""): 1,
+    }
+    assert store.counters("s1", as_of=first_seq) == before_revision
+    assert store.counters("s1", as_of="2025-01-01T23:59:59") == before_revision
+    assert store.counters("s1", as_of="2025-01-01T10:30:00") == {("title_abstract", "exclude", "animal study"): 1}
+    assert store.counters("s1", as_of=store.last_seq("s1")) == store.counters("s1")
+
+
+def test_sessions_are_isolated_and_deleted_whole(store, tmp_path):
+    store.append_decisions("s1", [decision("r1", "include", "2025-01-01T10:00:00")])
+    store.append_decisions("s2", [decision("r1", "exclude", "2025-01-01T10:00:00", reason="duplicate")])
+    store.add_pool_records("s1", [("r1", "Statins in adults", None)])
+    assert store.total_decisions() == 2
+
+    store.delete_session("s1")
+    assert store.counters("s1") == {}
+    assert store.get_decisions("s1") == []
+    assert store.pool_size("s1") == 0
+    assert store.counters("s2") == {("title_abstract", "exclude", "duplicate"): 1}
+
+
+def test_failed_batches_leave_no_trace(store):
+    store.append_decisions("s1", [decision("r1", "include", "2025-01-01T10:00:00")])
+    broken = decision("r2", "include", "2025-01-01T10:01:00")
+    del broken["confidence"]
+    with pytest.raises(KeyError):
+        store.append_decisions("s1", [decision("r1", "exclude", "2025-01-01T10:01:00", reason="x"), broken])
+    assert store.counters("s1") == {("title_abstract", "include", ""): 1}
+    assert len(store.get_decisions("s1", include_history=True)) == 1
+
+
+def test_state_survives_reopening(tmp_path):
+    path = str(tmp_path / "screening.db")
+    store = ScreeningStore(path)
+    store.append_decisions("s1", [decision("r1", "include", "2025-01-01T10:00:00")])
+    store.add_pool_records("s1", [("r1", "first", b"\x00\x01"), ("r2", "second", None)])
+    store.close()
+
+    reopened = ScreeningStore(path)
+    assert reopened.counters("s1") == {("title_abstract", "include", ""): 1}
+    assert reopened.current_labels("s1") == [("r1", "include")]
+    assert reopened.add_pool_records("s1", [("r2", "second", None), ("r3", "third", None)]) == 1
+    assert [row[0] for row in reopened.load_pool("s1")] == ["r1", "r2", "r3"]
+    reopened.close()
+
+
+def test_decision_paging(store):
+    store.append_decisions("s1", [
+        decision(f"r{index}", "include", f"2025-01-01T10:0{index}:00") for index in range(5)
+    ])
+    page = store.get_decisions("s1", limit=2, offset=2)
+    assert [row["record_id"] for row in page] == ["r2", "r3"]
+    assert [row["record_id"] for row in store.get_decisions("s1", record_id="r4")] == ["r4"]
@@ -0,0 +1,174 @@
+"""
+Tests for the synthesis agent's vectorized meta-analysis core
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from meta_analysis import (
+    MetaAnalysisError, bootstrap_intervals, compute_effect_sizes, leave_one_out,
+    outcome_effects, pool, resolve_method,
+)
+
+Y = np.array([0.10, 0.30, 0.35, 0.65, 0.45, 0.15])
+V = np.array([0.03, 0.03, 0.05, 0.01, 0.05, 0.02])
+
+
+def dersimonian_laird(y, v):
+    """Textbook DL pooling, one study at a time."""
+    w = [1 / vi for vi in v]
+    fixed = sum(wi * yi for wi, yi in zip(w, y)) / sum(w)
+    q = sum(wi * (yi - fixed) ** 2 for wi, yi in zip(w, y))
+    c = sum(w) - sum(wi * wi for wi in w) / sum(w)
+    tau2 = max(0.0, (q - (len(y) - 1)) / c)
+    w_star = [1 / (vi + tau2) for vi in v]
+    estimate = sum(wi * yi for wi, yi in zip(w_star, y)) / sum(w_star)
+    return estimate, math.sqrt(1 / sum(w_star)), tau2, q
+
+
+def single(method, y=Y, v=V):
+    return pool(y, v, np.zeros(len(y), dtype=int), 1, method)
+
+
+def test_dersimonian_laird_matches_reference():
+    estimate, se, tau2, q = dersimonian_laird(Y, V)
+    result = single("DL")
+    assert result["estimate"][0] == pytest.approx(estimate)
+    assert result["se"][0] == pytest.approx(se)
+    assert result["tau2"][0] == pytest.approx(tau2)
+    assert result["q"][0] == pytest.approx(q)
+    assert result["k"][0] == 6 and result["df"][0] == 5
+
+
+def test_fixed_effect_has_no_between_study_variance():
+    result = single("FE")
+    assert result["tau2"][0] == 0
+    assert result["estimate"][0] == pytest.approx(np.sum(Y / V) / np.sum(1 / V))
+    assert result["estimate"][0] == pytest.approx(result["fixed_estimate"][0])
+
+
+def reml_score(tau2, y=Y, v=V):
+    w = 1 / (v + tau2)
+    mu = np.sum(w * y) / np.sum(w)
+    return np.sum(w * w * (y - mu) ** 2) - (np.sum(w) - np.sum(w * w) / np.sum(w))
+
+
+def test_reml_solves_the_score_equation():
+    low, high = 0.0, 1.0
+    for _ in range(100):
+        middle = (low + high) / 2
+        low, high = (middle, high) if reml_score(middle) > 0 else (low, middle)
+    assert single("REML")["tau2"][0] == pytest.approx(low, rel=1e-6)
+
+
+def test_homogeneous_studies_have_zero_tau2():
+    y = np.array([0.2, 0.21, 0.19, 0.2])
+    v = np.full(4, 0.1)
+    for method in ("DL", "REML"):
+        result = single(method, y, v)
+        assert result["tau2"][0] == 0
+        assert result["i2"][0] == 0
+
+
+def test_groups_are_pooled_independently():
+    groups = np.array([0, 0, 0, 1, 1, 1])
+    grouped = pool(Y, V, groups, 2, "REML")
+    for group in (0, 1):
+        alone = single("REML", Y[groups == group], V[groups == group])
+        for key in ("estimate", "se", "tau2", "q", "p_value"):
+            assert grouped[key][group] == pytest.approx(alone[key][0], abs=1e-7)
+
+
+def test_empty_groups_get_nan():
+    result = pool(Y, V, np.zeros(6, dtype=int), 2, "DL")
+    assert result["k"].tolist() == [6, 0]
+    assert np.isnan(result["estimate"][1])
+
+
+def test_leave_one_out_matches_pooling_the_rest():
+    groups = np.array([1, 0, 1, 0, 1, 0])
+    omitted, results = leave_one_out(Y, V, groups, 2, "DL")
+    assert sorted(omitted.tolist()) == list(range(6))
+    assert groups[omitted].tolist() == [0, 0, 0, 1, 1, 1]
+    for row, study in enumerate(omitted):
+        rest = (groups == groups[study]) & (np.arange(6) != study)
+        estimate, se, tau2, _ = dersimonian_laird(Y[rest], V[rest])
+        assert results["estimate"][row] == pytest.approx(estimate)
+        assert results["se"][row] == pytest.approx(se)
+        assert results["tau2"][row] == pytest.approx(tau2)
+
+
+def test_bootstrap_intervals_are_reproducible_and_cover_the_estimate():
+    groups = np.zeros(6, dtype=int)
+    lower, upper = bootstrap_intervals(Y, V, groups, 1, "DL", samples=200, seed=7)
+    again = bootstrap_intervals(Y, V, groups, 1, "DL", samples=200, seed=7)
+    assert (lower, upper) == again
+    assert lower[0] < single("DL")["estimate"][0] < upper[0]
+
+
+def test_bootstrap_chunks_give_the_same_replicates(monkeypatch):
+    import meta_analysis
+
+    groups = np.zeros(6, dtype=int)
+    whole = bootstrap_intervals(Y, V, groups, 1, "DL", samples=50, seed=3)
+    monkeypatch.setattr(meta_analysis, "BOOTSTRAP_CHUNK_ROWS", 6 * 7)
+    chunked = bootstrap_intervals(Y, V, groups, 1, "DL", samples=50, seed=3)
+    assert np.allclose(whole, chunked)
+
+
+def test_hedges_g_applies_small_sample_correction():
+    study = {"mean_group1": 12, "mean_group2": 10, "sd_group1": 4, "sd_group2": 4, "n_group1": 10, "n_group2": 10}
+    d, _ = compute_effect_sizes([study], "cohens_d")
+    g, _ = compute_effect_sizes([study], "hedges_g")
+    assert d[0] == pytest.approx(0.5)
+    assert g[0] == pytest.approx(0.5 * (1 - 3 / (4 * 18 - 1)))
+
+
+def test_zero_cells_get_continuity_correction():
+    y, v = compute_effect_sizes([
+        {"events_group1": 0, "non_events_group1": 10, "events_group2": 5, "non_events_group2": 5},
+    ], "log_odds_ratio")
+    assert y[0] == pytest.approx(math.log((0.5 * 5.5) / (10.5 * 5.5)))
+    assert v[0] == pytest.approx(1 / 0.5 + 1 / 10.5 + 2 / 5.5)
+
+
+def test_incomplete_studies_are_nan():
+    y, v = compute_effect_sizes([
+        {"mean_group1": 1, "mean_group2": 0, "sd_group1": 1, "sd_group2": 1, "n_group1": 1, "n_group2": 10},
+        {"mean_group1": 1, "mean_group2": 0, "sd_group1": "n/a", "sd_group2": 1, "n_group1": 5, "n_group2": 5},
+    ], "mean_difference")
+    assert np.isnan(y).all() and np.isnan(v).all()
+
+
+def test_reported_effects_take_precedence():
+    y, v, approximated = outcome_effects([
+        {"effect_size": 2.0, "confidence_interval": [1.0, 4.0]},
+        {"effect_size": 0.4, "total_n": 80},
+    ], "odds_ratio")
+    assert y[0] == pytest.approx(math.log(2.0))
+    assert v[0] == pytest.approx(((math.log(4.0) - 0.0) / (2 * 1.959964)) ** 2, rel=1e-5)
+    assert np.isnan(y[1])
+
+    y, v, approximated = outcome_effects([{"effect_size": 0.4, "total_n": 80}], "hedges_g")
+    assert (y[0], v[0]) == (0.4, pytest.approx(4 / 80))
+    assert approximated.tolist() == [True]
+
+
+@pytest.mark.parametrize("model, estimator, expected", [
+    ("fixed", "REML", "FE"),
+    ("random", "dersimonian_laird", "DL"),
+    ("random", "reml", "REML"),
+])
+def test_resolve_method(model, estimator, expected):
+    assert resolve_method(model, estimator) == expected
+
+
+def test_unknown_options_raise():
+    with pytest.raises(MetaAnalysisError):
+        resolve_method("random", "PM")
+    with pytest.raises(MetaAnalysisError):
+        compute_effect_sizes([], "risk_ratio")
+    with pytest.raises(MetaAnalysisError):
+        pool(Y, V, np.zeros(6, dtype=int), 1, "ML")